@@ -118,6 +118,50 @@ def _format_token_count(count: int) -> str:
     return str(count)
 
 
+def _history_page_start(messages: list[Any], end: int, size: int) -> int:
+    """Find where the page of thread history ending at `end` should start.
+
+    The page holds at least `size` messages (unless the history is shorter)
+    and starts at a boundary no tool call crosses: every `ToolMessage` of the
+    page answers a tool call of the page. Pages therefore convert to the same
+    `MessageData` on their own as they would as part of the whole history.
+    A `ToolMessage` whose tool call no earlier `AIMessage` declares (e.g. after
+    the history was summarized) answers nothing, so it is ignored rather than
+    extending the page to the start of the history.
+
+    Args:
+        messages: LangChain messages of the thread.
+        end: Exclusive end index of the page.
+        size: Minimum number of messages in the page.
+
+    Returns:
+        Index of the first message of the page.
+    """
+    from langchain_core.messages import AIMessage, ToolMessage
+
+    # Tool call ids declared by the AI messages before `start`
+    declared = {
+        tc.get("id")
+        for msg in messages[:end]
+        if isinstance(msg, AIMessage)
+        for tc in msg.tool_calls
+    }
+    unanswered: set[str] = set()
+    start = end
+    while start > 0:
+        start -= 1
+        msg = messages[start]
+        if isinstance(msg, ToolMessage) and msg.tool_call_id in declared:
+            unanswered.add(msg.tool_call_id)
+        elif isinstance(msg, AIMessage):
+            ids = {tc.get("id") for tc in msg.tool_calls}
+            unanswered -= ids
+            declared -= ids
+        if end - start >= size and not unanswered:
+            break
+    return start
+
+
 def _write_iterm_escape(sequence: str) -> None:
     """Write an iTerm2 escape sequence to stderr.
 
@@ -464,6 +508,9 @@ class DeepAgentsApp(App):
         self._processing_pending = False
         # Message virtualization store
         self._message_store = MessageStore()
+        # LangChain messages of a resumed thread that precede the store's
+        # first message and have not been converted yet
+        self._unconverted_history: list[Any] = []
         # Lazily imported here to avoid pulling image dependencies into
         # argument parsing paths.
         from deepagents_cli.input import ImageTracker
@@ -663,6 +710,9 @@ class DeepAgentsApp(App):
             return
 
         to_hydrate = self._message_store.get_messages_to_hydrate()
+        if len(to_hydrate) < self._message_store.HYDRATE_BUFFER:
+            await self._load_older_history()
+            to_hydrate = self._message_store.get_messages_to_hydrate()
         if not to_hydrate:
             return
 
@@ -1482,7 +1532,7 @@ class DeepAgentsApp(App):
                         data.tool_status = ToolStatus.SUCCESS
                     else:
                         data.tool_status = ToolStatus.ERROR
-                    data.tool_output = content
+                    data.set_tool_output(content)
                 else:
                     logger.debug(
                         "ToolMessage with tool_call_id=%r could not be "
@@ -1502,14 +1552,65 @@ class DeepAgentsApp(App):
 
         return result
 
+    @staticmethod
+    def _convert_history_tail(
+        messages: list[Any], end: int, min_count: int
+    ) -> tuple[int, list[MessageData]]:
+        """Convert the newest messages before `end` into `MessageData`.
+
+        Converts pages of messages (see `_history_page_start`), newest first,
+        until at least `min_count` `MessageData` are produced or the history
+        is exhausted.
+
+        Args:
+            messages: LangChain messages of the thread.
+            end: Exclusive end index of the messages to convert.
+            min_count: Number of `MessageData` to produce if possible.
+
+        Returns:
+            Index of the first converted message, and the converted data.
+        """
+        data: list[MessageData] = []
+        while end > 0 and len(data) < min_count:
+            start = _history_page_start(messages, end, min_count - len(data))
+            data = DeepAgentsApp._convert_messages_to_data(messages[start:end]) + data
+            end = start
+        return end, data
+
+    async def _load_older_history(self) -> None:
+        """Convert the next page of a resumed thread's older history.
+
+        The conversion runs in a worker thread; its result is prepended to the
+        `MessageStore` as archived messages, ready to be hydrated.
+        """
+        history = self._unconverted_history
+        if not history:
+            return
+        self._unconverted_history = []
+        first = self._message_store.get_message_at_index(0)
+
+        start, data = await asyncio.to_thread(
+            self._convert_history_tail,
+            history,
+            len(history),
+            self._message_store.HYDRATE_BUFFER,
+        )
+
+        # The conversation was cleared or switched while converting
+        if self._message_store.get_message_at_index(0) is not first:
+            return
+        self._unconverted_history = history[:start]
+        self._message_store.prepend(data, more_above=start > 0)
+
     async def _load_thread_history(self) -> None:
         """Load and render message history when resuming a thread.
 
-        This retrieves the checkpoint state from the agent and converts stored
-        messages into lightweight `MessageData` objects, then bulk-loads them
-        into the `MessageStore`. Only the last `WINDOW_SIZE` messages are
-        mounted as widgets, drastically reducing DOM operations for large
-        threads.
+        This retrieves the checkpoint state from the agent and converts the
+        newest `WINDOW_SIZE` stored messages into lightweight `MessageData`
+        objects in a worker thread, then bulk-loads them into the
+        `MessageStore` and mounts them as widgets. Older messages are only
+        converted, a page at a time, when the user scrolls up to them, so
+        resuming long threads does not stall the UI.
         """
         if not self._agent or not self._lc_thread_id:
             return
@@ -1526,13 +1627,21 @@ class DeepAgentsApp(App):
             if not messages:
                 return
 
-            # 2. Convert to data (pure computation, no DOM)
-            all_data = self._convert_messages_to_data(messages)
-            if not all_data:
+            # 2. Convert the tail to data (pure computation, off the event loop)
+            start, tail_data = await asyncio.to_thread(
+                self._convert_history_tail,
+                messages,
+                len(messages),
+                self._message_store.WINDOW_SIZE,
+            )
+            if not tail_data:
                 return
 
-            # 3. Bulk load into store (sets visible window)
-            _archived, visible = self._message_store.bulk_load(all_data)
+            # 3. Bulk load into store (sets visible window); the rest of the
+            # history is converted when scrolled to
+            _archived, visible = self._message_store.bulk_load(tail_data)
+            self._unconverted_history = messages[:start]
+            self._message_store.set_unloaded_above(start > 0)
 
             # 4. Remove spacer once
             await self._remove_spacer()
@@ -1676,6 +1785,7 @@ class DeepAgentsApp(App):
         """Clear the messages area and message store."""
         # Clear the message store first
         self._message_store.clear()
+        self._unconverted_history = []
         try:
             messages = self.query_one("#messages", Container)
             await messages.remove_children()
@@ -0,0 +1,180 @@
+"""Checkpoint serializer that compresses payloads behind a readable header.
+
+Long threads checkpoint their whole message history (and the agent's `files`)
+on every step, so checkpoint blobs grow large and compress well.
+`CompressedSerializer` wraps the serializer of the checkpointer and stores large
+values as a small uncompressed header followed by a zstd frame:
+
+| Offset | Size | Field                                         |
+| ------ | ---- | --------------------------------------------- |
+| 0      | 4    | Magic bytes `DAC1`                            |
+| 4      | 4    | Number of messages (checkpoints only)         |
+| 8      | 8    | Size of the uncompressed payload, in bytes    |
+| 16     | 8    | Size of the compressed payload, in bytes      |
+| 24     | 8    | Time of serialization, in epoch seconds       |
+
+The stored type is the inner type with a `+zstd` suffix, so values written
+before the wrapper was introduced (or too small to be worth compressing) are
+still read by the inner serializer unchanged. Thread listings read the header
+with `read_header` instead of decoding the payload.
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import zstandard
+
+if TYPE_CHECKING:
+    from langgraph.checkpoint.serde.base import SerializerProtocol
+
+COMPRESSED_TYPE_SUFFIX = "+zstd"
+"""Suffix appended to the inner type of compressed values."""
+
+DEFAULT_MIN_COMPRESS_SIZE = 1024
+"""Smallest serialized value (in bytes) worth compressing."""
+
+DEFAULT_COMPRESSION_LEVEL = 3
+
+_MAGIC = b"DAC1"
+_HEADER = struct.Struct("<4sIQQd")
+
+HEADER_SIZE = _HEADER.size
+"""Size of the uncompressed header in bytes."""
+
+
+class CheckpointHeader(NamedTuple):
+    """Metadata stored uncompressed in front of a compressed value."""
+
+    message_count: int
+    """Number of messages of the checkpoint, 0 for other values."""
+
+    raw_size: int
+    """Size of the uncompressed payload in bytes."""
+
+    compressed_size: int
+    """Size of the compressed payload in bytes."""
+
+    updated_at: float
+    """Time the value was serialized, in epoch seconds."""
+
+
+def is_compressed(type_str: str | None) -> bool:
+    """Whether a stored type names a value written by `CompressedSerializer`.
+
+    Returns:
+        True if the value starts with a `CheckpointHeader`.
+    """
+    return bool(type_str) and type_str.endswith(COMPRESSED_TYPE_SUFFIX)
+
+
+def read_header(data: bytes) -> CheckpointHeader:
+    """Parse the header in front of a compressed value.
+
+    Args:
+        data: The stored value, or at least its first `HEADER_SIZE` bytes.
+
+    Returns:
+        The parsed header.
+
+    Raises:
+        ValueError: If `data` does not start with a valid header.
+    """
+    if len(data) < HEADER_SIZE:
+        msg = f"Compressed value is truncated ({len(data)} bytes)"
+        raise ValueError(msg)
+    magic, message_count, raw_size, compressed_size, updated_at = _HEADER.unpack_from(
+        data
+    )
+    if magic != _MAGIC:
+        msg = f"Unknown compressed value header {magic!r}"
+        raise ValueError(msg)
+    return CheckpointHeader(message_count, raw_size, compressed_size, updated_at)
+
+
+def count_messages(obj: Any) -> int:  # noqa: ANN401  # Arbitrary checkpoint value
+    """Count the messages of a checkpoint, 0 for any other value.
+
+    Returns:
+        Number of messages in the `messages` channel.
+    """
+    if not isinstance(obj, dict):
+        return 0
+    channel_values = obj.get("channel_values")
+    if not isinstance(channel_values, dict):
+        return 0
+    messages = channel_values.get("messages")
+    return len(messages) if isinstance(messages, list) else 0
+
+
+class CompressedSerializer:
+    """`SerializerProtocol` wrapper compressing large values with zstd.
+
+    Example:
+        ```python
+        serde = CompressedSerializer(JsonPlusSerializer())
+        checkpointer = AsyncSqliteSaver(conn, serde=serde)
+        ```
+    """
+
+    def __init__(
+        self,
+        inner: SerializerProtocol,
+        *,
+        min_compress_size: int = DEFAULT_MIN_COMPRESS_SIZE,
+        level: int = DEFAULT_COMPRESSION_LEVEL,
+    ) -> None:
+        """Initialize the serializer.
+
+        Args:
+            inner: Serializer producing the payload, e.g. `JsonPlusSerializer`.
+            min_compress_size: Values serializing to fewer bytes are stored as the
+                inner serializer wrote them.
+            level: zstd compression level.
+        """
+        self.inner = inner
+        self.min_compress_size = min_compress_size
+        self.level = level
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:  # noqa: ANN401  # SerializerProtocol signature
+        """Serialize `obj`, compressing the payload if it is large enough.
+
+        Returns:
+            Tuple of the stored type and the stored bytes.
+        """
+        type_str, payload = self.inner.dumps_typed(obj)
+        if len(payload) < self.min_compress_size:
+            return type_str, payload
+        compressed = zstandard.compress(payload, self.level)
+        header = _HEADER.pack(
+            _MAGIC, count_messages(obj), len(payload), len(compressed), time.time()
+        )
+        return type_str + COMPRESSED_TYPE_SUFFIX, header + compressed
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:  # noqa: ANN401  # SerializerProtocol signature
+        """Deserialize a value written by `dumps_typed` or by the inner serializer.
+
+        Returns:
+            The deserialized value.
+
+        Raises:
+            ValueError: If a compressed value is corrupt.
+        """
+        type_str, payload = data
+        if not is_compressed(type_str):
+            return self.inner.loads_typed(data)
+        header = read_header(payload)
+        try:
+            raw = zstandard.decompress(
+                payload[HEADER_SIZE:], max_output_size=header.raw_size
+            )
+        except zstandard.ZstdError as e:
+            msg = f"Corrupt compressed {type_str} value"
+            raise ValueError(msg) from e
+        if len(raw) != header.raw_size:
+            msg = f"Corrupt compressed {type_str} value"
+            raise ValueError(msg)
+        inner_type = type_str[: -len(COMPRESSED_TYPE_SUFFIX)]
+        return self.inner.loads_typed((inner_type, raw))
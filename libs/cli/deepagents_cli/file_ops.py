@@ -8,6 +8,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal
 
+from deepagents.backends import FileContentCache
 from deepagents.backends.utils import perform_string_replacement
 
 from deepagents_cli.config import settings
@@ -274,11 +275,26 @@ class FileOpTracker:
     """Collect file operation metrics during a CLI interaction."""
 
     def __init__(
-        self, *, assistant_id: str | None, backend: BackendProtocol | None = None
+        self,
+        *,
+        assistant_id: str | None,
+        backend: BackendProtocol | None = None,
+        thread_id: str | None = None,
     ) -> None:
-        """Initialize the tracker."""
+        """Initialize the tracker.
+
+        Args:
+            assistant_id: Agent identifier used to resolve physical paths.
+            backend: Backend the agent's file tools use. File contents are then
+                read through the file content cache it shares with the agent.
+            thread_id: Thread of the agent run, used to look up cached contents.
+        """
         self.assistant_id = assistant_id
         self.backend = backend
+        self.thread_id = thread_id
+        self._file_cache = (
+            FileContentCache.for_backend(backend) if backend is not None else None
+        )
         self.active: dict[str | None, FileOperationRecord] = {}
         self.completed: list[FileOperationRecord] = []
 
@@ -304,15 +320,7 @@ class FileOpTracker:
         if tool_name in {"write_file", "edit_file"}:
             if self.backend and path_str:
                 try:
-                    responses = self.backend.download_files([path_str])
-                    if (
-                        responses
-                        and responses[0].content is not None
-                        and responses[0].error is None
-                    ):
-                        record.before_content = responses[0].content.decode("utf-8")
-                    else:
-                        record.before_content = ""
+                    record.before_content = self._read_backend_file(path_str) or ""
                 except (OSError, UnicodeDecodeError, AttributeError) as e:
                     logger.debug(
                         "Failed to read before_content for %s: %s", path_str, e
@@ -437,21 +445,31 @@ class FileOpTracker:
                 if record_path == file_path:
                     record.hitl_approved = True
 
+    def _read_backend_file(self, file_path: str) -> str | None:
+        """Read a file from the backend, reusing the content the agent's tools cached.
+
+        Returns:
+            The file content, or `None` if the file could not be downloaded.
+        """
+        if self.backend is None or self._file_cache is None:
+            return None
+        cached = self._file_cache.get(self.backend, file_path, thread_id=self.thread_id)
+        if cached is not None:
+            return cached
+        responses = self.backend.download_files([file_path])
+        if not responses or responses[0].content is None or responses[0].error:
+            return None
+        content = responses[0].content.decode("utf-8")
+        self._file_cache.put(self.backend, file_path, content, thread_id=self.thread_id)
+        return content
+
     def _populate_after_content(self, record: FileOperationRecord) -> None:
         # Use backend if available (works for any BackendProtocol implementation)
         if self.backend:
             try:
                 file_path = record.args.get("file_path") or record.args.get("path")
                 if file_path:
-                    responses = self.backend.download_files([file_path])
-                    if (
-                        responses
-                        and responses[0].content is not None
-                        and responses[0].error is None
-                    ):
-                        record.after_content = responses[0].content.decode("utf-8")
-                    else:
-                        record.after_content = None
+                    record.after_content = self._read_backend_file(file_path)
                 else:
                     record.after_content = None
             except (OSError, UnicodeDecodeError, AttributeError) as e:
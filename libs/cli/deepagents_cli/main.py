@@ -133,6 +133,25 @@ def format_tool_warning_cli(tool: str) -> str:
     return f"{tool} is not installed."
 
 
+def _positive_float(value: str) -> float:
+    """Parse a strictly positive number for argparse.
+
+    Returns:
+        The parsed number.
+
+    Raises:
+        argparse.ArgumentTypeError: If `value` is not a number greater than zero.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        number = 0
+    if number > 0:
+        return number
+    msg = f"expected a positive number, got {value!r}"
+    raise argparse.ArgumentTypeError(msg)
+
+
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments.
 
@@ -146,6 +165,7 @@ def parse_args() -> argparse.Namespace:
         show_list_help,
         show_reset_help,
         show_threads_delete_help,
+        show_threads_gc_help,
         show_threads_help,
         show_threads_list_help,
     )
@@ -269,6 +289,24 @@ def parse_args() -> argparse.Namespace:
         parents=help_parent(show_threads_delete_help),
     )
     threads_delete.add_argument("thread_id", help="Thread ID to delete")
+    threads_gc = threads_sub.add_parser(
+        "gc",
+        help="Prune old checkpoints and compact the session database",
+        add_help=False,
+        parents=help_parent(show_threads_gc_help),
+    )
+    threads_gc.add_argument(
+        "--keep",
+        type=int,
+        default=None,
+        help="Checkpoints to keep per thread (default: 10)",
+    )
+    threads_gc.add_argument(
+        "--max-age-days",
+        type=_positive_float,
+        default=None,
+        help="Delete threads not used for this many days (default: keep all)",
+    )
 
     # Default interactive mode — argument order here determines the
     # usage line printed by argparse; keep in sync with ui.show_help().
@@ -465,7 +503,10 @@ async def run_textual_cli_async(
     from deepagents_cli.app import run_textual_app
     from deepagents_cli.config import console, create_model, settings
     from deepagents_cli.model_config import ModelConfigError
-    from deepagents_cli.sessions import get_checkpointer
+    from deepagents_cli.sessions import (
+        collect_garbage_in_background,
+        get_checkpointer,
+    )
     from deepagents_cli.tools import fetch_url, http_request, web_search
 
     try:
@@ -541,6 +582,8 @@ async def run_textual_cli_async(
         from deepagents_cli.app import AppResult
 
         result = AppResult(return_code=1, thread_id=None)
+        # Apply opt-in checkpoint retention while the session runs (once a day)
+        gc_task = asyncio.create_task(collect_garbage_in_background())
         try:
             result = await run_textual_app(
                 agent=agent,
@@ -556,6 +599,9 @@ async def run_textual_cli_async(
                 sandbox_type=sandbox_type if sandbox_type != "none" else None,
             )
         finally:
+            gc_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await gc_task
             # Clean up sandbox after app exits (success or error)
             if sandbox_cm is not None:
                 try:
@@ -828,6 +874,7 @@ def cli_main() -> None:
         elif args.command == "threads":
             from deepagents_cli.sessions import (
                 delete_thread_command,
+                gc_threads_command,
                 list_threads_command,
             )
             from deepagents_cli.ui import show_threads_help
@@ -843,6 +890,13 @@ def cli_main() -> None:
                 )
             elif args.threads_command == "delete":
                 asyncio.run(delete_thread_command(args.thread_id))
+            elif args.threads_command == "gc":
+                asyncio.run(
+                    gc_threads_command(
+                        keep_checkpoints=args.keep,
+                        max_age_days=args.max_age_days,
+                    )
+                )
             else:
                 # No subcommand provided, show threads help screen
                 show_threads_help()
@@ -649,7 +649,9 @@ async def run_non_interactive(
             )
 
             file_op_tracker = FileOpTracker(
-                assistant_id=assistant_id, backend=composite_backend
+                assistant_id=assistant_id,
+                backend=composite_backend,
+                thread_id=thread_id,
             )
 
             await _run_agent_loop(
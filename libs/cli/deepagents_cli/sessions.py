@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
+import time
 import uuid
+import weakref
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING, NotRequired, TypedDict
 
@@ -13,9 +17,10 @@ if TYPE_CHECKING:
     from collections.abc import AsyncIterator
 
     import aiosqlite
-    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
     from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 
+    from deepagents_cli.checkpoint_serde import CompressedSerializer
+
 logger = logging.getLogger(__name__)
 
 _aiosqlite_patched = False
@@ -51,22 +56,141 @@ def _patch_aiosqlite() -> None:
     _aiosqlite_patched = True
 
 
-@asynccontextmanager
-async def _connect() -> AsyncIterator[aiosqlite.Connection]:
+# Applied to every connection to the sessions database. WAL lets the thread
+# listings read while a session writes checkpoints, and with WAL,
+# `synchronous=NORMAL` only risks the last commits on power loss, never
+# corruption.
+_CONNECTION_PRAGMAS = (
+    "journal_mode = WAL",
+    "synchronous = NORMAL",
+    "mmap_size = 268435456",
+    "cache_size = -16384",
+    "temp_store = MEMORY",
+)
+
+
+async def _configure_connection(conn: aiosqlite.Connection) -> None:
+    """Apply `_CONNECTION_PRAGMAS` to a new connection."""
+    for pragma in _CONNECTION_PRAGMAS:
+        async with conn.execute(f"PRAGMA {pragma}"):
+            pass
+
+
+async def _open_connection(path: str, *, daemon: bool = False) -> aiosqlite.Connection:
     """Import aiosqlite, apply the compatibility patch, and connect.
 
-    Centralizes the deferred import + patch + connect sequence used by every
-    database function in this module.
+    Args:
+        path: Database file.
+        daemon: Run the connection's worker thread as a daemon, so a connection
+            that is never closed does not keep the interpreter alive at exit.
 
-    Yields:
-        An open aiosqlite connection to the sessions database.
+    Returns:
+        An open, configured aiosqlite connection.
     """
     import aiosqlite as _aiosqlite
 
     _patch_aiosqlite()
 
-    async with _aiosqlite.connect(str(get_db_path()), timeout=30.0) as conn:
-        yield conn
+    conn = _aiosqlite.connect(path, timeout=30.0)
+    # aiosqlite>=0.22 runs the connection in a worker thread it does not expose
+    conn._thread.daemon = daemon
+    await conn
+    try:
+        await _configure_connection(conn)
+    except BaseException:
+        await conn.close()
+        raise
+    return conn
+
+
+class _SharedConnection:
+    """Long-lived connection to one sessions database, shared by this module.
+
+    Reusing the connection also reuses the statements sqlite3 prepared for it,
+    since its statement cache is keyed by the SQL text. Coroutines take turns
+    through a lock per event loop; the CLI runs one loop at a time, so the
+    connection is never used by two loops at once.
+    """
+
+    def __init__(self, conn: aiosqlite.Connection) -> None:
+        self.conn = conn
+        self._locks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Lock
+        ] = weakref.WeakKeyDictionary()
+
+    def lock(self) -> asyncio.Lock:
+        """Return the lock serializing use of the connection in the running loop."""
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
+
+
+_shared_connections: dict[str, _SharedConnection] = {}
+_shared_connections_lock = threading.Lock()
+
+# Tables known to exist per connection; tables are never dropped, so only
+# positive results are cached.
+_known_tables: weakref.WeakKeyDictionary[aiosqlite.Connection, set[str]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _shared_connection(path: str) -> _SharedConnection:
+    """Return the shared connection to `path`, opening it on first use.
+
+    Returns:
+        The open shared connection.
+    """
+    shared = _shared_connections.get(path)
+    if shared is not None and shared.conn.is_alive():  # type: ignore[attr-defined]
+        return shared
+    conn = await _open_connection(path, daemon=True)
+    with _shared_connections_lock:
+        current = _shared_connections.get(path)
+        if current is shared or current is None:
+            shared = _shared_connections[path] = _SharedConnection(conn)
+            conn = None
+        else:
+            shared = current
+    if conn is not None:
+        # Another coroutine opened the shared connection meanwhile
+        await conn.close()
+    return shared
+
+
+@asynccontextmanager
+async def _connect(*, dedicated: bool = False) -> AsyncIterator[aiosqlite.Connection]:
+    """Connect to the sessions database.
+
+    Args:
+        dedicated: Open a separate connection, closed on exit, instead of
+            borrowing the shared one. Use it for long maintenance work that
+            must not hold up the quick queries of the UI.
+
+    Yields:
+        An open aiosqlite connection to the sessions database, exclusively
+            used by the caller until the context exits. A transaction left
+            open by an error is rolled back.
+    """
+    path = str(get_db_path())
+    if dedicated:
+        conn = await _open_connection(path)
+        try:
+            yield conn
+        finally:
+            await conn.close()
+        return
+
+    shared = await _shared_connection(path)
+    async with shared.lock():
+        try:
+            yield shared.conn
+        except BaseException:
+            if shared.conn.in_transaction:
+                await shared.conn.rollback()
+            raise
 
 
 class ThreadInfo(TypedDict):
@@ -85,6 +209,22 @@ class ThreadInfo(TypedDict):
     """Number of messages in the thread."""
 
 
+class GarbageCollectionResult(TypedDict):
+    """Outcome of `collect_garbage`."""
+
+    threads_deleted: int
+    """Number of threads deleted for being older than the maximum age."""
+
+    checkpoints_deleted: int
+    """Number of checkpoints deleted, including those of deleted threads."""
+
+    writes_deleted: int
+    """Number of pending writes deleted along with their checkpoints."""
+
+    bytes_reclaimed: int
+    """Bytes by which the database shrank."""
+
+
 def format_timestamp(iso_timestamp: str | None) -> str:
     """Format ISO timestamp for display (e.g., 'Dec 30, 6:10pm').
 
@@ -139,9 +279,32 @@ async def _table_exists(conn: aiosqlite.Connection, table: str) -> bool:
     Returns:
         True if table exists, False otherwise.
     """
+    known = _known_tables.setdefault(conn, set())
+    if table in known:
+        return True
     query = "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?"
     async with conn.execute(query, (table,)) as cursor:
-        return await cursor.fetchone() is not None
+        exists = await cursor.fetchone() is not None
+    if exists:
+        known.add(table)
+    return exists
+
+
+async def _ensure_thread_index(conn: aiosqlite.Connection) -> bool:
+    """Create the `threads` summary table if the database predates it.
+
+    Returns:
+        True if the table is ready, False if no checkpoint was saved yet.
+    """
+    from deepagents_cli.thread_index import ensure_thread_index
+
+    known = _known_tables.setdefault(conn, set())
+    if "threads" in known:
+        return True
+    if not await ensure_thread_index(conn):
+        return False
+    known.update(("checkpoints", "threads"))
+    return True
 
 
 async def list_threads(
@@ -149,7 +312,10 @@ async def list_threads(
     limit: int = 20,
     include_message_count: bool = False,
 ) -> list[ThreadInfo]:
-    """List threads from checkpoints table.
+    """List threads from the `threads` summary table.
+
+    Message counts missing from the table (threads saved before it existed) are
+    computed from the latest checkpoint once and stored.
 
     Args:
         agent_name: Optional filter by agent name.
@@ -162,28 +328,22 @@ async def list_threads(
     """
     async with _connect() as conn:
         # Return empty if table doesn't exist yet (fresh install)
-        if not await _table_exists(conn, "checkpoints"):
+        if not await _ensure_thread_index(conn):
             return []
 
         if agent_name:
             query = """
-                SELECT thread_id,
-                       json_extract(metadata, '$.agent_name') as agent_name,
-                       MAX(json_extract(metadata, '$.updated_at')) as updated_at
-                FROM checkpoints
-                WHERE json_extract(metadata, '$.agent_name') = ?
-                GROUP BY thread_id
+                SELECT thread_id, agent_name, updated_at, message_count
+                FROM threads
+                WHERE agent_name = ?
                 ORDER BY updated_at DESC
                 LIMIT ?
             """
             params: tuple = (agent_name, limit)
         else:
             query = """
-                SELECT thread_id,
-                       json_extract(metadata, '$.agent_name') as agent_name,
-                       MAX(json_extract(metadata, '$.updated_at')) as updated_at
-                FROM checkpoints
-                GROUP BY thread_id
+                SELECT thread_id, agent_name, updated_at, message_count
+                FROM threads
                 ORDER BY updated_at DESC
                 LIMIT ?
             """
@@ -196,15 +356,25 @@ async def list_threads(
                 for r in rows
             ]
 
-        # Fetch message counts if requested
+        # Fill in message counts if requested, computing the unknown ones
         if include_message_count and threads:
-            from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
-
-            serde = JsonPlusSerializer()
-            for thread in threads:
-                thread["message_count"] = await _count_messages_from_checkpoint(
-                    conn, thread["thread_id"], serde
-                )
+            serde = _checkpoint_serde()
+            backfilled = False
+            for thread, row in zip(threads, rows, strict=True):
+                count = row[3]
+                if count is None:
+                    count = await _count_messages_from_checkpoint(
+                        conn, thread["thread_id"], serde
+                    )
+                    await conn.execute(
+                        "UPDATE threads SET message_count = ? "
+                        "WHERE thread_id = ? AND message_count IS NULL",
+                        (count, thread["thread_id"]),
+                    )
+                    backfilled = True
+                thread["message_count"] = count
+            if backfilled:
+                await conn.commit()
 
         return threads
 
@@ -212,13 +382,14 @@ async def list_threads(
 async def _count_messages_from_checkpoint(
     conn: aiosqlite.Connection,
     thread_id: str,
-    serde: JsonPlusSerializer,
+    serde: CompressedSerializer,
 ) -> int:
     """Count messages from the most recent checkpoint blob.
 
     With durability="exit", messages are stored in the checkpoint blob,
-    not in the writes table. This function deserializes the checkpoint
-    and counts the messages in channel_values.
+    not in the writes table. Compressed checkpoints record the count in their
+    header, so only that header is read. Older, uncompressed checkpoints are
+    deserialized and the messages in channel_values are counted.
 
     Args:
         conn: Database connection.
@@ -228,20 +399,32 @@ async def _count_messages_from_checkpoint(
     Returns:
         Number of messages in the checkpoint, or 0 if not found.
     """
+    from deepagents_cli.checkpoint_serde import (
+        COMPRESSED_TYPE_SUFFIX,
+        HEADER_SIZE,
+        is_compressed,
+        read_header,
+    )
+
     query = """
-        SELECT type, checkpoint
+        SELECT type,
+               CASE WHEN type LIKE ? THEN substr(checkpoint, 1, ?)
+                    ELSE checkpoint END
         FROM checkpoints
         WHERE thread_id = ?
         ORDER BY checkpoint_id DESC
         LIMIT 1
     """
-    async with conn.execute(query, (thread_id,)) as cursor:
+    params = (f"%{COMPRESSED_TYPE_SUFFIX}", HEADER_SIZE, thread_id)
+    async with conn.execute(query, params) as cursor:
         row = await cursor.fetchone()
         if not row or not row[0] or not row[1]:
             return 0
 
         type_str, checkpoint_blob = row
         try:
+            if is_compressed(type_str):
+                return read_header(checkpoint_blob).message_count
             data = serde.loads_typed((type_str, checkpoint_blob))
             channel_values = data.get("channel_values", {})
             messages = channel_values.get("messages", [])
@@ -263,21 +446,19 @@ async def get_most_recent(agent_name: str | None = None) -> str | None:
         Most recent thread_id or None if no threads exist.
     """
     async with _connect() as conn:
-        if not await _table_exists(conn, "checkpoints"):
+        if not await _ensure_thread_index(conn):
             return None
 
         if agent_name:
             query = """
-                SELECT thread_id FROM checkpoints
-                WHERE json_extract(metadata, '$.agent_name') = ?
-                ORDER BY checkpoint_id DESC
+                SELECT thread_id FROM threads
+                WHERE agent_name = ?
+                ORDER BY updated_at DESC
                 LIMIT 1
             """
             params: tuple = (agent_name,)
         else:
-            query = (
-                "SELECT thread_id FROM checkpoints ORDER BY checkpoint_id DESC LIMIT 1"
-            )
+            query = "SELECT thread_id FROM threads ORDER BY updated_at DESC LIMIT 1"
             params = ()
 
         async with conn.execute(query, params) as cursor:
@@ -292,31 +473,26 @@ async def get_thread_agent(thread_id: str) -> str | None:
         Agent name associated with the thread, or None if not found.
     """
     async with _connect() as conn:
-        if not await _table_exists(conn, "checkpoints"):
+        if not await _ensure_thread_index(conn):
             return None
 
-        query = """
-            SELECT json_extract(metadata, '$.agent_name')
-            FROM checkpoints
-            WHERE thread_id = ?
-            LIMIT 1
-        """
+        query = "SELECT agent_name FROM threads WHERE thread_id = ?"
         async with conn.execute(query, (thread_id,)) as cursor:
             row = await cursor.fetchone()
             return row[0] if row else None
 
 
 async def thread_exists(thread_id: str) -> bool:
-    """Check if a thread exists in checkpoints.
+    """Check if a thread exists.
 
     Returns:
         True if thread exists, False otherwise.
     """
     async with _connect() as conn:
-        if not await _table_exists(conn, "checkpoints"):
+        if not await _ensure_thread_index(conn):
             return False
 
-        query = "SELECT 1 FROM checkpoints WHERE thread_id = ? LIMIT 1"
+        query = "SELECT 1 FROM threads WHERE thread_id = ?"
         async with conn.execute(query, (thread_id,)) as cursor:
             row = await cursor.fetchone()
             return row is not None
@@ -332,19 +508,22 @@ async def find_similar_threads(thread_id: str, limit: int = 3) -> list[str]:
     Returns:
         List of thread IDs that begin with the given prefix.
     """
+    from deepagents_cli.thread_index import PREFIX_UPPER_BOUND
+
     async with _connect() as conn:
-        if not await _table_exists(conn, "checkpoints"):
+        if not await _ensure_thread_index(conn):
             return []
 
+        # A key range rather than LIKE, so the lookup uses the primary key index
         query = """
-            SELECT DISTINCT thread_id
-            FROM checkpoints
-            WHERE thread_id LIKE ?
+            SELECT thread_id
+            FROM threads
+            WHERE thread_id >= ? AND thread_id < ?
             ORDER BY thread_id
             LIMIT ?
         """
-        prefix = thread_id + "%"
-        async with conn.execute(query, (prefix, limit)) as cursor:
+        params = (thread_id, thread_id + PREFIX_UPPER_BOUND, limit)
+        async with conn.execute(query, params) as cursor:
             rows = await cursor.fetchall()
             return [r[0] for r in rows]
 
@@ -365,26 +544,285 @@ async def delete_thread(thread_id: str) -> bool:
         deleted = cursor.rowcount > 0
         if await _table_exists(conn, "writes"):
             await conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+        if await _table_exists(conn, "threads"):
+            await conn.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,))
         await conn.commit()
         return deleted
 
 
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+async def _pragma(conn: aiosqlite.Connection, pragma: str) -> list[tuple]:
+    """Run a pragma to completion.
+
+    Returns:
+        All rows the pragma produced.
+    """
+    async with conn.execute(f"PRAGMA {pragma}") as cursor:
+        return [tuple(row) for row in await cursor.fetchall()]
+
+
+async def _database_size(conn: aiosqlite.Connection) -> int:
+    """Return the size of the database in bytes, excluding its WAL file."""
+    page_count = (await _pragma(conn, "page_count"))[0][0]
+    page_size = (await _pragma(conn, "page_size"))[0][0]
+    return page_count * page_size
+
+
+# Rows deleted per transaction by `collect_garbage`
+_GC_BATCH_SIZE = 500
+
+
+async def _delete_checkpoints(
+    conn: aiosqlite.Connection, keys: list[tuple[str, str, str]]
+) -> tuple[int, int]:
+    """Delete checkpoints and their pending writes in batches.
+
+    Each batch is committed on its own, so the write lock is only held briefly
+    and the checkpoints of a running session can be saved in between.
+
+    Args:
+        conn: Connection to the sessions database.
+        keys: `(thread_id, checkpoint_ns, checkpoint_id)` of the checkpoints.
+
+    Returns:
+        Numbers of deleted checkpoints and pending writes.
+    """
+    checkpoints = writes = 0
+    has_writes = await _table_exists(conn, "writes")
+    for start in range(0, len(keys), _GC_BATCH_SIZE):
+        batch = keys[start : start + _GC_BATCH_SIZE]
+        cursor = await conn.executemany(
+            "DELETE FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            batch,
+        )
+        checkpoints += cursor.rowcount
+        if has_writes:
+            cursor = await conn.executemany(
+                "DELETE FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                batch,
+            )
+            writes += cursor.rowcount
+        await conn.commit()
+    return checkpoints, writes
+
+
+async def collect_garbage(
+    *,
+    keep_checkpoints: int | None,
+    max_age_days: float | None = None,
+    vacuum_pages: int | None = None,
+) -> GarbageCollectionResult:
+    """Delete old checkpoints and threads, and return free space to the OS.
+
+    Resuming a thread only needs its latest checkpoint; older ones only serve
+    its history, and pending writes are only needed alongside their checkpoint.
+
+    Args:
+        keep_checkpoints: Checkpoints kept per thread (and subgraph namespace),
+            newest first.
+
+            When `None`, all checkpoints of the remaining threads are kept.
+        max_age_days: Delete threads not updated for this many days.
+
+            When `None`, threads are kept regardless of age.
+        vacuum_pages: Maximum number of free pages to release to the OS, which
+            bounds how long the database stays locked.
+
+            Databases are released from incrementally (`auto_vacuum=INCREMENTAL`).
+            When `None`, all free pages are released, and a database created
+            without incremental auto-vacuum is converted by a full `VACUUM`
+            first. A limit leaves unconverted databases as they are; SQLite
+            then reuses their free pages for new checkpoints.
+
+    Returns:
+        What was deleted and how many bytes were reclaimed.
+    """
+    result = GarbageCollectionResult(
+        threads_deleted=0, checkpoints_deleted=0, writes_deleted=0, bytes_reclaimed=0
+    )
+    async with _connect(dedicated=True) as conn:
+        if not await _ensure_thread_index(conn):
+            return result
+        size_before = await _database_size(conn)
+
+        if max_age_days is not None:
+            cutoff = (datetime.now(UTC) - timedelta(days=max_age_days)).isoformat()
+            async with conn.execute(
+                "SELECT thread_id FROM threads WHERE updated_at < ?", (cutoff,)
+            ) as cursor:
+                expired = [(row[0],) for row in await cursor.fetchall()]
+            async with conn.execute(
+                """
+                SELECT thread_id, checkpoint_ns, checkpoint_id FROM checkpoints
+                WHERE thread_id IN (
+                    SELECT thread_id FROM threads WHERE updated_at < ?
+                )
+                """,
+                (cutoff,),
+            ) as cursor:
+                keys = [(row[0], row[1], row[2]) for row in await cursor.fetchall()]
+            checkpoints, writes = await _delete_checkpoints(conn, keys)
+            result["checkpoints_deleted"] += checkpoints
+            result["writes_deleted"] += writes
+            for start in range(0, len(expired), _GC_BATCH_SIZE):
+                await conn.executemany(
+                    "DELETE FROM threads WHERE thread_id = ?",
+                    expired[start : start + _GC_BATCH_SIZE],
+                )
+                await conn.commit()
+            result["threads_deleted"] = len(expired)
+
+        if keep_checkpoints is not None:
+            # Newest first within each thread and namespace, served by the primary
+            # key. Selecting is a read, so it does not block checkpoint writes.
+            async with conn.execute(
+                """
+                SELECT thread_id, checkpoint_ns, checkpoint_id FROM (
+                    SELECT thread_id, checkpoint_ns, checkpoint_id, ROW_NUMBER() OVER (
+                        PARTITION BY thread_id, checkpoint_ns
+                        ORDER BY checkpoint_id DESC
+                    ) AS position
+                    FROM checkpoints
+                )
+                WHERE position > ?
+                """,
+                (max(1, keep_checkpoints),),
+            ) as cursor:
+                keys = [(row[0], row[1], row[2]) for row in await cursor.fetchall()]
+            checkpoints, writes = await _delete_checkpoints(conn, keys)
+            result["checkpoints_deleted"] += checkpoints
+            result["writes_deleted"] += writes
+
+        auto_vacuum = (await _pragma(conn, "auto_vacuum"))[0][0]
+        if auto_vacuum == _AUTO_VACUUM_INCREMENTAL:
+            if vacuum_pages is None:
+                await _pragma(conn, "incremental_vacuum")
+            elif vacuum_pages > 0:
+                await _pragma(conn, f"incremental_vacuum({int(vacuum_pages)})")
+        elif vacuum_pages is None:
+            await _pragma(conn, "auto_vacuum = INCREMENTAL")
+            await conn.execute("VACUUM")
+        await conn.commit()
+        await _pragma(conn, "wal_checkpoint(TRUNCATE)")
+
+        result["bytes_reclaimed"] = max(0, size_before - await _database_size(conn))
+        return result
+
+
+_GC_INTERVAL_SECONDS = 24 * 60 * 60
+_BACKGROUND_VACUUM_PAGES = 2048
+
+
+def _claim_garbage_collection() -> bool:
+    """Check whether background collection is due, and mark it as done if so.
+
+    A marker file next to the database records the last run, so concurrent and
+    frequent CLI sessions collect at most once a day.
+
+    Returns:
+        True if the caller should collect now.
+    """
+    marker = get_db_path().with_name("sessions.gc")
+    try:
+        if time.time() - marker.stat().st_mtime < _GC_INTERVAL_SECONDS:
+            return False
+    except FileNotFoundError:
+        pass
+    marker.touch()
+    return True
+
+
+async def collect_garbage_in_background() -> None:
+    """Apply the configured retention settings once a day, with a bounded vacuum.
+
+    Retention is opt-in: nothing is deleted unless `DA_CLI_KEEP_CHECKPOINTS` or
+    `DA_CLI_THREAD_MAX_AGE_DAYS` is set. Meant to run as a task alongside an
+    interactive session: deletions are committed in batches and at most a few
+    MB of free pages are released per run. Failures are logged and otherwise
+    ignored.
+    """
+    import os
+
+    keep_checkpoints = (
+        get_checkpoint_retention() if "DA_CLI_KEEP_CHECKPOINTS" in os.environ else None
+    )
+    max_age_days = get_thread_max_age_days()
+    if keep_checkpoints is None and max_age_days is None:
+        return
+    try:
+        if not _claim_garbage_collection():
+            return
+        result = await collect_garbage(
+            keep_checkpoints=keep_checkpoints,
+            max_age_days=max_age_days,
+            vacuum_pages=_BACKGROUND_VACUUM_PAGES,
+        )
+    except Exception:
+        logger.warning("Background session garbage collection failed", exc_info=True)
+        return
+    logger.debug("Background session garbage collection: %s", result)
+
+
 @asynccontextmanager
 async def get_checkpointer() -> AsyncIterator[AsyncSqliteSaver]:
     """Get AsyncSqliteSaver for the global database.
 
+    Checkpoints are written through `CompressedSerializer`, which compresses
+    large checkpoints and still reads the uncompressed ones of older versions.
+    The saver also keeps the `threads` summary table current.
+
     Yields:
         AsyncSqliteSaver instance for checkpoint persistence.
     """
-    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    import aiosqlite as _aiosqlite
+
+    from deepagents_cli.thread_index import IndexedAsyncSqliteSaver
 
     _patch_aiosqlite()
 
-    async with AsyncSqliteSaver.from_conn_string(str(get_db_path())) as checkpointer:
-        yield checkpointer
+    async with _aiosqlite.connect(str(get_db_path())) as conn:
+        await _configure_connection(conn)
+        yield IndexedAsyncSqliteSaver(conn, serde=_checkpoint_serde())
+
+
+def _checkpoint_serde() -> CompressedSerializer:
+    """Create the serializer checkpoints of the global database are stored with.
+
+    Returns:
+        A `CompressedSerializer` wrapping LangGraph's default serializer.
+    """
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+    from deepagents_cli.checkpoint_serde import CompressedSerializer
+
+    return CompressedSerializer(JsonPlusSerializer())
 
 
 _DEFAULT_THREAD_LIMIT = 20
+_DEFAULT_CHECKPOINT_RETENTION = 10
+
+
+def _positive_int_from_env(name: str, default: int) -> int:
+    """Read a positive integer setting from the environment.
+
+    Returns:
+        The value of `name` clamped to a minimum of 1, or `default` when the
+            variable is unset or not an integer.
+    """
+    import os
+
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        logger.warning("Invalid %s value %r, using default %d", name, raw, default)
+        return default
 
 
 def get_thread_limit() -> int:
@@ -396,20 +834,43 @@ def get_thread_limit() -> int:
     Returns:
         Number of threads to display.
     """
+    return _positive_int_from_env("DA_CLI_RECENT_THREADS", _DEFAULT_THREAD_LIMIT)
+
+
+def get_checkpoint_retention() -> int:
+    """Read the number of checkpoints kept per thread from `DA_CLI_KEEP_CHECKPOINTS`.
+
+    Falls back to `_DEFAULT_CHECKPOINT_RETENTION` when the variable is unset or
+    contains a non-integer value. The result is clamped to a minimum of 1.
+
+    Returns:
+        Number of checkpoints to keep per thread.
+    """
+    return _positive_int_from_env(
+        "DA_CLI_KEEP_CHECKPOINTS", _DEFAULT_CHECKPOINT_RETENTION
+    )
+
+
+def get_thread_max_age_days() -> float | None:
+    """Read the thread expiry age from `DA_CLI_THREAD_MAX_AGE_DAYS`.
+
+    Returns:
+        Days after their last update when threads are deleted, or `None` (keep
+            threads forever) when the variable is unset or not a positive number.
+    """
     import os
 
-    raw = os.environ.get("DA_CLI_RECENT_THREADS")
+    raw = os.environ.get("DA_CLI_THREAD_MAX_AGE_DAYS")
     if raw is None:
-        return _DEFAULT_THREAD_LIMIT
+        return None
     try:
-        return max(1, int(raw))
+        days = float(raw)
     except ValueError:
-        logger.warning(
-            "Invalid DA_CLI_RECENT_THREADS value %r, using default %d",
-            raw,
-            _DEFAULT_THREAD_LIMIT,
-        )
-        return _DEFAULT_THREAD_LIMIT
+        days = 0
+    if days > 0:
+        return days
+    logger.warning("Invalid DA_CLI_THREAD_MAX_AGE_DAYS value %r, ignoring it", raw)
+    return None
 
 
 async def list_threads_command(
@@ -485,3 +946,56 @@ async def delete_thread_command(thread_id: str) -> None:
         console.print(f"[green]Thread '{thread_id}' deleted.[/green]")
     else:
         console.print(f"[red]Thread '{thread_id}' not found.[/red]")
+
+
+def _format_bytes(size: int) -> str:
+    """Format a byte count for display (e.g., '12.3 MB').
+
+    Returns:
+        Human-readable size.
+    """
+    value = float(size)
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:  # noqa: PLR2004  # Unit step
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+async def gc_threads_command(
+    keep_checkpoints: int | None = None,
+    max_age_days: float | None = None,
+) -> None:
+    """CLI handler for `deepagents threads gc`.
+
+    Prunes old checkpoints and threads, compacts the database, and reports
+    what was removed.
+
+    Args:
+        keep_checkpoints: Checkpoints kept per thread.
+
+            When `None`, reads from `DA_CLI_KEEP_CHECKPOINTS` or falls back to
+            the default.
+        max_age_days: Delete threads not updated for this many days.
+
+            When `None`, reads from `DA_CLI_THREAD_MAX_AGE_DAYS`; threads are
+            kept regardless of age if that is unset too.
+    """
+    from deepagents_cli.config import console
+
+    result = await collect_garbage(
+        keep_checkpoints=(
+            get_checkpoint_retention()
+            if keep_checkpoints is None
+            else max(1, keep_checkpoints)
+        ),
+        max_age_days=get_thread_max_age_days()
+        if max_age_days is None
+        else max_age_days,
+    )
+    console.print(
+        f"[green]Reclaimed {_format_bytes(result['bytes_reclaimed'])}.[/green] "
+        f"Deleted {result['threads_deleted']} expired threads, "
+        f"{result['checkpoints_deleted']} checkpoints and "
+        f"{result['writes_deleted']} pending writes."
+    )
@@ -6,7 +6,9 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
 import uuid
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
@@ -89,6 +91,162 @@ def _is_summarization_chunk(metadata: dict | None) -> bool:
     return metadata.get("lc_source") == "summarization"
 
 
+_RENDER_FPS = 30.0
+"""Maximum number of times per second streamed text is written to widgets."""
+
+
+@dataclass
+class RenderStats:
+    """Rendering counters of a `RenderScheduler`."""
+
+    chunks: int = 0
+    """Number of streamed text chunks buffered."""
+
+    frames: int = 0
+    """Number of flushes that wrote buffered text to widgets."""
+
+    dropped_frames: int = 0
+    """Number of frame slots missed.
+
+    A slot is missed while the event loop is too busy to flush on time, or
+    while a flush takes longer than a frame.
+    """
+
+    total_flush_latency: float = 0.0
+    """Sum over frames of the time from buffering their first chunk to the end
+    of the flush, in seconds."""
+
+    max_flush_latency: float = 0.0
+    """Longest flush latency of a frame, in seconds."""
+
+
+class RenderScheduler:
+    """Coalesces streamed assistant text into frames written at a bounded rate.
+
+    Writing every streamed chunk to its `AssistantMessage` re-renders the
+    Markdown each time, which fast models turn into visible lag. The scheduler
+    buffers text per namespace and writes it from a timer task at most
+    `max_fps` times per second. Callers `flush` it at boundaries that must show
+    all text streamed so far: tool calls and results, the end of a message,
+    and interrupts.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_fps: float = _RENDER_FPS,
+        on_flush: Callable[[], None] | None = None,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            max_fps: Maximum number of flushes per second.
+            on_flush: Callback invoked after each flush, e.g. to scroll the chat.
+        """
+        self._interval = 1.0 / max_fps
+        self._on_flush = on_flush
+        self._pending: dict[tuple, tuple[AssistantMessage, list[str]]] = {}
+        self._pending_since: float | None = None
+        self._last_flush_at = float("-inf")
+        self._timer: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+        self.stats = RenderStats()
+
+    async def write(self, ns_key: tuple, message: AssistantMessage, text: str) -> None:
+        """Buffer streamed text of `message` until the next frame.
+
+        Args:
+            ns_key: Namespace the text was streamed in.
+            message: Widget the text belongs to.
+            text: The streamed text chunk.
+        """
+        if not text:
+            return
+        pending = self._pending.get(ns_key)
+        if pending is not None and pending[0] is not message:
+            # The namespace moved on to a new message: finish the previous one
+            await self.flush()
+            pending = None
+        if pending is None:
+            pending = self._pending[ns_key] = (message, [])
+        pending[1].append(text)
+        self.stats.chunks += 1
+
+        now = time.monotonic()
+        if self._pending_since is None:
+            self._pending_since = now
+        if self._timer is None:
+            due = max(now, self._last_flush_at + self._interval)
+            self._timer = asyncio.create_task(self._flush_at(due))
+
+    async def _flush_at(self, due: float) -> None:
+        """Flush at the monotonic time `due`."""
+        await asyncio.sleep(max(0.0, due - time.monotonic()))
+        self._timer = None
+        late = time.monotonic() - due
+        if late > self._interval:
+            self.stats.dropped_frames += int(late / self._interval)
+        try:
+            await self.flush()
+        except Exception:
+            logger.warning("Failed to render streamed text", exc_info=True)
+
+    async def flush(self) -> None:
+        """Write all buffered text to its messages now."""
+        async with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            pending_since, self._pending_since = self._pending_since, None
+            start = self._last_flush_at = time.monotonic()
+            for message, parts in pending.values():
+                await message.append_content("".join(parts))
+            end = time.monotonic()
+
+            stats = self.stats
+            stats.frames += 1
+            if end - start > self._interval:
+                stats.dropped_frames += int((end - start) / self._interval)
+            latency = end - (pending_since if pending_since is not None else start)
+            stats.total_flush_latency += latency
+            stats.max_flush_latency = max(stats.max_flush_latency, latency)
+
+        if self._on_flush:
+            self._on_flush()
+
+    async def close(self) -> None:
+        """Flush buffered text and stop the timer."""
+        await self.flush()
+        self.cancel()
+
+    def cancel(self) -> None:
+        """Stop the timer and discard buffered text."""
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self._pending.clear()
+        self._pending_since = None
+
+    def report(self) -> RenderStats:
+        """Log the rendering stats and start counting anew.
+
+        Returns:
+            The stats since the previous report.
+        """
+        stats, self.stats = self.stats, RenderStats()
+        if stats.frames:
+            logger.debug(
+                "Rendered %d streamed chunks in %d frames (%d dropped), "
+                "flush latency %.1fms mean, %.1fms max",
+                stats.chunks,
+                stats.frames,
+                stats.dropped_frames,
+                stats.total_flush_latency / stats.frames * 1000,
+                stats.max_flush_latency * 1000,
+            )
+        return stats
+
+
 class TextualUIAdapter:
     """Adapter for rendering agent output to Textual widgets.
 
@@ -133,6 +291,9 @@ class TextualUIAdapter:
     _token_tracker: Any
     """Token usage tracker for displaying counts."""
 
+    _render_scheduler: RenderScheduler
+    """Coalesces streamed assistant text into frames."""
+
     def __init__(
         self,
         mount_message: Callable[..., Awaitable[None]],
@@ -172,6 +333,7 @@ class TextualUIAdapter:
         # State tracking
         self._current_tool_messages: dict[str, ToolCallMessage] = {}
         self._token_tracker: Any = None
+        self._render_scheduler = RenderScheduler(on_flush=scroll_to_bottom)
 
     def set_token_tracker(self, tracker: Any) -> None:  # noqa: ANN401  # Dynamic tracker type from Textual
         """Set the token tracker for usage tracking."""
@@ -315,7 +477,9 @@ async def execute_task_textual(
     if adapter._token_tracker:
         adapter._token_tracker.hide()
 
-    file_op_tracker = FileOpTracker(assistant_id=assistant_id, backend=backend)
+    file_op_tracker = FileOpTracker(
+        assistant_id=assistant_id, backend=backend, thread_id=thread_id
+    )
     displayed_tool_ids: set[str] = set()
     tool_call_buffers: dict[str | int, dict] = {}
 
@@ -421,6 +585,8 @@ async def execute_task_textual(
                         continue
 
                     if isinstance(message, ToolMessage):
+                        # Show all text streamed before the tool result
+                        await adapter._render_scheduler.flush()
                         tool_name = getattr(message, "name", "")
                         tool_status = getattr(message, "status", "success")
                         tool_content = format_tool_message_content(message.content)
@@ -514,16 +680,12 @@ async def execute_task_textual(
                                     await adapter._mount_message(current_msg)
                                     assistant_message_by_namespace[ns_key] = current_msg
 
-                                # Append just the new text chunk for smoother
-                                # streaming (uses MarkdownStream internally for
-                                # better performance)
-                                await current_msg.append_content(text)
-
-                                # Sticky scroll: scroll to bottom only if user is
-                                # near bottom. This lets users scroll away and
-                                # stay where they are
-                                if adapter._scroll_to_bottom:
-                                    adapter._scroll_to_bottom()
+                                # Buffer the chunk; the render scheduler appends
+                                # buffered text at a bounded frame rate and then
+                                # sticky-scrolls to the bottom
+                                await adapter._render_scheduler.write(
+                                    ns_key, current_msg, text
+                                )
 
                         elif block_type in {"tool_call_chunk", "tool_call"}:
                             chunk_name = block.get("name")
@@ -636,6 +798,7 @@ async def execute_task_textual(
                             assistant_message_by_namespace.pop(ns_key, None)
 
             # Flush any remaining text from all namespaces
+            await adapter._render_scheduler.close()
             for ns_key, pending_text in list(pending_text_by_namespace.items()):
                 if pending_text:
                     await _flush_assistant_text_ns(
@@ -781,6 +944,9 @@ async def execute_task_textual(
                 break
 
     except asyncio.CancelledError:
+        # Show the text streamed before the interrupt, as saved below
+        await adapter._render_scheduler.close()
+
         # Clear active message immediately so it won't block pruning
         # If we don't do this, the store still thinks it's actice and protects
         # from pruning, which breaks get_messages_to_prune(), potentially
@@ -824,6 +990,9 @@ async def execute_task_textual(
         return
 
     except KeyboardInterrupt:
+        # Show the text streamed before the interrupt, as saved below
+        await adapter._render_scheduler.close()
+
         # Clear active message immediately so it won't block pruning
         # If we don't do this, the store still thinks it's actice and protects
         # from pruning, which breaks get_messages_to_prune(), potentially
@@ -866,6 +1035,10 @@ async def execute_task_textual(
                 adapter._token_tracker.show()  # Restore previous value
         return
 
+    finally:
+        adapter._render_scheduler.cancel()
+        adapter._render_scheduler.report()
+
     # Update token tracker
     if adapter._token_tracker and (captured_input_tokens or captured_output_tokens):
         adapter._token_tracker.add(captured_input_tokens, captured_output_tokens)
@@ -882,6 +1055,8 @@ async def _flush_assistant_text_ns(
     Finalizes the streaming by stopping the MarkdownStream.
     If no message exists yet, creates one with the full content.
     """
+    # Write text still buffered by the render scheduler before finalizing
+    await adapter._render_scheduler.flush()
     if not text.strip():
         return
 
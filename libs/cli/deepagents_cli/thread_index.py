@@ -0,0 +1,187 @@
+"""Summary table of the threads stored in the CLI session database.
+
+LangGraph's `checkpoints` table holds one row per checkpoint, so listing threads
+from it means grouping every checkpoint of every thread and extracting JSON
+metadata from each row. The `threads` table keeps one row per thread instead:
+
+- `IndexedAsyncSqliteSaver` updates a thread's row whenever it saves a checkpoint of
+    that thread, and deletes it with the thread.
+- `ensure_thread_index` creates the table on first use and backfills it from the
+    existing checkpoints. Message counts of backfilled threads are unknown (`NULL`)
+    until `sessions.list_threads` computes them.
+
+The primary key on `thread_id` serves prefix lookups, and the indexes on
+`updated_at` and `(agent_name, updated_at)` serve the thread listings.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from langgraph.checkpoint.base import get_checkpoint_metadata
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from deepagents_cli.checkpoint_serde import count_messages
+
+if TYPE_CHECKING:
+    import aiosqlite
+    from langchain_core.runnables import RunnableConfig
+    from langgraph.checkpoint.base import (
+        ChannelVersions,
+        Checkpoint,
+        CheckpointMetadata,
+    )
+
+_CREATE_STATEMENTS = (
+    """
+    CREATE TABLE threads (
+        thread_id TEXT PRIMARY KEY,
+        agent_name TEXT,
+        updated_at TEXT,
+        message_count INTEGER
+    )
+    """,
+    "CREATE INDEX threads_updated_at ON threads (updated_at)",
+    "CREATE INDEX threads_agent_name ON threads (agent_name, updated_at)",
+)
+
+_BACKFILL = """
+    INSERT INTO threads (thread_id, agent_name, updated_at)
+    SELECT thread_id,
+           json_extract(metadata, '$.agent_name'),
+           MAX(json_extract(metadata, '$.updated_at'))
+    FROM checkpoints
+    GROUP BY thread_id
+"""
+
+_UPSERT = """
+    INSERT INTO threads (thread_id, agent_name, updated_at, message_count)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (thread_id) DO UPDATE SET
+        agent_name = COALESCE(excluded.agent_name, agent_name),
+        updated_at = CASE
+            WHEN excluded.updated_at > COALESCE(updated_at, '')
+            THEN excluded.updated_at ELSE updated_at END,
+        message_count = COALESCE(excluded.message_count, message_count)
+"""
+
+PREFIX_UPPER_BOUND = "\U0010ffff"
+"""Appended to a thread ID prefix to get the exclusive end of its key range."""
+
+
+async def _table_exists(conn: aiosqlite.Connection, table: str) -> bool:
+    query = "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?"
+    async with conn.execute(query, (table,)) as cursor:
+        return await cursor.fetchone() is not None
+
+
+async def ensure_thread_index(conn: aiosqlite.Connection) -> bool:
+    """Create and backfill the `threads` table if the database lacks it.
+
+    The migration runs in one write transaction, so concurrent CLI processes
+    backfill the table once.
+
+    Args:
+        conn: Connection to the session database.
+
+    Returns:
+        True if the `threads` table is ready, False if the database has no
+            checkpoints table yet (fresh install).
+    """
+    if await _table_exists(conn, "threads"):
+        return True
+    if not await _table_exists(conn, "checkpoints"):
+        return False
+    await conn.commit()
+    await conn.execute("BEGIN IMMEDIATE")
+    try:
+        if not await _table_exists(conn, "threads"):
+            for statement in _CREATE_STATEMENTS:
+                await conn.execute(statement)
+            await conn.execute(_BACKFILL)
+    except BaseException:
+        await conn.rollback()
+        raise
+    await conn.commit()
+    return True
+
+
+async def record_checkpoint(
+    conn: aiosqlite.Connection,
+    thread_id: str,
+    metadata: dict[str, Any],
+    message_count: int | None,
+) -> None:
+    """Update the row of a thread after one of its checkpoints was saved.
+
+    Does not commit.
+
+    Args:
+        conn: Connection to the session database.
+        thread_id: Thread the checkpoint belongs to.
+        metadata: Checkpoint metadata, merged with the run's config metadata.
+        message_count: Number of messages of the checkpoint, or `None` to keep
+            the recorded count (e.g. for checkpoints of subgraphs).
+    """
+    await conn.execute(
+        _UPSERT,
+        (
+            thread_id,
+            metadata.get("agent_name"),
+            metadata.get("updated_at"),
+            message_count,
+        ),
+    )
+
+
+class IndexedAsyncSqliteSaver(AsyncSqliteSaver):
+    """`AsyncSqliteSaver` that keeps the `threads` table current."""
+
+    _index_ready = False
+
+    async def setup(self) -> None:
+        """Create the checkpoint tables and the `threads` table if needed."""
+        await super().setup()
+        async with self.lock:
+            await self._ensure_index()
+
+    async def _ensure_index(self) -> None:
+        """Create the `threads` table once. Must be called holding `self.lock`."""
+        if not self._index_ready:
+            self._index_ready = await ensure_thread_index(self.conn)
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint and update the row of its thread.
+
+        Returns:
+            Configuration of the stored checkpoint.
+        """
+        next_config = await super().aput(config, checkpoint, metadata, new_versions)
+        configurable = config["configurable"]
+        is_root = not configurable.get("checkpoint_ns")
+        async with self.lock:
+            await self._ensure_index()
+            await record_checkpoint(
+                self.conn,
+                str(configurable["thread_id"]),
+                {**get_checkpoint_metadata(config, metadata)},
+                count_messages(checkpoint) if is_root else None,
+            )
+            await self.conn.commit()
+        return next_config
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints and writes of a thread, and its row."""
+        await self.setup()
+        await super().adelete_thread(thread_id)
+        async with self.lock:
+            await self.conn.execute(
+                "DELETE FROM threads WHERE thread_id = ?", (str(thread_id),)
+            )
+            await self.conn.commit()
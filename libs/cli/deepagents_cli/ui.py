@@ -71,7 +71,7 @@ def show_help() -> None:
         "  deepagents skills <list|create|info|delete>    Manage agent skills"
     )
     console.print(
-        "  deepagents threads <list|delete>               Manage conversation threads"
+        "  deepagents threads <list|delete|gc>            Manage conversation threads"
     )
     console.print()
 
@@ -289,6 +289,7 @@ def show_threads_help() -> None:
     console.print("[bold]Commands:[/bold]", style=COLORS["primary"])
     console.print("  list|ls           List all threads")
     console.print("  delete <ID>       Delete a thread")
+    console.print("  gc                Prune old checkpoints and compact the database")
     console.print()
     console.print("[bold]Options:[/bold]", style=COLORS["primary"])
     console.print("  -h, --help        Show this help message")
@@ -296,6 +297,7 @@ def show_threads_help() -> None:
     console.print("[bold]Examples:[/bold]", style=COLORS["primary"])
     console.print("  deepagents threads list")
     console.print("  deepagents threads delete abc123")
+    console.print("  deepagents threads gc")
     console.print()
 
 
@@ -329,3 +331,31 @@ def show_threads_list_help() -> None:
     console.print("  deepagents threads list --agent mybot")
     console.print("  deepagents threads list --limit 50")
     console.print()
+
+
+def show_threads_gc_help() -> None:
+    """Show help information for the `threads gc` subcommand."""
+    console.print()
+    console.print("[bold]Usage:[/bold]", style=COLORS["primary"])
+    console.print("  deepagents threads gc [options]")
+    console.print()
+    console.print(
+        "Deletes all but the latest checkpoints of each thread, optionally "
+        "deletes threads that have not been used for a while, and compacts "
+        "the session database. Also runs in the background once a day when "
+        "one of the variables below is set."
+    )
+    console.print()
+    console.print("[bold]Options:[/bold]", style=COLORS["primary"])
+    console.print("  --keep N          Checkpoints to keep per thread (default: 10)")
+    console.print("  --max-age-days D  Delete threads not used for D days")
+    console.print("  -h, --help        Show this help message")
+    console.print()
+    console.print("[bold]Environment:[/bold]", style=COLORS["primary"])
+    console.print("  DA_CLI_KEEP_CHECKPOINTS      Default for --keep")
+    console.print("  DA_CLI_THREAD_MAX_AGE_DAYS   Default for --max-age-days")
+    console.print()
+    console.print("[bold]Examples:[/bold]", style=COLORS["primary"])
+    console.print("  deepagents threads gc")
+    console.print("  deepagents threads gc --keep 1 --max-age-days 90")
+    console.print()
@@ -6,15 +6,21 @@ for slash commands (/) and file mentions (@).
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+import logging
 import shutil
 
 # S404: subprocess is required for git ls-files to get project file list
 import subprocess  # noqa: S404
+import threading
 from difflib import SequenceMatcher
 from enum import StrEnum
 from pathlib import Path
 from typing import TYPE_CHECKING, Protocol
 
+logger = logging.getLogger(__name__)
+
 
 def _get_git_executable() -> str | None:
     """Get full path to git executable using shutil.which().
@@ -26,6 +32,8 @@ def _get_git_executable() -> str | None:
 
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
     from textual import events
 
 
@@ -379,25 +387,218 @@ def _fuzzy_search(
     Returns:
         List of matching file paths sorted by relevance score.
     """
-    # Filter dotfiles unless explicitly searching for them
-    filtered = (
-        candidates
-        if include_dotfiles
-        else [c for c in candidates if not _is_dotpath(c)]
+    result = _FileIndex(candidates).search(
+        query, limit, include_dotfiles=include_dotfiles
     )
+    # Only a cancelled search returns None
+    return result[0] if result is not None else []
+
+
+_CANCEL_CHECK_INTERVAL = 4096
+"""Number of files searched between checks for cancellation."""
+
+
+def _char_bit(char: str) -> int:
+    """Return the bit standing for `char` in a character bitmask.
+
+    Letters and digits get a bit each; other characters share the rest, which
+    only makes the masks more permissive.
+
+    Returns:
+        An int with a single bit set.
+    """
+    if "a" <= char <= "z":
+        return 1 << (ord(char) - ord("a"))
+    if "0" <= char <= "9":
+        return 1 << (26 + ord(char) - ord("0"))
+    return 1 << (36 + ord(char) % 28)
+
+
+def _char_mask(text: str) -> int:
+    """Return the bitmask of the characters of `text`.
+
+    Returns:
+        The union of the bits of all characters.
+    """
+    mask = 0
+    for char in set(text):
+        mask |= _char_bit(char)
+    return mask
+
+
+class _FileIndex:
+    """Precomputed lookup structures for fuzzy search over a list of files.
+
+    Scores match `_fuzzy_score`, but most files are ruled out without scoring:
+
+    - Substring matches (scores of 40 and more) are found with one `in` test
+        per file, or per file that matched a query the new query extends.
+    - Fuzzy filename matches (scores below 40) are only needed when fewer than
+        `limit` files match as a substring. Scoring at least `_MIN_FUZZY_SCORE`
+        requires a `SequenceMatcher` ratio of 0.5 against the filename, so only
+        filenames of a third to three times the query length are considered,
+        and only those containing enough of the query's characters according to
+        their character bitmask.
+    """
+
+    def __init__(self, paths: list[str]) -> None:
+        """Index `paths`.
+
+        Args:
+            paths: File paths relative to the project root.
+        """
+        self.paths = paths
+        self.lower_paths = [path.replace("\\", "/").lower() for path in paths]
+        self.name_starts = [path.rfind("/") + 1 for path in self.lower_paths]
+        self.names = [
+            path[start:]
+            for path, start in zip(self.lower_paths, self.name_starts, strict=True)
+        ]
+        self.name_masks = [_char_mask(name) for name in self.names]
+        self.dotpaths = [_is_dotpath(path) for path in paths]
+        self.by_name_length: dict[int, list[int]] = {}
+        for index, name in enumerate(self.names):
+            self.by_name_length.setdefault(len(name), []).append(index)
+        self.root_order = sorted(
+            range(len(paths)),
+            key=lambda index: (_path_depth(paths[index]), paths[index].lower()),
+        )
+
+    def substring_matches(
+        self,
+        query: str,
+        within: list[int] | None = None,
+        is_cancelled: Callable[[], bool] | None = None,
+    ) -> list[int] | None:
+        """Find the files whose path contains `query`.
+
+        Args:
+            query: Lowercased query.
+            within: Indices to search, e.g. the matches of a query `query`
+                extends. Defaults to all files.
+            is_cancelled: Polled periodically; the search stops when it
+                returns True.
 
-    if not query:
-        # Empty query: show root-level files first, sorted by depth then name
-        sorted_files = sorted(filtered, key=lambda p: (_path_depth(p), p.lower()))
-        return sorted_files[:limit]
+        Returns:
+            Indices of the matching files in index order, or None if cancelled.
+        """
+        pool = within if within is not None else range(len(self.paths))
+        lower_paths = self.lower_paths
+        matches: list[int] = []
+        for offset in range(0, len(pool), _CANCEL_CHECK_INTERVAL):
+            if is_cancelled is not None and is_cancelled():
+                return None
+            chunk = pool[offset : offset + _CANCEL_CHECK_INTERVAL]
+            matches.extend(index for index in chunk if query in lower_paths[index])
+        return matches
+
+    def _substring_score(self, index: int, query: str) -> float:
+        """Score a file whose path contains `query`, as `_fuzzy_score` does.
 
-    scored = [
-        (score, c)
-        for c in filtered
-        if (score := _fuzzy_score(query, c)) >= _MIN_FUZZY_SCORE
-    ]
-    scored.sort(key=lambda x: -x[0])
-    return [c for _, c in scored[:limit]]
+        Returns:
+            Score of the match.
+        """
+        path = self.paths[index]
+        lower = self.lower_paths[index]
+        name_start = self.name_starts[index]
+        length_bonus = 1 / len(path)
+        idx = lower.find(query, name_start)
+        if idx >= 0:
+            if idx == name_start:
+                return 150 + length_bonus
+            if lower[idx - 1] in "_-.":
+                return 120 + length_bonus
+            return 100 + length_bonus
+        idx = lower.find(query)
+        if idx == 0 or path[idx - 1] in "/_-.":
+            return 60 + length_bonus
+        return 40 + length_bonus
+
+    def _fuzzy_candidates(self, query: str) -> Iterable[int]:
+        """Yield the files whose filename may fuzzy-match `query`.
+
+        Yields:
+            Indices of files passing the length and bitmask prefilters.
+        """
+        query_bits: dict[int, int] = {}
+        for char in query:
+            bit = _char_bit(char)
+            query_bits[bit] = query_bits.get(bit, 0) + 1
+        query_length = len(query)
+        for name_length in range(-(-query_length // 3), 3 * query_length + 1):
+            required = query_length + name_length
+            for index in self.by_name_length.get(name_length, ()):
+                mask = self.name_masks[index]
+                # Upper bound of the characters SequenceMatcher can match
+                present = sum(n for bit, n in query_bits.items() if mask & bit)
+                if 4 * min(present, name_length) >= required:
+                    yield index
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        *,
+        include_dotfiles: bool,
+        within: list[int] | None = None,
+        is_cancelled: Callable[[], bool] | None = None,
+    ) -> tuple[list[str], list[int]] | None:
+        """Return the best matches of `query`, like `_fuzzy_search`.
+
+        Args:
+            query: Search query.
+            limit: Max results to return.
+            include_dotfiles: Whether to include dotfiles.
+            within: Substring matches of a query that `query` extends, as
+                returned by a previous search, to narrow the search to.
+            is_cancelled: Polled periodically; the search stops when it
+                returns True.
+
+        Returns:
+            The matching paths sorted by relevance, and the substring matches
+                to pass as `within` when the query is extended; or None if the
+                search was cancelled.
+        """
+        dotpaths = self.dotpaths
+        if not query:
+            top = [
+                index
+                for index in self.root_order
+                if include_dotfiles or not dotpaths[index]
+            ][:limit]
+            return [self.paths[index] for index in top], []
+
+        query_lower = query.lower()
+        matches = self.substring_matches(query_lower, within, is_cancelled)
+        if matches is None:
+            return None
+        scored = [
+            (-self._substring_score(index, query_lower), index)
+            for index in matches
+            if include_dotfiles or not dotpaths[index]
+        ]
+
+        # Fuzzy matches all score below substring matches
+        if len(scored) < limit:
+            matched = set(matches)
+            for count, index in enumerate(self._fuzzy_candidates(query_lower)):
+                if (
+                    count % _CANCEL_CHECK_INTERVAL == 0
+                    and is_cancelled is not None
+                    and is_cancelled()
+                ):
+                    return None
+                if index in matched or (dotpaths[index] and not include_dotfiles):
+                    continue
+                matcher = SequenceMatcher(None, query_lower, self.names[index])
+                if matcher.quick_ratio() <= _MIN_FUZZY_RATIO:
+                    continue
+                ratio = matcher.ratio()
+                if ratio > _MIN_FUZZY_RATIO and ratio * 30 >= _MIN_FUZZY_SCORE:
+                    scored.append((-ratio * 30, index))
+
+        top = heapq.nsmallest(limit, scored)
+        return [self.paths[index] for _, index in top], matches
 
 
 class FuzzyFileController:
@@ -419,21 +620,32 @@ class FuzzyFileController:
         self._project_root = _find_project_root(self._cwd)
         self._suggestions: list[tuple[str, str]] = []
         self._selected_index = 0
-        self._file_cache: list[str] | None = None
-
-    def _get_files(self) -> list[str]:
-        """Get cached file list or refresh.
+        self._index: _FileIndex | None = None
+        self._index_lock = threading.Lock()
+        # Index, lowercased query and substring matches of the last search,
+        # to narrow the search when the query is extended
+        self._last_search: tuple[_FileIndex, str, list[int]] | None = None
+        # Bumped on every text change and reset, so that stale background
+        # searches stop and their results are dropped
+        self._generation = 0
+        self._search_task: asyncio.Task[None] | None = None
+
+    def _get_index(self) -> _FileIndex:
+        """Get the cached file index, building it if needed.
 
         Returns:
-            List of project file paths.
+            Index of the project files.
         """
-        if self._file_cache is None:
-            self._file_cache = _get_project_files(self._project_root)
-        return self._file_cache
+        with self._index_lock:
+            if self._index is None:
+                self._index = _FileIndex(_get_project_files(self._project_root))
+            return self._index
 
     def refresh_cache(self) -> None:
         """Force refresh of file cache."""
-        self._file_cache = None
+        with self._index_lock:
+            self._index = None
+            self._last_search = None
 
     @staticmethod
     def can_handle(text: str, cursor_index: int) -> bool:
@@ -459,13 +671,19 @@ class FuzzyFileController:
 
     def reset(self) -> None:
         """Clear suggestions."""
+        self._generation += 1
         if self._suggestions:
             self._suggestions.clear()
             self._selected_index = 0
             self._view.clear_completion_suggestions()
 
     def on_text_changed(self, text: str, cursor_index: int) -> None:
-        """Update suggestions when text changes."""
+        """Update suggestions when text changes.
+
+        Within a running event loop (the app), files are searched in a worker
+        thread and a newer change cancels the search. Otherwise they are
+        searched synchronously.
+        """
         if not self.can_handle(text, cursor_index):
             self.reset()
             return
@@ -474,8 +692,37 @@ class FuzzyFileController:
         at_index = before_cursor.rfind("@")
         search = before_cursor[at_index + 1 :]
 
-        suggestions = self._get_fuzzy_suggestions(search)
+        self._generation += 1
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._show_suggestions(self._get_fuzzy_suggestions(search) or [])
+            return
+
+        if self._search_task is not None:
+            self._search_task.cancel()
+        self._search_task = asyncio.create_task(
+            self._search_in_background(search, self._generation)
+        )
+
+    async def _search_in_background(self, search: str, generation: int) -> None:
+        """Search files in a worker thread and show the results unless stale."""
+
+        def is_stale() -> bool:
+            return self._generation != generation
 
+        try:
+            suggestions = await asyncio.to_thread(
+                self._get_fuzzy_suggestions, search, is_stale
+            )
+        except OSError:
+            logger.warning("Failed to search project files", exc_info=True)
+            return
+        if suggestions is not None and not is_stale():
+            self._show_suggestions(suggestions)
+
+    def _show_suggestions(self, suggestions: list[tuple[str, str]]) -> None:
+        """Render `suggestions`, or clear the popup if there are none."""
         if suggestions:
             self._suggestions = suggestions
             self._selected_index = 0
@@ -485,18 +732,43 @@ class FuzzyFileController:
         else:
             self.reset()
 
-    def _get_fuzzy_suggestions(self, search: str) -> list[tuple[str, str]]:
+    def _get_fuzzy_suggestions(
+        self, search: str, is_cancelled: Callable[[], bool] | None = None
+    ) -> list[tuple[str, str]] | None:
         """Get fuzzy file suggestions.
 
+        Args:
+            search: Text typed after `@`.
+            is_cancelled: Polled while searching; the search stops when it
+                returns True.
+
         Returns:
-            List of (label, type_hint) tuples for matching files.
+            List of (label, type_hint) tuples for matching files, or None if
+                the search was cancelled.
         """
-        files = self._get_files()
+        index = self._get_index()
+        query = search.lower()
+        within = None
+        last_search = self._last_search
+        if last_search is not None:
+            last_index, last_query, last_matches = last_search
+            if last_index is index and last_query and query.startswith(last_query):
+                within = last_matches
+
         # Include dotfiles only if query starts with "."
         include_dots = search.startswith(".")
-        matches = _fuzzy_search(
-            search, files, limit=MAX_SUGGESTIONS, include_dotfiles=include_dots
+        result = index.search(
+            search,
+            MAX_SUGGESTIONS,
+            include_dotfiles=include_dots,
+            within=within,
+            is_cancelled=is_cancelled,
         )
+        if result is None:
+            return None
+        matches, substring_matches = result
+        if query:
+            self._last_search = (index, query, substring_matches)
 
         suggestions: list[tuple[str, str]] = []
         for path in matches:
@@ -18,6 +18,8 @@ from enum import StrEnum
 from time import time
 from typing import TYPE_CHECKING, Any
 
+import zstandard
+
 if TYPE_CHECKING:
     from textual.widget import Widget
 
@@ -36,6 +38,14 @@ _UPDATABLE_FIELDS: frozenset[str] = frozenset(
     }
 )
 
+_COMPRESS_OUTPUT_CHARS = 4096
+"""Tool outputs at least this long are stored zstd-compressed.
+
+Tool outputs (file reads, command output, search results) are by far the
+largest part of a long thread's history, and only the few mounted tool widgets
+need them as text.
+"""
+
 
 class MessageType(StrEnum):
     """Types of messages in the chat."""
@@ -59,13 +69,14 @@ class ToolStatus(StrEnum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageData:
     """In-memory message data for virtualization.
 
     This dataclass holds all information needed to recreate a message widget.
     It is designed to be lightweight so that thousands of messages can be
-    stored without meaningful memory overhead.
+    stored without meaningful memory overhead: instances use `__slots__`, and
+    large tool outputs are kept compressed until a widget needs them.
     """
 
     type: MessageType
@@ -95,8 +106,13 @@ class MessageData:
     tool_status: ToolStatus | None = None
     """Current execution status of the tool call."""
 
-    tool_output: str | None = None
-    """Output returned by the tool after execution."""
+    tool_output: str | bytes | None = None
+    """Output returned by the tool after execution.
+
+    Outputs of at least `_COMPRESS_OUTPUT_CHARS` characters are stored as
+    zstd-compressed UTF-8 bytes; read and assign the text through
+    `get_tool_output()` and `set_tool_output()`.
+    """
 
     tool_expanded: bool = False
     """Whether the tool output section is expanded in the UI."""
@@ -126,7 +142,7 @@ class MessageData:
     """
 
     def __post_init__(self) -> None:
-        """Validate type-field coherence after construction.
+        """Validate type-field coherence and compress a large tool output.
 
         Raises:
             ValueError: If a TOOL message is missing `tool_name`.
@@ -134,6 +150,29 @@ class MessageData:
         if self.type == MessageType.TOOL and not self.tool_name:
             msg = "TOOL messages must have a tool_name"
             raise ValueError(msg)
+        if isinstance(self.tool_output, str):
+            self.set_tool_output(self.tool_output)
+
+    def get_tool_output(self) -> str | None:
+        """Return the tool output as text, decompressing it if needed.
+
+        Returns:
+            The tool output, or `None` if there is none.
+        """
+        if isinstance(self.tool_output, bytes):
+            return zstandard.decompress(self.tool_output).decode("utf-8")
+        return self.tool_output
+
+    def set_tool_output(self, output: str | None) -> None:
+        """Store a tool output, compressing it if it is large.
+
+        Args:
+            output: The tool output text, or `None` to clear it.
+        """
+        if output is not None and len(output) >= _COMPRESS_OUTPUT_CHARS:
+            self.tool_output = zstandard.compress(output.encode("utf-8"))
+        else:
+            self.tool_output = output
 
     def to_widget(self) -> Widget:
         """Recreate a widget from this message data.
@@ -167,7 +206,7 @@ class MessageData:
                 # Deferred state is restored automatically during on_mount
                 # via _restore_deferred_state
                 widget._deferred_status = self.tool_status
-                widget._deferred_output = self.tool_output
+                widget._deferred_output = self.get_tool_output()
                 widget._deferred_expanded = self.tool_expanded
                 return widget
 
@@ -311,9 +350,17 @@ class MessageStore:
     def __init__(self) -> None:
         """Initialize the message store."""
         self._messages: list[MessageData] = []
+        # Position of each message ID, for O(1) lookups by ID. A message's index
+        # in `_messages` is its position plus `_index_offset`, which grows as
+        # older messages are prepended.
+        self._index_by_id: dict[str, int] = {}
+        self._index_offset: int = 0
         self._visible_start: int = 0
         self._visible_end: int = 0
 
+        # Whether older messages exist that are not loaded into the store yet
+        self._unloaded_above: bool = False
+
         # Track active streaming message - never archive this
         self._active_message_id: str | None = None
 
@@ -329,8 +376,13 @@ class MessageStore:
 
     @property
     def has_messages_above(self) -> bool:
-        """Check if there are archived messages above the visible window."""
-        return self._visible_start > 0
+        """Check if there are archived or unloaded messages above the visible window."""
+        return self._visible_start > 0 or self._unloaded_above
+
+    @property
+    def has_unloaded_above(self) -> bool:
+        """Check if older messages exist that are not loaded into the store yet."""
+        return self._unloaded_above
 
     @property
     def has_messages_below(self) -> bool:
@@ -343,6 +395,9 @@ class MessageStore:
         Args:
             message: The message data to add.
         """
+        self._index_by_id.setdefault(
+            message.id, len(self._messages) - self._index_offset
+        )
         self._messages.append(message)
         self._visible_end = len(self._messages)
 
@@ -361,6 +416,9 @@ class MessageStore:
         Returns:
             Tuple of (archived, visible) message lists.
         """
+        start = len(self._messages) - self._index_offset
+        for position, message in enumerate(messages, start):
+            self._index_by_id.setdefault(message.id, position)
         self._messages.extend(messages)
         total = len(self._messages)
 
@@ -384,10 +442,40 @@ class MessageStore:
         Returns:
             The message data, or None if not found.
         """
-        for msg in self._messages:
-            if msg.id == message_id:
-                return msg
-        return None
+        position = self._index_by_id.get(message_id)
+        if position is None:
+            return None
+        return self._messages[position + self._index_offset]
+
+    def prepend(self, messages: list[MessageData], *, more_above: bool) -> None:
+        """Load older messages in front of the stored ones, as archived messages.
+
+        Used to load a resumed thread's history page by page, as the user
+        scrolls up. The visible window keeps showing the same messages.
+
+        Args:
+            messages: Ordered list of the messages preceding the stored ones.
+            more_above: Whether even older messages remain to be loaded.
+        """
+        count = len(messages)
+        self._index_offset += count
+        for position, message in enumerate(messages, -self._index_offset):
+            self._index_by_id[message.id] = position
+        self._messages[:0] = messages
+        self._visible_start += count
+        self._visible_end += count
+        self._unloaded_above = more_above
+
+    def set_unloaded_above(self, unloaded: bool) -> None:
+        """Record whether older messages exist that are not loaded yet.
+
+        While set, `has_messages_above` stays true so that scrolling to the
+        top triggers loading them.
+
+        Args:
+            unloaded: Whether older messages remain to be loaded.
+        """
+        self._unloaded_above = unloaded
 
     def get_message_at_index(self, index: int) -> MessageData | None:
         """Get a message by its index.
@@ -424,12 +512,15 @@ class MessageStore:
             msg = f"Cannot update unknown or protected fields: {unknown}"
             raise ValueError(msg)
 
-        for msg_data in self._messages:
-            if msg_data.id == message_id:
-                for key, value in updates.items():
-                    setattr(msg_data, key, value)
-                return True
-        return False
+        msg_data = self.get_message(message_id)
+        if msg_data is None:
+            return False
+        for key, value in updates.items():
+            if key == "tool_output":
+                msg_data.set_tool_output(value)
+            else:
+                setattr(msg_data, key, value)
+        return True
 
     def set_active_message(self, message_id: str | None) -> None:
         """Set the currently active (streaming) message.
@@ -582,6 +673,9 @@ class MessageStore:
     def clear(self) -> None:
         """Clear all messages."""
         self._messages.clear()
+        self._index_by_id.clear()
+        self._index_offset = 0
+        self._unloaded_above = False
         self._visible_start = 0
         self._visible_end = 0
         self._active_message_id = None
@@ -192,6 +192,39 @@ class TestSubcommandHelpFlags:
             must_not_contain="--sandbox",
         )
 
+    def test_threads_gc_help(self) -> None:
+        """Running `deepagents threads gc -h` should show threads gc help."""
+        self._run_help(
+            ["deepagents", "threads", "gc", "-h"],
+            must_contain="--max-age-days",
+            must_not_contain="--sandbox",
+        )
+
+
+class TestThreadsGcArgs:
+    """Tests for `deepagents threads gc` arguments."""
+
+    def test_max_age_days(self) -> None:
+        """Verify --max-age-days accepts a positive number of days."""
+        with patch.object(
+            sys, "argv", ["deepagents", "threads", "gc", "--max-age-days", "7.5"]
+        ):
+            args = parse_args()
+        assert args.max_age_days == 7.5
+
+    @pytest.mark.parametrize("value", ["0", "-3", "nan", "soon"])
+    def test_max_age_days_rejects_non_positive(self, value: str) -> None:
+        """Verify --max-age-days refuses values that would expire every thread."""
+        with (
+            patch.object(
+                sys, "argv", ["deepagents", "threads", "gc", "--max-age-days", value]
+            ),
+            patch("sys.stderr", io.StringIO()),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            parse_args()
+        assert exc_info.value.code == 2
+
 
 class TestShortFlags:
     """Test that short flag aliases (-a, -M, -v) parse correctly."""
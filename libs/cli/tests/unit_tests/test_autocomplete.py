@@ -1,7 +1,8 @@
 """Tests for autocomplete fuzzy search functionality."""
 
+import asyncio
 from typing import cast
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -11,6 +12,7 @@ from deepagents_cli.widgets.autocomplete import (
     FuzzyFileController,
     MultiCompletionManager,
     SlashCommandController,
+    _FileIndex,
     _find_project_root,
     _fuzzy_score,
     _fuzzy_search,
@@ -133,6 +135,121 @@ class TestFuzzySearch:
         assert any("utils.py" in r for r in results)
 
 
+class TestFileIndex:
+    """Tests for the precomputed file index behind fuzzy search."""
+
+    @pytest.fixture
+    def files(self):
+        """A few thousand generated paths plus some hand-picked ones."""
+        generated = [
+            f"pkg{i % 13}/sub_{i % 7}/mod-{i}.{('py', 'md', 'json')[i % 3]}"
+            for i in range(3000)
+        ]
+        return [
+            *generated,
+            "src/main.py",
+            "src/mian_helper.py",
+            "README.md",
+            ".github/workflows/ci.yml",
+            "docs/api/main_reference.md",
+        ]
+
+    def test_matches_fuzzy_score(self, files):
+        """Index results equal ranking every file by `_fuzzy_score`."""
+        index = _FileIndex(files)
+        for query in ["main", "mian", "mdo", "sub_3/mod-1", "pkg12", "rdme", "zq"]:
+            scored = [(_fuzzy_score(query, f), f) for f in files if not _is_dotpath(f)]
+            expected = [
+                f for score, f in sorted(scored, key=lambda x: -x[0]) if score >= 15
+            ][:10]
+            results, _ = index.search(query, 10, include_dotfiles=False)
+            assert results == expected, query
+
+    def test_narrowing_matches_full_search(self, files):
+        """Searching within the previous query's matches gives the same results."""
+        index = _FileIndex(files)
+        within = None
+        typed = ""
+        for char in "mod-12":
+            typed += char
+            narrowed, within = index.search(
+                typed, 10, include_dotfiles=False, within=within
+            )
+            full, _ = index.search(typed, 10, include_dotfiles=False)
+            assert narrowed == full
+        assert len(within) < len(files) // 10
+
+    def test_cancelled_search_returns_none(self, files):
+        """A search whose query went stale stops early."""
+        index = _FileIndex(files)
+        assert (
+            index.search("mod", 10, include_dotfiles=False, is_cancelled=lambda: True)
+            is None
+        )
+
+
+class TestFuzzyFileControllerSearch:
+    """Tests for FuzzyFileController searching and rendering."""
+
+    @pytest.fixture
+    def mock_view(self):
+        """Create a mock CompletionView."""
+        return MagicMock()
+
+    @pytest.fixture
+    def controller(self, mock_view, tmp_path):
+        """Create a FuzzyFileController over a fixed file list."""
+        files = ["src/main.py", "src/app.py", "README.md", "tests/test_main.py"]
+        with patch(
+            "deepagents_cli.widgets.autocomplete._get_project_files",
+            return_value=files,
+        ):
+            controller = FuzzyFileController(mock_view, cwd=tmp_path)
+            controller._get_index()
+        return controller
+
+    def test_searches_synchronously_without_event_loop(self, controller, mock_view):
+        """Without a running loop, suggestions render immediately."""
+        controller.on_text_changed("@main", 5)
+        mock_view.render_completion_suggestions.assert_called_once()
+        suggestions, _ = mock_view.render_completion_suggestions.call_args.args
+        assert suggestions[0] == ("@src/main.py", "py")
+
+    async def test_searches_in_background_and_drops_stale_queries(
+        self, controller, mock_view
+    ):
+        """Only the latest query's results are rendered."""
+        controller.on_text_changed("@m", 2)
+        controller.on_text_changed("@ma", 3)
+        controller.on_text_changed("@app", 4)
+        mock_view.render_completion_suggestions.assert_not_called()
+
+        await controller._search_task
+
+        mock_view.render_completion_suggestions.assert_called_once()
+        suggestions, _ = mock_view.render_completion_suggestions.call_args.args
+        assert suggestions == [("@src/app.py", "py")]
+
+    async def test_reset_drops_pending_results(self, controller, mock_view):
+        """Results of a search started before a reset are not rendered."""
+        controller.on_text_changed("@main", 5)
+        task = controller._search_task
+        controller.reset()
+
+        await task
+        await asyncio.sleep(0)
+
+        mock_view.render_completion_suggestions.assert_not_called()
+
+    def test_refresh_cache_rebuilds_index(self, controller):
+        """refresh_cache drops the index and the narrowing state."""
+        controller.on_text_changed("@ma", 3)
+        assert controller._last_search is not None
+        controller.refresh_cache()
+        assert controller._index is None
+        assert controller._last_search is None
+
+
 class TestHelperFunctions:
     """Tests for helper functions."""
 
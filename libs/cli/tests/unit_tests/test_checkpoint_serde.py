@@ -0,0 +1,88 @@
+"""Tests for the compressed checkpoint serializer."""
+
+import time
+
+import pytest
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from deepagents_cli.checkpoint_serde import (
+    HEADER_SIZE,
+    CompressedSerializer,
+    is_compressed,
+    read_header,
+)
+
+
+def _checkpoint(message_count: int) -> dict:
+    return {
+        "v": 1,
+        "id": "checkpoint-id",
+        "channel_values": {
+            "messages": [
+                {"type": "human", "content": f"message {i} " * 10}
+                for i in range(message_count)
+            ],
+            "files": {"/notes.txt": {"content": ["line"] * 100}},
+        },
+    }
+
+
+class TestCompressedSerializer:
+    """Tests for CompressedSerializer."""
+
+    def test_round_trips_large_values_compressed(self):
+        """Large values are compressed behind a header and restored unchanged."""
+        serde = CompressedSerializer(JsonPlusSerializer())
+        checkpoint = _checkpoint(30)
+
+        type_str, data = serde.dumps_typed(checkpoint)
+
+        assert is_compressed(type_str)
+        assert serde.loads_typed((type_str, data)) == checkpoint
+        inner_size = len(JsonPlusSerializer().dumps_typed(checkpoint)[1])
+        header = read_header(data)
+        assert header.message_count == 30
+        assert header.raw_size == inner_size
+        assert header.compressed_size == len(data) - HEADER_SIZE
+        assert header.compressed_size < inner_size
+        assert header.updated_at == pytest.approx(time.time(), abs=60)
+
+    def test_small_values_are_stored_as_the_inner_serializer_writes_them(self):
+        """Values below the size threshold skip compression and the header."""
+        serde = CompressedSerializer(JsonPlusSerializer())
+
+        stored = serde.dumps_typed({"channel_values": {"messages": []}})
+
+        assert stored == JsonPlusSerializer().dumps_typed(
+            {"channel_values": {"messages": []}}
+        )
+        assert not is_compressed(stored[0])
+
+    def test_reads_values_of_the_inner_serializer(self):
+        """Checkpoints written before compression still load."""
+        checkpoint = _checkpoint(3)
+        stored = JsonPlusSerializer().dumps_typed(checkpoint)
+
+        serde = CompressedSerializer(JsonPlusSerializer())
+
+        assert serde.loads_typed(stored) == checkpoint
+
+    def test_non_checkpoint_values_have_no_message_count(self):
+        """Only checkpoints record a message count."""
+        serde = CompressedSerializer(JsonPlusSerializer(), min_compress_size=0)
+
+        _, data = serde.dumps_typed(["a", "b", "c"])
+
+        assert read_header(data).message_count == 0
+
+    def test_rejects_corrupt_values(self):
+        """Truncated or corrupt compressed values raise ValueError."""
+        serde = CompressedSerializer(JsonPlusSerializer())
+        type_str, data = serde.dumps_typed(_checkpoint(30))
+
+        with pytest.raises(ValueError, match="truncated"):
+            serde.loads_typed((type_str, data[: HEADER_SIZE - 1]))
+        with pytest.raises(ValueError, match="header"):
+            serde.loads_typed((type_str, b"XXXX" + data[4:]))
+        with pytest.raises(ValueError, match="Corrupt"):
+            serde.loads_typed((type_str, data[:-10]))
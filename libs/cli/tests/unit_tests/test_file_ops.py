@@ -1,6 +1,8 @@
 import textwrap
 from pathlib import Path
 
+from deepagents.backends import FileContentCache, FilesystemBackend
+from deepagents.backends.protocol import FileDownloadResponse
 from langchain_core.messages import ToolMessage
 
 from deepagents_cli.file_ops import FileOpTracker, build_approval_preview
@@ -100,6 +102,35 @@ def test_tracker_records_edit_diff(tmp_path: Path) -> None:
     assert '+    return "hi"' in record.diff
 
 
+def test_tracker_reuses_contents_cached_by_agent_tools(tmp_path: Path) -> None:
+    downloads: list[str] = []
+
+    class CountingBackend(FilesystemBackend):
+        def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+            downloads.extend(paths)
+            return super().download_files(paths)
+
+    backend = CountingBackend(root_dir=tmp_path, virtual_mode=True)
+    (tmp_path / "app.py").write_text("x = 1\n")
+    # The agent's read_file tool cached the file for this thread
+    FileContentCache.for_backend(backend).put(
+        backend, "/app.py", "x = 1\n", thread_id="thread-1"
+    )
+    tracker = FileOpTracker(assistant_id=None, backend=backend, thread_id="thread-1")
+
+    tracker.start_operation("edit_file", {"file_path": "/app.py"}, "edit-1")
+    (tmp_path / "app.py").write_text("x = 20\n")
+    record = tracker.complete_with_message(
+        ToolMessage(content="Successfully replaced", tool_call_id="edit-1")
+    )
+
+    assert record is not None
+    assert record.before_content == "x = 1\n"
+    assert record.after_content == "x = 20\n"
+    # Only the changed file had to be downloaded again
+    assert downloads == ["/app.py"]
+
+
 def test_build_approval_preview_generates_diff(tmp_path: Path) -> None:
     target = tmp_path / "notes.txt"
     target.write_text("alpha\nbeta\n")
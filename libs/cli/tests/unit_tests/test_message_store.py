@@ -1,5 +1,7 @@
 """Tests for message store and serialization."""
 
+from dataclasses import replace
+
 import pytest
 from textual.widgets import Static
 
@@ -148,6 +150,41 @@ class TestMessageData:
         assert data.is_streaming is False
         assert data.height_hint is None
 
+    def test_message_data_has_no_instance_dict(self):
+        """MessageData uses __slots__ to keep archived messages small."""
+        msg = MessageData(type=MessageType.USER, content="hi")
+        assert not hasattr(msg, "__dict__")
+
+    def test_large_tool_output_stored_compressed(self):
+        """Large tool outputs are compressed but read back unchanged."""
+        output = "line of tool output\n" * 1000
+        data = MessageData(
+            type=MessageType.TOOL,
+            content="",
+            tool_name="read_file",
+            tool_output=output,
+        )
+        assert isinstance(data.tool_output, bytes)
+        assert len(data.tool_output) < len(output) // 10
+        assert data.get_tool_output() == output
+        assert data.to_widget()._deferred_output == output
+        assert replace(data, tool_expanded=True).get_tool_output() == output
+
+        data.set_tool_output("short")
+        assert data.tool_output == "short"
+        assert data.get_tool_output() == "short"
+
+    def test_update_message_compresses_tool_output(self):
+        """Tool outputs set through the store are compressed like at construction."""
+        store = MessageStore()
+        data = MessageData(type=MessageType.TOOL, content="", tool_name="bash")
+        store.append(data)
+
+        output = "x" * 5000
+        assert store.update_message(data.id, tool_output=output)
+        assert isinstance(data.tool_output, bytes)
+        assert data.get_tool_output() == output
+
     def test_tool_message_requires_tool_name(self):
         """Test that TOOL messages must have a tool_name."""
         with pytest.raises(ValueError, match="TOOL messages must have a tool_name"):
@@ -673,6 +710,82 @@ class TestBulkLoad:
         assert store._visible_start == 2
         assert archived[0].id == "pre-0"
 
+    def test_bulk_load_indexes_messages_by_id(self):
+        """Messages loaded in bulk can be found and updated by ID."""
+        store = MessageStore()
+        store.append(MessageData(type=MessageType.USER, content="pre", id="pre-0"))
+        store.bulk_load(
+            [
+                MessageData(type=MessageType.USER, content=f"msg{i}", id=f"id-{i}")
+                for i in range(100)
+            ]
+        )
+        store.append(MessageData(type=MessageType.USER, content="post", id="post-0"))
+
+        assert store.get_message("pre-0").content == "pre"
+        assert store.get_message("id-42").content == "msg42"
+        assert store.update_message("post-0", content="updated") is True
+        assert store.get_message("post-0").content == "updated"
+
+        store.clear()
+        assert store.get_message("id-42") is None
+        assert store.update_message("post-0", content="gone") is False
+
+
+class TestPrepend:
+    """Test loading older messages in front of the stored ones."""
+
+    def test_prepend_keeps_visible_window(self):
+        """Prepended messages are archived and the window keeps its messages."""
+        store = MessageStore()
+        store.bulk_load(
+            [
+                MessageData(type=MessageType.USER, content=f"new{i}", id=f"new-{i}")
+                for i in range(3)
+            ]
+        )
+        store.set_unloaded_above(True)
+        assert store.has_messages_above
+        assert store.get_messages_to_hydrate() == []
+
+        older = [
+            MessageData(type=MessageType.USER, content=f"old{i}", id=f"old-{i}")
+            for i in range(4)
+        ]
+        store.prepend(older, more_above=False)
+
+        assert store.total_count == 7
+        assert [m.id for m in store.get_visible_messages()] == [
+            "new-0",
+            "new-1",
+            "new-2",
+        ]
+        assert store.get_messages_to_hydrate() == older
+        assert not store.has_unloaded_above
+
+    def test_prepend_keeps_id_lookups(self):
+        """Messages stay findable by ID across prepends and appends."""
+        store = MessageStore()
+        store.append(MessageData(type=MessageType.USER, content="b", id="b"))
+        store.prepend(
+            [MessageData(type=MessageType.USER, content="a", id="a")],
+            more_above=True,
+        )
+        store.append(MessageData(type=MessageType.USER, content="c", id="c"))
+        store.prepend(
+            [MessageData(type=MessageType.USER, content="z", id="z")],
+            more_above=False,
+        )
+
+        assert [m.id for m in store.get_all_messages()] == ["z", "a", "b", "c"]
+        for message_id in ("z", "a", "b", "c"):
+            assert store.get_message(message_id).content == message_id
+
+        store.clear()
+        assert not store.has_messages_above
+        store.append(MessageData(type=MessageType.USER, content="d", id="d"))
+        assert store.get_message("d").content == "d"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -202,6 +202,93 @@ class TestThreadFunctions:
             assert result is False
 
 
+class TestSharedConnection:
+    """Tests for the shared, tuned connection behind the session helpers."""
+
+    @pytest.fixture
+    def temp_db(self, tmp_path: Path) -> Path:
+        """Create a temporary database with three threads."""
+        db_path = tmp_path / "test_sessions.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("""
+            CREATE TABLE checkpoints (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                metadata BLOB,
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+            )
+        """)
+        now = datetime.now(UTC).isoformat()
+        for tid, agent in [
+            ("thread1", "agent1"),
+            ("thread2", "agent2"),
+            ("thread3", "agent1"),
+        ]:
+            metadata = json.dumps({"agent_name": agent, "updated_at": now})
+            conn.execute(
+                "INSERT INTO checkpoints (thread_id, checkpoint_id, metadata) "
+                "VALUES (?, ?, ?)",
+                (tid, f"cp_{tid}", metadata),
+            )
+        conn.commit()
+        conn.close()
+        return db_path
+
+    def test_reuses_configured_connection_across_event_loops(self, temp_db):
+        """All helpers share one WAL-mode connection, even across asyncio.run."""
+
+        async def _borrow() -> object:
+            async with sessions._connect() as conn:
+                return conn
+
+        async def _pragmas(conn) -> tuple:
+            async with conn.execute("PRAGMA journal_mode") as cursor:
+                journal_mode = (await cursor.fetchone())[0]
+            async with conn.execute("PRAGMA synchronous") as cursor:
+                synchronous = (await cursor.fetchone())[0]
+            return journal_mode, synchronous
+
+        with patch.object(sessions, "get_db_path", return_value=temp_db):
+            first = asyncio.run(_borrow())
+            assert asyncio.run(_borrow()) is first
+            assert asyncio.run(_pragmas(first)) == ("wal", 1)
+
+    def test_caches_schema_detection(self, temp_db):
+        """Repeated calls do not probe sqlite_master again."""
+        statements: list[str] = []
+
+        async def _test() -> None:
+            assert await sessions.thread_exists("thread1")
+            async with sessions._connect() as conn:
+                await conn.set_trace_callback(statements.append)
+            assert await sessions.thread_exists("thread2")
+            assert await sessions.get_thread_agent("thread3") == "agent1"
+            async with sessions._connect() as conn:
+                await conn.set_trace_callback(None)
+
+        with patch.object(sessions, "get_db_path", return_value=temp_db):
+            asyncio.run(_test())
+
+        assert statements
+        assert not [s for s in statements if "sqlite_master" in s]
+
+    def test_rolls_back_transaction_left_open_by_error(self, temp_db):
+        """An error inside `_connect` does not leak a transaction to the next user."""
+
+        async def _fail() -> None:
+            async with sessions._connect() as conn:
+                await conn.execute("DELETE FROM threads")
+                msg = "boom"
+                raise RuntimeError(msg)
+
+        with patch.object(sessions, "get_db_path", return_value=temp_db):
+            assert asyncio.run(sessions.thread_exists("thread1"))
+            with pytest.raises(RuntimeError, match="boom"):
+                asyncio.run(_fail())
+            assert asyncio.run(sessions.thread_exists("thread1"))
+
+
 class TestGetCheckpointer:
     """Tests for get_checkpointer async context manager."""
 
@@ -216,6 +303,45 @@ class TestGetCheckpointer:
 
         asyncio.run(_test())
 
+    def test_compresses_checkpoints_and_counts_from_header(self, tmp_path):
+        """Large checkpoints are compressed and counted without decoding them."""
+        from langgraph.checkpoint.base import empty_checkpoint
+
+        from deepagents_cli.checkpoint_serde import CompressedSerializer
+
+        messages = [
+            {"type": "human", "content": f"message {i} " * 20} for i in range(50)
+        ]
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"messages": messages}
+        config = {"configurable": {"thread_id": "big", "checkpoint_ns": ""}}
+
+        async def _test() -> None:
+            async with sessions.get_checkpointer() as cp:
+                await cp.aput(config, checkpoint, {"agent_name": "agent1"}, {})
+                restored = await cp.aget_tuple(config)
+            assert restored is not None
+            assert restored.checkpoint["channel_values"]["messages"] == messages
+
+            with patch.object(
+                CompressedSerializer, "loads_typed", side_effect=AssertionError
+            ):
+                threads = await sessions.list_threads(include_message_count=True)
+            assert threads[0]["message_count"] == 50
+
+        db_path = tmp_path / "test.db"
+        with patch.object(sessions, "get_db_path", return_value=db_path):
+            asyncio.run(_test())
+
+        conn = sqlite3.connect(str(db_path))
+        type_str, size = conn.execute(
+            "SELECT type, length(checkpoint) FROM checkpoints"
+        ).fetchone()
+        conn.close()
+        assert type_str.endswith("+zstd")
+        raw_size = len(JsonPlusSerializer().dumps_typed(checkpoint)[1])
+        assert size < raw_size / 4
+
 
 class TestFormatTimestamp:
     """Tests for format_timestamp helper."""
@@ -402,6 +528,26 @@ class TestListThreadsWithMessageCount:
             assert len(threads) == 1
             assert "message_count" not in threads[0]
 
+    def test_backfills_legacy_database(self, temp_db_with_messages: Path) -> None:
+        """Databases without the `threads` table are migrated on first read."""
+        with patch.object(sessions, "get_db_path", return_value=temp_db_with_messages):
+            threads = asyncio.run(sessions.list_threads(include_message_count=True))
+        assert threads[0]["message_count"] == 3
+
+        conn = sqlite3.connect(str(temp_db_with_messages))
+        row = conn.execute(
+            "SELECT agent_name, updated_at, message_count FROM threads"
+        ).fetchone()
+        indexes = {
+            r[0]
+            for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE tbl_name = 'threads'"
+            )
+        }
+        conn.close()
+        assert row == ("agent1", "2024-01-01", 3)
+        assert {"threads_updated_at", "threads_agent_name"} <= indexes
+
 
 class TestMessageCountFromCheckpointBlob:
     """Tests for counting messages from checkpoint blob (not writes table).
@@ -497,6 +643,230 @@ class TestMessageCountFromCheckpointBlob:
             assert threads[0]["message_count"] == 4
 
 
+class TestThreadIndex:
+    """Tests for the `threads` summary table."""
+
+    @staticmethod
+    def _checkpoint(message_count: int) -> dict:
+        from langgraph.checkpoint.base import empty_checkpoint
+
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {
+            "messages": [{"type": "human", "content": "hi"}] * message_count
+        }
+        return checkpoint
+
+    def test_checkpointer_keeps_index_current(self, tmp_path: Path) -> None:
+        """Saving and deleting checkpoints updates the thread rows."""
+
+        async def _test() -> None:
+            async with sessions.get_checkpointer() as cp:
+                for thread_id, agent, updated_at, count in [
+                    ("abc1", "agent1", "2024-01-01T00:00:00", 2),
+                    ("abc2", "agent2", "2024-01-02T00:00:00", 5),
+                    ("a%c3", "agent1", "2024-01-03T00:00:00", 1),
+                ]:
+                    config = {
+                        "configurable": {"thread_id": thread_id, "checkpoint_ns": ""},
+                        "metadata": {"agent_name": agent, "updated_at": updated_at},
+                    }
+                    await cp.aput(config, self._checkpoint(count), {}, {})
+
+                # Subgraph checkpoints keep the root message count
+                subgraph = {
+                    "configurable": {"thread_id": "abc1", "checkpoint_ns": "sub"}
+                }
+                await cp.aput(subgraph, self._checkpoint(9), {}, {})
+
+                threads = await sessions.list_threads(include_message_count=True)
+                assert [(t["thread_id"], t["message_count"]) for t in threads] == [
+                    ("a%c3", 1),
+                    ("abc2", 5),
+                    ("abc1", 2),
+                ]
+                assert await sessions.get_most_recent("agent1") == "a%c3"
+                assert await sessions.get_thread_agent("abc2") == "agent2"
+                assert await sessions.find_similar_threads("abc") == ["abc1", "abc2"]
+                assert await sessions.find_similar_threads("a%") == ["a%c3"]
+
+                await cp.adelete_thread("abc2")
+                assert not await sessions.thread_exists("abc2")
+
+        with patch.object(sessions, "get_db_path", return_value=tmp_path / "t.db"):
+            asyncio.run(_test())
+
+
+class TestCollectGarbage:
+    """Tests for checkpoint retention and compaction."""
+
+    @pytest.fixture
+    def temp_db_with_history(self, tmp_path: Path) -> Path:
+        """Create a database with two threads of five large checkpoints each."""
+        db_path = tmp_path / "sessions.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("""
+            CREATE TABLE checkpoints (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                parent_checkpoint_id TEXT,
+                type TEXT,
+                checkpoint BLOB,
+                metadata BLOB,
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE writes (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                channel TEXT NOT NULL,
+                type TEXT,
+                value BLOB,
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+            )
+        """)
+        recent = datetime.now(UTC).isoformat()
+        for thread_id, updated_at in [
+            ("old", "2020-01-01T00:00:00+00:00"),
+            ("new", recent),
+        ]:
+            metadata = json.dumps({"agent_name": "agent1", "updated_at": updated_at})
+            for i in range(5):
+                conn.execute(
+                    "INSERT INTO checkpoints "
+                    "(thread_id, checkpoint_id, type, checkpoint, metadata) "
+                    "VALUES (?, ?, 'bytes', randomblob(20000), ?)",
+                    (thread_id, f"cp_{i}", metadata),
+                )
+                conn.execute(
+                    "INSERT INTO writes VALUES (?, '', ?, 'task', 0, 'messages', "
+                    "'bytes', randomblob(100))",
+                    (thread_id, f"cp_{i}"),
+                )
+        conn.commit()
+        conn.close()
+        return db_path
+
+    def test_keeps_latest_checkpoints_and_compacts(
+        self, temp_db_with_history: Path
+    ) -> None:
+        """Old checkpoints and their writes are deleted and the file shrinks."""
+        with patch.object(sessions, "get_db_path", return_value=temp_db_with_history):
+            result = asyncio.run(sessions.collect_garbage(keep_checkpoints=2))
+
+        assert result["threads_deleted"] == 0
+        assert result["checkpoints_deleted"] == 6
+        assert result["writes_deleted"] == 6
+        assert result["bytes_reclaimed"] > 5 * 20000
+
+        conn = sqlite3.connect(str(temp_db_with_history))
+        remaining = conn.execute(
+            "SELECT thread_id, checkpoint_id FROM checkpoints ORDER BY 1, 2"
+        ).fetchall()
+        writes = conn.execute("SELECT count(*) FROM writes").fetchone()[0]
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        conn.close()
+        assert remaining == [
+            ("new", "cp_3"),
+            ("new", "cp_4"),
+            ("old", "cp_3"),
+            ("old", "cp_4"),
+        ]
+        assert writes == 4
+        assert auto_vacuum == 2  # Converted to incremental auto-vacuum
+
+    def test_expires_old_threads(self, temp_db_with_history: Path) -> None:
+        """Threads not updated within the maximum age are deleted entirely."""
+        with patch.object(sessions, "get_db_path", return_value=temp_db_with_history):
+            result = asyncio.run(
+                sessions.collect_garbage(keep_checkpoints=10, max_age_days=30)
+            )
+            assert not asyncio.run(sessions.thread_exists("old"))
+            assert asyncio.run(sessions.thread_exists("new"))
+
+        assert result["threads_deleted"] == 1
+        assert result["checkpoints_deleted"] == 5
+        assert result["writes_deleted"] == 5
+
+    def test_bounded_vacuum_does_not_rewrite_database(
+        self, temp_db_with_history: Path
+    ) -> None:
+        """A page limit never converts the database with a full VACUUM."""
+        with patch.object(sessions, "get_db_path", return_value=temp_db_with_history):
+            result = asyncio.run(
+                sessions.collect_garbage(keep_checkpoints=1, vacuum_pages=10)
+            )
+
+        assert result["checkpoints_deleted"] == 8
+        assert result["bytes_reclaimed"] == 0
+        conn = sqlite3.connect(str(temp_db_with_history))
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+        conn.close()
+
+    def test_deletes_in_batches(self, temp_db_with_history: Path) -> None:
+        """Batches smaller than the deletion set still delete everything."""
+        with (
+            patch.object(sessions, "get_db_path", return_value=temp_db_with_history),
+            patch.object(sessions, "_GC_BATCH_SIZE", 4),
+        ):
+            result = asyncio.run(
+                sessions.collect_garbage(keep_checkpoints=1, max_age_days=30)
+            )
+
+        assert result["threads_deleted"] == 1
+        assert result["checkpoints_deleted"] == 9
+        assert result["writes_deleted"] == 9
+
+    def test_background_collection_is_opt_in(self, temp_db_with_history: Path) -> None:
+        """Without retention settings, background collection deletes nothing."""
+        env = {
+            k: v
+            for k, v in __import__("os").environ.items()
+            if k not in {"DA_CLI_KEEP_CHECKPOINTS", "DA_CLI_THREAD_MAX_AGE_DAYS"}
+        }
+        with (
+            patch.object(sessions, "get_db_path", return_value=temp_db_with_history),
+            patch.dict("os.environ", env, clear=True),
+            patch.object(sessions, "collect_garbage") as collect,
+        ):
+            asyncio.run(sessions.collect_garbage_in_background())
+
+        collect.assert_not_called()
+        assert not (temp_db_with_history.parent / "sessions.gc").exists()
+
+    def test_background_collection_runs_once_a_day(
+        self, temp_db_with_history: Path
+    ) -> None:
+        """Background collection is skipped until the interval has passed."""
+        with (
+            patch.object(sessions, "get_db_path", return_value=temp_db_with_history),
+            patch.dict("os.environ", {"DA_CLI_KEEP_CHECKPOINTS": "4"}),
+            patch.object(
+                sessions, "collect_garbage", wraps=sessions.collect_garbage
+            ) as collect,
+        ):
+            asyncio.run(sessions.collect_garbage_in_background())
+            asyncio.run(sessions.collect_garbage_in_background())
+
+        collect.assert_called_once_with(
+            keep_checkpoints=4, max_age_days=None, vacuum_pages=2048
+        )
+        assert (temp_db_with_history.parent / "sessions.gc").exists()
+
+    def test_retention_settings_from_env(self) -> None:
+        """Retention settings are read from the environment."""
+        env = {"DA_CLI_KEEP_CHECKPOINTS": "0", "DA_CLI_THREAD_MAX_AGE_DAYS": "7.5"}
+        with patch.dict("os.environ", env):
+            assert sessions.get_checkpoint_retention() == 1
+            assert sessions.get_thread_max_age_days() == 7.5
+        with patch.dict("os.environ", {"DA_CLI_THREAD_MAX_AGE_DAYS": "never"}):
+            assert sessions.get_thread_max_age_days() is None
+
+
 class TestGetThreadLimit:
     """Tests for get_thread_limit() env var parsing."""
 
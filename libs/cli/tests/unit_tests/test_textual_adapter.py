@@ -1,5 +1,6 @@
 """Unit tests for textual_adapter functions."""
 
+import asyncio
 from asyncio import Future
 from collections.abc import Generator
 from datetime import datetime
@@ -9,6 +10,7 @@ from unittest.mock import MagicMock
 import pytest
 
 from deepagents_cli.textual_adapter import (
+    RenderScheduler,
     TextualUIAdapter,
     _build_interrupted_ai_message,
     _build_stream_config,
@@ -108,6 +110,104 @@ class TestTextualUIAdapterInit:
         set_active.assert_called_once_with(None)
 
 
+class _RecordingMessage:
+    """Stand-in for `AssistantMessage` recording appended text."""
+
+    def __init__(self) -> None:
+        self.appends: list[str] = []
+
+    async def append_content(self, text: str) -> None:
+        self.appends.append(text)
+
+
+class TestRenderScheduler:
+    """Tests for `RenderScheduler` frame coalescing."""
+
+    async def test_coalesces_chunks_into_frames(self) -> None:
+        """Chunks streamed faster than the frame rate are written together."""
+        flushes: list[None] = []
+        scheduler = RenderScheduler(max_fps=20, on_flush=lambda: flushes.append(None))
+        message = _RecordingMessage()
+
+        for i in range(100):
+            await scheduler.write((), message, f"{i} ")  # type: ignore[arg-type]
+            await asyncio.sleep(0.002)
+        await scheduler.close()
+
+        assert "".join(message.appends) == "".join(f"{i} " for i in range(100))
+        assert 1 < len(message.appends) < 50
+        assert len(flushes) == len(message.appends)
+        stats = scheduler.report()
+        assert stats.chunks == 100
+        assert stats.frames == len(message.appends)
+        assert 0 < stats.max_flush_latency < 1
+        assert scheduler.stats.frames == 0
+
+    async def test_flushes_without_further_chunks(self) -> None:
+        """Buffered text is written by the timer even if the stream pauses."""
+        scheduler = RenderScheduler(max_fps=100)
+        message = _RecordingMessage()
+
+        await scheduler.write((), message, "hello")  # type: ignore[arg-type]
+        assert message.appends == []
+        await asyncio.sleep(0.05)
+
+        assert message.appends == ["hello"]
+        scheduler.cancel()
+
+    async def test_flush_writes_immediately(self) -> None:
+        """An explicit flush (e.g. at a tool boundary) does not wait for a frame."""
+        scheduler = RenderScheduler(max_fps=1)
+        first, second = _RecordingMessage(), _RecordingMessage()
+
+        await scheduler.write((), first, "a")  # type: ignore[arg-type]
+        await scheduler.write(("sub",), second, "b")  # type: ignore[arg-type]
+        await scheduler.flush()
+
+        assert first.appends == ["a"]
+        assert second.appends == ["b"]
+        scheduler.cancel()
+
+    async def test_new_message_in_namespace_flushes_previous(self) -> None:
+        """Text of a namespace's previous message is written before new text."""
+        scheduler = RenderScheduler(max_fps=1)
+        first, second = _RecordingMessage(), _RecordingMessage()
+
+        await scheduler.write((), first, "a")  # type: ignore[arg-type]
+        await scheduler.write((), second, "b")  # type: ignore[arg-type]
+
+        assert first.appends == ["a"]
+        assert second.appends == []
+        await scheduler.close()
+        assert second.appends == ["b"]
+
+    async def test_counts_frames_dropped_by_slow_flushes(self) -> None:
+        """A flush taking several frame intervals counts as dropped frames."""
+
+        class _SlowMessage(_RecordingMessage):
+            async def append_content(self, text: str) -> None:
+                await asyncio.sleep(0.1)
+                await super().append_content(text)
+
+        scheduler = RenderScheduler(max_fps=100)
+        await scheduler.write((), _SlowMessage(), "slow")  # type: ignore[arg-type]
+        await scheduler.close()
+
+        assert scheduler.stats.dropped_frames >= 5
+
+    async def test_cancel_discards_buffered_text(self) -> None:
+        """Cancelling stops the timer and drops text that was not written."""
+        scheduler = RenderScheduler(max_fps=100)
+        message = _RecordingMessage()
+
+        await scheduler.write((), message, "lost")  # type: ignore[arg-type]
+        scheduler.cancel()
+        await asyncio.sleep(0.05)
+        await scheduler.flush()
+
+        assert message.appends == []
+
+
 class TestBuildStreamConfig:
     """Tests for `_build_stream_config` metadata construction."""
 
@@ -1,5 +1,7 @@
 """Tests for ThreadSelectorScreen."""
 
+import asyncio
+from collections.abc import Callable
 from typing import Any, ClassVar
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -11,7 +13,7 @@ from textual.containers import Container, Vertical
 from textual.screen import ModalScreen
 from textual.widgets import Static
 
-from deepagents_cli.app import DeepAgentsApp
+from deepagents_cli.app import DeepAgentsApp, _history_page_start
 from deepagents_cli.sessions import ThreadInfo
 from deepagents_cli.widgets.thread_selector import ThreadSelectorScreen
 
@@ -1221,3 +1223,120 @@ class TestConvertMessagesToData:
         """Empty input should return empty output."""
         result = DeepAgentsApp._convert_messages_to_data([])
         assert result == []
+
+
+class TestLazyHistoryConversion:
+    """Tests for paged conversion of resumed thread history."""
+
+    @staticmethod
+    def _history(turns: int) -> list[Any]:
+        """Build a history of turns with a parallel tool call each."""
+        from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+        messages: list[Any] = []
+        for i in range(turns):
+            messages.extend(
+                [
+                    HumanMessage(content=f"question {i}"),
+                    AIMessage(
+                        content=f"answer {i}",
+                        tool_calls=[
+                            {"id": f"a-{i}", "name": "ls", "args": {}},
+                            {"id": f"b-{i}", "name": "grep", "args": {}},
+                        ],
+                    ),
+                    ToolMessage(content=f"ls {i}", tool_call_id=f"a-{i}"),
+                    ToolMessage(content=f"grep {i}", tool_call_id=f"b-{i}"),
+                ]
+            )
+        return messages
+
+    @staticmethod
+    def _summary(data: list[Any]) -> list[tuple[Any, ...]]:
+        return [
+            (d.type, d.content, d.tool_name, d.tool_status, d.tool_output) for d in data
+        ]
+
+    def test_pages_match_full_conversion(self) -> None:
+        """Converting page by page yields the same data as converting at once."""
+        messages = self._history(30)
+        expected = self._summary(DeepAgentsApp._convert_messages_to_data(messages))
+
+        for size in (1, 5, 7, 13):
+            data: list[Any] = []
+            end = len(messages)
+            while end > 0:
+                end, page = DeepAgentsApp._convert_history_tail(messages, end, size)
+                assert len(page) >= size or end == 0
+                data = page + data
+            assert self._summary(data) == expected
+
+    def test_tail_does_not_split_tool_calls(self) -> None:
+        """The tail starts before the tool call its tool results answer."""
+        from langchain_core.messages import AIMessage, ToolMessage
+
+        messages = self._history(5)
+        start, data = DeepAgentsApp._convert_history_tail(messages, len(messages), 2)
+
+        assert not isinstance(messages[start], ToolMessage)
+        assert isinstance(messages[start], AIMessage)
+        assert [d.tool_output for d in data if d.tool_name] == ["ls 4", "grep 4"]
+
+    def test_orphan_tool_result_does_not_extend_tail(self) -> None:
+        """A tool result whose tool call is missing does not pull in all history."""
+        from langchain_core.messages import ToolMessage
+
+        messages = self._history(5)
+        messages.insert(12, ToolMessage(content="orphan", tool_call_id="gone"))
+        assert _history_page_start(messages, len(messages), 9) == 12
+
+    @pytest.mark.asyncio
+    async def test_older_history_loaded_on_demand(self) -> None:
+        """Only the tail is converted on resume; older pages load on demand."""
+        app = DeepAgentsApp()
+        store = app._message_store
+        messages = self._history(100)
+
+        start, tail = DeepAgentsApp._convert_history_tail(
+            messages, len(messages), store.WINDOW_SIZE
+        )
+        store.bulk_load(tail)
+        app._unconverted_history = messages[:start]
+        store.set_unloaded_above(start > 0)
+        assert 0 < len(tail) < 100
+        assert store.has_messages_above
+
+        while store.has_unloaded_above:
+            await app._load_older_history()
+
+        assert app._unconverted_history == []
+        expected = DeepAgentsApp._convert_messages_to_data(messages)
+        assert self._summary(store.get_all_messages()) == self._summary(expected)
+        assert store.get_visible_messages() == tail[-store.WINDOW_SIZE :]
+        first = store.get_message_at_index(0)
+        assert store.get_message(first.id) is first
+
+    @pytest.mark.asyncio
+    async def test_older_history_discarded_after_clear(self) -> None:
+        """A page converted for a conversation that was since cleared is dropped."""
+        from deepagents_cli.widgets.message_store import MessageData, MessageType
+
+        app = DeepAgentsApp()
+        store = app._message_store
+        store.append(MessageData(type=MessageType.USER, content="old"))
+        app._unconverted_history = self._history(20)
+        store.set_unloaded_above(True)
+        to_thread = asyncio.to_thread
+
+        async def clear_while_converting(
+            func: Callable[..., tuple[int, list[Any]]], *args: object
+        ) -> tuple[int, list[Any]]:
+            store.clear()
+            store.append(MessageData(type=MessageType.USER, content="new"))
+            return await to_thread(func, *args)
+
+        with patch("asyncio.to_thread", side_effect=clear_while_converting):
+            await app._load_older_history()
+
+        assert [m.content for m in store.get_all_messages()] == ["new"]
+        assert app._unconverted_history == []
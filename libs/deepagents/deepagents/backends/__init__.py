@@ -1,5 +1,7 @@
 """Memory backends for pluggable file storage."""
 
+from deepagents.backends.blobs import BlobStore, DirectoryBlobStore, SqliteBlobStore, StoreBlobStore, blob_refcounts
+from deepagents.backends.cache import FileContentCache
 from deepagents.backends.composite import CompositeBackend
 from deepagents.backends.filesystem import FilesystemBackend
 from deepagents.backends.local_shell import DEFAULT_EXECUTE_TIMEOUT, LocalShellBackend
@@ -15,10 +17,16 @@ __all__ = [
     "DEFAULT_EXECUTE_TIMEOUT",
     "BackendContext",
     "BackendProtocol",
+    "BlobStore",
     "CompositeBackend",
+    "DirectoryBlobStore",
+    "FileContentCache",
     "FilesystemBackend",
     "LocalShellBackend",
     "NamespaceFactory",
+    "SqliteBlobStore",
     "StateBackend",
     "StoreBackend",
+    "StoreBlobStore",
+    "blob_refcounts",
 ]
@@ -0,0 +1,140 @@
+"""Atomic file replacement shared by the backends that write to the local disk."""
+
+import contextlib
+import errno
+import os
+import secrets
+import sys
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, Literal, Self
+
+FsyncPolicy = Literal["none", "file", "full"]
+
+# Buffer size of the temp file written by `AtomicFileWriter`
+_WRITE_BUFFER_SIZE = 1 << 20
+# Characters encoded per write, so large text is never encoded in one full copy
+_ENCODE_CHUNK_CHARS = 1 << 20
+# Only Linux supports `sendfile` between regular files (macOS requires a socket)
+_SENDFILE_TO_FILES = sys.platform.startswith("linux")
+
+
+def _kernel_copy(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    """Copy bytes between files without passing them through user space.
+
+    Any error of the kernel copy is treated as unsupported: the caller copies through
+    user space instead, which reports errors that are not specific to the kernel copy.
+
+    Returns:
+        Number of bytes copied, `0` if neither `os.copy_file_range` nor `os.sendfile`
+        supports these files.
+    """
+    copy_file_range = getattr(os, "copy_file_range", None)
+    sendfile = getattr(os, "sendfile", None) if _SENDFILE_TO_FILES else None
+    attempts = []
+    if copy_file_range is not None:
+        attempts.append(lambda: copy_file_range(src_fd, dst_fd, count, offset))
+    if sendfile is not None:
+        attempts.append(lambda: sendfile(dst_fd, src_fd, offset, count))
+    for attempt in attempts:
+        try:
+            return attempt()
+        except OSError:
+            continue
+    return 0
+
+
+def _copy_range(src_fd: int, dst_fd: int, offset: int, count: int) -> None:
+    """Append `count` bytes of `src_fd` starting at `offset` to `dst_fd`.
+
+    Uses `os.copy_file_range` or `os.sendfile` so the data stays in the kernel (and may
+    share blocks on copy-on-write filesystems), falling back to `os.pread`/`os.write`.
+
+    Raises:
+        OSError: If `src_fd` ends before `count` bytes were copied.
+    """
+    while count > 0:
+        copied = _kernel_copy(src_fd, dst_fd, offset, count)
+        if copied == 0:
+            chunk = os.pread(src_fd, min(count, _WRITE_BUFFER_SIZE), offset)
+            if not chunk:
+                msg = "Unexpected end of file while copying"
+                raise OSError(errno.EIO, msg)
+            copied = os.write(dst_fd, chunk)
+        offset += copied
+        count -= copied
+
+
+class AtomicFileWriter:
+    """Write the new content of a file to a sibling temp file and rename it over the file.
+
+    Readers see either the old or the new file, never a partial one, and a crash
+    leaves the original file intact. The replaced file's permission bits are kept;
+    new files get `0o644` minus the umask. Symlinks are not written through.
+
+    Args:
+        target: Path of the file to create or replace.
+        fsync: `'none'` only renames, which is atomic for concurrent readers and
+            process crashes. `'file'` also flushes the content to disk before the
+            rename, and `'full'` additionally syncs the directory so the rename itself
+            survives power loss.
+    """
+
+    # Temp file holding the new content, opened by `__enter__`
+    _file: BinaryIO
+
+    def __init__(self, target: Path, *, fsync: FsyncPolicy = "none") -> None:
+        self.target = target
+        self.fsync = fsync
+        self._temp = target.with_name(f".{target.name}.{secrets.token_hex(6)}.tmp")
+
+    def __enter__(self) -> Self:
+        if self.target.is_symlink():
+            raise OSError(errno.ELOOP, "Refusing to replace a symbolic link", str(self.target))
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0)
+        fd = os.open(self._temp, flags, 0o644)
+        self._file = os.fdopen(fd, "wb", buffering=_WRITE_BUFFER_SIZE)
+        return self
+
+    def write(self, data: bytes) -> None:
+        """Append bytes to the new content."""
+        self._file.write(data)
+
+    def write_text(self, text: str) -> None:
+        """Append text to the new content, encoded as UTF-8 in chunks."""
+        for start in range(0, len(text), _ENCODE_CHUNK_CHARS):
+            self.write(text[start : start + _ENCODE_CHUNK_CHARS].encode("utf-8"))
+
+    def copy_from(self, src_fd: int, offset: int, count: int) -> None:
+        """Append `count` unchanged bytes of another file starting at `offset`."""
+        self._file.flush()
+        _copy_range(src_fd, self._file.fileno(), offset, count)
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None) -> None:
+        file = self._file
+        try:
+            try:
+                if exc_type is None:
+                    file.flush()
+                    if self.fsync != "none":
+                        os.fsync(file.fileno())
+            finally:
+                file.close()
+            if exc_type is None:
+                self._commit()
+        except BaseException:
+            self._temp.unlink(missing_ok=True)
+            raise
+        if exc_type is not None:
+            self._temp.unlink(missing_ok=True)
+
+    def _commit(self) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            self._temp.chmod(self.target.stat().st_mode & 0o7777)
+        self._temp.replace(self.target)
+        if self.fsync == "full":
+            dir_fd = os.open(self.target.parent, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
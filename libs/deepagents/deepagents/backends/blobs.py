@@ -0,0 +1,362 @@
+"""Content-addressed storage for file contents kept out of agent state.
+
+`StateBackend(runtime, blob_store=...)` keeps only a content hash and metadata for
+each file in the `files` state channel and stores the content itself in a
+`BlobStore`. Checkpoints then no longer re-serialize every file body on every
+step, only the small references of files that changed.
+
+Blobs are immutable and keyed by the SHA-256 of their content, so identical files
+share one blob and cached copies never go stale. A blob is not deleted when its
+file changes, because earlier checkpoints of the thread still reference it.
+Instead, count the references of the states that must stay readable and collect
+the rest:
+
+```python
+blob_store = SqliteBlobStore("blobs.db")
+agent = create_deep_agent(backend=lambda rt: StateBackend(rt, blob_store=blob_store))
+
+...
+
+states = [agent.get_state(config).values for config in live_thread_configs]
+blob_store.collect(blob_refcounts(states))
+```
+"""
+
+from __future__ import annotations
+
+import abc
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from deepagents.backends._atomic import AtomicFileWriter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+    from langgraph.store.base import BaseStore
+
+    from deepagents.backends.types import FileData
+
+DEFAULT_CACHE_CHARS = 32 << 20
+DEFAULT_GRACE_SECONDS = 3600.0
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def blob_refcounts(states: Iterable[Mapping[str, Any]]) -> Counter[str]:
+    """Count the references to each blob from the files of agent states.
+
+    Args:
+        states: Agent states (or any mappings with a `files` key), e.g. the latest
+            checkpoint of every thread that must stay resumable.
+
+    Returns:
+        Number of files referencing each blob digest.
+    """
+    refcounts: Counter[str] = Counter()
+    for state in states:
+        for file_data in (state.get("files") or {}).values():
+            digest = file_data.get("content_hash") if file_data else None
+            if digest:
+                refcounts[digest] += 1
+    return refcounts
+
+
+class BlobStore(abc.ABC):
+    """Base class of content-addressed blob stores for file contents.
+
+    Subclasses implement raw byte storage. Content read through the store is cached
+    per digest, since a digest always names the same content.
+    """
+
+    def __init__(self, *, cache_chars: int = DEFAULT_CACHE_CHARS) -> None:
+        """Initialize the store.
+
+        Args:
+            cache_chars: Maximum total size of the file contents kept in memory, in
+                characters.
+        """
+        self.cache_chars = cache_chars
+        self._cache: OrderedDict[str, list[str]] = OrderedDict()
+        self._cached_chars = 0
+        self._cache_lock = threading.Lock()
+
+    @staticmethod
+    def digest(content: str) -> str:
+        """Return the digest naming `content`."""
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def put(self, content: str) -> str:
+        """Store `content` unless it is already stored, refreshing its storage time.
+
+        Refreshing keeps a blob that was unreferenced, and is referenced again by a state
+        that is not checkpointed yet, within the grace period of `collect`.
+
+        Returns:
+            The digest of `content`.
+        """
+        digest = self.digest(content)
+        self._write(digest, content.encode("utf-8"))
+        self._remember(digest, content.split("\n"))
+        return digest
+
+    def get_lines(self, digest: str) -> list[str] | None:
+        """Return the lines of the content stored under `digest`, `None` if it is missing.
+
+        The returned list is shared with the cache and must not be mutated.
+        """
+        with self._cache_lock:
+            lines = self._cache.get(digest)
+            if lines is not None:
+                self._cache.move_to_end(digest)
+                return lines
+        data = self._read(digest) if _DIGEST_RE.match(digest) else None
+        if data is None:
+            return None
+        lines = data.decode("utf-8").split("\n")
+        self._remember(digest, lines)
+        return lines
+
+    def get(self, digest: str) -> str | None:
+        """Return the content stored under `digest`, `None` if it is missing."""
+        lines = self.get_lines(digest)
+        return None if lines is None else "\n".join(lines)
+
+    def collect(self, refcounts: Mapping[str, int], *, grace_seconds: float = DEFAULT_GRACE_SECONDS) -> int:
+        """Delete the blobs no state references.
+
+        Args:
+            refcounts: References per digest, see `blob_refcounts`. Blobs without a
+                positive count are deleted.
+            grace_seconds: Keep blobs stored more recently than this, which may belong to
+                a state that is not checkpointed yet.
+
+        Returns:
+            Number of deleted blobs.
+        """
+        cutoff = time.time() - grace_seconds
+        garbage = [digest for digest, stored_at in self._list() if refcounts.get(digest, 0) <= 0 and stored_at <= cutoff]
+        if garbage:
+            self._delete(garbage)
+            with self._cache_lock:
+                for digest in garbage:
+                    lines = self._cache.pop(digest, None)
+                    if lines is not None:
+                        self._cached_chars -= sum(map(len, lines))
+        return len(garbage)
+
+    def _remember(self, digest: str, lines: list[str]) -> None:
+        size = sum(map(len, lines))
+        if size > self.cache_chars // 4:
+            return
+        with self._cache_lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                return
+            self._cache[digest] = lines
+            self._cached_chars += size
+            while self._cached_chars > self.cache_chars:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_chars -= sum(map(len, evicted))
+
+    @abc.abstractmethod
+    def _read(self, digest: str) -> bytes | None:
+        """Return the stored bytes of `digest`, `None` if missing."""
+
+    @abc.abstractmethod
+    def _write(self, digest: str, data: bytes) -> None:
+        """Store `data` under `digest`, only refreshing the storage time of an existing blob."""
+
+    @abc.abstractmethod
+    def _delete(self, digests: list[str]) -> None:
+        """Delete the blobs of `digests`, ignoring missing ones."""
+
+    @abc.abstractmethod
+    def _list(self) -> Iterator[tuple[str, float]]:
+        """Yield the digest and storage time (epoch seconds) of every blob."""
+
+
+class DirectoryBlobStore(BlobStore):
+    """Blob store keeping each blob in a file of a local directory.
+
+    Blobs are spread over subdirectories named after the first two characters of
+    their digest, and written atomically.
+    """
+
+    def __init__(self, root_dir: str | Path, *, cache_chars: int = DEFAULT_CACHE_CHARS) -> None:
+        """Initialize the store.
+
+        Args:
+            root_dir: Directory holding the blobs, created if missing.
+            cache_chars: Maximum total size of the file contents kept in memory, in
+                characters.
+        """
+        super().__init__(cache_chars=cache_chars)
+        self.root_dir = Path(root_dir)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        return self.root_dir / digest[:2] / digest
+
+    def _read(self, digest: str) -> bytes | None:
+        try:
+            return self._path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, digest: str, data: bytes) -> None:
+        path = self._path(digest)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        else:
+            return
+        path.parent.mkdir(exist_ok=True)
+        with AtomicFileWriter(path) as writer:
+            writer.write(data)
+
+    def _delete(self, digests: list[str]) -> None:
+        for digest in digests:
+            self._path(digest).unlink(missing_ok=True)
+
+    def _list(self) -> Iterator[tuple[str, float]]:
+        with os.scandir(self.root_dir) as shards:
+            for shard in shards:
+                if not shard.is_dir(follow_symlinks=False):
+                    continue
+                with os.scandir(shard.path) as entries:
+                    for entry in entries:
+                        if _DIGEST_RE.match(entry.name):
+                            yield entry.name, entry.stat().st_mtime
+
+
+class SqliteBlobStore(BlobStore):
+    """Blob store keeping blobs in a table of a SQLite database."""
+
+    def __init__(self, path: str | Path, *, table: str = "blobs", cache_chars: int = DEFAULT_CACHE_CHARS) -> None:
+        """Initialize the store, creating its table if needed.
+
+        Args:
+            path: Database file, or `':memory:'`.
+            table: Name of the table holding the blobs.
+            cache_chars: Maximum total size of the file contents kept in memory, in
+                characters.
+
+        Raises:
+            ValueError: If `table` is not a valid SQL identifier.
+        """
+        if not _IDENTIFIER_RE.match(table):
+            msg = f"Invalid table name: {table!r}"
+            raise ValueError(msg)
+        super().__init__(cache_chars=cache_chars)
+        self.table = table
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (digest TEXT PRIMARY KEY, content BLOB NOT NULL, stored_at REAL NOT NULL)")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _read(self, digest: str) -> bytes | None:
+        with self._lock:
+            row = self._conn.execute(f"SELECT content FROM {self.table} WHERE digest = ?", (digest,)).fetchone()  # noqa: S608  # Validated identifier
+        return None if row is None else bytes(row[0])
+
+    def _write(self, digest: str, data: bytes) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO {self.table} (digest, content, stored_at) VALUES (?, ?, ?) "  # noqa: S608  # Validated identifier
+                "ON CONFLICT (digest) DO UPDATE SET stored_at = excluded.stored_at",
+                (digest, data, time.time()),
+            )
+
+    def _delete(self, digests: list[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(f"DELETE FROM {self.table} WHERE digest = ?", [(digest,) for digest in digests])  # noqa: S608  # Validated identifier
+
+    def _list(self) -> Iterator[tuple[str, float]]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT digest, stored_at FROM {self.table}").fetchall()  # noqa: S608  # Validated identifier
+        yield from rows
+
+
+class StoreBlobStore(BlobStore):
+    """Blob store keeping blobs as items of a LangGraph `BaseStore` namespace."""
+
+    def __init__(
+        self,
+        store: BaseStore,
+        namespace: tuple[str, ...] = ("deepagents", "blobs"),
+        *,
+        cache_chars: int = DEFAULT_CACHE_CHARS,
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            store: The LangGraph store holding the blobs.
+            namespace: Namespace of the blob items.
+            cache_chars: Maximum total size of the file contents kept in memory, in
+                characters.
+        """
+        super().__init__(cache_chars=cache_chars)
+        self.store = store
+        self.namespace = namespace
+
+    def _read(self, digest: str) -> bytes | None:
+        item = self.store.get(self.namespace, digest)
+        return None if item is None else item.value["content"].encode("utf-8")
+
+    def _write(self, digest: str, data: bytes) -> None:
+        # Stores have no way to only touch an item, so re-put it to refresh `updated_at`
+        self.store.put(self.namespace, digest, {"content": data.decode("utf-8")}, index=False)
+
+    def _delete(self, digests: list[str]) -> None:
+        for digest in digests:
+            self.store.delete(self.namespace, digest)
+
+    def _list(self) -> Iterator[tuple[str, float]]:
+        page_size = 100
+        offset = 0
+        while True:
+            items = self.store.search(self.namespace, limit=page_size, offset=offset)
+            yield from ((item.key, item.updated_at.timestamp()) for item in items)
+            if len(items) < page_size:
+                return
+            offset += page_size
+
+
+def load_file_data(file_data: FileData, blob_store: BlobStore | None) -> FileData | None:
+    """Return `file_data` with its content, loading it from `blob_store` if externalized.
+
+    Returns:
+        The `FileData` with `content`, or `None` if its blob is missing.
+    """
+    if "content" in file_data:
+        return file_data
+    lines = blob_store.get_lines(file_data["content_hash"]) if blob_store is not None else None
+    if lines is None:
+        return None
+    return {"content": lines, "created_at": file_data["created_at"], "modified_at": file_data["modified_at"]}
+
+
+def externalize_file_data(file_data: FileData, blob_store: BlobStore) -> FileData:
+    """Store the content of `file_data` in `blob_store` and return a reference to it."""
+    content = "\n".join(file_data["content"])
+    return {
+        "content_hash": blob_store.put(content),
+        "size": len(content),
+        "created_at": file_data["created_at"],
+        "modified_at": file_data["modified_at"],
+    }
@@ -0,0 +1,419 @@
+"""Read-through cache of file contents shared by the tools of an agent turn.
+
+Within one turn an agent commonly reads a file, edits it, and reads it again, while
+consumers outside the agent (e.g. a diff preview in a UI) download the same file
+once more. `FileContentCache` keeps the text of recently read and written files per
+thread and per storage so those round trips are served from memory. Reads outside of a
+thread (no `thread_id`) are never cached.
+
+How long an entry stays valid depends on the backend that stores the file:
+
+- `FilesystemBackend` (also as a `CompositeBackend` route): entries carry the file's
+    modification time and size, and are revalidated with a `stat` call on every hit.
+    The version is taken before the file is downloaded, and files larger than the
+    cache accepts are not downloaded at all.
+- `StateBackend`: never cached, since files already live in the agent state.
+- Any other backend (sandboxes, `StoreBackend`): entries are unversioned and only
+    valid until the owner invalidates them, which `FilesystemMiddleware` does at the
+    start of every run and after any tool call that may change files behind its back.
+
+Files found too large or not UTF-8 text are remembered like entries without content, so
+later reads go straight to the backend instead of downloading them again.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from deepagents.backends.composite import CompositeBackend
+from deepagents.backends.filesystem import FilesystemBackend
+from deepagents.backends.state import StateBackend
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+    from deepagents.backends.protocol import BackendProtocol, FileDownloadResponse
+
+logger = logging.getLogger(__name__)
+
+# Version of a file stored by `FilesystemBackend`: modification time in ns and size
+_FileVersion = tuple[int, int]
+
+
+class _CurrentType:
+    """Type of `_CURRENT`, the marker for `put` to take the version of the file when it is called."""
+
+
+_CURRENT = _CurrentType()
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_ENTRY_CHARS = 1 << 20
+
+# Unique token per backend instance; unlike `id()`, never reused for a later instance
+_instance_tokens: weakref.WeakKeyDictionary[object, int] = weakref.WeakKeyDictionary()
+_instance_tokens_lock = threading.Lock()
+_next_token = itertools.count()
+
+
+def _route(backend: BackendProtocol, path: str) -> tuple[BackendProtocol, str]:
+    """Return the backend that stores `path` and the path within that backend."""
+    while isinstance(backend, CompositeBackend):
+        backend, path = backend._get_backend_and_key(path)
+    return backend, path
+
+
+def _storage_key(backend: BackendProtocol) -> Hashable | None:
+    """Identify the storage behind a (routed) backend, or `None` if it cannot be identified.
+
+    `FilesystemBackend`s are identified by their root, so instances a factory builds per
+    call share entries. Any other backend is identified by the instance itself, since
+    e.g. two `StoreBackend`s may see different namespaces.
+    """
+    if isinstance(backend, FilesystemBackend):
+        return ("filesystem", str(backend.cwd), backend.virtual_mode)
+    with _instance_tokens_lock:
+        try:
+            token = _instance_tokens.get(backend)
+            if token is None:
+                token = _instance_tokens[backend] = next(_next_token)
+        except TypeError:
+            # Backend does not support weak references
+            return None
+    return ("instance", token)
+
+
+def storage_scope(backend: BackendProtocol, path: str) -> tuple[Hashable | None, str] | None:
+    """Identify the storage that holds `path`, independently of the backend instance.
+
+    Caches shared by the backends a factory builds per thread use this to tell which
+    files those backends see alike.
+
+    Args:
+        backend: The backend to resolve `path` against, routed through any
+            `CompositeBackend`.
+        path: Path of the file or directory.
+
+    Returns:
+        `None` if `path` lives in agent state (`StateBackend`) and so differs per
+            thread. Otherwise the storage and the path within it, where the storage
+            identifies a `FilesystemBackend` by its root and is `None` for backends whose
+            storage cannot be told apart from the instance.
+    """
+    target, key = _route(backend, path)
+    if isinstance(target, StateBackend):
+        return None
+    if isinstance(target, FilesystemBackend):
+        return _storage_key(target), key
+    return None, path
+
+
+class _Missing(Exception):  # noqa: N818
+    """The file no longer exists or cannot be checked."""
+
+
+def _version(backend: BackendProtocol, path: str) -> _FileVersion | None:
+    """Return the current version of `path`, or `None` if the backend has no versions.
+
+    Raises:
+        _Missing: If the file of a versioned backend cannot be checked.
+    """
+    target, key = _route(backend, path)
+    if not isinstance(target, FilesystemBackend):
+        return None
+    try:
+        stat = target._resolve_path(key).stat()
+    except (OSError, ValueError) as e:
+        raise _Missing from e
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileContentCache:
+    """Bounded per-thread cache of file contents, validated against the backend.
+
+    Entries are keyed by thread id, the storage the file lives in and its path, and
+    evicted least recently used first. Files larger than `max_entry_chars` and reads
+    without a thread id are not cached; files that turn out not to be cacheable are
+    remembered so they are not downloaded again. Use `for_backend` to get the
+    cache shared by every consumer of a backend.
+
+    Example:
+        ```python
+        cache = FileContentCache.for_backend(backend)
+        content = cache.read(backend, "/src/app.py", thread_id=thread_id)
+        if content is None:
+            ...  # Not cacheable or not readable, fall back to the backend
+        ```
+    """
+
+    _registry: weakref.WeakKeyDictionary[object, FileContentCache] = weakref.WeakKeyDictionary()
+    _registry_lock = threading.Lock()
+
+    def __init__(self, *, max_entries: int = DEFAULT_MAX_ENTRIES, max_entry_chars: int = DEFAULT_MAX_ENTRY_CHARS) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of files kept across all threads.
+            max_entry_chars: Maximum size of a cached file, in characters.
+        """
+        self.max_entries = max_entries
+        self.max_entry_chars = max_entry_chars
+        # Content `None` marks a file that is too large or not UTF-8 text
+        self._entries: OrderedDict[tuple[str, Hashable, str], tuple[str | None, _FileVersion | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_backend(cls, owner: object) -> FileContentCache:
+        """Return the cache shared by all consumers of a backend.
+
+        Args:
+            owner: The backend instance, or the backend factory a middleware was
+                configured with.
+
+        Returns:
+            The cache registered for `owner`, created on first use. Owners that do not
+            support weak references get a new, unshared cache.
+        """
+        with cls._registry_lock:
+            try:
+                cache = cls._registry.get(owner)
+                if cache is None:
+                    cache = cls._registry[owner] = cls()
+            except TypeError:
+                return cls()
+        return cache
+
+    @staticmethod
+    def cacheable(backend: BackendProtocol, path: str) -> bool:
+        """Whether files at `path` are cached at all."""
+        target = _route(backend, path)[0]
+        return not isinstance(target, StateBackend) and _storage_key(target) is not None
+
+    @staticmethod
+    def _key(backend: BackendProtocol, path: str, thread_id: str | None) -> tuple[str, Hashable, str] | None:
+        if thread_id is None:
+            return None
+        target = _route(backend, path)[0]
+        if isinstance(target, StateBackend):
+            return None
+        storage = _storage_key(target)
+        return None if storage is None else (thread_id, storage, path)
+
+    def has_entries(self, thread_id: str | None) -> bool:
+        """Whether any file is cached for `thread_id`."""
+        with self._lock:
+            return any(key[0] == thread_id and entry[0] is not None for key, entry in self._entries.items())
+
+    def get(self, backend: BackendProtocol, path: str, *, thread_id: str | None) -> str | None:
+        """Return the cached content of `path` if it is still current.
+
+        Args:
+            backend: The backend the file was read from.
+            path: Absolute file path.
+            thread_id: Thread the entry belongs to.
+
+        Returns:
+            The file content, or `None` on a miss.
+        """
+        key = self._key(backend, path, thread_id)
+        if key is None:
+            return None
+        entry = self._lookup(key, backend, path)
+        return None if entry is None else entry[0]
+
+    def _lookup(self, key: tuple[str, Hashable, str], backend: BackendProtocol, path: str) -> tuple[str | None, _FileVersion | None] | None:
+        """Return the current entry stored under `key`, dropping it if the file changed."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[1] is not None:
+            try:
+                current = _version(backend, path)
+            except _Missing:
+                current = None
+            if current != entry[1]:
+                entry = None
+                with self._lock:
+                    self._entries.pop(key, None)
+        if entry is None:
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return entry
+
+    def prepare_download(self, backend: BackendProtocol, path: str, *, thread_id: str | None) -> tuple[bool, _FileVersion | None]:
+        """Check whether downloading `path` into the cache is worthwhile, before a miss is downloaded.
+
+        Args:
+            backend: The backend that stores the file.
+            path: Absolute file path.
+            thread_id: Thread the entry belongs to.
+
+        Returns:
+            Whether to download the file, and its version to pass to `put` once it is
+            downloaded. The file is not downloaded if it is not cacheable, is known to be
+            too large or not UTF-8 text, or is larger than `max_entry_chars` bytes.
+        """
+        key = self._key(backend, path, thread_id)
+        if key is None:
+            return False, None
+        entry = self._lookup(key, backend, path)
+        if entry is not None:
+            # A cached file is served by `get`; only marked files end up here
+            return entry[0] is not None, entry[1]
+        try:
+            version = _version(backend, path)
+        except _Missing:
+            return False, None
+        if version is not None and version[1] > self.max_entry_chars:
+            self._store(key, None, version)
+            return False, None
+        return True, version
+
+    def put(
+        self,
+        backend: BackendProtocol,
+        path: str,
+        content: str,
+        *,
+        thread_id: str | None,
+        version: _FileVersion | None | _CurrentType = _CURRENT,
+    ) -> None:
+        """Store the current content of `path`.
+
+        Call this right after writing the file, so the recorded version matches
+        `content`. After a download, pass the version `prepare_download` returned
+        instead, so a change made while downloading is not recorded as current.
+
+        Args:
+            backend: The backend that stores the file.
+            path: Absolute file path.
+            content: The file content.
+            thread_id: Thread the entry belongs to.
+            version: Version of the file `content` was read at. Taken from the backend
+                if not given.
+        """
+        key = self._key(backend, path, thread_id)
+        if key is None:
+            return
+        if isinstance(version, _CurrentType):
+            try:
+                version = _version(backend, path)
+            except _Missing:
+                self.invalidate(thread_id, path)
+                return
+        self._store(key, content if len(content) <= self.max_entry_chars else None, version)
+
+    def _store(self, key: tuple[str, Hashable, str], content: str | None, version: _FileVersion | None) -> None:
+        with self._lock:
+            self._entries[key] = (content, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def put_download(
+        self, backend: BackendProtocol, path: str, response: FileDownloadResponse | None, *, thread_id: str | None, version: _FileVersion | None
+    ) -> str | None:
+        """Cache a downloaded file, or remember that it is not UTF-8 text.
+
+        Args:
+            backend: The backend that stores the file.
+            path: Absolute file path.
+            response: The download of `path`.
+            thread_id: Thread the entry belongs to.
+            version: Version `prepare_download` returned before the download.
+
+        Returns:
+            The file content, or `None` if the download failed or is not UTF-8 text.
+        """
+        if response is None or response.content is None or response.error is not None:
+            return None
+        try:
+            content = response.content.decode("utf-8")
+        except UnicodeDecodeError:
+            key = self._key(backend, path, thread_id)
+            if key is not None:
+                self._store(key, None, version)
+            return None
+        self.put(backend, path, content, thread_id=thread_id, version=version)
+        return content
+
+    def invalidate(self, thread_id: str | None, path: str | None = None, *, unversioned_only: bool = False) -> None:
+        """Drop cached files of a thread.
+
+        Args:
+            thread_id: Thread whose entries are dropped.
+            path: Only drop this file, from whichever storage it was cached for. Drops
+                all files of the thread if `None`.
+            unversioned_only: Keep entries that are revalidated against their backend
+                on every hit.
+        """
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if key[0] == thread_id and (path is None or key[2] == path) and not (unversioned_only and entry[1] is not None)
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all cached files."""
+        with self._lock:
+            self._entries.clear()
+
+    def read(self, backend: BackendProtocol, path: str, *, thread_id: str | None) -> str | None:
+        """Return the content of `path`, downloading and caching it on a miss.
+
+        Args:
+            backend: The backend that stores the file.
+            path: Absolute file path.
+            thread_id: Thread the entry belongs to.
+
+        Returns:
+            The file content, or `None` if the file is not cacheable, `thread_id` is
+            `None`, or the file is too large or could not be downloaded as UTF-8 text.
+            Callers then read it through the backend to get its own result or error
+            message.
+        """
+        content = self.get(backend, path, thread_id=thread_id)
+        if content is not None:
+            return content
+        download, version = self.prepare_download(backend, path, thread_id=thread_id)
+        if not download:
+            return None
+        try:
+            responses = backend.download_files([path])
+        except Exception:  # noqa: BLE001
+            logger.debug("Could not download %s for the file content cache", path, exc_info=True)
+            return None
+        return self.put_download(backend, path, responses[0] if responses else None, thread_id=thread_id, version=version)
+
+    async def aread(self, backend: BackendProtocol, path: str, *, thread_id: str | None) -> str | None:
+        """Return the content of `path`, downloading and caching it on a miss (async version).
+
+        Args:
+            backend: The backend that stores the file.
+            path: Absolute file path.
+            thread_id: Thread the entry belongs to.
+
+        Returns:
+            The file content, or `None` if the file is not cacheable, `thread_id` is
+            `None`, or the file is too large or could not be downloaded as UTF-8 text.
+        """
+        content = self.get(backend, path, thread_id=thread_id)
+        if content is not None:
+            return content
+        download, version = self.prepare_download(backend, path, thread_id=thread_id)
+        if not download:
+            return None
+        try:
+            responses = await backend.adownload_files([path])
+        except Exception:  # noqa: BLE001
+            logger.debug("Could not download %s for the file content cache", path, exc_info=True)
+            return None
+        return self.put_download(backend, path, responses[0] if responses else None, thread_id=thread_id, version=version)
@@ -31,6 +31,7 @@ from deepagents.backends.protocol import (
     GrepMatch,
     SandboxBackendProtocol,
     WriteResult,
+    edit_accepts_line_range,
     execute_accepts_timeout,
 )
 from deepagents.backends.state import StateBackend
@@ -416,6 +417,8 @@ class CompositeBackend(BackendProtocol):
         old_string: str,
         new_string: str,
         replace_all: bool = False,  # noqa: FBT001, FBT002
+        *,
+        line_range: tuple[int, int] | None = None,
     ) -> EditResult:
         """Edit a file, routing to appropriate backend.
 
@@ -424,12 +427,17 @@ class CompositeBackend(BackendProtocol):
             old_string: String to find and replace.
             new_string: Replacement string.
             replace_all: If True, replace all occurrences.
+            line_range: Optional `(start, end)` lines where `old_string` is expected,
+                passed on to backends that support the hint.
 
         Returns:
             Success message or Command object, or error message on failure.
         """
         backend, stripped_key = self._get_backend_and_key(file_path)
-        res = backend.edit(stripped_key, old_string, new_string, replace_all=replace_all)
+        if line_range is not None and edit_accepts_line_range(type(backend)):
+            res = backend.edit(stripped_key, old_string, new_string, replace_all=replace_all, line_range=line_range)
+        else:
+            res = backend.edit(stripped_key, old_string, new_string, replace_all=replace_all)
         if res.files_update:
             try:
                 runtime = getattr(self.default, "runtime", None)
@@ -448,10 +456,15 @@ class CompositeBackend(BackendProtocol):
         old_string: str,
         new_string: str,
         replace_all: bool = False,  # noqa: FBT001, FBT002
+        *,
+        line_range: tuple[int, int] | None = None,
     ) -> EditResult:
         """Async version of edit."""
         backend, stripped_key = self._get_backend_and_key(file_path)
-        res = await backend.aedit(stripped_key, old_string, new_string, replace_all=replace_all)
+        if line_range is not None and edit_accepts_line_range(type(backend)):
+            res = await backend.aedit(stripped_key, old_string, new_string, replace_all=replace_all, line_range=line_range)
+        else:
+            res = await backend.aedit(stripped_key, old_string, new_string, replace_all=replace_all)
         if res.files_update:
             try:
                 runtime = getattr(self.default, "runtime", None)
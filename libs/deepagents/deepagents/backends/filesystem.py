@@ -1,16 +1,21 @@
 """`FilesystemBackend`: Read and write files directly from the filesystem."""
 
+import contextlib
 import json
 import logging
 import os
 import re
+import stat
 import subprocess
 import warnings
+from collections.abc import Iterable, Iterator, Sequence
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 import wcmatch.glob as wcglob
 
+from deepagents.backends._atomic import AtomicFileWriter, FsyncPolicy
 from deepagents.backends.protocol import (
     BackendProtocol,
     EditResult,
@@ -28,6 +33,41 @@ from deepagents.backends.utils import (
 
 logger = logging.getLogger(__name__)
 
+_FSYNC_POLICIES = ("none", "file", "full")
+
+# Glob semantics of `Path.glob`: `*` also matches names starting with a dot
+_GLOB_FLAGS = wcglob.GLOBSTAR | wcglob.DOTGLOB
+
+
+class _IgnoreRules:
+    """Gitignore-style rules matched against paths relative to the backend root.
+
+    Supports comments, `!` negation, directory-only patterns ending in `/`, patterns
+    anchored by a `/`, and `**`. Later rules override earlier ones.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._rules: list[tuple[Any, bool]] = []
+        for raw in patterns:
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            line = line.removeprefix("!").removeprefix("\\")
+            anchored = "/" in line.rstrip("/")
+            line = line.lstrip("/") if anchored else f"**/{line}"
+            self._rules.append((wcglob.compile(line, flags=_GLOB_FLAGS), negate))
+
+    def ignored(self, relative_path: str, *, is_dir: bool) -> bool:
+        """Whether the file or directory at `relative_path` is ignored."""
+        candidate = f"{relative_path}/" if is_dir else relative_path
+        ignored = False
+        for matcher, negate in self._rules:
+            # Only rules that would flip the current state need to be matched
+            if ignored == negate and matcher.match(candidate):
+                ignored = not negate
+        return ignored
+
 
 class FilesystemBackend(BackendProtocol):
     """Backend that reads and writes files directly from the filesystem.
@@ -82,6 +122,10 @@ class FilesystemBackend(BackendProtocol):
         root_dir: str | Path | None = None,
         virtual_mode: bool | None = None,  # noqa: FBT001
         max_file_size_mb: int = 10,
+        *,
+        fsync: FsyncPolicy = "none",
+        ignore_patterns: Sequence[str] | None = None,
+        respect_gitignore: bool = False,
     ) -> None:
         """Initialize filesystem backend.
 
@@ -115,7 +159,29 @@ class FilesystemBackend(BackendProtocol):
                 grep's Python fallback search.
 
                 Files exceeding this limit are skipped during search. Defaults to 10 MB.
+            fsync: Durability of writes, edits and uploads, which always go to a temp
+                file that is renamed over the target so readers never see a partial file.
+
+                - `'none'` (default): no `fsync`. Fastest, and safe against process
+                    crashes, but a power loss may lose recent writes.
+                - `'file'`: sync the file content before the rename.
+                - `'full'`: also sync the parent directory after the rename.
+
+            ignore_patterns: Gitignore-style patterns of files and directories hidden
+                from `ls_info` and `glob_info`, e.g. `["node_modules/", ".git/"]`.
+
+                Ignored directories are not descended into by `glob_info`. Paths
+                outside `root_dir` are never ignored.
+            respect_gitignore: Also ignore the paths listed in the `.gitignore` file
+                of `root_dir`, read once when the backend is created.
+                `ignore_patterns` take precedence over it.
+
+        Raises:
+            ValueError: If `fsync` is not a supported policy.
         """
+        if fsync not in _FSYNC_POLICIES:
+            msg = f"Unsupported fsync policy {fsync!r}, expected one of {', '.join(_FSYNC_POLICIES)}"
+            raise ValueError(msg)
         self.cwd = Path(root_dir).resolve() if root_dir else Path.cwd()
         if virtual_mode is None:
             warnings.warn(
@@ -131,6 +197,15 @@ class FilesystemBackend(BackendProtocol):
             virtual_mode = False
         self.virtual_mode = virtual_mode
         self.max_file_size_bytes = max_file_size_mb * 1024 * 1024
+        self.fsync: FsyncPolicy = fsync
+        patterns: list[str] = []
+        if respect_gitignore:
+            try:
+                patterns.extend((self.cwd / ".gitignore").read_text(encoding="utf-8").splitlines())
+            except (OSError, UnicodeDecodeError):
+                logger.debug("Could not read .gitignore in %s", self.cwd, exc_info=True)
+        patterns.extend(ignore_patterns or ())
+        self._ignore = _IgnoreRules(patterns)
 
     def _resolve_path(self, key: str) -> Path:
         """Resolve a file path with security checks.
@@ -185,7 +260,67 @@ class FilesystemBackend(BackendProtocol):
         """
         return "/" + path.resolve().relative_to(self.cwd).as_posix()
 
-    def ls_info(self, path: str) -> list[FileInfo]:  # noqa: C901, PLR0912, PLR0915  # Complex virtual_mode logic
+    def _root_prefix(self, path: Path) -> str | None:
+        """Return the path of `path` relative to the root as a prefix for its entries.
+
+        Returns:
+            `''` for the root itself, `'a/b/'` for a directory below it, or `None` for
+                paths outside the root.
+        """
+        try:
+            relative = path.relative_to(self.cwd).as_posix()
+        except ValueError:
+            return None
+        return "" if relative == "." else f"{relative}/"
+
+    def _entry_path(self, entry: os.DirEntry[str], root_relative: str | None) -> str | None:
+        """Return the path reported for a directory entry, `None` if it leaves the root in virtual mode."""
+        if not self.virtual_mode:
+            return entry.path
+        if root_relative is not None and not entry.is_symlink():
+            return f"/{root_relative}"
+        try:
+            return self._to_virtual_path(Path(entry.path))
+        except ValueError:
+            logger.debug("Skipping path outside root: %s", entry.path)
+        except OSError:
+            logger.warning("Could not resolve path: %s", entry.path, exc_info=True)
+        return None
+
+    def _entry_info(self, entry: os.DirEntry[str], root_relative: str | None, *, files_only: bool = False) -> FileInfo | None:
+        """Describe a directory entry, using its cached `stat` result.
+
+        Symlinks are followed. Only symlinks need resolving to compute the virtual path,
+        since every other entry lies below the already resolved directory being scanned.
+
+        Args:
+            entry: The entry, from `os.scandir`.
+            root_relative: Path of the entry relative to the root, `None` outside it.
+            files_only: Skip directories.
+
+        Returns:
+            The `FileInfo`, or `None` if the entry is skipped: broken symlinks, special
+                files, ignored paths, and symlinks leaving the root in virtual mode.
+        """
+        try:
+            st = entry.stat()
+        except OSError:
+            return None
+        is_dir = stat.S_ISDIR(st.st_mode)
+        if not (stat.S_ISREG(st.st_mode) or (is_dir and not files_only)):
+            return None
+        if root_relative is not None and self._ignore.ignored(root_relative, is_dir=is_dir):
+            return None
+
+        path = self._entry_path(entry, root_relative)
+        if path is None:
+            return None
+        modified_at = datetime.fromtimestamp(st.st_mtime).isoformat()  # noqa: DTZ006  # Local filesystem timestamps don't need timezone
+        if is_dir:
+            return {"path": f"{path}/", "is_dir": True, "size": 0, "modified_at": modified_at}
+        return {"path": path, "is_dir": False, "size": int(st.st_size), "modified_at": modified_at}
+
+    def ls_info(self, path: str) -> list[FileInfo]:
         """List files and directories in the specified directory (non-recursive).
 
         Args:
@@ -197,94 +332,15 @@ class FilesystemBackend(BackendProtocol):
                 `is_dir=True`.
         """
         dir_path = self._resolve_path(path)
-        if not dir_path.exists() or not dir_path.is_dir():
-            return []
+        root_prefix = self._root_prefix(dir_path)
 
         results: list[FileInfo] = []
-
-        # Convert cwd to string for comparison
-        cwd_str = str(self.cwd)
-        if not cwd_str.endswith("/"):
-            cwd_str += "/"
-
-        # List only direct children (non-recursive)
-        try:
-            for child_path in dir_path.iterdir():
-                try:
-                    is_file = child_path.is_file()
-                    is_dir = child_path.is_dir()
-                except OSError:
-                    continue
-
-                abs_path = str(child_path)
-
-                if not self.virtual_mode:
-                    # Non-virtual mode: use absolute paths
-                    if is_file:
-                        try:
-                            st = child_path.stat()
-                            results.append(
-                                {
-                                    "path": abs_path,
-                                    "is_dir": False,
-                                    "size": int(st.st_size),
-                                    "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),  # noqa: DTZ006  # Local filesystem timestamps don't need timezone
-                                }
-                            )
-                        except OSError:
-                            results.append({"path": abs_path, "is_dir": False})
-                    elif is_dir:
-                        try:
-                            st = child_path.stat()
-                            results.append(
-                                {
-                                    "path": abs_path + "/",
-                                    "is_dir": True,
-                                    "size": 0,
-                                    "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),  # noqa: DTZ006  # Local filesystem timestamps don't need timezone
-                                }
-                            )
-                        except OSError:
-                            results.append({"path": abs_path + "/", "is_dir": True})
-                else:
-                    # Virtual mode: strip cwd prefix using Path for cross-platform support
-                    try:
-                        virt_path = self._to_virtual_path(child_path)
-                    except ValueError:
-                        logger.debug("Skipping path outside root: %s", child_path)
-                        continue
-                    except OSError:
-                        logger.warning("Could not resolve path: %s", child_path, exc_info=True)
-                        continue
-
-                    if is_file:
-                        try:
-                            st = child_path.stat()
-                            results.append(
-                                {
-                                    "path": virt_path,
-                                    "is_dir": False,
-                                    "size": int(st.st_size),
-                                    "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),  # noqa: DTZ006  # Local filesystem timestamps don't need timezone
-                                }
-                            )
-                        except OSError:
-                            results.append({"path": virt_path, "is_dir": False})
-                    elif is_dir:
-                        try:
-                            st = child_path.stat()
-                            results.append(
-                                {
-                                    "path": virt_path + "/",
-                                    "is_dir": True,
-                                    "size": 0,
-                                    "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),  # noqa: DTZ006  # Local filesystem timestamps don't need timezone
-                                }
-                            )
-                        except OSError:
-                            results.append({"path": virt_path + "/", "is_dir": True})
-        except (OSError, PermissionError):
-            pass
+        # A missing path or a file raises on `scandir`, and an unreadable entry ends the listing
+        with contextlib.suppress(OSError), os.scandir(dir_path) as entries:
+            for entry in entries:
+                info = self._entry_info(entry, None if root_prefix is None else root_prefix + entry.name)
+                if info is not None:
+                    results.append(info)
 
         # Keep deterministic order by path
         results.sort(key=lambda x: x.get("path", ""))
@@ -357,13 +413,8 @@ class FilesystemBackend(BackendProtocol):
             # Create parent directories if needed
             resolved_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Prefer O_NOFOLLOW to avoid writing through symlinks
-            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
-            if hasattr(os, "O_NOFOLLOW"):
-                flags |= os.O_NOFOLLOW
-            fd = os.open(resolved_path, flags, 0o644)
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                f.write(content)
+            with AtomicFileWriter(resolved_path, fsync=self.fsync) as writer:
+                writer.write_text(content)
 
             return WriteResult(path=file_path, files_update=None)
         except (OSError, UnicodeEncodeError) as e:
@@ -375,6 +426,8 @@ class FilesystemBackend(BackendProtocol):
         old_string: str,
         new_string: str,
         replace_all: bool = False,  # noqa: FBT001, FBT002
+        *,
+        line_range: tuple[int, int] | None = None,
     ) -> EditResult:
         """Edit a file by replacing string occurrences.
 
@@ -384,6 +437,10 @@ class FilesystemBackend(BackendProtocol):
             new_string: The replacement text.
             replace_all: If `True`, replace all occurrences. If `False` (default),
                 replace only if exactly one occurrence exists.
+            line_range: Optional `(start, end)` lines where `old_string` is expected.
+                An occurrence unique in the file and within these lines is replaced
+                without decoding the rest of the file: unchanged bytes are copied by
+                the kernel.
 
         Returns:
             `EditResult` with path and occurrence count on success, or error
@@ -396,6 +453,9 @@ class FilesystemBackend(BackendProtocol):
             return EditResult(error=f"Error: File '{file_path}' not found")
 
         try:
+            if line_range is not None and not replace_all and self._splice_in_line_range(resolved_path, old_string, new_string, line_range):
+                return EditResult(path=file_path, files_update=None, occurrences=1)
+
             # Read securely
             fd = os.open(resolved_path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
             with os.fdopen(fd, "r", encoding="utf-8") as f:
@@ -408,18 +468,54 @@ class FilesystemBackend(BackendProtocol):
 
             new_content, occurrences = result
 
-            # Write securely
-            flags = os.O_WRONLY | os.O_TRUNC
-            if hasattr(os, "O_NOFOLLOW"):
-                flags |= os.O_NOFOLLOW
-            fd = os.open(resolved_path, flags)
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                f.write(new_content)
+            with AtomicFileWriter(resolved_path, fsync=self.fsync) as writer:
+                writer.write_text(new_content)
 
             return EditResult(path=file_path, files_update=None, occurrences=int(occurrences))
         except (OSError, UnicodeDecodeError, UnicodeEncodeError) as e:
             return EditResult(error=f"Error editing file '{file_path}': {e}")
 
+    def _splice_in_line_range(self, resolved_path: Path, old_string: str, new_string: str, line_range: tuple[int, int]) -> bool:
+        """Replace `old_string` if it occurs exactly once in the file, within a range of lines.
+
+        Only the lines in the range are decoded; the rest of the file is scanned as bytes
+        to check that the occurrence is unique. The new file is assembled from kernel-side
+        copies of the bytes before and after the occurrence around the replacement, then
+        renamed over the original.
+
+        Returns:
+            Whether the file was edited. `False` leaves the file untouched.
+        """
+        start_line, end_line = max(line_range[0], 0), line_range[1]
+        old_bytes = old_string.encode("utf-8")
+        new_bytes = new_string.encode("utf-8")
+        if start_line >= end_line or not old_bytes:
+            return False
+        fd = os.open(resolved_path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+        with os.fdopen(fd, "rb") as f:
+            offset = 0
+            for _ in range(start_line):
+                line = f.readline()
+                if not line:
+                    return False
+                offset += len(line)
+            region = b"".join(f.readline() for _ in range(end_line - start_line))
+            # UTF-8 is self-synchronizing, so byte matches are character matches in valid text
+            region.decode("utf-8")
+            if region.count(old_bytes) != 1:
+                return False
+            f.seek(0)
+            if f.read().count(old_bytes) != 1:
+                return False
+            position = offset + region.index(old_bytes)
+            tail = position + len(old_bytes)
+            size = os.fstat(fd).st_size
+            with AtomicFileWriter(resolved_path, fsync=self.fsync) as writer:
+                writer.copy_from(fd, 0, position)
+                writer.write(new_bytes)
+                writer.copy_from(fd, tail, size - tail)
+        return True
+
     def grep_raw(
         self,
         pattern: str,
@@ -572,7 +668,33 @@ class FilesystemBackend(BackendProtocol):
 
         return results
 
-    def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:  # noqa: C901, PLR0912  # Complex virtual_mode logic
+    def _walk_files(self, search_path: Path) -> Iterator[tuple[os.DirEntry[str], str, str | None]]:
+        """Yield every non-directory entry below `search_path` with one `scandir` per directory.
+
+        Like `Path.rglob`, symlinks to directories are yielded but not descended into.
+        Unreadable and ignored directories are skipped.
+
+        Yields:
+            The entry, its path relative to `search_path`, and its path relative to the
+                root (`None` outside the root).
+        """
+        root_prefix = self._root_prefix(search_path)
+        stack = [(str(search_path), "")]
+        while stack:
+            directory, prefix = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        relative = prefix + entry.name
+                        root_relative = None if root_prefix is None else root_prefix + relative
+                        if not entry.is_dir(follow_symlinks=False):
+                            yield entry, relative, root_relative
+                        elif root_relative is None or not self._ignore.ignored(root_relative, is_dir=True):
+                            stack.append((entry.path, f"{relative}/"))
+            except OSError:
+                continue
+
+    def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
         """Find files matching a glob pattern.
 
         Args:
@@ -591,62 +713,17 @@ class FilesystemBackend(BackendProtocol):
             raise ValueError(msg)
 
         search_path = self.cwd if path == "/" else self._resolve_path(path)
-        if not search_path.exists() or not search_path.is_dir():
+        # Patterns match like `Path.rglob`, where a trailing `**` only matches directories
+        if not pattern or Path(pattern).name == "**" or not search_path.is_dir():
             return []
+        matcher = wcglob.compile(f"**/{pattern}", flags=_GLOB_FLAGS)
 
         results: list[FileInfo] = []
-        try:
-            # Use recursive globbing to match files in subdirectories as tests expect
-            for matched_path in search_path.rglob(pattern):
-                try:
-                    is_file = matched_path.is_file()
-                except (PermissionError, OSError):
-                    continue
-                if not is_file:
-                    continue
-                if self.virtual_mode:
-                    try:
-                        matched_path.resolve().relative_to(self.cwd)
-                    except ValueError:
-                        continue
-                abs_path = str(matched_path)
-                if not self.virtual_mode:
-                    try:
-                        st = matched_path.stat()
-                        results.append(
-                            {
-                                "path": abs_path,
-                                "is_dir": False,
-                                "size": int(st.st_size),
-                                "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),  # noqa: DTZ006  # Local filesystem timestamps don't need timezone
-                            }
-                        )
-                    except OSError:
-                        results.append({"path": abs_path, "is_dir": False})
-                else:
-                    # Virtual mode: use Path for cross-platform support
-                    try:
-                        virt = self._to_virtual_path(matched_path)
-                    except ValueError:
-                        logger.debug("Skipping glob result outside root: %s", matched_path)
-                        continue
-                    except OSError:
-                        logger.warning("Could not resolve glob result path: %s", matched_path, exc_info=True)
-                        continue
-                    try:
-                        st = matched_path.stat()
-                        results.append(
-                            {
-                                "path": virt,
-                                "is_dir": False,
-                                "size": int(st.st_size),
-                                "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),  # noqa: DTZ006  # Local filesystem timestamps don't need timezone
-                            }
-                        )
-                    except OSError:
-                        results.append({"path": virt, "is_dir": False})
-        except (OSError, ValueError):
-            pass
+        for entry, relative, root_relative in self._walk_files(search_path):
+            if matcher.match(relative):
+                info = self._entry_info(entry, root_relative, files_only=True)
+                if info is not None:
+                    results.append(info)
 
         results.sort(key=lambda x: x.get("path", ""))
         return results
@@ -669,12 +746,8 @@ class FilesystemBackend(BackendProtocol):
                 # Create parent directories if needed
                 resolved_path.parent.mkdir(parents=True, exist_ok=True)
 
-                flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
-                if hasattr(os, "O_NOFOLLOW"):
-                    flags |= os.O_NOFOLLOW
-                fd = os.open(resolved_path, flags, 0o644)
-                with os.fdopen(fd, "wb") as f:
-                    f.write(content)
+                with AtomicFileWriter(resolved_path, fsync=self.fsync) as writer:
+                    writer.write(content)
 
                 responses.append(FileUploadResponse(path=path, error=None))
             except FileNotFoundError:
@@ -17,7 +17,6 @@ from typing import Any, Literal, NotRequired, TypeAlias
 from langchain.tools import ToolRuntime
 from typing_extensions import TypedDict
 
-from deepagents.backends.types import FilesystemState
 logger = logging.getLogger(__name__)
 
 FileOperationError = Literal[
@@ -179,7 +178,7 @@ class BackendProtocol(abc.ABC):  # noqa: B024
     }
     """
 
-    def ls_info(self, path: str, runtime: ToolRuntime[None, FilesystemState]) -> list["FileInfo"]:
+    def ls_info(self, path: str) -> list["FileInfo"]:
         """List all files in a directory with metadata.
 
         Args:
@@ -195,7 +194,7 @@ class BackendProtocol(abc.ABC):  # noqa: B024
         """
         raise NotImplementedError
 
-    async def als_info(self, path: str, runtime: ToolRuntime[None, FilesystemState]) -> list["FileInfo"]:
+    async def als_info(self, path: str) -> list["FileInfo"]:
         """Async version of ls_info."""
         return await asyncio.to_thread(self.ls_info, path)
 
@@ -204,7 +203,6 @@ class BackendProtocol(abc.ABC):  # noqa: B024
         file_path: str,
         offset: int = 0,
         limit: int = 2000,
-        runtime: ToolRuntime[None, FilesystemState] = None
     ) -> str:
         """Read file content with line numbers.
 
@@ -233,7 +231,6 @@ class BackendProtocol(abc.ABC):  # noqa: B024
         file_path: str,
         offset: int = 0,
         limit: int = 2000,
-        runtime: ToolRuntime[None, FilesystemState] = None,
     ) -> str:
         """Async version of read."""
         return await asyncio.to_thread(self.read, file_path, offset, limit)
@@ -243,7 +240,6 @@ class BackendProtocol(abc.ABC):  # noqa: B024
         pattern: str,
         path: str | None = None,
         glob: str | None = None,
-        runtime: ToolRuntime[None, FilesystemState] = None,
     ) -> list["GrepMatch"] | str:
         """Search for a literal text pattern in files.
 
@@ -285,12 +281,11 @@ class BackendProtocol(abc.ABC):  # noqa: B024
         pattern: str,
         path: str | None = None,
         glob: str | None = None,
-        runtime: ToolRuntime[None, FilesystemState] = None,
     ) -> list["GrepMatch"] | str:
         """Async version of grep_raw."""
         return await asyncio.to_thread(self.grep_raw, pattern, path, glob)
 
-    def glob_info(self, pattern: str, path: str = "/", runtime: ToolRuntime[None, FilesystemState] = None) -> list["FileInfo"]:
+    def glob_info(self, pattern: str, path: str = "/") -> list["FileInfo"]:
         """Find files matching a glob pattern.
 
         Args:
@@ -309,7 +304,7 @@ class BackendProtocol(abc.ABC):  # noqa: B024
         """
         raise NotImplementedError
 
-    async def aglob_info(self, pattern: str, path: str = "/", runtime: ToolRuntime[None, FilesystemState] = None) -> list["FileInfo"]:
+    async def aglob_info(self, pattern: str, path: str = "/") -> list["FileInfo"]:
         """Async version of glob_info."""
         return await asyncio.to_thread(self.glob_info, pattern, path)
 
@@ -317,7 +312,6 @@ class BackendProtocol(abc.ABC):  # noqa: B024
         self,
         file_path: str,
         content: str,
-        runtime: ToolRuntime[None, FilesystemState] = None
     ) -> WriteResult:
         """Write content to a new file in the filesystem, error if file exists.
 
@@ -335,7 +329,6 @@ class BackendProtocol(abc.ABC):  # noqa: B024
         self,
         file_path: str,
         content: str,
-        runtime: ToolRuntime[None, FilesystemState] = None
     ) -> WriteResult:
         """Async version of write."""
         return await asyncio.to_thread(self.write, file_path, content)
@@ -345,8 +338,9 @@ class BackendProtocol(abc.ABC):  # noqa: B024
         file_path: str,
         old_string: str,
         new_string: str,
-        replace_all: bool = False,
-        runtime: ToolRuntime[None, FilesystemState] = None
+        replace_all: bool = False,  # noqa: FBT001, FBT002
+        *,
+        line_range: tuple[int, int] | None = None,
     ) -> EditResult:
         """Perform exact string replacements in an existing file.
 
@@ -358,6 +352,13 @@ class BackendProtocol(abc.ABC):  # noqa: B024
                        Must be different from old_string.
             replace_all: If True, replace all occurrences. If False (default),
                         old_string must be unique in the file or the edit fails.
+            line_range: Optional `(start, end)` line indices (0-indexed, end-exclusive)
+                where `old_string` is expected, e.g. the window of the last read.
+
+                The hint never relaxes the uniqueness check: it only lets backends
+                locate an occurrence that is unique in the file within these lines
+                and splice the replacement there. Otherwise the edit behaves as
+                without the hint. Ignored when `replace_all` is set.
 
         Returns:
             EditResult
@@ -369,13 +370,16 @@ class BackendProtocol(abc.ABC):  # noqa: B024
         file_path: str,
         old_string: str,
         new_string: str,
-        replace_all: bool = False,
-        runtime: ToolRuntime[None, FilesystemState] = None
+        replace_all: bool = False,  # noqa: FBT001, FBT002
+        *,
+        line_range: tuple[int, int] | None = None,
     ) -> EditResult:
         """Async version of edit."""
+        if line_range is not None and edit_accepts_line_range(type(self)):
+            return await asyncio.to_thread(self.edit, file_path, old_string, new_string, replace_all, line_range=line_range)
         return await asyncio.to_thread(self.edit, file_path, old_string, new_string, replace_all)
 
-    def upload_files(self, files: list[tuple[str, bytes]], runtime: ToolRuntime[None, FilesystemState]) -> list[FileUploadResponse]:
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
         """Upload multiple files to the sandbox.
 
         This API is designed to allow developers to use it either directly or
@@ -401,11 +405,11 @@ class BackendProtocol(abc.ABC):  # noqa: B024
         """
         raise NotImplementedError
 
-    async def aupload_files(self, files: list[tuple[str, bytes]], runtime: ToolRuntime[None, FilesystemState]) -> list[FileUploadResponse]:
+    async def aupload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
         """Async version of upload_files."""
         return await asyncio.to_thread(self.upload_files, files)
 
-    def download_files(self, paths: list[str], runtime: ToolRuntime[None, FilesystemState]) -> list[FileDownloadResponse]:
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
         """Download multiple files from the sandbox.
 
         This API is designed to allow developers to use it either directly or
@@ -421,7 +425,7 @@ class BackendProtocol(abc.ABC):  # noqa: B024
         """
         raise NotImplementedError
 
-    async def adownload_files(self, paths: list[str], runtime: ToolRuntime[None, FilesystemState]) -> list[FileDownloadResponse]:
+    async def adownload_files(self, paths: list[str]) -> list[FileDownloadResponse]:
         """Async version of download_files."""
         return await asyncio.to_thread(self.download_files, paths)
 
@@ -522,5 +526,23 @@ def execute_accepts_timeout(cls: type[SandboxBackendProtocol]) -> bool:
         return "timeout" in sig.parameters
 
 
+@lru_cache(maxsize=128)
+def edit_accepts_line_range(cls: type[BackendProtocol]) -> bool:
+    """Check whether a backend class's `edit` and `aedit` accept a `line_range` kwarg.
+
+    Backends written before the `line_range` hint was added to `BackendProtocol`
+    may override them without it.
+
+    Results are cached per class to avoid repeated introspection overhead.
+    """
+    try:
+        signatures = [inspect.signature(cls.edit), inspect.signature(cls.aedit)]
+    except (ValueError, TypeError):
+        logger.debug("Could not inspect signature of %s.edit; assuming line_range is not supported.", cls.__qualname__, exc_info=True)
+        return False
+    else:
+        return all("line_range" in sig.parameters for sig in signatures)
+
+
 BackendFactory: TypeAlias = Callable[[ToolRuntime], BackendProtocol]
 BACKEND_TYPES = BackendProtocol | BackendFactory
@@ -11,8 +11,13 @@ from __future__ import annotations
 
 import base64
 import json
+import re
+import secrets
 import shlex
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime
+from typing import Any, TypeVar
 
 from deepagents.backends.protocol import (
     EditResult,
@@ -91,7 +96,9 @@ with open(file_path, 'w') as f:
 __DEEPAGENTS_EOF__"""
 
 # Use heredoc to pass edit parameters via stdin to avoid ARG_MAX limits.
-# Stdin format: base64-encoded JSON with {"path": str, "old": str, "new": str}.
+# Stdin format: base64-encoded JSON with {"path": str, "old": str, "new": str, "range": [int, int] | None}.
+# With a line range, an occurrence unique in the file is located within the range and
+# replaced in place without decoding the rest; otherwise the whole file is edited.
 # JSON bundles all parameters; base64 ensures safe transport of arbitrary content
 # (special chars, newlines, etc.) through the heredoc without escaping issues.
 _EDIT_COMMAND_TEMPLATE = """python3 -c "
@@ -112,6 +119,7 @@ try:
     file_path = data['path']
     old = data['old']
     new = data['new']
+    line_range = data.get('range')
 except Exception as e:
     print(f'Error: Failed to decode edit payload: {{e}}', file=sys.stderr)
     sys.exit(4)
@@ -120,6 +128,31 @@ except Exception as e:
 if not os.path.isfile(file_path):
     sys.exit(3)  # File not found
 
+# Replace an occurrence unique in the file within the line range in place
+if line_range and not {replace_all} and old:
+    old_bytes = old.encode('utf-8')
+    new_bytes = new.encode('utf-8')
+    with open(file_path, 'r+b') as f:
+        offset = 0
+        for _ in range(max(line_range[0], 0)):
+            line = f.readline()
+            offset += len(line)
+        region = b''.join(f.readline() for _ in range(max(line_range[1] - max(line_range[0], 0), 0)))
+        f.seek(0)
+        if region.count(old_bytes) == 1 and f.read().count(old_bytes) == 1:
+            position = offset + region.index(old_bytes)
+            if len(old_bytes) == len(new_bytes):
+                f.seek(position)
+                f.write(new_bytes)
+            else:
+                f.seek(position + len(old_bytes))
+                rest = f.read()
+                f.seek(position)
+                f.write(new_bytes + rest)
+                f.truncate()
+            print(1)
+            sys.exit(0)
+
 # Read file content
 with open(file_path, 'r') as f:
     text = f.read()
@@ -184,6 +217,127 @@ for i, line in enumerate(selected_lines):
 " 2>&1"""
 
 
+_T = TypeVar("_T")
+
+# Command of a read-only file operation and the parser of its result
+_Operation = tuple[str, Callable[[ExecuteResponse], _T]]
+
+
+def _parse_file_infos(result: ExecuteResponse) -> list[FileInfo]:
+    """Parse the JSON lines printed by the ls and glob scripts into `FileInfo` dicts."""
+    file_infos: list[FileInfo] = []
+    for line in result.output.strip().split("\n"):
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        info: FileInfo = {"path": data["path"], "is_dir": data["is_dir"]}
+        if "size" in data:
+            info["size"] = data["size"]
+            info["modified_at"] = datetime.fromtimestamp(data["mtime"], tz=UTC).isoformat()
+        file_infos.append(info)
+    return file_infos
+
+
+def _ls_operation(path: str) -> _Operation[list[FileInfo]]:
+    cmd = f"""python3 -c "
+import os
+import json
+
+path = '{path}'
+
+try:
+    with os.scandir(path) as it:
+        for entry in it:
+            result = {{
+                'path': os.path.join(path, entry.name),
+                'is_dir': entry.is_dir(follow_symlinks=False)
+            }}
+            print(json.dumps(result))
+except FileNotFoundError:
+    pass
+except PermissionError:
+    pass
+" 2>/dev/null"""
+    return cmd, _parse_file_infos
+
+
+def _read_operation(file_path: str, offset: int = 0, limit: int = 2000) -> _Operation[str]:
+    def parse(result: ExecuteResponse) -> str:
+        output = result.output.rstrip()
+        if result.exit_code != 0 or "Error: File not found" in output:
+            return f"Error: File '{file_path}' not found"
+        return output
+
+    return _READ_COMMAND_TEMPLATE.format(file_path=file_path, offset=offset, limit=limit), parse
+
+
+def _grep_operation(pattern: str, path: str | None = None, glob: str | None = None) -> _Operation[list[GrepMatch]]:
+    search_path = shlex.quote(path or ".")
+
+    # Build grep command to get structured output
+    grep_opts = "-rHnF"  # recursive, with filename, with line number, fixed-strings (literal)
+
+    # Add glob pattern if specified
+    glob_pattern = ""
+    if glob:
+        glob_pattern = f"--include='{glob}'"
+
+    # Escape pattern for shell
+    pattern_escaped = shlex.quote(pattern)
+
+    def parse(result: ExecuteResponse) -> list[GrepMatch]:
+        output = result.output.rstrip()
+        if not output:
+            return []
+
+        # Parse grep output into GrepMatch objects
+        matches: list[GrepMatch] = []
+        for line in output.split("\n"):
+            # Format is: path:line_number:text
+            parts = line.split(":", 2)
+            if len(parts) >= 3:  # noqa: PLR2004  # Grep output field count
+                matches.append(
+                    {
+                        "path": parts[0],
+                        "line": int(parts[1]),
+                        "text": parts[2],
+                    }
+                )
+        return matches
+
+    return f"grep {grep_opts} {glob_pattern} -e {pattern_escaped} {search_path} 2>/dev/null || true", parse
+
+
+def _glob_operation(pattern: str, path: str = "/") -> _Operation[list[FileInfo]]:
+    # Encode pattern and path as base64 to avoid escaping issues
+    pattern_b64 = base64.b64encode(pattern.encode("utf-8")).decode("ascii")
+    path_b64 = base64.b64encode(path.encode("utf-8")).decode("ascii")
+    return _GLOB_COMMAND_TEMPLATE.format(path_b64=path_b64, pattern_b64=pattern_b64), _parse_file_infos
+
+
+def _batch_command(plans: list[_Operation[Any] | None], marker: str) -> str:
+    """Join the commands of `plans` into one, printing `marker` and the exit code after each."""
+    return "\n".join(f"{plan[0]}\nprintf '\\n{marker} %s\\n' \"$?\"" for plan in plans if plan is not None)
+
+
+def _split_batch_output(output: str, marker: str) -> list[ExecuteResponse]:
+    """Split the output of a batch command into the responses of its commands, leaving out any cut off."""
+    parts = re.split(rf"\n{marker} (-?\d+)\n", output)
+    return [ExecuteResponse(output=parts[i], exit_code=int(parts[i + 1])) for i in range(0, len(parts) - 1, 2)]
+
+
+# Read-only file operations `BaseSandbox.batch_file_operations` runs in one command, by method name
+_BATCHABLE_OPERATIONS: dict[str, Callable[..., _Operation[Any]]] = {
+    "ls_info": _ls_operation,
+    "read": _read_operation,
+    "grep_raw": _grep_operation,
+    "glob_info": _glob_operation,
+}
+
+
 class BaseSandbox(SandboxBackendProtocol, ABC):
     """Base sandbox implementation with execute() as abstract method.
 
@@ -212,39 +366,7 @@ class BaseSandbox(SandboxBackendProtocol, ABC):
 
     def ls_info(self, path: str) -> list[FileInfo]:
         """Structured listing with file metadata using os.scandir."""
-        cmd = f"""python3 -c "
-import os
-import json
-
-path = '{path}'
-
-try:
-    with os.scandir(path) as it:
-        for entry in it:
-            result = {{
-                'path': os.path.join(path, entry.name),
-                'is_dir': entry.is_dir(follow_symlinks=False)
-            }}
-            print(json.dumps(result))
-except FileNotFoundError:
-    pass
-except PermissionError:
-    pass
-" 2>/dev/null"""
-
-        result = self.execute(cmd)
-
-        file_infos: list[FileInfo] = []
-        for line in result.output.strip().split("\n"):
-            if not line:
-                continue
-            try:
-                data = json.loads(line)
-                file_infos.append({"path": data["path"], "is_dir": data["is_dir"]})
-            except json.JSONDecodeError:
-                continue
-
-        return file_infos
+        return self._run(_ls_operation(path))
 
     def read(
         self,
@@ -253,17 +375,7 @@ except PermissionError:
         limit: int = 2000,
     ) -> str:
         """Read file content with line numbers using a single shell command."""
-        # Use template for reading file with offset and limit
-        cmd = _READ_COMMAND_TEMPLATE.format(file_path=file_path, offset=offset, limit=limit)
-        result = self.execute(cmd)
-
-        output = result.output.rstrip()
-        exit_code = result.exit_code
-
-        if exit_code != 0 or "Error: File not found" in output:
-            return f"Error: File '{file_path}' not found"
-
-        return output
+        return self._run(_read_operation(file_path, offset, limit))
 
     def write(
         self,
@@ -295,11 +407,17 @@ except PermissionError:
         old_string: str,
         new_string: str,
         replace_all: bool = False,  # noqa: FBT001, FBT002
+        *,
+        line_range: tuple[int, int] | None = None,
     ) -> EditResult:
-        """Edit a file by replacing string occurrences. Returns EditResult."""
-        # Create JSON payload with file path, old string, and new string
+        """Edit a file by replacing string occurrences. Returns EditResult.
+
+        With a `line_range` hint, the edit script splices an occurrence that is unique
+        in the file and lies within the range in place.
+        """
+        # Create JSON payload with file path, old string, new string and line range
         # This avoids shell injection via file_path and ARG_MAX limits on strings
-        payload = json.dumps({"path": file_path, "old": old_string, "new": new_string})
+        payload = json.dumps({"path": file_path, "old": old_string, "new": new_string, "range": line_range})
         payload_b64 = base64.b64encode(payload.encode("utf-8")).decode("ascii")
 
         # Use template for string replacement
@@ -332,70 +450,62 @@ except PermissionError:
         glob: str | None = None,
     ) -> list[GrepMatch] | str:
         """Structured search results or error string for invalid input."""
-        search_path = shlex.quote(path or ".")
-
-        # Build grep command to get structured output
-        grep_opts = "-rHnF"  # recursive, with filename, with line number, fixed-strings (literal)
-
-        # Add glob pattern if specified
-        glob_pattern = ""
-        if glob:
-            glob_pattern = f"--include='{glob}'"
-
-        # Escape pattern for shell
-        pattern_escaped = shlex.quote(pattern)
-
-        cmd = f"grep {grep_opts} {glob_pattern} -e {pattern_escaped} {search_path} 2>/dev/null || true"
-        result = self.execute(cmd)
-
-        output = result.output.rstrip()
-        if not output:
-            return []
-
-        # Parse grep output into GrepMatch objects
-        matches: list[GrepMatch] = []
-        for line in output.split("\n"):
-            # Format is: path:line_number:text
-            parts = line.split(":", 2)
-            if len(parts) >= 3:  # noqa: PLR2004  # Grep output field count
-                matches.append(
-                    {
-                        "path": parts[0],
-                        "line": int(parts[1]),
-                        "text": parts[2],
-                    }
-                )
-
-        return matches
+        return self._run(_grep_operation(pattern, path, glob))
 
     def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
         """Structured glob matching returning FileInfo dicts."""
-        # Encode pattern and path as base64 to avoid escaping issues
-        pattern_b64 = base64.b64encode(pattern.encode("utf-8")).decode("ascii")
-        path_b64 = base64.b64encode(path.encode("utf-8")).decode("ascii")
+        return self._run(_glob_operation(pattern, path))
+
+    def _run(self, operation: _Operation[_T]) -> _T:
+        command, parse = operation
+        return parse(self.execute(command))
+
+    def _plan_batch(self, operations: Sequence[tuple[str, dict[str, Any]]]) -> list[_Operation[Any] | None]:
+        """Return the command and parser of each operation, `None` for operations that run on their own."""
+        plans: list[_Operation[Any] | None] = []
+        for name, kwargs in operations:
+            build = _BATCHABLE_OPERATIONS.get(name)
+            # Subclasses may implement an operation without the shell commands of this class
+            if build is None or getattr(type(self), name) is not getattr(BaseSandbox, name):
+                plans.append(None)
+            else:
+                plans.append(build(**kwargs))
+        return plans
+
+    def batch_file_operations(self, operations: Sequence[tuple[str, dict[str, Any]]]) -> list[Any]:
+        """Run several read-only file operations with a single `execute` call.
+
+        Operations this class cannot combine, such as methods a subclass overrides, and
+        operations whose output was cut off run through their own method instead.
 
-        cmd = _GLOB_COMMAND_TEMPLATE.format(path_b64=path_b64, pattern_b64=pattern_b64)
-        result = self.execute(cmd)
-
-        output = result.output.strip()
-        if not output:
-            return []
-
-        # Parse JSON output into FileInfo dicts
-        file_infos: list[FileInfo] = []
-        for line in output.split("\n"):
-            try:
-                data = json.loads(line)
-                file_infos.append(
-                    {
-                        "path": data["path"],
-                        "is_dir": data["is_dir"],
-                    }
-                )
-            except json.JSONDecodeError:
-                continue
+        Args:
+            operations: Pairs of the name of a read-only method of this backend
+                (`ls_info`, `read`, `grep_raw` or `glob_info`) and its keyword arguments.
 
-        return file_infos
+        Returns:
+            The result of each operation, as its method would return it.
+        """
+        plans = self._plan_batch(operations)
+        marker = f"__DEEPAGENTS_BATCH_{secrets.token_hex(8)}__"
+        command = _batch_command(plans, marker)
+        responses = iter(_split_batch_output(self.execute(command).output, marker) if command else [])
+        results: list[Any] = []
+        for (name, kwargs), plan in zip(operations, plans, strict=True):
+            response = next(responses, None) if plan is not None else None
+            results.append(getattr(self, name)(**kwargs) if plan is None or response is None else plan[1](response))
+        return results
+
+    async def abatch_file_operations(self, operations: Sequence[tuple[str, dict[str, Any]]]) -> list[Any]:
+        """Async version of batch_file_operations."""
+        plans = self._plan_batch(operations)
+        marker = f"__DEEPAGENTS_BATCH_{secrets.token_hex(8)}__"
+        command = _batch_command(plans, marker)
+        responses = iter(_split_batch_output((await self.aexecute(command)).output, marker) if command else [])
+        results: list[Any] = []
+        for (name, kwargs), plan in zip(operations, plans, strict=True):
+            response = next(responses, None) if plan is not None else None
+            results.append(await getattr(self, f"a{name}")(**kwargs) if plan is None or response is None else plan[1](response))
+        return results
 
     @property
     @abstractmethod
@@ -1,7 +1,11 @@
 """StateBackend: Store files in LangGraph agent state (ephemeral)."""
 
-from typing import TYPE_CHECKING
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
 
+from deepagents.backends.blobs import BlobStore, externalize_file_data, load_file_data
 from deepagents.backends.protocol import (
     BackendProtocol,
     EditResult,
@@ -11,19 +15,53 @@ from deepagents.backends.protocol import (
     GrepMatch,
     WriteResult,
 )
+from deepagents.backends.types import FileData
 from deepagents.backends.utils import (
     _glob_search_files,
     create_file_data,
+    edit_file_data,
     file_data_to_string,
     format_read_response,
     grep_matches_from_files,
-    perform_string_replacement,
-    update_file_data,
 )
 
 if TYPE_CHECKING:
     from langchain.tools import ToolRuntime
 
+_inherited_files: ContextVar[Mapping[str, FileData] | None] = ContextVar("deepagents_inherited_files", default=None)
+
+
+@contextmanager
+def inherit_files(files: Mapping[str, FileData]) -> Iterator[None]:
+    """Expose a parent agent's files to `StateBackend`s running inside this context.
+
+    Used to hand files to a subagent by reference: the subagent starts with no
+    `files` of its own, reads fall through to `files`, and only what it writes
+    ends up in its state (and checkpoints).
+
+    Args:
+        files: The files the parent agent can see. Must not be mutated while the
+            context is active.
+    """
+    token = _inherited_files.set(files)
+    try:
+        yield
+    finally:
+        _inherited_files.reset(token)
+
+
+def visible_files(state: Mapping[str, Any]) -> dict[str, FileData]:
+    """Return the files a `StateBackend` sees for `state`.
+
+    This is the state's own `files`, layered over any files inherited from a parent
+    agent via `inherit_files`. Merging only copies references, never file contents.
+    """
+    files = state.get("files") or {}
+    inherited = _inherited_files.get()
+    if inherited is None:
+        return files
+    return {**inherited, **files}
+
 
 class StateBackend(BackendProtocol):
     """Backend that stores files in agent state (ephemeral).
@@ -35,11 +73,44 @@ class StateBackend(BackendProtocol):
     Special handling: Since LangGraph state must be updated via Command objects
     (not direct mutation), operations return Command objects instead of None.
     This is indicated by the uses_state=True flag.
+
+    With a `blob_store`, state only holds a content hash and metadata per file and
+    the content is kept in the blob store, so checkpoints grow with what changed
+    rather than with the size of all files.
     """
 
-    def __init__(self, runtime: "ToolRuntime") -> None:
-        """Initialize StateBackend with runtime."""
+    def __init__(self, runtime: "ToolRuntime", *, blob_store: BlobStore | None = None) -> None:
+        """Initialize StateBackend with runtime.
+
+        Args:
+            runtime: The tool runtime giving access to the agent state.
+            blob_store: Store for file contents. New and edited files are kept in it
+                and referenced from state by hash. Files passed in with their content
+                are read as before.
+        """
         self.runtime = runtime
+        self.blob_store = blob_store
+
+    def _load(self, file_data: FileData) -> FileData | None:
+        """Return `file_data` with its content, `None` if its blob is missing."""
+        return load_file_data(file_data, self.blob_store)
+
+    def _loaded_files(self) -> dict[str, FileData]:
+        """Return the visible files with their content, skipping files whose blob is missing."""
+        files = visible_files(self.runtime.state)
+        if self.blob_store is None:
+            return files
+        return {path: loaded for path, fd in files.items() if (loaded := self._load(fd)) is not None}
+
+    def _stored(self, file_data: FileData) -> FileData:
+        """Return the `FileData` to put in state for new content."""
+        return file_data if self.blob_store is None else externalize_file_data(file_data, self.blob_store)
+
+    @staticmethod
+    def _size(file_data: FileData) -> int:
+        if "content" not in file_data:
+            return int(file_data.get("size", 0))
+        return len("\n".join(file_data["content"]))
 
     def ls_info(self, path: str) -> list[FileInfo]:
         """List files and directories in the specified directory (non-recursive).
@@ -51,7 +122,7 @@ class StateBackend(BackendProtocol):
             List of FileInfo-like dicts for files and directories directly in the directory.
             Directories have a trailing / in their path and is_dir=True.
         """
-        files = self.runtime.state.get("files", {})
+        files = visible_files(self.runtime.state)
         infos: list[FileInfo] = []
         subdirs: set[str] = set()
 
@@ -74,12 +145,11 @@ class StateBackend(BackendProtocol):
                 continue
 
             # This is a file directly in the current directory
-            size = len("\n".join(fd.get("content", [])))
             infos.append(
                 {
                     "path": k,
                     "is_dir": False,
-                    "size": int(size),
+                    "size": self._size(fd),
                     "modified_at": fd.get("modified_at", ""),
                 }
             )
@@ -106,13 +176,16 @@ class StateBackend(BackendProtocol):
         Returns:
             Formatted file content with line numbers, or error message.
         """
-        files = self.runtime.state.get("files", {})
+        files = visible_files(self.runtime.state)
         file_data = files.get(file_path)
 
         if file_data is None:
             return f"Error: File '{file_path}' not found"
 
-        return format_read_response(file_data, offset, limit)
+        loaded = self._load(file_data)
+        if loaded is None:
+            return f"Error: Content of file '{file_path}' is missing from the blob store"
+        return format_read_response(loaded, offset, limit)
 
     def write(
         self,
@@ -123,12 +196,12 @@ class StateBackend(BackendProtocol):
 
         Returns WriteResult with files_update to update LangGraph state.
         """
-        files = self.runtime.state.get("files", {})
+        files = visible_files(self.runtime.state)
 
         if file_path in files:
             return WriteResult(error=f"Cannot write to {file_path} because it already exists. Read and then make an edit, or write to a new path.")
 
-        new_file_data = create_file_data(content)
+        new_file_data = self._stored(create_file_data(content))
         return WriteResult(path=file_path, files_update={file_path: new_file_data})
 
     def edit(
@@ -137,26 +210,30 @@ class StateBackend(BackendProtocol):
         old_string: str,
         new_string: str,
         replace_all: bool = False,  # noqa: FBT001, FBT002
+        *,
+        line_range: tuple[int, int] | None = None,
     ) -> EditResult:
         """Edit a file by replacing string occurrences.
 
         Returns EditResult with files_update and occurrences.
         """
-        files = self.runtime.state.get("files", {})
+        files = visible_files(self.runtime.state)
         file_data = files.get(file_path)
 
         if file_data is None:
             return EditResult(error=f"Error: File '{file_path}' not found")
 
-        content = file_data_to_string(file_data)
-        result = perform_string_replacement(content, old_string, new_string, replace_all)
+        loaded = self._load(file_data)
+        if loaded is None:
+            return EditResult(error=f"Error: Content of file '{file_path}' is missing from the blob store")
+
+        result = edit_file_data(loaded, old_string, new_string, replace_all, line_range)
 
         if isinstance(result, str):
             return EditResult(error=result)
 
-        new_content, occurrences = result
-        new_file_data = update_file_data(file_data, new_content)
-        return EditResult(path=file_path, files_update={file_path: new_file_data}, occurrences=int(occurrences))
+        new_file_data, occurrences = result
+        return EditResult(path=file_path, files_update={file_path: self._stored(new_file_data)}, occurrences=int(occurrences))
 
     def grep_raw(
         self,
@@ -165,12 +242,12 @@ class StateBackend(BackendProtocol):
         glob: str | None = None,
     ) -> list[GrepMatch] | str:
         """Search state files for a literal text pattern."""
-        files = self.runtime.state.get("files", {})
+        files = self._loaded_files()
         return grep_matches_from_files(files, pattern, path if path is not None else "/", glob)
 
     def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
         """Get FileInfo for files matching glob pattern."""
-        files = self.runtime.state.get("files", {})
+        files = visible_files(self.runtime.state)
         result = _glob_search_files(files, pattern, path)
         if result == "No files found":
             return []
@@ -178,12 +255,11 @@ class StateBackend(BackendProtocol):
         infos: list[FileInfo] = []
         for p in paths:
             fd = files.get(p)
-            size = len("\n".join(fd.get("content", []))) if fd else 0
             infos.append(
                 {
                     "path": p,
                     "is_dir": False,
-                    "size": int(size),
+                    "size": self._size(fd) if fd else 0,
                     "modified_at": fd.get("modified_at", "") if fd else "",
                 }
             )
@@ -213,11 +289,13 @@ class StateBackend(BackendProtocol):
         Returns:
             List of FileDownloadResponse objects, one per input path
         """
-        state_files = self.runtime.state.get("files", {})
+        state_files = visible_files(self.runtime.state)
         responses: list[FileDownloadResponse] = []
 
         for path in paths:
             file_data = state_files.get(path)
+            if file_data is not None:
+                file_data = self._load(file_data)
 
             if file_data is None:
                 responses.append(FileDownloadResponse(path=path, content=None, error="file_not_found"))
@@ -22,14 +22,14 @@ from deepagents.backends.protocol import (
     GrepMatch,
     WriteResult,
 )
+from deepagents.backends.types import FileData
 from deepagents.backends.utils import (
     _glob_search_files,
     create_file_data,
+    edit_file_data,
     file_data_to_string,
     format_read_response,
     grep_matches_from_files,
-    perform_string_replacement,
-    update_file_data,
 )
 
 if TYPE_CHECKING:
@@ -198,7 +198,7 @@ class StoreBackend(BackendProtocol):
             return (assistant_id, namespace)
         return (namespace,)
 
-    def _convert_store_item_to_file_data(self, store_item: Item) -> dict[str, Any]:
+    def _convert_store_item_to_file_data(self, store_item: Item) -> FileData:
         """Convert a store Item to FileData format.
 
         Args:
@@ -225,7 +225,7 @@ class StoreBackend(BackendProtocol):
             "modified_at": store_item.value["modified_at"],
         }
 
-    def _convert_file_data_to_store_value(self, file_data: dict[str, Any]) -> dict[str, Any]:
+    def _convert_file_data_to_store_value(self, file_data: FileData) -> dict[str, Any]:
         """Convert FileData to a dict suitable for store.put().
 
         Args:
@@ -451,6 +451,8 @@ class StoreBackend(BackendProtocol):
         old_string: str,
         new_string: str,
         replace_all: bool = False,  # noqa: FBT001, FBT002
+        *,
+        line_range: tuple[int, int] | None = None,
     ) -> EditResult:
         """Edit a file by replacing string occurrences.
 
@@ -469,14 +471,12 @@ class StoreBackend(BackendProtocol):
         except ValueError as e:
             return EditResult(error=f"Error: {e}")
 
-        content = file_data_to_string(file_data)
-        result = perform_string_replacement(content, old_string, new_string, replace_all)
+        result = edit_file_data(file_data, old_string, new_string, replace_all, line_range)
 
         if isinstance(result, str):
             return EditResult(error=result)
 
-        new_content, occurrences = result
-        new_file_data = update_file_data(file_data, new_content)
+        new_file_data, occurrences = result
 
         # Update file in store
         store_value = self._convert_file_data_to_store_value(new_file_data)
@@ -489,6 +489,8 @@ class StoreBackend(BackendProtocol):
         old_string: str,
         new_string: str,
         replace_all: bool = False,  # noqa: FBT001, FBT002
+        *,
+        line_range: tuple[int, int] | None = None,
     ) -> EditResult:
         """Async version of edit using native store async methods.
 
@@ -507,14 +509,12 @@ class StoreBackend(BackendProtocol):
         except ValueError as e:
             return EditResult(error=f"Error: {e}")
 
-        content = file_data_to_string(file_data)
-        result = perform_string_replacement(content, old_string, new_string, replace_all)
+        result = edit_file_data(file_data, old_string, new_string, replace_all, line_range)
 
         if isinstance(result, str):
             return EditResult(error=result)
 
-        new_content, occurrences = result
-        new_file_data = update_file_data(file_data, new_content)
+        new_file_data, occurrences = result
 
         # Update file in store using async method
         store_value = self._convert_file_data_to_store_value(new_file_data)
@@ -1,14 +1,27 @@
+"""State types shared by backends and the filesystem middleware."""
+
 from typing import Annotated, NotRequired
 
 from langchain.agents.middleware.types import AgentState
 from typing_extensions import TypedDict
 
+
 class FileData(TypedDict):
-    """Data structure for storing file contents with metadata."""
+    """Data structure for storing file contents with metadata.
+
+    Holds either the `content` itself or, for files whose content lives in a
+    `BlobStore`, its `content_hash` and `size`.
+    """
 
-    content: list[str]
+    content: NotRequired[list[str]]
     """Lines of the file."""
 
+    content_hash: NotRequired[str]
+    """Digest of the content in the backend's blob store."""
+
+    size: NotRequired[int]
+    """Size of the externalized content, in characters."""
+
     created_at: str
     """ISO 8601 timestamp of file creation."""
 
@@ -56,4 +69,4 @@ class FilesystemState(AgentState):
     """State for the filesystem middleware."""
 
     files: Annotated[NotRequired[dict[str, FileData]], _file_data_reducer]
-    """Files in the filesystem."""
\ No newline at end of file
+    """Files in the filesystem."""
@@ -5,9 +5,12 @@ helpers used by backends and the composite router. Structured helpers
 enable composition without fragile string parsing.
 """
 
+import functools
 import os
 import re
-from collections.abc import Sequence
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Sequence
 from datetime import UTC, datetime
 from pathlib import Path, PurePosixPath
 from typing import Any, Literal, overload
@@ -15,6 +18,7 @@ from typing import Any, Literal, overload
 import wcmatch.glob as wcglob
 
 from deepagents.backends.protocol import FileInfo as _FileInfo, GrepMatch as _GrepMatch
+from deepagents.backends.types import FileData
 
 EMPTY_CONTENT_WARNING = "System reminder: File exists but has empty contents"
 MAX_LINE_LENGTH = 5000
@@ -22,6 +26,12 @@ LINE_NUMBER_WIDTH = 6
 TOOL_RESULT_TOKEN_LIMIT = 20000  # Same threshold as eviction
 TRUNCATION_GUIDANCE = "... [results truncated, try being more specific with your parameters]"
 
+# Total size of the file contents kept joined for searching, in characters
+SEARCH_BUFFER_CACHE_CHARS = 64 << 20
+
+# Regex features whose meaning differs between a single line and a whole file buffer
+_LINE_BOUND_REGEX = re.compile(r"\\[AZz]|\(\?<?[=!]")
+
 # Re-export protocol types for backwards compatibility
 FileInfo = _FileInfo
 GrepMatch = _GrepMatch
@@ -95,7 +105,7 @@ def check_empty_content(content: str) -> str | None:
     return None
 
 
-def file_data_to_string(file_data: dict[str, Any]) -> str:
+def file_data_to_string(file_data: FileData) -> str:
     """Convert FileData to plain string content.
 
     Args:
@@ -107,7 +117,7 @@ def file_data_to_string(file_data: dict[str, Any]) -> str:
     return "\n".join(file_data["content"])
 
 
-def create_file_data(content: str, created_at: str | None = None) -> dict[str, Any]:
+def create_file_data(content: str, created_at: str | None = None) -> FileData:
     """Create a FileData object with timestamps.
 
     Args:
@@ -127,12 +137,12 @@ def create_file_data(content: str, created_at: str | None = None) -> dict[str, A
     }
 
 
-def update_file_data(file_data: dict[str, Any], content: str) -> dict[str, Any]:
+def update_file_data(file_data: FileData, content: str | list[str]) -> FileData:
     """Update FileData with new content, preserving creation timestamp.
 
     Args:
         file_data: Existing FileData dict
-        content: New content as string
+        content: New content as string, or as its lines
 
     Returns:
         Updated FileData dict
@@ -148,7 +158,7 @@ def update_file_data(file_data: dict[str, Any], content: str) -> dict[str, Any]:
 
 
 def format_read_response(
-    file_data: dict[str, Any],
+    file_data: FileData,
     offset: int,
     limit: int,
 ) -> str:
@@ -162,7 +172,24 @@ def format_read_response(
     Returns:
         Formatted content or error message
     """
-    content = file_data_to_string(file_data)
+    return format_read_content(file_data_to_string(file_data), offset, limit)
+
+
+def format_read_content(
+    content: str,
+    offset: int,
+    limit: int,
+) -> str:
+    """Format raw file content for read response with line numbers.
+
+    Args:
+        content: File content as string
+        offset: Line offset (0-indexed)
+        limit: Maximum number of lines
+
+    Returns:
+        Formatted content or error message
+    """
     empty_msg = check_empty_content(content)
     if empty_msg:
         return empty_msg
@@ -178,11 +205,91 @@ def format_read_response(
     return format_content_with_line_numbers(selected_lines, start_line=start_idx + 1)
 
 
+def _line_range_offsets(content: str, line_range: tuple[int, int]) -> tuple[int, int] | None:
+    """Return the character span of a range of lines, including the newline ending it.
+
+    Returns `None` if the range is empty or starts past the end of `content`.
+    """
+    start_line, end_line = max(line_range[0], 0), line_range[1]
+    if start_line >= end_line:
+        return None
+    start = 0
+    for _ in range(start_line):
+        newline = content.find("\n", start)
+        if newline == -1:
+            return None
+        start = newline + 1
+    end = start
+    for _ in range(end_line - start_line):
+        newline = content.find("\n", end)
+        if newline == -1:
+            return start, len(content)
+        end = newline + 1
+    return start, end
+
+
+def replace_in_line_range(content: str, old_string: str, new_string: str, line_range: tuple[int, int]) -> str | None:
+    """Replace `old_string` if it occurs exactly once in the file, within a range of lines.
+
+    The range only tells where to look for the occurrence: a string that also appears
+    elsewhere in the file is never replaced, so the usual uniqueness check still applies.
+
+    Args:
+        content: Original content
+        old_string: String to replace
+        new_string: Replacement string
+        line_range: `(start, end)` line indices, 0-indexed and end-exclusive
+
+    Returns:
+        The new content, or `None` if `old_string` is not unique in the file or lies outside the range
+    """
+    span = _line_range_offsets(content, line_range)
+    if span is None or not old_string or content.count(old_string) != 1:
+        return None
+    index = content.find(old_string, *span)
+    if index == -1:
+        return None
+    return content[:index] + new_string + content[index + len(old_string) :]
+
+
+def replace_in_file_data_lines(lines: list[str], old_string: str, new_string: str, line_range: tuple[int, int]) -> list[str] | None:
+    """Replace `old_string` within a range of `FileData` lines without joining the whole file.
+
+    Same semantics as `replace_in_line_range`, applied to the lines of a `FileData`.
+
+    Args:
+        lines: Lines of the file, as stored in `FileData["content"]`
+        old_string: String to replace
+        new_string: Replacement string
+        line_range: `(start, end)` line indices, 0-indexed and end-exclusive
+
+    Returns:
+        The new lines, or `None` if `old_string` is not unique in the file or lies outside the range
+    """
+    start, end = max(line_range[0], 0), min(line_range[1], len(lines))
+    if start >= end or not old_string:
+        return None
+    # A single-line string cannot span lines, so it is counted without joining them
+    occurrences = "\n".join(lines).count(old_string) if "\n" in old_string else sum(line.count(old_string) for line in lines)
+    if occurrences != 1:
+        return None
+    # Include the newline ending the range, as `replace_in_line_range` does
+    region = "\n".join(lines[start:end]) + ("\n" if end < len(lines) else "")
+    replaced = replace_in_line_range(region, old_string, new_string, (0, end - start))
+    if replaced is None:
+        return None
+    if end < len(lines):
+        return [*lines[:start], *(replaced + lines[end]).split("\n"), *lines[end + 1 :]]
+    return [*lines[:start], *replaced.split("\n")]
+
+
 def perform_string_replacement(
     content: str,
     old_string: str,
     new_string: str,
     replace_all: bool = False,  # noqa: FBT001, FBT002
+    *,
+    line_range: tuple[int, int] | None = None,
 ) -> tuple[str, int] | str:
     """Perform string replacement with occurrence validation.
 
@@ -191,10 +298,17 @@ def perform_string_replacement(
         old_string: String to replace
         new_string: Replacement string
         replace_all: Whether to replace all occurrences
+        line_range: Optional `(start, end)` lines where `old_string` is expected. See
+            `replace_in_line_range`; ignored when `replace_all` is set.
 
     Returns:
         Tuple of (new_content, occurrences) on success, or error message string
     """
+    if line_range is not None and not replace_all:
+        replaced = replace_in_line_range(content, old_string, new_string, line_range)
+        if replaced is not None:
+            return replaced, 1
+
     occurrences = content.count(old_string)
 
     if occurrences == 0:
@@ -210,6 +324,39 @@ def perform_string_replacement(
     return new_content, occurrences
 
 
+def edit_file_data(
+    file_data: FileData,
+    old_string: str,
+    new_string: str,
+    replace_all: bool,  # noqa: FBT001
+    line_range: tuple[int, int] | None = None,
+) -> tuple[FileData, int] | str:
+    """Apply a string replacement to FileData.
+
+    With a `line_range` hint, an occurrence unique in the file is looked up in those
+    lines and spliced into the stored lines without joining the whole file.
+
+    Args:
+        file_data: Existing FileData dict
+        old_string: String to replace
+        new_string: Replacement string
+        replace_all: Whether to replace all occurrences
+        line_range: Optional `(start, end)` lines where `old_string` is expected
+
+    Returns:
+        Tuple of (updated FileData, occurrences) on success, or error message string
+    """
+    if line_range is not None and not replace_all:
+        lines = replace_in_file_data_lines(file_data["content"], old_string, new_string, line_range)
+        if lines is not None:
+            return update_file_data(file_data, lines), 1
+    result = perform_string_replacement(file_data_to_string(file_data), old_string, new_string, replace_all)
+    if isinstance(result, str):
+        return result
+    new_content, occurrences = result
+    return update_file_data(file_data, new_content), occurrences
+
+
 @overload
 def truncate_if_too_long(result: list[str]) -> list[str]: ...
 
@@ -362,6 +509,93 @@ def _filter_files_by_path(files: dict[str, Any], normalized_path: str) -> dict[s
     return {fp: fd for fp, fd in files.items() if fp.startswith(dir_prefix)}
 
 
+class _SearchBufferCache:
+    """Cache of file contents joined into one string, keyed by path and `modified_at`.
+
+    FileData stores content as a list of lines. One search of the joined buffer rules
+    out most files much faster than testing every line, and the buffer is reused
+    until the file changes. Once full, the oldest buffers are evicted first.
+    """
+
+    def __init__(self, max_chars: int = SEARCH_BUFFER_CACHE_CHARS) -> None:
+        self.max_chars = max_chars
+        self._entries: OrderedDict[tuple[str, str | None], tuple[list[str], str]] = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: str, file_data: dict[str, Any]) -> str:
+        """Return the content of `file_data` as one newline-joined string."""
+        lines = file_data["content"]
+        key = (path, file_data.get("modified_at"))
+        entry = self._entries.get(key)
+        # Timestamps alone are not unique (e.g. hand-built FileData), so confirm the lines
+        if entry is not None and (entry[0] is lines or entry[0] == lines):
+            return entry[1]
+        buffer = "\n".join(lines)
+        if len(buffer) <= self.max_chars // 4:
+            with self._lock:
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self._chars -= len(previous[1])
+                self._entries[key] = (lines, buffer)
+                self._chars += len(buffer)
+                while self._chars > self.max_chars:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._chars -= len(evicted)
+        return buffer
+
+
+_search_buffers = _SearchBufferCache()
+
+
+@functools.lru_cache(maxsize=256)
+def _glob_matcher(pattern: str, flags: int) -> Callable[[str], bool]:
+    """Compile a glob pattern once and return its match function."""
+    return wcglob.compile(pattern, flags=flags).match
+
+
+@functools.lru_cache(maxsize=256)
+def _buffer_scanner(pattern: str, flags: int = 0) -> re.Pattern[str]:
+    """Compile the regex that finds matches of `pattern` anywhere in a file buffer."""
+    return re.compile(pattern, flags | re.MULTILINE)
+
+
+def _matching_lines(buffer: str, scanner: re.Pattern[str]) -> Iterator[tuple[int, str]]:
+    """Yield the number and text of every line of `buffer` that contains a match.
+
+    Matches are found in the whole buffer and their offsets mapped back to lines.
+    `scanner` must only match within a line.
+
+    Yields:
+        `(line_number, line)` tuples, one per matching line, in order.
+    """
+    line_number, counted, position = 1, 0, 0
+    while position <= len(buffer) and (match := scanner.search(buffer, position)) is not None:
+        index = match.start()
+        line_number += buffer.count("\n", counted, index)
+        counted = index
+        start = buffer.rfind("\n", 0, index) + 1
+        end = buffer.find("\n", index)
+        if end == -1:
+            end = len(buffer)
+        yield line_number, buffer[start:end]
+        # Continue on the next line: each line is reported at most once
+        position = end + 1
+
+
+def _literal_matching_lines(pattern: str, scanner: re.Pattern[str], lines: list[str], buffer: str) -> Iterator[tuple[int, str]]:
+    """Yield the lines containing `pattern`, found with `scanner` in the file's joined buffer."""
+    first = scanner.search(buffer)
+    if first is None:
+        return
+    # Mapping offsets to lines costs more per match than testing a line, so files
+    # where most lines match are searched line by line
+    if buffer.count(pattern, first.start()) * 8 > len(lines):
+        yield from ((i, line) for i, line in enumerate(lines, 1) if pattern in line)
+        return
+    yield from _matching_lines(buffer, scanner)
+
+
 def _glob_search_files(
     files: dict[str, Any],
     pattern: str,
@@ -396,7 +630,7 @@ def _glob_search_files(
     # - Patterns without path separators (e.g., "*.py") match only in the current
     #   directory (non-recursive) relative to `path`.
     # - Use "**" explicitly for recursive matching.
-    effective_pattern = pattern
+    match = _glob_matcher(pattern, wcglob.BRACE | wcglob.GLOBSTAR)
 
     matches = []
     for file_path, file_data in filtered.items():
@@ -412,7 +646,7 @@ def _glob_search_files(
             # Directory prefix - strip the directory path
             relative = file_path[len(normalized_path) + 1 :]  # +1 for the slash
 
-        if wcglob.globmatch(relative, effective_pattern, flags=wcglob.BRACE | wcglob.GLOBSTAR):
+        if match(relative):
             matches.append((file_path, file_data["modified_at"]))
 
     matches.sort(key=lambda x: x[1], reverse=True)
@@ -491,15 +725,19 @@ def _grep_search_files(
     filtered = _filter_files_by_path(files, normalized_path)
 
     if glob:
-        filtered = {fp: fd for fp, fd in filtered.items() if wcglob.globmatch(Path(fp).name, glob, flags=wcglob.BRACE)}
+        match = _glob_matcher(glob, wcglob.BRACE)
+        filtered = {fp: fd for fp, fd in filtered.items() if match(Path(fp).name)}
 
+    # A buffer without a match rules out every line of the file, except for string
+    # anchors and lookarounds, which see past the line in a buffer
+    scanner = None if _LINE_BOUND_REGEX.search(pattern) else _buffer_scanner(pattern)
     results: dict[str, list[tuple[int, str]]] = {}
     for file_path, file_data in filtered.items():
-        for line_num, line in enumerate(file_data["content"], 1):
-            if regex.search(line):
-                if file_path not in results:
-                    results[file_path] = []
-                results[file_path].append((line_num, line))
+        if scanner is not None and scanner.search(_search_buffers.get(file_path, file_data)) is None:
+            continue
+        matched = [(i, line) for i, line in enumerate(file_data["content"], 1) if regex.search(line)]
+        if matched:
+            results[file_path] = matched
 
     if not results:
         return "No matches found"
@@ -517,7 +755,8 @@ def grep_matches_from_files(
 ) -> list[GrepMatch] | str:
     """Return structured grep matches from an in-memory files mapping.
 
-    Performs literal text search (not regex).
+    Performs literal text search (not regex) over the joined content of each file,
+    which is cached until the file's `modified_at` changes.
 
     Returns a list of GrepMatch on success, or a string for invalid inputs.
     We deliberately do not raise here to keep backends non-throwing in tool
@@ -531,13 +770,20 @@ def grep_matches_from_files(
     filtered = _filter_files_by_path(files, normalized_path)
 
     if glob:
-        filtered = {fp: fd for fp, fd in filtered.items() if wcglob.globmatch(Path(fp).name, glob, flags=wcglob.BRACE)}
+        match = _glob_matcher(glob, wcglob.BRACE)
+        filtered = {fp: fd for fp, fd in filtered.items() if match(Path(fp).name)}
 
     matches: list[GrepMatch] = []
+    if "\n" in pattern:
+        # Lines never contain a newline
+        return matches
+    scanner = _buffer_scanner(re.escape(pattern))
     for file_path, file_data in filtered.items():
-        for line_num, line in enumerate(file_data["content"], 1):
-            if pattern in line:  # Simple substring search for literal matching
-                matches.append({"path": file_path, "line": int(line_num), "text": line})
+        buffer = _search_buffers.get(file_path, file_data)
+        matches.extend(
+            {"path": file_path, "line": line_num, "text": line}
+            for line_num, line in _literal_matching_lines(pattern, scanner, file_data["content"], buffer)
+        )
     return matches
 
 
@@ -9,9 +9,9 @@ from langchain.agents.middleware.types import AgentMiddleware
 from langchain.agents.structured_output import ResponseFormat
 from langchain.chat_models import init_chat_model
 from langchain_anthropic import ChatAnthropic
-from langchain_anthropic.middleware import AnthropicPromptCachingMiddleware
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import SystemMessage
+from langchain_core.runnables import Runnable
 from langchain_core.tools import BaseTool
 from langgraph.cache.base import BaseCache
 from langgraph.graph.state import CompiledStateGraph
@@ -23,12 +23,15 @@ from deepagents.backends.protocol import BackendFactory, BackendProtocol
 from deepagents.middleware.filesystem import FilesystemMiddleware
 from deepagents.middleware.memory import MemoryMiddleware
 from deepagents.middleware.patch_tool_calls import PatchToolCallsMiddleware
+from deepagents.middleware.prompt_caching import PromptCachingMiddleware
 from deepagents.middleware.skills import SkillsMiddleware
 from deepagents.middleware.subagents import (
     GENERAL_PURPOSE_SUBAGENT,
     CompiledSubAgent,
     SubAgent,
     SubAgentMiddleware,
+    _create_subagent_runnable,
+    _LazySubagent,
 )
 from deepagents.middleware.summarization import SummarizationMiddleware, _compute_summarization_defaults
 
@@ -79,6 +82,66 @@ def get_default_model() -> ChatAnthropic:
     )
 
 
+def _summarization_middleware(model: BaseChatModel, *, backend: BackendProtocol | BackendFactory) -> SummarizationMiddleware:
+    """Build the summarization middleware of a deep agent, with defaults from the model profile."""
+    summarization_defaults = _compute_summarization_defaults(model)
+    return SummarizationMiddleware(
+        model=model,
+        backend=backend,
+        trigger=summarization_defaults["trigger"],
+        keep=summarization_defaults["keep"],
+        trim_tokens_to_summarize=None,
+        truncate_args_settings=summarization_defaults["truncate_args_settings"],
+    )
+
+
+def _lazy_subagent(spec: SubAgent, *, backend: BackendProtocol | BackendFactory, skills: list[str] | None) -> CompiledSubAgent:
+    """Wrap a subagent so its graph is compiled on its first `task` call.
+
+    The middleware stack is built and validated immediately; only `create_agent`
+    is deferred. A model given as a string is also only initialized on the first
+    compile, together with the summarization middleware that depends on it.
+
+    Args:
+        spec: Subagent spec with `model` and `tools` already filled in. Its own
+            `middleware` runs after the base deep agent stack.
+        backend: Backend for the subagent's filesystem and summarization middleware.
+        skills: Skill sources for the subagent, if any.
+
+    Returns:
+        A `CompiledSubAgent` whose runnable is compiled on first use.
+    """
+    model = spec["model"]
+    # The summarization middleware goes between `head` and `tail`
+    head: list[AgentMiddleware[Any, Any, Any]] = [TodoListMiddleware(), FilesystemMiddleware(backend=backend, deduplicate_evictions=True)]
+    tail: list[AgentMiddleware[Any, Any, Any]] = [PromptCachingMiddleware(unsupported_model_behavior="ignore"), PatchToolCallsMiddleware()]
+    if skills is not None:
+        tail.append(SkillsMiddleware(backend=backend, sources=skills))
+    tail.extend(spec.get("middleware", []))
+
+    if isinstance(model, str):
+        model_spec = model
+
+        def build(lazy_spec: SubAgent) -> Runnable:
+            resolved = init_chat_model(model_spec)
+            middleware = [*head, _summarization_middleware(resolved, backend=backend), *tail]
+            return _create_subagent_runnable({**lazy_spec, "model": resolved, "middleware": middleware})
+
+        runnable = _LazySubagent({**spec, "middleware": [*head, *tail]}, build)
+    else:
+        middleware = [*head, _summarization_middleware(model, backend=backend), *tail]
+        runnable = _LazySubagent({**spec, "middleware": middleware}, _create_subagent_runnable)
+
+    compiled: CompiledSubAgent = {
+        "name": spec["name"],
+        "description": spec["description"],
+        "runnable": runnable,
+    }
+    if "timeout" in spec:
+        compiled["timeout"] = spec["timeout"]
+    return compiled
+
+
 def create_deep_agent(  # noqa: C901, PLR0912  # Complex graph assembly logic with many conditional branches
     model: str | BaseChatModel | None = None,
     tools: Sequence[BaseTool | Callable | dict[str, Any]] | None = None,
@@ -128,7 +191,7 @@ def create_deep_agent(  # noqa: C901, PLR0912  # Complex graph assembly logic wi
             If a string, it's concatenated with the base prompt.
         middleware: Additional middleware to apply after the standard middleware stack
             (`TodoListMiddleware`, `FilesystemMiddleware`, `SubAgentMiddleware`,
-            `SummarizationMiddleware`, `AnthropicPromptCachingMiddleware`,
+            `SummarizationMiddleware`, `PromptCachingMiddleware`,
             `PatchToolCallsMiddleware`).
         subagents: The subagents to use.
 
@@ -140,6 +203,8 @@ def create_deep_agent(  # noqa: C901, PLR0912  # Complex graph assembly logic wi
             - (optional) `tools`
             - (optional) `model` (either a `LanguageModelLike` instance or `dict` settings)
             - (optional) `middleware` (list of `AgentMiddleware`)
+
+            Subagent graphs are compiled on their first `task` call and reused afterwards.
         skills: Optional list of skill source paths (e.g., `["/skills/user/", "/skills/project/"]`).
 
             Paths must be specified using POSIX conventions (forward slashes) and are relative
@@ -192,32 +257,15 @@ def create_deep_agent(  # noqa: C901, PLR0912  # Complex graph assembly logic wi
 
     backend = backend if backend is not None else (StateBackend)
 
-    # Build general-purpose subagent with default middleware stack
-    gp_middleware: list[AgentMiddleware[Any, Any, Any]] = [
-        TodoListMiddleware(),
-        FilesystemMiddleware(backend=backend),
-        SummarizationMiddleware(
-            model=model,
-            backend=backend,
-            trigger=summarization_defaults["trigger"],
-            keep=summarization_defaults["keep"],
-            trim_tokens_to_summarize=None,
-            truncate_args_settings=summarization_defaults["truncate_args_settings"],
-        ),
-        AnthropicPromptCachingMiddleware(unsupported_model_behavior="ignore"),
-        PatchToolCallsMiddleware(),
-    ]
-    if skills is not None:
-        gp_middleware.append(SkillsMiddleware(backend=backend, sources=skills))
-    if interrupt_on is not None:
-        gp_middleware.append(HumanInTheLoopMiddleware(interrupt_on=interrupt_on))
-
+    # Subagent middleware stacks and graphs are only built on a subagent's first `task` call
     general_purpose_spec: SubAgent = {  # ty: ignore[missing-typed-dict-key]
         **GENERAL_PURPOSE_SUBAGENT,
         "model": model,
         "tools": tools or [],
-        "middleware": gp_middleware,
     }
+    if interrupt_on is not None:
+        general_purpose_spec["interrupt_on"] = interrupt_on
+    general_purpose_subagent = _lazy_subagent(general_purpose_spec, backend=backend, skills=skills)
 
     # Process user-provided subagents to fill in defaults for model, tools, and middleware
     processed_subagents: list[SubAgent | CompiledSubAgent] = []
@@ -226,42 +274,18 @@ def create_deep_agent(  # noqa: C901, PLR0912  # Complex graph assembly logic wi
             # CompiledSubAgent - use as-is
             processed_subagents.append(spec)
         else:
-            # SubAgent - fill in defaults and prepend base middleware
+            # SubAgent - fill in defaults; base middleware is prepended when it is compiled
+            # A model given as a string is initialized on the subagent's first compile
             subagent_model = spec.get("model", model)
-            if isinstance(subagent_model, str):
-                subagent_model = init_chat_model(subagent_model)
-
-            # Build middleware: base stack + skills (if specified) + user's middleware
-            subagent_summarization_defaults = _compute_summarization_defaults(subagent_model)
-            subagent_middleware: list[AgentMiddleware[Any, Any, Any]] = [
-                TodoListMiddleware(),
-                FilesystemMiddleware(backend=backend),
-                SummarizationMiddleware(
-                    model=subagent_model,
-                    backend=backend,
-                    trigger=subagent_summarization_defaults["trigger"],
-                    keep=subagent_summarization_defaults["keep"],
-                    trim_tokens_to_summarize=None,
-                    truncate_args_settings=subagent_summarization_defaults["truncate_args_settings"],
-                ),
-                AnthropicPromptCachingMiddleware(unsupported_model_behavior="ignore"),
-                PatchToolCallsMiddleware(),
-            ]
-            subagent_skills = spec.get("skills")
-            if subagent_skills:
-                subagent_middleware.append(SkillsMiddleware(backend=backend, sources=subagent_skills))
-            subagent_middleware.extend(spec.get("middleware", []))
-
             processed_spec: SubAgent = {  # ty: ignore[missing-typed-dict-key]
                 **spec,
                 "model": subagent_model,
                 "tools": spec.get("tools", tools or []),
-                "middleware": subagent_middleware,
             }
-            processed_subagents.append(processed_spec)
+            processed_subagents.append(_lazy_subagent(processed_spec, backend=backend, skills=spec.get("skills") or None))
 
     # Combine GP with processed user-provided subagents
-    all_subagents: list[SubAgent | CompiledSubAgent] = [general_purpose_spec, *processed_subagents]
+    all_subagents: list[SubAgent | CompiledSubAgent] = [general_purpose_subagent, *processed_subagents]
 
     # Build main agent middleware stack
     deepagent_middleware: list[AgentMiddleware[Any, Any, Any]] = [
@@ -273,7 +297,7 @@ def create_deep_agent(  # noqa: C901, PLR0912  # Complex graph assembly logic wi
         deepagent_middleware.append(SkillsMiddleware(backend=backend, sources=skills))
     deepagent_middleware.extend(
         [
-            FilesystemMiddleware(backend=backend),
+            FilesystemMiddleware(backend=backend, deduplicate_evictions=True),
             SubAgentMiddleware(
                 backend=backend,
                 subagents=all_subagents,
@@ -286,7 +310,7 @@ def create_deep_agent(  # noqa: C901, PLR0912  # Complex graph assembly logic wi
                 trim_tokens_to_summarize=None,
                 truncate_args_settings=summarization_defaults["truncate_args_settings"],
             ),
-            AnthropicPromptCachingMiddleware(unsupported_model_behavior="ignore"),
+            PromptCachingMiddleware(unsupported_model_behavior="ignore"),
             PatchToolCallsMiddleware(),
         ]
     )
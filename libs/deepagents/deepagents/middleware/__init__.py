@@ -2,16 +2,19 @@
 
 from deepagents.middleware.filesystem import FilesystemMiddleware
 from deepagents.middleware.memory import MemoryMiddleware
+from deepagents.middleware.prompt_caching import PromptCachingMiddleware
 from deepagents.middleware.skills import SkillsMiddleware
-from deepagents.middleware.subagents import CompiledSubAgent, SubAgent, SubAgentMiddleware
+from deepagents.middleware.subagents import CompiledSubAgent, SubAgent, SubAgentMiddleware, SubAgentResultCache
 from deepagents.middleware.summarization import SummarizationMiddleware
 
 __all__ = [
     "CompiledSubAgent",
     "FilesystemMiddleware",
     "MemoryMiddleware",
+    "PromptCachingMiddleware",
     "SkillsMiddleware",
     "SubAgent",
     "SubAgentMiddleware",
+    "SubAgentResultCache",
     "SummarizationMiddleware",
 ]
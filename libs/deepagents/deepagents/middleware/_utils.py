@@ -1,7 +1,88 @@
 """Utility functions for middleware."""
 
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
 from langchain_core.messages import ContentBlock, SystemMessage
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+# Number of fragment variants a middleware keeps, e.g. the memory of different threads
+DEFAULT_FRAGMENT_CACHE_SIZE = 16
+
+# Fragment caches of live middleware, consulted by `cacheable_prefix_length`
+_fragment_caches: weakref.WeakSet[PromptFragmentCache] = weakref.WeakSet()
+_fragment_caches_lock = threading.Lock()
+
+
+class PromptFragmentCache:
+    """Bounded memo of the system prompt fragments one middleware renders.
+
+    Fragments are keyed by a fingerprint of the inputs they are built from, so a
+    fragment is only rendered again when its inputs change and is otherwise the same
+    string on every model call. A fragment served more than once is stable across
+    calls; `cacheable_prefix_length` ends the stable prefix of a composed prompt at the
+    first fragment that is not.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_FRAGMENT_CACHE_SIZE) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of fragments kept, least recently used first out.
+        """
+        self.maxsize = maxsize
+        self._fragments: OrderedDict[Hashable, str] = OrderedDict()
+        # Number of times each cached fragment was served
+        self._served: dict[str, int] = {}
+        self._lock = threading.Lock()
+        with _fragment_caches_lock:
+            _fragment_caches.add(self)
+
+    def render(self, key: Hashable | None, build: Callable[[], str]) -> str:
+        """Return the fragment for `key`, building it with `build` on a miss.
+
+        Args:
+            key: Fingerprint of the inputs of the fragment, or `None` if they cannot
+                be fingerprinted, in which case the fragment is built and not cached.
+            build: Builds the fragment from its inputs.
+
+        Returns:
+            The fragment text.
+        """
+        if key is None:
+            return build()
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None:
+                self._fragments.move_to_end(key)
+                self._served[fragment] += 1
+                return fragment
+        fragment = build()
+        with self._lock:
+            existing = self._fragments.get(key)
+            if existing is not None:
+                self._served[existing] += 1
+                return existing
+            self._fragments[key] = fragment
+            self._served[fragment] = self._served.get(fragment, 0) + 1
+            while len(self._fragments) > self.maxsize:
+                _, evicted = self._fragments.popitem(last=False)
+                if evicted not in self._fragments.values():
+                    del self._served[evicted]
+        return fragment
+
+    def is_stable(self, fragment: str) -> bool | None:
+        """Whether `fragment` was served more than once, `None` if this cache does not hold it."""
+        with self._lock:
+            served = self._served.get(fragment)
+        return None if served is None else served > 1
+
 
 def append_to_system_message(
     system_message: SystemMessage | None,
@@ -9,6 +90,12 @@ def append_to_system_message(
 ) -> SystemMessage:
     """Append text to a system message.
 
+    Middleware compose the system prompt by appending one fragment each on every model
+    call. Each call returns a new `SystemMessage`, but the same base message and fragment
+    always yield the same content blocks, byte for byte, which keeps the prompt prefix
+    stable for provider prompt caching. Render fragments that depend on state through a
+    `PromptFragmentCache` so `cacheable_prefix_length` can tell which of them changed.
+
     Args:
         system_message: Existing system message or None.
         text: Text to add to the system message.
@@ -21,3 +108,34 @@ def append_to_system_message(
         text = f"\n\n{text}"
     new_content.append({"type": "text", "text": text})
     return SystemMessage(content_blocks=new_content)
+
+
+def cacheable_prefix_length(system_message: SystemMessage | None) -> int:
+    """Return how many leading characters of a composed system prompt are stable across calls.
+
+    The prefix covers the leading text blocks up to the first fragment that a
+    `PromptFragmentCache` rendered for its current inputs but has not served again yet,
+    i.e. the part of the prompt a provider prompt cache can reuse from an earlier
+    request. Blocks no fragment cache holds, such as the base prompt and static
+    fragments, are assumed stable.
+
+    Args:
+        system_message: A system message built with `append_to_system_message`.
+
+    Returns:
+        Number of characters in the stable prefix, `0` if none is known.
+    """
+    if system_message is None:
+        return 0
+    with _fragment_caches_lock:
+        caches = list(_fragment_caches)
+    length = 0
+    for i, block in enumerate(system_message.content_blocks):
+        if block.get("type") != "text":
+            break
+        text = block.get("text", "")
+        fragment = text[2:] if i and text.startswith("\n\n") else text
+        if any(cache.is_stable(fragment) is False for cache in caches):
+            break
+        length += len(text)
+    return length
@@ -1,14 +1,20 @@
 """Middleware for providing filesystem tools to an agent."""
 # ruff: noqa: E501
 
+import asyncio
 import base64
-from collections.abc import Awaitable, Callable
-from pathlib import Path
-from typing import Annotated, Any, Literal, NotRequired, cast
+import functools
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterator
+from contextvars import ContextVar
+from pathlib import Path, PurePosixPath
+from typing import Annotated, Any, Literal, cast
 
 from langchain.agents.middleware.types import (
     AgentMiddleware,
-    AgentState,
     ContextT,
     ModelRequest,
     ModelResponse,
@@ -18,11 +24,14 @@ from langchain.tools import ToolRuntime
 from langchain.tools.tool_node import ToolCallRequest
 from langchain_core.messages import ToolMessage
 from langchain_core.messages.content import create_image_block
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import BaseTool, StructuredTool
+from langgraph.config import get_config
+from langgraph.runtime import Runtime
 from langgraph.types import Command
-from typing_extensions import TypedDict
 
 from deepagents.backends import StateBackend
+from deepagents.backends.cache import FileContentCache
 from deepagents.backends.composite import CompositeBackend
 from deepagents.backends.protocol import (
     BACKEND_TYPES as BACKEND_TYPES,  # Re-export type here for backwards compatibility
@@ -30,18 +39,24 @@ from deepagents.backends.protocol import (
     EditResult,
     SandboxBackendProtocol,
     WriteResult,
+    edit_accepts_line_range,
     execute_accepts_timeout,
 )
+from deepagents.backends.sandbox import BaseSandbox
 from deepagents.backends.types import FileData, FilesystemState
 from deepagents.backends.utils import (
     format_content_with_line_numbers,
     format_grep_matches,
+    format_read_content,
+    perform_string_replacement,
     sanitize_tool_call_id,
     truncate_if_too_long,
     validate_path,
 )
 from deepagents.middleware._utils import append_to_system_message
 
+logger = logging.getLogger(__name__)
+
 EMPTY_CONTENT_WARNING = "System reminder: File exists but has empty contents"
 LINE_NUMBER_WIDTH = 6
 DEFAULT_READ_OFFSET = 0
@@ -70,119 +85,10 @@ READ_FILE_TRUNCATION_MSG = (
 # Using 4 chars per token as a conservative approximation (actual ratio varies by content)
 # This errs on the high side to avoid premature eviction of content that might fit
 NUM_CHARS_PER_TOKEN = 4
-
-
-class FileData(TypedDict):
-    """Data structure for storing file contents with metadata."""
-
-    content: list[str]
-    """Lines of the file."""
-
-    created_at: str
-    """ISO 8601 timestamp of file creation."""
-
-    modified_at: str
-    """ISO 8601 timestamp of last modification."""
-
-
-def _file_data_reducer(left: dict[str, FileData] | None, right: dict[str, FileData | None]) -> dict[str, FileData]:
-    """Merge file updates with support for deletions.
-
-    This reducer enables file deletion by treating `None` values in the right
-    dictionary as deletion markers. It's designed to work with LangGraph's
-    state management where annotated reducers control how state updates merge.
-
-    Args:
-        left: Existing files dictionary. May be `None` during initialization.
-        right: New files dictionary to merge. Files with `None` values are
-            treated as deletion markers and removed from the result.
-
-    Returns:
-        Merged dictionary where right overwrites left for matching keys,
-        and `None` values in right trigger deletions.
-
-    Example:
-        ```python
-        existing = {"/file1.txt": FileData(...), "/file2.txt": FileData(...)}
-        updates = {"/file2.txt": None, "/file3.txt": FileData(...)}
-        result = file_data_reducer(existing, updates)
-        # Result: {"/file1.txt": FileData(...), "/file3.txt": FileData(...)}
-        ```
-    """
-    if left is None:
-        return {k: v for k, v in right.items() if v is not None}
-
-    result = {**left}
-    for key, value in right.items():
-        if value is None:
-            result.pop(key, None)
-        else:
-            result[key] = value
-    return result
-
-
-def _validate_path(path: str, *, allowed_prefixes: Sequence[str] | None = None) -> str:
-    r"""Validate and normalize file path for security.
-
-    Ensures paths are safe to use by preventing directory traversal attacks
-    and enforcing consistent formatting. All paths are normalized to use
-    forward slashes and start with a leading slash.
-
-    This function is designed for virtual filesystem paths and rejects
-    Windows absolute paths (e.g., C:/..., F:/...) to maintain consistency
-    and prevent path format ambiguity.
-
-    Args:
-        path: The path to validate and normalize.
-        allowed_prefixes: Optional list of allowed path prefixes. If provided,
-            the normalized path must start with one of these prefixes.
-
-    Returns:
-        Normalized canonical path starting with `/` and using forward slashes.
-
-    Raises:
-        ValueError: If path contains traversal sequences (`..` or `~`), is a
-            Windows absolute path (e.g., C:/...), or does not start with an
-            allowed prefix when `allowed_prefixes` is specified.
-
-    Example:
-        ```python
-        validate_path("foo/bar")  # Returns: "/foo/bar"
-        validate_path("/./foo//bar")  # Returns: "/foo/bar"
-        validate_path("../etc/passwd")  # Raises ValueError
-        validate_path(r"C:\\Users\\file.txt")  # Raises ValueError
-        validate_path("/data/file.txt", allowed_prefixes=["/data/"])  # OK
-        validate_path("/etc/file.txt", allowed_prefixes=["/data/"])  # Raises ValueError
-        ```
-    """
-    if ".." in path or path.startswith("~"):
-        msg = f"Path traversal not allowed: {path}"
-        raise ValueError(msg)
-
-    # Reject Windows absolute paths (e.g., C:\..., D:/...)
-    # This maintains consistency in virtual filesystem paths
-    if re.match(r"^[a-zA-Z]:", path):
-        msg = f"Windows absolute paths are not supported: {path}. Please use virtual paths starting with / (e.g., /workspace/file.txt)"
-        raise ValueError(msg)
-
-    normalized = os.path.normpath(path)
-    normalized = normalized.replace("\\", "/")
-
-    if not normalized.startswith("/"):
-        normalized = f"/{normalized}"
-
-    if allowed_prefixes is not None and not any(normalized.startswith(prefix) for prefix in allowed_prefixes):
-        msg = f"Path must start with one of {allowed_prefixes}: {path}"
-        raise ValueError(msg)
-
-    return normalized
-
-
-class FilesystemState(AgentState):
-    """State for the filesystem middleware."""
-
-    files: Annotated[NotRequired[dict[str, FileData]], _file_data_reducer]
-    """Files in the filesystem."""
+LARGE_TOOL_RESULTS_DIR = "/large_tool_results"
+_DIGEST_SLICE_CHARS = 1 << 20
+# Maximum number of `read_file` windows remembered as line range hints for edits
+_MAX_READ_WINDOWS = 256
 
 
 LIST_FILES_TOOL_DESCRIPTION = """Lists all files in a directory.
@@ -375,6 +281,12 @@ TOOLS_EXCLUDED_FROM_EVICTION = (
 )
 
 
+# Tools that leave cached file contents valid or update them on write
+TOOLS_PRESERVING_FILE_CACHE = frozenset({"ls", "read_file", "write_file", "edit_file", "glob", "grep"})
+
+# Read-only tools whose parallel calls are batched into shared backend requests
+TOOLS_BATCHED_WHEN_PARALLEL = frozenset({"ls", "read_file", "glob", "grep"})
+
 TOO_LARGE_TOOL_MSG = """Tool result too large, the result of this tool call {tool_call_id} was saved in the filesystem at this path: {file_path}
 
 You can read the result from the filesystem by using the read_file tool, but make sure to only read part of the result at a time.
@@ -387,9 +299,51 @@ Here is a preview showing the head and tail of the result (lines of the form `..
 """
 
 
+def _count_lines(content_str: str) -> int:
+    """Count lines the way evicted files are stored: one per newline, ignoring a trailing newline."""
+    if not content_str:
+        return 0
+    return content_str.count("\n") + (0 if content_str.endswith("\n") else 1)
+
+
+def _head_lines(content_str: str, count: int, *, max_chars: int) -> list[str]:
+    """Return the first `count` lines of `content_str`, each cut to `max_chars`, without splitting the whole string.
+
+    A carriage return before the newline is dropped, so CRLF content previews like `splitlines()` would.
+    """
+    lines: list[str] = []
+    start = 0
+    while len(lines) < count and start < len(content_str):
+        end = content_str.find("\n", start)
+        if end == -1:
+            end = len(content_str)
+        lines.append(content_str[start : min(end, start + max_chars)].removesuffix("\r"))
+        start = end + 1
+    return lines
+
+
+def _tail_lines(content_str: str, count: int, *, max_chars: int) -> list[str]:
+    """Return the last `count` lines of `content_str`, each cut to `max_chars`, without splitting the whole string.
+
+    A carriage return before the newline is dropped, as in `_head_lines`.
+    """
+    lines: list[str] = []
+    end = len(content_str) - 1 if content_str.endswith("\n") else len(content_str)
+    while len(lines) < count and end >= 0:
+        start = content_str.rfind("\n", 0, end) + 1
+        lines.append(content_str[start : min(end, start + max_chars)].removesuffix("\r"))
+        end = start - 1
+    lines.reverse()
+    return lines
+
+
 def _create_content_preview(content_str: str, *, head_lines: int = 5, tail_lines: int = 5) -> str:
     """Create a preview of content showing head and tail with truncation marker.
 
+    Only the previewed lines are sliced out of `content_str`, so building a preview of a
+    very large tool result does not copy it. Line numbers match those `read_file` reports
+    for the evicted file.
+
     Args:
         content_str: The full content string to preview.
         head_lines: Number of lines to show from the start.
@@ -398,24 +352,191 @@ def _create_content_preview(content_str: str, *, head_lines: int = 5, tail_lines
     Returns:
         Formatted preview string with line numbers.
     """
-    lines = content_str.splitlines()
+    total_lines = _count_lines(content_str)
 
-    if len(lines) <= head_lines + tail_lines:
+    if total_lines <= head_lines + tail_lines:
         # If file is small enough, show all lines
-        preview_lines = [line[:1000] for line in lines]
+        preview_lines = _head_lines(content_str, total_lines, max_chars=1000)
         return format_content_with_line_numbers(preview_lines, start_line=1)
 
     # Show head and tail with truncation marker
-    head = [line[:1000] for line in lines[:head_lines]]
-    tail = [line[:1000] for line in lines[-tail_lines:]]
+    head = _head_lines(content_str, head_lines, max_chars=1000)
+    tail = _tail_lines(content_str, tail_lines, max_chars=1000)
 
     head_sample = format_content_with_line_numbers(head, start_line=1)
-    truncation_notice = f"\n... [{len(lines) - head_lines - tail_lines} lines truncated] ...\n"
-    tail_sample = format_content_with_line_numbers(tail, start_line=len(lines) - tail_lines + 1)
+    truncation_notice = f"\n... [{total_lines - head_lines - tail_lines} lines truncated] ...\n"
+    tail_sample = format_content_with_line_numbers(tail, start_line=total_lines - tail_lines + 1)
 
     return head_sample + truncation_notice + tail_sample
 
 
+def _iter_content_chunks(content: str | list[str | dict]) -> Iterator[str]:
+    """Yield the text of a tool result in pieces whose concatenation is the evicted file content.
+
+    A plain string or a single text block is yielded as is. Other content yields the pieces
+    of `str(content)` one block at a time.
+    """
+    if isinstance(content, str):
+        yield content
+        return
+    if len(content) == 1 and isinstance(content[0], dict) and content[0].get("type") == "text" and "text" in content[0]:
+        # Single text block - extract text directly for readability
+        yield str(content[0]["text"])
+        return
+    yield "["
+    for i, block in enumerate(content):
+        if i:
+            yield ", "
+        yield repr(block)
+    yield "]"
+
+
+def _content_to_evict(content: str | list[str | dict], max_chars: int) -> str | None:
+    """Return the text to evict for a tool result, or `None` if it fits within `max_chars`.
+
+    Content is stringified one chunk at a time and the size check stops as soon as the
+    limit is crossed, so results under the limit are never joined into one string and
+    plain string results are never copied.
+    """
+    chunks = _iter_content_chunks(content)
+    parts: list[str] = []
+    size = 0
+    for chunk in chunks:
+        parts.append(chunk)
+        size += len(chunk)
+        if size > max_chars:
+            break
+    else:
+        return None
+    parts.extend(chunks)
+    return parts[0] if len(parts) == 1 else "".join(parts)
+
+
+def _content_digest(content_str: str) -> str:
+    """Hash `content_str` in bounded slices so large results are never encoded in one piece."""
+    digest = hashlib.sha256()
+    for start in range(0, len(content_str), _DIGEST_SLICE_CHARS):
+        digest.update(content_str[start : start + _DIGEST_SLICE_CHARS].encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()[:32]
+
+
+# What the batch of the current tool call fetched for it: the call it was fetched for, and the result
+_prefetched_result: ContextVar[tuple[tuple[Any, ...], Any] | None] = ContextVar("_prefetched_result", default=None)
+
+
+def _prefetched(call: tuple[Any, ...]) -> Any | None:  # noqa: ANN401
+    """Return what the batch of the current tool call fetched for `call`, or `None` if it fetched nothing."""
+    prefetched = _prefetched_result.get()
+    return prefetched[1] if prefetched is not None and prefetched[0] == call else None
+
+
+def _batched_call(name: str, args: dict[str, Any]) -> tuple[Any, ...] | None:
+    """Identify what a read-only tool call fetches from the backend, or `None` if it is not batched.
+
+    The tools look their prefetched result up under the same tuple, built from their
+    validated arguments.
+    """
+    try:
+        if name == "read_file":
+            file_path = validate_path(args["file_path"])
+            if Path(file_path).suffix.lower() in IMAGE_EXTENSIONS:
+                return None
+            return ("read_file", file_path, args.get("offset", DEFAULT_READ_OFFSET), args.get("limit", DEFAULT_READ_LIMIT))
+        if name == "ls":
+            return ("ls", validate_path(args["path"]))
+        if name == "glob":
+            return ("glob", args["pattern"], validate_path(args.get("path", "/")))
+        if name == "grep":
+            return ("grep", args["pattern"], args.get("path"), args.get("glob"))
+    except (KeyError, TypeError, ValueError):
+        pass
+    return None
+
+
+def _batched_operation(call: tuple[Any, ...]) -> tuple[str, dict[str, Any]]:
+    """Return the backend method, and its arguments, that fetches a batched tool call."""
+    if call[0] == "read_file":
+        return "read", {"file_path": call[1], "offset": call[2], "limit": call[3]}
+    if call[0] == "ls":
+        return "ls_info", {"path": call[1]}
+    if call[0] == "glob":
+        return "glob_info", {"pattern": call[1], "path": call[2]}
+    return "grep_raw", {"pattern": call[1], "path": call[2], "glob": call[3]}
+
+
+class _ToolCallBatcher:
+    """Coalesce concurrent read-only tool calls into batched backend requests.
+
+    Calls started in the same event loop iteration with the same scope, as the tool node
+    issues them for parallel tool calls, join one pending batch. Once no more calls join,
+    `fetch` fetches what the calls of the batch need with as few backend requests as it
+    can, and each call gets back its own result. The scope identifies the data the
+    backend sees (see `FilesystemMiddleware._backend_scope`), so calls for different
+    threads, users or subagents never share a batch.
+    A call that ends up alone in its batch, or whose batch raised, gets `None` and reads
+    from the backend on its own.
+    """
+
+    def __init__(self, fetch: Callable[[list[ToolCallRequest]], Awaitable[list[Any]]]) -> None:
+        self._fetch = fetch
+        self._pending: dict[tuple[asyncio.AbstractEventLoop, int], list[tuple[ToolCallRequest, asyncio.Future[Any]]]] = {}
+        self._flushes: set[asyncio.Task[None]] = set()
+
+    async def join(self, request: ToolCallRequest, *, scope: int) -> Any | None:  # noqa: ANN401
+        """Add `request` to the current batch of `scope` and return what the batch fetched for it."""
+        loop = asyncio.get_running_loop()
+        key = (loop, scope)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = []
+            flush = loop.create_task(self._flush(key))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+        future: asyncio.Future[Any] = loop.create_future()
+        pending.append((request, future))
+        # Shield the shared batch so one cancelled call does not cancel the others
+        return await asyncio.shield(future)
+
+    async def _flush(self, key: tuple[asyncio.AbstractEventLoop, int]) -> None:
+        # Let calls started concurrently with the first one join the batch
+        await asyncio.sleep(0)
+        calls = self._pending.pop(key)
+        results: list[Any] = [None] * len(calls)
+        if len(calls) > 1:
+            try:
+                fetched = await self._fetch([request for request, _ in calls])
+            except Exception:  # noqa: BLE001
+                logger.debug("Batch of %d tool calls failed, running them one by one", len(calls), exc_info=True)
+            else:
+                results[: len(fetched)] = fetched[: len(results)]
+        for (_, future), result in zip(calls, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+
+def _thread_id(config: RunnableConfig | None) -> str | None:
+    """Return the thread id of a run config, or `None` when running without one."""
+    thread_id = (config or {}).get("configurable", {}).get("thread_id")
+    return None if thread_id is None else str(thread_id)
+
+
+def _current_thread_id() -> str | None:
+    """Return the thread id of the current run, or `None` outside of a runnable context."""
+    try:
+        return _thread_id(get_config())
+    except RuntimeError:
+        return None
+
+
+@functools.cache
+def _filesystem_system_prompt(*, include_execution: bool) -> str:
+    """Build the filesystem system prompt, adding execution instructions if `include_execution`."""
+    prompt_parts = [FILESYSTEM_SYSTEM_PROMPT]
+    if include_execution:
+        prompt_parts.append(EXECUTION_SYSTEM_PROMPT)
+    return "\n\n".join(prompt_parts).strip()
+
+
 class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]):
     """Middleware for providing filesystem and optional execution tools to an agent.
 
@@ -445,6 +566,13 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
 
             When exceeded, writes the result using the configured backend and replaces it
             with a truncated preview and file reference.
+        deduplicate_evictions: Whether to store evicted tool results under a hash of their
+            content instead of their tool call id.
+
+            Repeated large results (e.g. re-running a command or re-reading a huge file)
+            then cost one write and no extra state. `create_deep_agent` turns this on.
+            Evicted files are never deleted, as summaries and offloaded conversation
+            history may still point at them.
 
     Example:
         ```python
@@ -477,6 +605,7 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         custom_tool_descriptions: dict[str, str] | None = None,
         tool_token_limit_before_evict: int | None = 20000,
         max_execute_timeout: int = 3600,
+        deduplicate_evictions: bool = False,
     ) -> None:
         """Initialize the filesystem middleware.
 
@@ -491,6 +620,8 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
 
                 Defaults to 3600 seconds (1 hour). Any per-command timeout
                 exceeding this value will be rejected with an error message.
+            deduplicate_evictions: Whether to store evicted tool results under a hash of
+                their content so repeated results are written only once.
 
         Raises:
             ValueError: If `max_execute_timeout` is not positive.
@@ -506,6 +637,11 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         self._custom_tool_descriptions = custom_tool_descriptions or {}
         self._tool_token_limit_before_evict = tool_token_limit_before_evict
         self._max_execute_timeout = max_execute_timeout
+        self._deduplicate_evictions = deduplicate_evictions
+        self._tool_call_batcher = _ToolCallBatcher(self._afetch_batch)
+        self._file_cache = FileContentCache.for_backend(self.backend)
+        self._read_windows: OrderedDict[tuple[str, str], tuple[int, int]] = OrderedDict()
+        self._read_windows_lock = threading.Lock()
 
         self.tools = [
             self._create_ls_tool(),
@@ -530,6 +666,17 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
             return self.backend(runtime)
         return self.backend
 
+    def _backend_scope(self, runtime: ToolRuntime[Any, Any]) -> int:
+        """Identify the data the backend resolved for `runtime` sees.
+
+        A configured backend instance is shared by every tool call. Backends built by a
+        factory are resolved per call, so two calls share a scope only when they run
+        against the same agent state, i.e. parallel calls of one agent step.
+        """
+        if callable(self.backend):
+            return id(runtime.state)
+        return id(self.backend)
+
     def _create_ls_tool(self) -> BaseTool:
         """Create the ls (list files) tool."""
         tool_description = self._custom_tool_descriptions.get("ls") or LIST_FILES_TOOL_DESCRIPTION
@@ -540,7 +687,10 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         ) -> str:
             """Synchronous wrapper for ls tool."""
             resolved_backend = self._get_backend(runtime)
-            validated_path = _validate_path(path)
+            try:
+                validated_path = validate_path(path)
+            except ValueError as e:
+                return f"Error: {e}"
             infos = resolved_backend.ls_info(validated_path)
             paths = [fi.get("path", "") for fi in infos]
             result = truncate_if_too_long(paths)
@@ -552,8 +702,13 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         ) -> str:
             """Asynchronous wrapper for ls tool."""
             resolved_backend = self._get_backend(runtime)
-            validated_path = _validate_path(path)
-            infos = await resolved_backend.als_info(validated_path)
+            try:
+                validated_path = validate_path(path)
+            except ValueError as e:
+                return f"Error: {e}"
+            infos = _prefetched(("ls", validated_path))
+            if infos is None:
+                infos = await resolved_backend.als_info(validated_path)
             paths = [fi.get("path", "") for fi in infos]
             result = truncate_if_too_long(paths)
             return str(result)
@@ -565,6 +720,144 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
             coroutine=async_ls,
         )
 
+    @property
+    def file_cache(self) -> FileContentCache:
+        """Cache of file contents read and written by the tools, shared by all users of the backend."""
+        return self._file_cache
+
+    def _remember_read_window(self, thread_id: str | None, file_path: str, offset: int, limit: int) -> None:
+        """Record the lines of the last `read_file` call on a file, used as a hint for edits.
+
+        Nothing is recorded without a thread id, so that runs cannot steer each other's edits.
+        """
+        if thread_id is None:
+            return
+        with self._read_windows_lock:
+            self._read_windows[thread_id, file_path] = (offset, offset + limit)
+            self._read_windows.move_to_end((thread_id, file_path))
+            while len(self._read_windows) > _MAX_READ_WINDOWS:
+                self._read_windows.popitem(last=False)
+
+    def _edit_options(self, backend: BackendProtocol, thread_id: str | None, file_path: str, *, replace_all: bool) -> dict[str, Any]:
+        """Return the keyword arguments of a backend edit, with the last read window of the file as `line_range` hint."""
+        options: dict[str, Any] = {"replace_all": replace_all}
+        if thread_id is not None and not replace_all and edit_accepts_line_range(type(backend)):
+            with self._read_windows_lock:
+                line_range = self._read_windows.get((thread_id, file_path))
+            if line_range is not None:
+                options["line_range"] = line_range
+        return options
+
+    def _read_cached(self, backend: BackendProtocol, file_path: str, *, offset: int, limit: int, thread_id: str | None) -> str:
+        """Read a file through the file content cache."""
+        self._remember_read_window(thread_id, file_path, offset, limit)
+        content = self._file_cache.read(backend, file_path, thread_id=thread_id)
+        if content is None:
+            return backend.read(file_path, offset=offset, limit=limit)
+        return format_read_content(content, offset, limit)
+
+    async def _aread_cached(self, backend: BackendProtocol, file_path: str, *, offset: int, limit: int, thread_id: str | None) -> str:
+        """Read a file through the file content cache, unless the batch of the tool call already read it."""
+        self._remember_read_window(thread_id, file_path, offset, limit)
+        prefetched = _prefetched(("read_file", file_path, offset, limit))
+        if prefetched is not None:
+            return prefetched
+        content = await self._file_cache.aread(backend, file_path, thread_id=thread_id)
+        if content is None:
+            return await backend.aread(file_path, offset=offset, limit=limit)
+        return format_read_content(content, offset, limit)
+
+    async def _afetch_batch(self, requests: list[ToolCallRequest]) -> list[tuple[tuple[Any, ...], Any] | None]:
+        """Fetch what a batch of parallel read-only tool calls needs with as few backend requests as possible.
+
+        `read_file` calls the file content cache misses download their files together.
+        On a `BaseSandbox`, all other calls, including reads of files the cache does not
+        keep, run in a single `execute` call. Calls left out, e.g. `ls` on an in-process
+        backend, get `None` and run on their own.
+
+        Args:
+            requests: The tool calls of the batch, all resolving to the same backend.
+
+        Returns:
+            For each call, the call it was fetched for and its backend result, or `None`.
+        """
+        backend = self._get_backend(requests[0].runtime)
+        results: list[tuple[tuple[Any, ...], Any] | None] = [None] * len(requests)
+        downloads: list[tuple[int, tuple[Any, ...], str | None, Any]] = []
+        operations: list[tuple[int, tuple[Any, ...]]] = []
+        for i, request in enumerate(requests):
+            call = _batched_call(request.tool_call["name"], request.tool_call["args"])
+            if call is None:
+                continue
+            if call[0] == "read_file":
+                _, file_path, offset, limit = call
+                thread_id = _thread_id(request.runtime.config)
+                content = self._file_cache.get(backend, file_path, thread_id=thread_id)
+                if content is not None:
+                    results[i] = (call, format_read_content(content, offset, limit))
+                    continue
+                download, version = self._file_cache.prepare_download(backend, file_path, thread_id=thread_id)
+                if download:
+                    downloads.append((i, call, thread_id, version))
+                    continue
+            operations.append((i, call))
+
+        for fetched in await asyncio.gather(self._adownload_batch(backend, downloads), self._arun_batch(backend, operations)):
+            for i, result in fetched.items():
+                results[i] = result
+        return results
+
+    async def _adownload_batch(
+        self, backend: BackendProtocol, downloads: list[tuple[int, tuple[Any, ...], str | None, Any]]
+    ) -> dict[int, tuple[tuple[Any, ...], str]]:
+        """Download the files of batched `read_file` cache misses in one request and cache them."""
+        if not downloads:
+            return {}
+        paths = list(dict.fromkeys(call[1] for _, call, _, _ in downloads))
+        responses = dict(zip(paths, await backend.adownload_files(paths), strict=False))
+        logger.debug("Batched %d read_file calls into one download", len(downloads))
+        results: dict[int, tuple[tuple[Any, ...], str]] = {}
+        for i, call, thread_id, version in downloads:
+            _, file_path, offset, limit = call
+            content = self._file_cache.put_download(backend, file_path, responses.get(file_path), thread_id=thread_id, version=version)
+            if content is not None:
+                results[i] = (call, format_read_content(content, offset, limit))
+        return results
+
+    @staticmethod
+    async def _arun_batch(backend: BackendProtocol, operations: list[tuple[int, tuple[Any, ...]]]) -> dict[int, tuple[tuple[Any, ...], Any]]:
+        """Run batched tool calls in a single sandbox command."""
+        # Only sandboxes combine operations; other backends gain nothing over separate calls
+        if not isinstance(backend, BaseSandbox) or len(operations) < 2:  # noqa: PLR2004
+            return {}
+        fetched = await backend.abatch_file_operations([_batched_operation(call) for _, call in operations])
+        logger.debug("Batched %d read-only tool calls into one sandbox command", len(operations))
+        return {i: (call, result) for (i, call), result in zip(operations, fetched, strict=True)}
+
+    def _update_cache_after_edit(
+        self,
+        backend: BackendProtocol,
+        file_path: str,
+        cached: str | None,
+        old_string: str,
+        new_string: str,
+        *,
+        replace_all: bool,
+        thread_id: str | None,
+        line_range: tuple[int, int] | None = None,
+    ) -> None:
+        """Apply a successful edit to the content of a file cached before it, or drop the file if it cannot be applied."""
+        # Backends read files with universal newlines, so edits of CRLF content may not match
+        result = (
+            perform_string_replacement(cached, old_string, new_string, replace_all, line_range=line_range)
+            if cached is not None and "\r" not in cached
+            else None
+        )
+        if isinstance(result, tuple):
+            self._file_cache.put(backend, file_path, result[0], thread_id=thread_id)
+        else:
+            self._file_cache.invalidate(thread_id, file_path)
+
     def _create_read_file_tool(self) -> BaseTool:  # noqa: C901
         """Create the read_file tool."""
         tool_description = self._custom_tool_descriptions.get("read_file") or READ_FILE_TOOL_DESCRIPTION
@@ -578,8 +871,31 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         ) -> ToolMessage | str:
             """Synchronous wrapper for read_file tool."""
             resolved_backend = self._get_backend(runtime)
-            validated_path = _validate_path(file_path)
-            result = resolved_backend.read(validated_path, offset=offset, limit=limit)
+            try:
+                validated_path = validate_path(file_path)
+            except ValueError as e:
+                return f"Error: {e}"
+
+            ext = Path(validated_path).suffix.lower()
+            if ext in IMAGE_EXTENSIONS:
+                responses = resolved_backend.download_files([validated_path])
+                if responses and responses[0].content is not None:
+                    media_type = IMAGE_MEDIA_TYPES.get(ext, "image/png")
+                    image_b64 = base64.standard_b64encode(responses[0].content).decode("utf-8")
+                    return ToolMessage(
+                        content_blocks=[create_image_block(base64=image_b64, mime_type=media_type)],
+                        name="read_file",
+                        tool_call_id=runtime.tool_call_id,
+                        additional_kwargs={
+                            "read_file_path": validated_path,
+                            "read_file_media_type": media_type,
+                        },
+                    )
+                if responses and responses[0].error:
+                    return f"Error reading image: {responses[0].error}"
+                return "Error reading image: unknown error"
+
+            result = self._read_cached(resolved_backend, validated_path, offset=offset, limit=limit, thread_id=_thread_id(runtime.config))
 
             lines = result.splitlines(keepends=True)
             if len(lines) > limit:
@@ -604,8 +920,31 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         ) -> ToolMessage | str:
             """Asynchronous wrapper for read_file tool."""
             resolved_backend = self._get_backend(runtime)
-            validated_path = _validate_path(file_path)
-            result = await resolved_backend.aread(validated_path, offset=offset, limit=limit)
+            try:
+                validated_path = validate_path(file_path)
+            except ValueError as e:
+                return f"Error: {e}"
+
+            ext = Path(validated_path).suffix.lower()
+            if ext in IMAGE_EXTENSIONS:
+                responses = await resolved_backend.adownload_files([validated_path])
+                if responses and responses[0].content is not None:
+                    media_type = IMAGE_MEDIA_TYPES.get(ext, "image/png")
+                    image_b64 = base64.standard_b64encode(responses[0].content).decode("utf-8")
+                    return ToolMessage(
+                        content_blocks=[create_image_block(base64=image_b64, mime_type=media_type)],
+                        name="read_file",
+                        tool_call_id=runtime.tool_call_id,
+                        additional_kwargs={
+                            "read_file_path": validated_path,
+                            "read_file_media_type": media_type,
+                        },
+                    )
+                if responses and responses[0].error:
+                    return f"Error reading image: {responses[0].error}"
+                return "Error reading image: unknown error"
+
+            result = await self._aread_cached(resolved_backend, validated_path, offset=offset, limit=limit, thread_id=_thread_id(runtime.config))
 
             lines = result.splitlines(keepends=True)
             if len(lines) > limit:
@@ -640,10 +979,14 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         ) -> Command | str:
             """Synchronous wrapper for write_file tool."""
             resolved_backend = self._get_backend(runtime)
-            validated_path = _validate_path(file_path)
+            try:
+                validated_path = validate_path(file_path)
+            except ValueError as e:
+                return f"Error: {e}"
             res: WriteResult = resolved_backend.write(validated_path, content)
             if res.error:
                 return res.error
+            self._file_cache.put(resolved_backend, validated_path, content, thread_id=_thread_id(runtime.config))
             # If backend returns state update, wrap into Command with ToolMessage
             if res.files_update is not None:
                 return Command(
@@ -666,10 +1009,14 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         ) -> Command | str:
             """Asynchronous wrapper for write_file tool."""
             resolved_backend = self._get_backend(runtime)
-            validated_path = _validate_path(file_path)
+            try:
+                validated_path = validate_path(file_path)
+            except ValueError as e:
+                return f"Error: {e}"
             res: WriteResult = await resolved_backend.awrite(validated_path, content)
             if res.error:
                 return res.error
+            self._file_cache.put(resolved_backend, validated_path, content, thread_id=_thread_id(runtime.config))
             # If backend returns state update, wrap into Command with ToolMessage
             if res.files_update is not None:
                 return Command(
@@ -706,10 +1053,17 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         ) -> Command | str:
             """Synchronous wrapper for edit_file tool."""
             resolved_backend = self._get_backend(runtime)
-            validated_path = _validate_path(file_path)
-            res: EditResult = resolved_backend.edit(validated_path, old_string, new_string, replace_all=replace_all)
+            try:
+                validated_path = validate_path(file_path)
+            except ValueError as e:
+                return f"Error: {e}"
+            thread_id = _thread_id(runtime.config)
+            cached = self._file_cache.get(resolved_backend, validated_path, thread_id=thread_id)
+            options = self._edit_options(resolved_backend, thread_id, validated_path, replace_all=replace_all)
+            res: EditResult = resolved_backend.edit(validated_path, old_string, new_string, **options)
             if res.error:
                 return res.error
+            self._update_cache_after_edit(resolved_backend, validated_path, cached, old_string, new_string, thread_id=thread_id, **options)
             if res.files_update is not None:
                 return Command(
                     update={
@@ -734,10 +1088,17 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         ) -> Command | str:
             """Asynchronous wrapper for edit_file tool."""
             resolved_backend = self._get_backend(runtime)
-            validated_path = _validate_path(file_path)
-            res: EditResult = await resolved_backend.aedit(validated_path, old_string, new_string, replace_all=replace_all)
+            try:
+                validated_path = validate_path(file_path)
+            except ValueError as e:
+                return f"Error: {e}"
+            thread_id = _thread_id(runtime.config)
+            cached = self._file_cache.get(resolved_backend, validated_path, thread_id=thread_id)
+            options = self._edit_options(resolved_backend, thread_id, validated_path, replace_all=replace_all)
+            res: EditResult = await resolved_backend.aedit(validated_path, old_string, new_string, **options)
             if res.error:
                 return res.error
+            self._update_cache_after_edit(resolved_backend, validated_path, cached, old_string, new_string, thread_id=thread_id, **options)
             if res.files_update is not None:
                 return Command(
                     update={
@@ -770,7 +1131,11 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         ) -> str:
             """Synchronous wrapper for glob tool."""
             resolved_backend = self._get_backend(runtime)
-            infos = resolved_backend.glob_info(pattern, path=path)
+            try:
+                validated_path = validate_path(path)
+            except ValueError as e:
+                return f"Error: {e}"
+            infos = resolved_backend.glob_info(pattern, path=validated_path)
             paths = [fi.get("path", "") for fi in infos]
             result = truncate_if_too_long(paths)
             return str(result)
@@ -782,7 +1147,13 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         ) -> str:
             """Asynchronous wrapper for glob tool."""
             resolved_backend = self._get_backend(runtime)
-            infos = await resolved_backend.aglob_info(pattern, path=path)
+            try:
+                validated_path = validate_path(path)
+            except ValueError as e:
+                return f"Error: {e}"
+            infos = _prefetched(("glob", pattern, validated_path))
+            if infos is None:
+                infos = await resolved_backend.aglob_info(pattern, path=validated_path)
             paths = [fi.get("path", "") for fi in infos]
             result = truncate_if_too_long(paths)
             return str(result)
@@ -810,7 +1181,7 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         ) -> str:
             """Synchronous wrapper for grep tool."""
             resolved_backend = self._get_backend(runtime)
-            raw = resolved_backend.grep_raw(pattern, path=path, glob=glob, runtime=runtime)
+            raw = resolved_backend.grep_raw(pattern, path=path, glob=glob)
             if isinstance(raw, str):
                 return raw
             formatted = format_grep_matches(raw, output_mode)
@@ -828,7 +1199,9 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         ) -> str:
             """Asynchronous wrapper for grep tool."""
             resolved_backend = self._get_backend(runtime)
-            raw = await resolved_backend.agrep_raw(pattern, path=path, glob=glob, runtime=runtime)
+            raw = _prefetched(("grep", pattern, path, glob))
+            if raw is None:
+                raw = await resolved_backend.agrep_raw(pattern, path=path, glob=glob)
             if isinstance(raw, str):
                 return raw
             formatted = format_grep_matches(raw, output_mode)
@@ -993,13 +1366,7 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
             system_prompt = self._custom_system_prompt
         else:
             # Build dynamic system prompt based on available tools
-            prompt_parts = [FILESYSTEM_SYSTEM_PROMPT]
-
-            # Add execution instructions if execute tool is available
-            if has_execute_tool and backend_supports_execution:
-                prompt_parts.append(EXECUTION_SYSTEM_PROMPT)
-
-            system_prompt = "\n\n".join(prompt_parts).strip()
+            system_prompt = _filesystem_system_prompt(include_execution=has_execute_tool and backend_supports_execution)
 
         if system_prompt:
             new_system_message = append_to_system_message(request.system_message, system_prompt)
@@ -1041,13 +1408,7 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
             system_prompt = self._custom_system_prompt
         else:
             # Build dynamic system prompt based on available tools
-            prompt_parts = [FILESYSTEM_SYSTEM_PROMPT]
-
-            # Add execution instructions if execute tool is available
-            if has_execute_tool and backend_supports_execution:
-                prompt_parts.append(EXECUTION_SYSTEM_PROMPT)
-
-            system_prompt = "\n\n".join(prompt_parts).strip()
+            system_prompt = _filesystem_system_prompt(include_execution=has_execute_tool and backend_supports_execution)
 
         if system_prompt:
             new_system_message = append_to_system_message(request.system_message, system_prompt)
@@ -1055,6 +1416,65 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
 
         return await handler(request)
 
+    def before_agent(self, state: FilesystemState, runtime: Runtime[ContextT]) -> dict[str, Any] | None:  # noqa: ARG002
+        """Start a run by dropping unversioned cached files.
+
+        Files cached from backends that cannot be revalidated may have changed since the
+        previous run, so they are read again.
+
+        Args:
+            state: The current agent state.
+            runtime: The runtime context.
+
+        Returns:
+            Always `None`; the agent state is left unchanged.
+        """
+        self._file_cache.invalidate(_current_thread_id(), unversioned_only=True)
+        return None
+
+    async def abefore_agent(self, state: FilesystemState, runtime: Runtime[ContextT]) -> dict[str, Any] | None:
+        """Start a run by dropping unversioned cached files.
+
+        Args:
+            state: The current agent state.
+            runtime: The runtime context.
+
+        Returns:
+            Always `None`; the agent state is left unchanged.
+        """
+        return self.before_agent(state, runtime)
+
+    def _evicted_result_path(self, tool_call_id: str, content_str: str) -> str:
+        if self._deduplicate_evictions:
+            return f"{LARGE_TOOL_RESULTS_DIR}/{_content_digest(content_str)}"
+        return f"{LARGE_TOOL_RESULTS_DIR}/{sanitize_tool_call_id(tool_call_id)}"
+
+    def _store_evicted_result(self, backend: BackendProtocol, file_path: str, content_str: str) -> tuple[bool, dict[str, FileData] | None]:
+        """Write evicted content unless identical content is already stored at `file_path`.
+
+        Returns:
+            Whether the content is stored, and the files update of the write, if any.
+        """
+        name = PurePosixPath(file_path).name
+        if self._deduplicate_evictions and backend.glob_info(name, path=LARGE_TOOL_RESULTS_DIR):
+            return True, None
+        result = backend.write(file_path, content_str)
+        if result.error:
+            # A parallel tool call may have stored the same content first
+            return self._deduplicate_evictions and bool(backend.glob_info(name, path=LARGE_TOOL_RESULTS_DIR)), None
+        return True, result.files_update
+
+    async def _astore_evicted_result(self, backend: BackendProtocol, file_path: str, content_str: str) -> tuple[bool, dict[str, FileData] | None]:
+        """Async version of `_store_evicted_result`."""
+        name = PurePosixPath(file_path).name
+        if self._deduplicate_evictions and await backend.aglob_info(name, path=LARGE_TOOL_RESULTS_DIR):
+            return True, None
+        result = await backend.awrite(file_path, content_str)
+        if result.error:
+            # A parallel tool call may have stored the same content first
+            return self._deduplicate_evictions and bool(await backend.aglob_info(name, path=LARGE_TOOL_RESULTS_DIR)), None
+        return True, result.files_update
+
     def _process_large_message(
         self,
         message: ToolMessage,
@@ -1070,11 +1490,15 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
             A tuple of (processed_message, files_update):
             - processed_message: New ToolMessage with truncated content and file reference
             - files_update: Dict of file updates to apply to state, or None if eviction failed
+              or reused content that was already stored
 
         Note:
-            The entire content is converted to string, written to /large_tool_results/{tool_call_id},
+            The entire content is converted to string, written to /large_tool_results/{tool_call_id}
+            (or /large_tool_results/{content_hash} with `deduplicate_evictions`),
             and replaced with a truncated preview plus file reference. The replacement is always
             returned as a plain string for consistency, regardless of original content type.
+            Content is stringified chunk by chunk and only joined once it is known to exceed
+            the limit; string content is written and previewed without being copied.
 
             ToolMessage supports multimodal content blocks (images, audio, etc.), but these are
             uncommon in tool results. For simplicity, all content is stringified and evicted.
@@ -1084,31 +1508,14 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         if not self._tool_token_limit_before_evict:
             return message, None
 
-        # Convert content to string once for both size check and eviction
-        # Special case: single text block - extract text directly for readability
-        if (
-            isinstance(message.content, list)
-            and len(message.content) == 1
-            and isinstance(message.content[0], dict)
-            and message.content[0].get("type") == "text"
-            and "text" in message.content[0]
-        ):
-            content_str = str(message.content[0]["text"])
-        elif isinstance(message.content, str):
-            content_str = message.content
-        else:
-            # Multiple blocks or non-text content - stringify entire structure
-            content_str = str(message.content)
-
-        # Check if content exceeds eviction threshold
-        if len(content_str) <= NUM_CHARS_PER_TOKEN * self._tool_token_limit_before_evict:
+        content_str = _content_to_evict(message.content, NUM_CHARS_PER_TOKEN * self._tool_token_limit_before_evict)
+        if content_str is None:
             return message, None
 
-        # Write content to filesystem
-        sanitized_id = sanitize_tool_call_id(message.tool_call_id)
-        file_path = f"/large_tool_results/{sanitized_id}"
-        result = resolved_backend.write(file_path, content_str)
-        if result.error:
+        # Write content to filesystem, or reuse identical content evicted earlier
+        file_path = self._evicted_result_path(message.tool_call_id, content_str)
+        stored, files_update = self._store_evicted_result(resolved_backend, file_path, content_str)
+        if not stored:
             return message, None
 
         # Create preview showing head and tail of the result
@@ -1125,7 +1532,7 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
             tool_call_id=message.tool_call_id,
             name=message.name,
         )
-        return processed_message, result.files_update
+        return processed_message, files_update
 
     async def _aprocess_large_message(
         self,
@@ -1141,30 +1548,14 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         if not self._tool_token_limit_before_evict:
             return message, None
 
-        # Convert content to string once for both size check and eviction
-        # Special case: single text block - extract text directly for readability
-        if (
-            isinstance(message.content, list)
-            and len(message.content) == 1
-            and isinstance(message.content[0], dict)
-            and message.content[0].get("type") == "text"
-            and "text" in message.content[0]
-        ):
-            content_str = str(message.content[0]["text"])
-        elif isinstance(message.content, str):
-            content_str = message.content
-        else:
-            # Multiple blocks or non-text content - stringify entire structure
-            content_str = str(message.content)
-
-        if len(content_str) <= NUM_CHARS_PER_TOKEN * self._tool_token_limit_before_evict:
+        content_str = _content_to_evict(message.content, NUM_CHARS_PER_TOKEN * self._tool_token_limit_before_evict)
+        if content_str is None:
             return message, None
 
-        # Write content to filesystem using async method
-        sanitized_id = sanitize_tool_call_id(message.tool_call_id)
-        file_path = f"/large_tool_results/{sanitized_id}"
-        result = await resolved_backend.awrite(file_path, content_str)
-        if result.error:
+        # Write content to filesystem using async methods, or reuse identical content evicted earlier
+        file_path = self._evicted_result_path(message.tool_call_id, content_str)
+        stored, files_update = await self._astore_evicted_result(resolved_backend, file_path, content_str)
+        if not stored:
             return message, None
 
         # Create preview showing head and tail of the result
@@ -1181,7 +1572,7 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
             tool_call_id=message.tool_call_id,
             name=message.name,
         )
-        return processed_message, result.files_update
+        return processed_message, files_update
 
     def _intercept_large_tool_result(self, tool_result: ToolMessage | Command, runtime: ToolRuntime) -> ToolMessage | Command:
         """Intercept and process large tool results before they're added to state.
@@ -1287,6 +1678,11 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         msg = f"Unreachable code reached in _aintercept_large_tool_result: for tool_result of type {type(tool_result)}"
         raise AssertionError(msg)
 
+    def _invalidate_file_cache_after(self, request: ToolCallRequest) -> None:
+        """Drop unversioned cached files after a tool that may have changed them behind the cache, e.g. `execute`."""
+        if request.tool_call["name"] not in TOOLS_PRESERVING_FILE_CACHE:
+            self._file_cache.invalidate(_thread_id(request.runtime.config), unversioned_only=True)
+
     def wrap_tool_call(
         self,
         request: ToolCallRequest,
@@ -1294,6 +1690,9 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
     ) -> ToolMessage | Command:
         """Check the size of the tool call result and evict to filesystem if too large.
 
+        Cached file contents the tool may have changed outside of the filesystem tools
+        are dropped afterwards.
+
         Args:
             request: The tool call request being processed.
             handler: The handler function to call with the modified request.
@@ -1302,10 +1701,11 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
             The raw ToolMessage, or a pseudo tool message with the ToolResult in state.
         """
         if self._tool_token_limit_before_evict is None or request.tool_call["name"] in TOOLS_EXCLUDED_FROM_EVICTION:
-            return handler(request)
-
-        tool_result = handler(request)
-        return self._intercept_large_tool_result(tool_result, request.runtime)
+            tool_result = handler(request)
+        else:
+            tool_result = self._intercept_large_tool_result(handler(request), request.runtime)
+        self._invalidate_file_cache_after(request)
+        return tool_result
 
     async def awrap_tool_call(
         self,
@@ -1314,6 +1714,12 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
     ) -> ToolMessage | Command:
         """(async)Check the size of the tool call result and evict to filesystem if too large.
 
+        Parallel calls of the read-only tools (`ls`, `read_file`, `glob`, `grep`) are
+        batched first: what they read is fetched with as few backend requests as
+        possible, and each call then runs with its own prefetched result. Cached file
+        contents the tool may have changed outside of the filesystem tools are dropped
+        afterwards.
+
         Args:
             request: The tool call request being processed.
             handler: The handler function to call with the modified request.
@@ -1321,8 +1727,16 @@ class FilesystemMiddleware(AgentMiddleware[FilesystemState, ContextT, ResponseT]
         Returns:
             The raw ToolMessage, or a pseudo tool message with the ToolResult in state.
         """
-        if self._tool_token_limit_before_evict is None or request.tool_call["name"] in TOOLS_EXCLUDED_FROM_EVICTION:
-            return await handler(request)
-
-        tool_result = await handler(request)
-        return await self._aintercept_large_tool_result(tool_result, request.runtime)
+        prefetched = None
+        if request.tool_call["name"] in TOOLS_BATCHED_WHEN_PARALLEL:
+            prefetched = await self._tool_call_batcher.join(request, scope=self._backend_scope(request.runtime))
+        token = _prefetched_result.set(prefetched)
+        try:
+            if self._tool_token_limit_before_evict is None or request.tool_call["name"] in TOOLS_EXCLUDED_FROM_EVICTION:
+                tool_result = await handler(request)
+            else:
+                tool_result = await self._aintercept_large_tool_result(await handler(request), request.runtime)
+        finally:
+            _prefetched_result.reset(token)
+        self._invalidate_file_cache_after(request)
+        return tool_result
@@ -51,6 +51,7 @@ Common sections include:
 from __future__ import annotations
 
 import logging
+import time
 from typing import TYPE_CHECKING, Annotated, NotRequired, TypedDict
 
 if TYPE_CHECKING:
@@ -59,7 +60,7 @@ if TYPE_CHECKING:
     from langchain_core.runnables import RunnableConfig
     from langgraph.runtime import Runtime
 
-    from deepagents.backends.protocol import BACKEND_TYPES, BackendProtocol
+    from deepagents.backends.protocol import BACKEND_TYPES, BackendProtocol, FileDownloadResponse
 
 from langchain.agents.middleware.types import (
     AgentMiddleware,
@@ -72,7 +73,7 @@ from langchain.agents.middleware.types import (
 )
 from langchain.tools import ToolRuntime
 
-from deepagents.middleware._utils import append_to_system_message
+from deepagents.middleware._utils import PromptFragmentCache, append_to_system_message
 
 logger = logging.getLogger(__name__)
 
@@ -156,6 +157,41 @@ MEMORY_SYSTEM_PROMPT = """<agent_memory>
 """
 
 
+def _contents_from_responses(paths: list[str], responses: list[FileDownloadResponse]) -> dict[str, str]:
+    """Decode the memory files downloaded for `paths`.
+
+    Args:
+        paths: Memory file paths, in the order they were requested.
+        responses: The backend's download responses for `paths`.
+
+    Returns:
+        Mapping of path to content for every non-empty file that was found.
+
+    Raises:
+        AssertionError: If the backend did not return one response per path.
+        ValueError: If a download failed for a reason other than the file not existing.
+    """
+    if len(responses) != len(paths):
+        msg = f"Expected {len(paths)} responses for paths {paths}, got {len(responses)}"
+        raise AssertionError(msg)
+
+    contents: dict[str, str] = {}
+    for path, response in zip(paths, responses, strict=True):
+        if response.error is not None:
+            # For now, memory files are treated as optional. file_not_found is expected
+            # and we skip silently to allow graceful degradation.
+            if response.error == "file_not_found":
+                continue
+            # Other errors should be raised
+            msg = f"Failed to download {path}: {response.error}"
+            raise ValueError(msg)
+
+        if response.content:
+            contents[path] = response.content.decode("utf-8")
+            logger.debug("Loaded memory from: %s", path)
+    return contents
+
+
 class MemoryMiddleware(AgentMiddleware[MemoryState, ContextT, ResponseT]):
     """Middleware for loading agent memory from `AGENTS.md` files.
 
@@ -190,6 +226,8 @@ class MemoryMiddleware(AgentMiddleware[MemoryState, ContextT, ResponseT]):
         """
         self._backend = backend
         self.sources = sources
+        # Rendered memory fragments, keyed by the sources and contents they were built from
+        self._memory_fragments = PromptFragmentCache()
 
     def _get_backend(self, state: MemoryState, runtime: Runtime, config: RunnableConfig) -> BackendProtocol:
         """Resolve backend from instance or factory.
@@ -235,81 +273,12 @@ class MemoryMiddleware(AgentMiddleware[MemoryState, ContextT, ResponseT]):
         memory_body = "\n\n".join(sections)
         return MEMORY_SYSTEM_PROMPT.format(agent_memory=memory_body)
 
-    async def _load_memory_from_backend(
-        self,
-        backend: BackendProtocol,
-        path: str,
-    ) -> str | None:
-        """Load memory content from a backend path.
-
-        Args:
-            backend: Backend to load from.
-            path: Path to the AGENTS.md file.
-
-        Returns:
-            File content if found, None otherwise.
-        """
-        results = await backend.adownload_files([path])
-        # Should get exactly one response for one path
-        if len(results) != 1:
-            msg = f"Expected 1 response for path {path}, got {len(results)}"
-            raise AssertionError(msg)
-        response = results[0]
-
-        if response.error is not None:
-            # For now, memory files are treated as optional. file_not_found is expected
-            # and we skip silently to allow graceful degradation.
-            if response.error == "file_not_found":
-                return None
-            # Other errors should be raised
-            msg = f"Failed to download {path}: {response.error}"
-            raise ValueError(msg)
-
-        if response.content is not None:
-            return response.content.decode("utf-8")
-
-        return None
-
-    def _load_memory_from_backend_sync(
-        self,
-        backend: BackendProtocol,
-        path: str,
-    ) -> str | None:
-        """Load memory content from a backend path synchronously.
-
-        Args:
-            backend: Backend to load from.
-            path: Path to the AGENTS.md file.
-
-        Returns:
-            File content if found, None otherwise.
-        """
-        results = backend.download_files([path])
-        # Should get exactly one response for one path
-        if len(results) != 1:
-            msg = f"Expected 1 response for path {path}, got {len(results)}"
-            raise AssertionError(msg)
-        response = results[0]
-
-        if response.error is not None:
-            # For now, memory files are treated as optional. file_not_found is expected
-            # and we skip silently to allow graceful degradation.
-            if response.error == "file_not_found":
-                return None
-            # Other errors should be raised
-            msg = f"Failed to download {path}: {response.error}"
-            raise ValueError(msg)
-
-        if response.content is not None:
-            return response.content.decode("utf-8")
-
-        return None
-
     def before_agent(self, state: MemoryState, runtime: Runtime, config: RunnableConfig) -> MemoryStateUpdate | None:  # ty: ignore[invalid-method-override]
         """Load memory content before agent execution (synchronous).
 
         Loads memory from all configured sources and stores in state.
-        Only loads if not already present in state.
+        Only loads if not already present in state. All sources are fetched
+        with a single `download_files` call.
 
         Args:
             state: Current agent state.
@@ -323,14 +292,10 @@ class MemoryMiddleware(AgentMiddleware[MemoryState, ContextT, ResponseT]):
         if "memory_contents" in state:
             return None
 
+        start = time.perf_counter()
         backend = self._get_backend(state, runtime, config)
-        contents: dict[str, str] = {}
-
-        for path in self.sources:
-            content = self._load_memory_from_backend_sync(backend, path)
-            if content:
-                contents[path] = content
-                logger.debug("Loaded memory from: %s", path)
+        contents = _contents_from_responses(self.sources, backend.download_files(self.sources)) if self.sources else {}
+        logger.debug("Loaded memory from %d of %d sources in %.3fs", len(contents), len(self.sources), time.perf_counter() - start)
 
         return MemoryStateUpdate(memory_contents=contents)
 
@@ -338,7 +303,8 @@ class MemoryMiddleware(AgentMiddleware[MemoryState, ContextT, ResponseT]):
         """Load memory content before agent execution.
 
         Loads memory from all configured sources and stores in state.
-        Only loads if not already present in state.
+        Only loads if not already present in state. All sources are fetched
+        with a single `adownload_files` call.
 
         Args:
             state: Current agent state.
@@ -352,14 +318,10 @@ class MemoryMiddleware(AgentMiddleware[MemoryState, ContextT, ResponseT]):
         if "memory_contents" in state:
             return None
 
+        start = time.perf_counter()
         backend = self._get_backend(state, runtime, config)
-        contents: dict[str, str] = {}
-
-        for path in self.sources:
-            content = await self._load_memory_from_backend(backend, path)
-            if content:
-                contents[path] = content
-                logger.debug("Loaded memory from: %s", path)
+        contents = _contents_from_responses(self.sources, await backend.adownload_files(self.sources)) if self.sources else {}
+        logger.debug("Loaded memory from %d of %d sources in %.3fs", len(contents), len(self.sources), time.perf_counter() - start)
 
         return MemoryStateUpdate(memory_contents=contents)
 
@@ -373,7 +335,8 @@ class MemoryMiddleware(AgentMiddleware[MemoryState, ContextT, ResponseT]):
             Modified request with memory injected into system message.
         """
         contents = request.state.get("memory_contents", {})
-        agent_memory = self._format_agent_memory(contents)
+        key = (tuple(self.sources), tuple(contents.items()))
+        agent_memory = self._memory_fragments.render(key, lambda: self._format_agent_memory(contents))
 
         new_system_message = append_to_system_message(request.system_message, agent_memory)
 
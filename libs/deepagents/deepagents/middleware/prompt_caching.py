@@ -0,0 +1,294 @@
+"""Cache-aware prompt caching middleware for Anthropic models.
+
+`AnthropicPromptCachingMiddleware` marks only the end of the conversation, so a
+single cache entry covers the whole prompt. Deep agents rewrite the middle of
+their conversation over time: summarization replaces old messages with a
+summary, and old `write_file`/`edit_file` arguments get truncated. Each rewrite
+invalidates that single entry and the next call pays for the full prompt again.
+
+`PromptCachingMiddleware` instead places explicit breakpoints at the boundaries
+that stay stable between those rewrites, in prompt order:
+
+1. The end of the stable system prompt, which also covers the tool schemas.
+2. The summary message of the latest `SummarizationEvent`.
+3. The end of the turn holding the last truncated tool call.
+4. The end of the conversation, like `AnthropicPromptCachingMiddleware`.
+
+Anthropic allows at most four breakpoints per request, so the plan never uses
+more. Cache reads and writes reported in the usage metadata of every response
+are aggregated in `PromptCachingMiddleware.cache_stats`.
+
+## Usage
+
+```python
+from langchain.agents import create_agent
+
+from deepagents.middleware.prompt_caching import PromptCachingMiddleware
+
+caching = PromptCachingMiddleware(ttl="5m")
+agent = create_agent(model="anthropic:claude-sonnet-4-5-20250929", middleware=[caching])
+
+agent.invoke(...)
+print(f"{caching.cache_stats.hit_ratio:.0%} of input tokens read from the cache")
+```
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+from langchain_anthropic.middleware import AnthropicPromptCachingMiddleware
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from deepagents.middleware._utils import cacheable_prefix_length
+from deepagents.middleware.summarization import DEFAULT_TRUNCATION_TEXT
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from langchain.agents.middleware.types import ModelCallResult, ModelRequest, ModelResponse
+    from langchain_core.messages import AnyMessage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PromptCacheStats:
+    """Aggregate prompt cache usage reported by the model across calls.
+
+    Token counts come from the `input_token_details` of each response's usage
+    metadata. `input_tokens` includes cached tokens, so `cache_read_tokens` is a
+    share of it.
+    """
+
+    requests: int = 0
+    """Number of model calls that reported usage metadata."""
+
+    input_tokens: int = 0
+    """Total input tokens, including tokens read from or written to the cache."""
+
+    cache_read_tokens: int = 0
+    """Input tokens served from the prompt cache."""
+
+    cache_creation_tokens: int = 0
+    """Input tokens written to the prompt cache."""
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of input tokens served from the prompt cache, `0.0` before any call."""
+        return self.cache_read_tokens / self.input_tokens if self.input_tokens else 0.0
+
+
+def _is_summary_message(message: AnyMessage) -> bool:
+    return isinstance(message, HumanMessage) and message.additional_kwargs.get("lc_source") == "summarization"
+
+
+def _with_cache_control(message: AnyMessage, cache_control: dict[str, str]) -> AnyMessage | None:
+    """Return a copy of `message` whose last content block carries `cache_control`.
+
+    Returns `None` when the message has no block Anthropic accepts a breakpoint on,
+    such as an AI message that only holds tool calls.
+    """
+    content = message.content
+    if isinstance(message, ToolMessage):
+        block = {
+            "type": "tool_result",
+            "content": content,
+            "tool_use_id": message.tool_call_id,
+            "is_error": message.status == "error",
+            "cache_control": cache_control,
+        }
+        return message.model_copy(update={"content": [block]})
+    if isinstance(message, AIMessage) and message.tool_calls:
+        # Tool use blocks are appended after the content, so a breakpoint here would
+        # leave the tool calls out of the cached prefix
+        return None
+    if isinstance(content, str):
+        if not content.strip():
+            return None
+        return message.model_copy(update={"content": [{"type": "text", "text": content, "cache_control": cache_control}]})
+    blocks: list[Any] = [{"type": "text", "text": block} if isinstance(block, str) else block for block in content]
+    for i in range(len(blocks) - 1, -1, -1):
+        block = blocks[i]
+        if not isinstance(block, dict):
+            continue
+        if block.get("type") in {"image", "document"} or (block.get("type") == "text" and block.get("text", "").strip()):
+            blocks[i] = {**block, "cache_control": cache_control}
+            return message.model_copy(update={"content": blocks})
+    return None
+
+
+class PromptCachingMiddleware(AnthropicPromptCachingMiddleware):
+    """Prompt caching middleware that places cache breakpoints at stable boundaries.
+
+    Use it in place of `AnthropicPromptCachingMiddleware`, inside (after) the
+    `SummarizationMiddleware` so it sees the summarized and truncated messages sent
+    to the model. Non-Anthropic models are handled according to
+    `unsupported_model_behavior`.
+    """
+
+    def __init__(
+        self,
+        type: Literal["ephemeral"] = "ephemeral",  # noqa: A002
+        ttl: Literal["5m", "1h"] = "5m",
+        min_messages_to_cache: int = 0,
+        unsupported_model_behavior: Literal["ignore", "warn", "raise"] = "warn",
+        truncation_text: str = DEFAULT_TRUNCATION_TEXT,
+    ) -> None:
+        """Initialize the middleware with cache control settings.
+
+        Args:
+            type: The type of cache to use, only `'ephemeral'` is supported.
+            ttl: The time to live for the cache, only `'5m'` and `'1h'` are supported.
+            min_messages_to_cache: The minimum number of messages until the cache is used.
+            unsupported_model_behavior: The behavior when a non-Anthropic model is used:
+                `'ignore'` continues without caching, `'warn'` also warns, and `'raise'`
+                raises a `ValueError`.
+            truncation_text: Text the `SummarizationMiddleware` uses to mark truncated
+                tool call arguments. Must match its `truncate_args_settings`.
+        """
+        super().__init__(
+            type=type,
+            ttl=ttl,
+            min_messages_to_cache=min_messages_to_cache,
+            unsupported_model_behavior=unsupported_model_behavior,
+        )
+        self.truncation_text = truncation_text
+        self._stats = PromptCacheStats()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def cache_stats(self) -> PromptCacheStats:
+        """Cache reads and writes reported by the model for calls made so far."""
+        return self._stats
+
+    def _truncation_boundary(self, messages: list[AnyMessage]) -> int | None:
+        """Index of the last message of the turn holding the last truncated tool call.
+
+        Arguments are truncated oldest first and stay truncated, so everything up to
+        the end of that turn no longer changes between calls.
+        """
+        for i in range(len(messages) - 1, -1, -1):
+            message = messages[i]
+            if isinstance(message, AIMessage) and any(
+                isinstance(value, str) and value.endswith(self.truncation_text) for call in message.tool_calls for value in call["args"].values()
+            ):
+                end = i
+                while end + 1 < len(messages) and isinstance(messages[end + 1], ToolMessage):
+                    end += 1
+                return end
+        return None
+
+    def _system_with_cache_control(self, system_message: SystemMessage, cache_control: dict[str, str]) -> SystemMessage | None:
+        """Mark the end of the stable part of the system prompt.
+
+        When the tail of a composed system prompt changes between calls (e.g. edited
+        memory), the breakpoint goes on the last block of the stable prefix so that
+        prefix is still read from the cache.
+        """
+        blocks: list[Any] = [{"type": "text", "text": block} if isinstance(block, str) else block for block in system_message.content_blocks]
+        target = len(blocks) - 1
+        stable = cacheable_prefix_length(system_message)
+        if 0 < stable < len(system_message.text):
+            length = 0
+            for i, block in enumerate(blocks):
+                length += len(block.get("text", ""))
+                if length == stable:
+                    target = i
+                    break
+        while target >= 0 and not (blocks[target].get("type") == "text" and blocks[target].get("text", "").strip()):
+            target -= 1
+        if target < 0:
+            return None
+        blocks[target] = {**blocks[target], "cache_control": cache_control}
+        return SystemMessage(content=blocks)
+
+    def _plan(self, request: ModelRequest) -> ModelRequest:
+        """Return `request` with cache breakpoints placed at its stable boundaries."""
+        cache_control: dict[str, str] = {"type": self.type, "ttl": self.ttl}
+        overrides: dict[str, Any] = {"model_settings": {**request.model_settings, "cache_control": cache_control}}
+
+        if request.system_message is not None:
+            system_message = self._system_with_cache_control(request.system_message, cache_control)
+            if system_message is not None:
+                overrides["system_message"] = system_message
+
+        # The final message is covered by the rolling `cache_control` model setting
+        boundaries: list[int] = []
+        last = len(request.messages) - 1
+        if request.messages and _is_summary_message(request.messages[0]) and last > 0:
+            boundaries.append(0)
+        truncated = self._truncation_boundary(request.messages)
+        if truncated is not None and truncated < last and truncated not in boundaries:
+            boundaries.append(truncated)
+
+        if boundaries:
+            messages = list(request.messages)
+            for i in boundaries:
+                marked = _with_cache_control(messages[i], cache_control)
+                if marked is not None:
+                    messages[i] = marked
+            overrides["messages"] = messages
+        return request.override(**overrides)
+
+    def _record_usage(self, response: ModelResponse) -> None:
+        usage = next((m.usage_metadata for m in reversed(response.result) if isinstance(m, AIMessage) and m.usage_metadata), None)
+        if usage is None:
+            return
+        details = usage.get("input_token_details") or {}
+        with self._stats_lock:
+            self._stats.requests += 1
+            self._stats.input_tokens += usage.get("input_tokens", 0)
+            self._stats.cache_read_tokens += details.get("cache_read", 0) or 0
+            self._stats.cache_creation_tokens += details.get("cache_creation", 0) or 0
+            hit_ratio = self._stats.hit_ratio
+        logger.debug(
+            "Prompt cache: %d tokens read, %d written of %d input tokens (%.0f%% hit ratio so far)",
+            details.get("cache_read", 0) or 0,
+            details.get("cache_creation", 0) or 0,
+            usage.get("input_tokens", 0),
+            hit_ratio * 100,
+        )
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> ModelCallResult:
+        """Place cache breakpoints on the request and record cache usage of the response.
+
+        Args:
+            request: The model request to potentially modify.
+            handler: The handler to execute the model request.
+
+        Returns:
+            The model response from the handler.
+        """
+        if not self._should_apply_caching(request):
+            return handler(request)
+        response = handler(self._plan(request))
+        self._record_usage(response)
+        return response
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelCallResult:
+        """Place cache breakpoints on the request and record cache usage of the response (async version).
+
+        Args:
+            request: The model request to potentially modify.
+            handler: The async handler to execute the model request.
+
+        Returns:
+            The model response from the handler.
+        """
+        if not self._should_apply_caching(request):
+            return await handler(request)
+        response = await handler(self._plan(request))
+        self._record_usage(response)
+        return response
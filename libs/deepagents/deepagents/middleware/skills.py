@@ -90,8 +90,13 @@ middleware = SkillsMiddleware(
 
 from __future__ import annotations
 
+import asyncio
+import copy
 import logging
 import re
+import threading
+import time
+import weakref
 from pathlib import PurePosixPath
 from typing import TYPE_CHECKING, Annotated
 
@@ -99,12 +104,12 @@ import yaml
 from langchain.agents.middleware.types import PrivateStateAttr
 
 if TYPE_CHECKING:
-    from collections.abc import Awaitable, Callable
+    from collections.abc import Awaitable, Callable, Hashable
 
     from langchain_core.runnables import RunnableConfig
     from langgraph.runtime import Runtime
 
-    from deepagents.backends.protocol import BACKEND_TYPES, BackendProtocol
+    from deepagents.backends.protocol import BACKEND_TYPES, BackendProtocol, FileInfo
 
 from typing import NotRequired, TypedDict
 
@@ -118,7 +123,8 @@ from langchain.agents.middleware.types import (
 )
 from langgraph.prebuilt import ToolRuntime
 
-from deepagents.middleware._utils import append_to_system_message
+from deepagents.backends.cache import storage_scope
+from deepagents.middleware._utils import PromptFragmentCache, append_to_system_message
 
 logger = logging.getLogger(__name__)
 
@@ -130,6 +136,9 @@ MAX_SKILL_NAME_LENGTH = 64
 MAX_SKILL_DESCRIPTION_LENGTH = 1024
 MAX_SKILL_COMPATIBILITY_LENGTH = 500
 
+# Glob (relative to a source path) matching the SKILL.md files `_list_skills` reads
+_SKILL_MD_GLOB = "*/SKILL.md"
+
 
 class SkillMetadata(TypedDict):
     """Metadata for a skill per Agent Skills specification (https://agentskills.io/specification)."""
@@ -558,6 +567,192 @@ async def _alist_skills(backend: BackendProtocol, source_path: str) -> list[Skil
     return skills
 
 
+_SkillsFingerprint = tuple[tuple[str, int, str], ...]
+
+
+def _skills_fingerprint(infos: list[FileInfo]) -> _SkillsFingerprint | None:
+    """Build a change-detection fingerprint from `glob_info` results for a source's `SKILL.md` files.
+
+    Args:
+        infos: `FileInfo` entries for the `SKILL.md` files of one source.
+
+    Returns:
+        Sorted `(path, size, modified_at)` tuples, or `None` if the backend does not
+            report sizes and modification times.
+    """
+    fingerprint: list[tuple[str, int, str]] = []
+    for info in infos:
+        size = info.get("size")
+        modified_at = info.get("modified_at")
+        if size is None or not modified_at:
+            return None
+        fingerprint.append((info["path"], size, modified_at))
+    return tuple(sorted(fingerprint))
+
+
+def _cache_scope(owner: object, backend: BackendProtocol, source_path: str) -> tuple[Hashable, str] | None:
+    """Return the scope and path under which the skills of `source_path` are cached, or `None` to not cache them.
+
+    Skills on a `FilesystemBackend` (also as a `CompositeBackend` route) are cached by the
+    backend's root, and skills on any other backend by `owner`, the backend or backend
+    factory the middleware was configured with. Either way backends built per thread
+    share entries. Skills in agent state (`StateBackend`) differ per thread and are not
+    cached.
+    """
+    scope = storage_scope(backend, source_path)
+    if scope is None:
+        return None
+    storage, path = scope
+    return (owner, source_path) if storage is None else (storage, path)
+
+
+class _SkillMetadataCache:
+    """Process-wide cache of parsed skill metadata.
+
+    Entries are keyed by a cache scope (see `_cache_scope`) and by source path, and are
+    only reused while the source's fingerprint is unchanged, which also tells apart
+    backends of a shared factory that see different skills. Callers get copies, so
+    mutating returned metadata never leaks into the cache. Sources whose backend
+    does not report sizes and modification times are remembered as unfingerprintable
+    and always reloaded, so they do not pay for a fingerprint on every thread.
+    """
+
+    def __init__(self) -> None:
+        # Filesystem roots are plain tuples; configured backends and factories are held weakly
+        self._storages: dict[Hashable, dict[str, tuple[_SkillsFingerprint, list[SkillMetadata]] | None]] = {}
+        self._owners: weakref.WeakKeyDictionary[object, dict[str, tuple[_SkillsFingerprint, list[SkillMetadata]] | None]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _sources(self, scope: object) -> dict[str, tuple[_SkillsFingerprint, list[SkillMetadata]] | None] | None:
+        if isinstance(scope, tuple):
+            return self._storages.setdefault(scope, {})
+        try:
+            return self._owners.setdefault(scope, {})
+        except TypeError:
+            # Owner does not support weak references; skip caching
+            return None
+
+    def fingerprintable(self, scope: object, source_path: str) -> bool:
+        """Whether `source_path` has not been found to lack fingerprint information."""
+        with self._lock:
+            sources = self._sources(scope)
+            return sources is not None and (source_path not in sources or sources[source_path] is not None)
+
+    def mark_unfingerprintable(self, scope: object, source_path: str) -> None:
+        """Remember that the backend reports no sizes or modification times for `source_path`."""
+        with self._lock:
+            sources = self._sources(scope)
+            if sources is not None:
+                sources[source_path] = None
+
+    def get(self, scope: object, source_path: str, fingerprint: _SkillsFingerprint) -> list[SkillMetadata] | None:
+        """Return cached skills for `source_path` if they were loaded at `fingerprint`."""
+        with self._lock:
+            sources = self._sources(scope)
+            entry = sources.get(source_path) if sources is not None else None
+        if entry is None or entry[0] != fingerprint:
+            return None
+        return copy.deepcopy(entry[1])
+
+    def put(self, scope: object, source_path: str, fingerprint: _SkillsFingerprint, skills: list[SkillMetadata]) -> None:
+        """Store the skills loaded for `source_path` at `fingerprint`."""
+        with self._lock:
+            sources = self._sources(scope)
+            if sources is not None:
+                sources[source_path] = (fingerprint, copy.deepcopy(skills))
+
+    def clear(self) -> None:
+        """Drop all cached metadata."""
+        with self._lock:
+            self._storages.clear()
+            self._owners.clear()
+
+
+_skill_metadata_cache = _SkillMetadataCache()
+
+
+def _load_source_skills(backend: BackendProtocol, source_path: str, *, owner: object = None) -> list[SkillMetadata]:
+    """List the skills of a source, reusing cached metadata while its `SKILL.md` files are unchanged.
+
+    Args:
+        backend: Backend instance to use for file operations
+        source_path: Path to the skills directory in the backend
+        owner: The backend or backend factory the middleware was configured with.
+            Defaults to `backend`.
+
+    Returns:
+        List of skill metadata from successfully parsed `SKILL.md` files
+    """
+    cache_scope = _cache_scope(backend if owner is None else owner, backend, source_path)
+    if cache_scope is None or not _skill_metadata_cache.fingerprintable(*cache_scope):
+        return _list_skills(backend, source_path)
+    fingerprint = _skills_fingerprint(backend.glob_info(_SKILL_MD_GLOB, source_path))
+    if fingerprint is None:
+        _skill_metadata_cache.mark_unfingerprintable(*cache_scope)
+        return _list_skills(backend, source_path)
+    cached = _skill_metadata_cache.get(*cache_scope, fingerprint)
+    if cached is not None:
+        return cached
+    skills = _list_skills(backend, source_path)
+    _skill_metadata_cache.put(*cache_scope, fingerprint, skills)
+    return skills
+
+
+async def _aload_source_skills(backend: BackendProtocol, source_path: str, *, owner: object = None) -> list[SkillMetadata]:
+    """List the skills of a source, reusing cached metadata while its `SKILL.md` files are unchanged (async version).
+
+    Args:
+        backend: Backend instance to use for file operations
+        source_path: Path to the skills directory in the backend
+        owner: The backend or backend factory the middleware was configured with.
+            Defaults to `backend`.
+
+    Returns:
+        List of skill metadata from successfully parsed `SKILL.md` files
+    """
+    cache_scope = _cache_scope(backend if owner is None else owner, backend, source_path)
+    if cache_scope is None or not _skill_metadata_cache.fingerprintable(*cache_scope):
+        return await _alist_skills(backend, source_path)
+    fingerprint = _skills_fingerprint(await backend.aglob_info(_SKILL_MD_GLOB, source_path))
+    if fingerprint is None:
+        _skill_metadata_cache.mark_unfingerprintable(*cache_scope)
+        return await _alist_skills(backend, source_path)
+    cached = _skill_metadata_cache.get(*cache_scope, fingerprint)
+    if cached is not None:
+        return cached
+    skills = await _alist_skills(backend, source_path)
+    _skill_metadata_cache.put(*cache_scope, fingerprint, skills)
+    return skills
+
+
+_PromptSkillKey = tuple[str, str, str, str | None, str | None, tuple[str, ...]]
+
+
+def _prompt_skills_key(skills: list[SkillMetadata]) -> tuple[_PromptSkillKey, ...] | None:
+    """Build a hashable cache key from the skill fields that appear in the system prompt.
+
+    Returns `None` if a skill is missing a field or has unhashable values.
+    """
+    try:
+        key = tuple(
+            (
+                skill["name"],
+                skill["description"],
+                skill["path"],
+                skill.get("license"),
+                skill.get("compatibility"),
+                tuple(skill.get("allowed_tools") or ()),
+            )
+            for skill in skills
+        )
+        hash(key)
+    except (KeyError, TypeError):
+        return None
+    return key
+
+
 SKILLS_SYSTEM_PROMPT = """
 
 ## Skills System
@@ -646,6 +841,8 @@ class SkillsMiddleware(AgentMiddleware[SkillsState, ContextT, ResponseT]):
         self._backend = backend
         self.sources = sources
         self.system_prompt_template = SKILLS_SYSTEM_PROMPT
+        # Rendered skills sections, keyed by the sources, template and skill fields they were built from
+        self._skills_fragments = PromptFragmentCache()
 
     def _get_backend(self, state: SkillsState, runtime: Runtime, config: RunnableConfig) -> BackendProtocol:
         """Resolve backend from instance or factory.
@@ -706,6 +903,13 @@ class SkillsMiddleware(AgentMiddleware[SkillsState, ContextT, ResponseT]):
 
         return "\n".join(lines)
 
+    def _format_skills_section(self, skills: list[SkillMetadata]) -> str:
+        """Format the full skills prompt fragment."""
+        return self.system_prompt_template.format(
+            skills_locations=self._format_skills_locations(),
+            skills_list=self._format_skills_list(skills),
+        )
+
     def modify_request(self, request: ModelRequest[ContextT]) -> ModelRequest[ContextT]:
         """Inject skills documentation into a model request's system message.
 
@@ -716,13 +920,9 @@ class SkillsMiddleware(AgentMiddleware[SkillsState, ContextT, ResponseT]):
             New model request with skills documentation injected into system message
         """
         skills_metadata = request.state.get("skills_metadata", [])
-        skills_locations = self._format_skills_locations()
-        skills_list = self._format_skills_list(skills_metadata)
-
-        skills_section = self.system_prompt_template.format(
-            skills_locations=skills_locations,
-            skills_list=skills_list,
-        )
+        skills_key = _prompt_skills_key(skills_metadata)
+        key = None if skills_key is None else (tuple(self.sources), self.system_prompt_template, skills_key)
+        skills_section = self._skills_fragments.render(key, lambda: self._format_skills_section(skills_metadata))
 
         new_system_message = append_to_system_message(request.system_message, skills_section)
 
@@ -732,7 +932,8 @@ class SkillsMiddleware(AgentMiddleware[SkillsState, ContextT, ResponseT]):
         """Load skills metadata before agent execution (synchronous).
 
         Runs before each agent interaction to discover available skills from all
-        configured sources. Re-loads on every call to capture any changes.
+        configured sources. Sources whose `SKILL.md` files are unchanged since they
+        were last loaded in this process are served from a metadata cache.
 
         Skills are loaded in source order with later sources overriding
         earlier ones if they contain skills with the same name (last one wins).
@@ -749,6 +950,7 @@ class SkillsMiddleware(AgentMiddleware[SkillsState, ContextT, ResponseT]):
         if "skills_metadata" in state:
             return None
 
+        start = time.perf_counter()
         # Resolve backend (supports both direct instances and factory functions)
         backend = self._get_backend(state, runtime, config)
         all_skills: dict[str, SkillMetadata] = {}
@@ -756,18 +958,20 @@ class SkillsMiddleware(AgentMiddleware[SkillsState, ContextT, ResponseT]):
         # Load skills from each source in order
         # Later sources override earlier ones (last one wins)
         for source_path in self.sources:
-            source_skills = _list_skills(backend, source_path)
+            source_skills = _load_source_skills(backend, source_path, owner=self._backend)
             for skill in source_skills:
                 all_skills[skill["name"]] = skill
 
         skills = list(all_skills.values())
+        logger.debug("Loaded %d skills from %d sources in %.3fs", len(skills), len(self.sources), time.perf_counter() - start)
         return SkillsStateUpdate(skills_metadata=skills)
 
     async def abefore_agent(self, state: SkillsState, runtime: Runtime, config: RunnableConfig) -> SkillsStateUpdate | None:  # ty: ignore[invalid-method-override]
         """Load skills metadata before agent execution (async).
 
         Runs before each agent interaction to discover available skills from all
-        configured sources. Re-loads on every call to capture any changes.
+        configured sources. Sources whose `SKILL.md` files are unchanged since they
+        were last loaded in this process are served from a metadata cache.
 
         Skills are loaded in source order with later sources overriding
         earlier ones if they contain skills with the same name (last one wins).
@@ -784,18 +988,20 @@ class SkillsMiddleware(AgentMiddleware[SkillsState, ContextT, ResponseT]):
         if "skills_metadata" in state:
             return None
 
+        start = time.perf_counter()
         # Resolve backend (supports both direct instances and factory functions)
         backend = self._get_backend(state, runtime, config)
         all_skills: dict[str, SkillMetadata] = {}
 
-        # Load skills from each source in order
+        # Fetch all sources concurrently, then merge in source order
         # Later sources override earlier ones (last one wins)
-        for source_path in self.sources:
-            source_skills = await _alist_skills(backend, source_path)
+        sources_skills = await asyncio.gather(*(_aload_source_skills(backend, source_path, owner=self._backend) for source_path in self.sources))
+        for source_skills in sources_skills:
             for skill in source_skills:
                 all_skills[skill["name"]] = skill
 
         skills = list(all_skills.values())
+        logger.debug("Loaded %d skills from %d sources in %.3fs", len(skills), len(self.sources), time.perf_counter() - start)
         return SkillsStateUpdate(skills_metadata=skills)
 
     def wrap_model_call(
@@ -1,8 +1,17 @@
 """Middleware for providing subagents to an agent via a `task` tool."""
 
+import asyncio
+import contextlib
+import hashlib
+import logging
+import threading
+import time
 import warnings
-from collections.abc import Awaitable, Callable, Sequence
-from typing import Annotated, Any, NotRequired, TypedDict, Unpack, cast
+import weakref
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Annotated, Any, Literal, NotRequired, TypedDict, Unpack, cast
 
 from langchain.agents import create_agent
 from langchain.agents.middleware import HumanInTheLoopMiddleware, InterruptOnConfig
@@ -10,14 +19,18 @@ from langchain.agents.middleware.types import AgentMiddleware, ContextT, ModelRe
 from langchain.chat_models import init_chat_model
 from langchain.tools import BaseTool, ToolRuntime
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import HumanMessage, ToolMessage
-from langchain_core.runnables import Runnable
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import Runnable, RunnableConfig
 from langchain_core.tools import StructuredTool
+from langgraph.store.base import BaseStore
 from langgraph.types import Command
 
 from deepagents.backends.protocol import BackendFactory, BackendProtocol
+from deepagents.backends.state import inherit_files, visible_files
 from deepagents.middleware._utils import append_to_system_message
 
+logger = logging.getLogger(__name__)
+
 
 class SubAgent(TypedDict):
     """Specification for an agent.
@@ -77,6 +90,9 @@ class SubAgent(TypedDict):
     skills: NotRequired[list[str]]
     """Skill source paths for SkillsMiddleware."""
 
+    timeout: NotRequired[float]
+    """Seconds a single `task` invocation of this subagent may run (async execution only)."""
+
 
 class CompiledSubAgent(TypedDict):
     """A pre-compiled agent spec.
@@ -109,6 +125,9 @@ class CompiledSubAgent(TypedDict):
     This is required for the subagent to communicate results back to the main agent.
     """
 
+    timeout: NotRequired[float]
+    """Seconds a single `task` invocation of this subagent may run (async execution only)."""
+
 
 DEFAULT_SUBAGENT_PROMPT = "In order to complete the objective that the user asks of you, you have access to a number of standard tools."
 
@@ -275,12 +294,389 @@ GENERAL_PURPOSE_SUBAGENT: SubAgent = {
 }
 
 
+class _LazySubagent(Runnable[dict[str, Any], dict[str, Any]]):
+    """A subagent graph that is compiled on first use and memoized afterwards.
+
+    Compiling a subagent with `create_agent` builds and validates a full LangGraph
+    graph, which dominates `create_deep_agent` construction time for agents with many
+    subagents. Deferring it means subagents that are never called are never compiled.
+
+    The middleware stack is still validated up front, so configuration errors surface
+    at construction rather than on the first `task` call.
+    """
+
+    def __init__(self, spec: SubAgent, build: Callable[[SubAgent], Runnable]) -> None:
+        _subagent_middleware(spec)
+        self.name = spec["name"]
+        self._spec = spec
+        self._build = build
+        self._runnable: Runnable | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def compiled(self) -> bool:
+        """Whether the graph has been built yet."""
+        return self._runnable is not None
+
+    def get(self) -> Runnable:
+        """Return the compiled graph, building it on the first call."""
+        if self._runnable is None:
+            with self._lock:
+                if self._runnable is None:
+                    self._runnable = self._build(self._spec)
+        return self._runnable
+
+    def invoke(self, input: dict[str, Any], config: RunnableConfig | None = None, **kwargs: Any) -> dict[str, Any]:  # noqa: A002
+        """Invoke the compiled graph, compiling it first if needed."""
+        return self.get().invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input: dict[str, Any], config: RunnableConfig | None = None, **kwargs: Any) -> dict[str, Any]:  # noqa: A002
+        """Async version of invoke; the first compile runs in a worker thread."""
+        runnable = self._runnable if self._runnable is not None else await asyncio.to_thread(self.get)
+        return await runnable.ainvoke(input, config, **kwargs)
+
+
 class _SubagentSpec(TypedDict):
     """Internal spec for building the task tool."""
 
     name: str
     description: str
     runnable: Runnable
+    timeout: NotRequired[float]
+
+
+@dataclass
+class SubagentSchedulerStats:
+    """Aggregate counters for `task` invocations routed through a `SubAgentMiddleware`.
+
+    Queue wait is the time a call spent waiting for a concurrency slot; run time is
+    the time spent inside the subagent once admitted.
+    """
+
+    started: int = 0
+    """Number of invocations admitted to run."""
+
+    completed: int = 0
+    """Number of invocations that returned a result."""
+
+    failed: int = 0
+    """Number of invocations that raised an exception."""
+
+    timed_out: int = 0
+    """Number of invocations stopped because they exceeded their timeout."""
+
+    cancelled: int = 0
+    """Number of invocations cancelled because a sibling `task` call failed."""
+
+    queue_wait_seconds: float = 0.0
+    """Total time spent waiting for a concurrency slot."""
+
+    max_queue_wait_seconds: float = 0.0
+    """Longest single wait for a concurrency slot."""
+
+    run_seconds: float = 0.0
+    """Total time spent running subagents."""
+
+
+class SubAgentResultCache:
+    """Cache of final subagent messages keyed by subagent type and task description.
+
+    A hit skips the subagent invocation entirely and returns the cached final message
+    as the `task` result. Only runs that changed nothing in the parent's state besides
+    appending that message are cached, so a hit never drops file writes or other
+    state updates.
+
+    Entries live in an in-process LRU by default. Pass a `BaseStore` to share them
+    across threads and processes.
+
+    Args:
+        store: Optional store to keep entries in. If `None`, an in-memory LRU is used.
+        namespace: Store namespace for entries. Ignored for the in-memory LRU.
+        max_entries: Maximum number of entries in the in-memory LRU.
+        ttl: Seconds after which an entry is no longer served. `None` never expires.
+        normalize: Match descriptions case-insensitively and ignoring whitespace
+            differences instead of requiring an exact match.
+
+    Attributes:
+        hits: Number of lookups served from the cache.
+        misses: Number of lookups that found no fresh entry.
+
+    Example:
+        ```python
+        from deepagents.middleware import SubAgentMiddleware, SubAgentResultCache
+
+        middleware = SubAgentMiddleware(
+            backend=my_backend,
+            subagents=[researcher],
+            result_cache=SubAgentResultCache(ttl=3600, normalize=True),
+        )
+        ```
+    """
+
+    def __init__(
+        self,
+        *,
+        store: BaseStore | None = None,
+        namespace: tuple[str, ...] = ("subagent_results",),
+        max_entries: int = 256,
+        ttl: float | None = None,
+        normalize: bool = False,
+    ) -> None:
+        """Initialize the `SubAgentResultCache`."""
+        self._store = store
+        self._namespace = namespace
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._normalize = normalize
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, subagent_type: str, description: str) -> str:
+        if self._normalize:
+            description = " ".join(description.split()).casefold()
+        return hashlib.sha256(f"{subagent_type}\0{description}".encode()).hexdigest()
+
+    def _fresh(self, created_at: float) -> bool:
+        return self._ttl is None or time.time() - created_at < self._ttl
+
+    def _record(self, message: str | None) -> str | None:
+        with self._lock:
+            if message is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return message
+
+    def _from_item(self, value: dict[str, Any] | None) -> str | None:
+        if value is None or not self._fresh(value["created_at"]):
+            return None
+        return value["message"]
+
+    def _get_local(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not self._fresh(entry[1]):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def _put_local(self, key: str, message: str) -> None:
+        with self._lock:
+            self._entries[key] = (message, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, subagent_type: str, description: str) -> str | None:
+        """Return the cached final message for a task, or `None` on a miss."""
+        key = self._key(subagent_type, description)
+        if self._store is None:
+            return self._record(self._get_local(key))
+        item = self._store.get(self._namespace, key)
+        return self._record(self._from_item(item.value if item else None))
+
+    async def aget(self, subagent_type: str, description: str) -> str | None:
+        """Async version of get."""
+        key = self._key(subagent_type, description)
+        if self._store is None:
+            return self._record(self._get_local(key))
+        item = await self._store.aget(self._namespace, key)
+        return self._record(self._from_item(item.value if item else None))
+
+    def put(self, subagent_type: str, description: str, message: str) -> None:
+        """Cache the final message of a task."""
+        key = self._key(subagent_type, description)
+        if self._store is None:
+            self._put_local(key, message)
+            return
+        self._store.put(self._namespace, key, {"message": message, "created_at": time.time()}, index=False)
+
+    async def aput(self, subagent_type: str, description: str, message: str) -> None:
+        """Async version of put."""
+        key = self._key(subagent_type, description)
+        if self._store is None:
+            self._put_local(key, message)
+            return
+        await self._store.aput(self._namespace, key, {"message": message, "created_at": time.time()}, index=False)
+
+
+class _TaskBatch:
+    """Sibling `task` calls issued by the same AI message."""
+
+    def __init__(self) -> None:
+        self.members = 0
+        self.running: set[asyncio.Future] = set()
+        self.failed_by: str | None = None
+
+
+class _SubagentScheduler:
+    """Admission control, timeouts and sibling cancellation for `task` calls.
+
+    Concurrency slots are granted in arrival order (both `asyncio.Semaphore` and
+    `threading.Semaphore` wake waiters FIFO), so a burst of parallel `task` calls
+    is served fairly. When one call in a batch raises, the remaining siblings are
+    cancelled instead of running on unobserved after the tool node has failed.
+    """
+
+    def __init__(self, *, max_concurrency: int | None, default_timeout: float | None) -> None:
+        if max_concurrency is not None and max_concurrency < 1:
+            msg = f"max_concurrency must be at least 1, got {max_concurrency}"
+            raise ValueError(msg)
+        self._max_concurrency = max_concurrency
+        self._default_timeout = default_timeout
+        self._thread_semaphore = threading.Semaphore(max_concurrency) if max_concurrency is not None else None
+        # asyncio primitives are bound to the loop they are first used on
+        self._loop_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+        self._batches: dict[str, _TaskBatch] = {}
+        self._lock = threading.Lock()
+        self.stats = SubagentSchedulerStats()
+
+    def _record_admission(self, wait: float) -> None:
+        with self._lock:
+            self.stats.started += 1
+            self.stats.queue_wait_seconds += wait
+            self.stats.max_queue_wait_seconds = max(self.stats.max_queue_wait_seconds, wait)
+
+    def _record_outcome(self, outcome: str, run: float) -> None:
+        with self._lock:
+            setattr(self.stats, outcome, getattr(self.stats, outcome) + 1)
+            self.stats.run_seconds += run
+
+    def _fail_batch(self, batch: _TaskBatch, tool_call_id: str, run_future: asyncio.Future, run: float) -> None:
+        self._record_outcome("failed", run)
+        if batch.failed_by is None:
+            batch.failed_by = tool_call_id
+            for sibling in batch.running:
+                if sibling is not run_future:
+                    sibling.cancel()
+
+    def _join_batch(self, batch_key: str) -> _TaskBatch:
+        with self._lock:
+            batch = self._batches.setdefault(batch_key, _TaskBatch())
+            batch.members += 1
+            return batch
+
+    def _leave_batch(self, batch_key: str, batch: _TaskBatch) -> None:
+        with self._lock:
+            batch.members -= 1
+            if batch.members == 0 and self._batches.get(batch_key) is batch:
+                del self._batches[batch_key]
+
+    @contextlib.contextmanager
+    def _thread_slot(self) -> Iterator[float]:
+        queued_at = time.perf_counter()
+        if self._thread_semaphore is None:
+            yield 0.0
+            return
+        with self._thread_semaphore:
+            yield time.perf_counter() - queued_at
+
+    @contextlib.asynccontextmanager
+    async def _loop_slot(self) -> AsyncIterator[float]:
+        queued_at = time.perf_counter()
+        if self._max_concurrency is None:
+            yield 0.0
+            return
+        loop = asyncio.get_running_loop()
+        semaphore = self._loop_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._loop_semaphores[loop] = asyncio.Semaphore(self._max_concurrency)
+        async with semaphore:
+            yield time.perf_counter() - queued_at
+
+    def run(self, subagent_type: str, invoke: Callable[[], dict]) -> dict:
+        """Run a subagent synchronously under the concurrency limit.
+
+        Timeouts are not enforced here since a running thread cannot be interrupted.
+        """
+        with self._thread_slot() as wait:
+            self._record_admission(wait)
+            started_at = time.perf_counter()
+            try:
+                result = invoke()
+            except Exception:
+                self._record_outcome("failed", time.perf_counter() - started_at)
+                raise
+            run = time.perf_counter() - started_at
+            self._record_outcome("completed", run)
+        logger.debug("Subagent %s finished (queue wait %.3fs, run %.3fs)", subagent_type, wait, run)
+        return result
+
+    async def arun(
+        self,
+        subagent_type: str,
+        invoke: Callable[[], Awaitable[dict]],
+        *,
+        batch_key: str,
+        tool_call_id: str,
+        timeout: float | None,  # noqa: ASYNC109
+    ) -> dict | str:
+        """Run a subagent under the concurrency limit, timeout and batch cancellation.
+
+        Returns:
+            The subagent's final state, or an error string for the model if the
+            invocation timed out or was cancelled because a sibling failed.
+        """
+        timeout = timeout if timeout is not None else self._default_timeout
+        batch = self._join_batch(batch_key)
+        try:
+            async with self._loop_slot() as wait:
+                if batch.failed_by is not None:
+                    self._record_outcome("cancelled", 0.0)
+                    return _sibling_cancelled_message(subagent_type, batch.failed_by)
+                self._record_admission(wait)
+                started_at = time.perf_counter()
+                run_future = asyncio.ensure_future(invoke())
+                batch.running.add(run_future)
+                try:
+                    result = await asyncio.wait_for(run_future, timeout)
+                except TimeoutError:
+                    if not run_future.cancelled():
+                        # Raised by the subagent itself rather than by `wait_for`
+                        self._fail_batch(batch, tool_call_id, run_future, time.perf_counter() - started_at)
+                        raise
+                    self._record_outcome("timed_out", time.perf_counter() - started_at)
+                    return f"Subagent {subagent_type} timed out after {timeout:g} seconds without returning a result"
+                except asyncio.CancelledError:
+                    current = asyncio.current_task()
+                    if batch.failed_by is None or (current is not None and current.cancelling()):
+                        # We are being cancelled from the outside; let it propagate
+                        raise
+                    self._record_outcome("cancelled", time.perf_counter() - started_at)
+                    return _sibling_cancelled_message(subagent_type, batch.failed_by)
+                except Exception:
+                    self._fail_batch(batch, tool_call_id, run_future, time.perf_counter() - started_at)
+                    raise
+                finally:
+                    batch.running.discard(run_future)
+                run = time.perf_counter() - started_at
+                self._record_outcome("completed", run)
+        finally:
+            self._leave_batch(batch_key, batch)
+        logger.debug("Subagent %s finished (queue wait %.3fs, run %.3fs)", subagent_type, wait, run)
+        return result
+
+
+def _sibling_cancelled_message(subagent_type: str, failed_tool_call_id: str) -> str:
+    return f"Subagent {subagent_type} was cancelled because a parallel task call ({failed_tool_call_id}) failed"
+
+
+def _task_batch_key(runtime: ToolRuntime) -> str:
+    """Identify the AI message that issued this `task` call.
+
+    Parallel `task` calls from one AI message share a key, which scopes sibling
+    cancellation to that batch.
+    """
+    tool_call_id = runtime.tool_call_id or ""
+    for message in reversed(runtime.state.get("messages", [])):
+        if isinstance(message, AIMessage) and any(call.get("id") == tool_call_id for call in message.tool_calls):
+            return message.id or ",".join(call.get("id") or "" for call in message.tool_calls)
+    return tool_call_id
 
 
 def _get_subagents_legacy(
@@ -371,9 +767,73 @@ def _get_subagents_legacy(
     return specs
 
 
-def _build_task_tool(  # noqa: C901
+def _create_subagent_runnable(spec: SubAgent) -> Runnable:
+    """Compile a fully-specified `SubAgent` into a runnable agent graph."""
+    # Resolve model if string
+    model = spec["model"]
+    if isinstance(model, str):
+        model = init_chat_model(model)
+
+    return create_agent(
+        model,
+        system_prompt=spec["system_prompt"],
+        tools=spec["tools"],
+        middleware=_subagent_middleware(spec),
+        name=spec["name"],
+    )
+
+
+def _subagent_middleware(spec: SubAgent) -> list[AgentMiddleware]:
+    """Return the middleware stack `create_agent` will receive for a `SubAgent`.
+
+    Raises:
+        AssertionError: If the stack contains duplicate middleware, mirroring
+            the check `create_agent` performs.
+    """
+    # Use middleware as provided (caller is responsible for building full stack)
+    middleware: list[AgentMiddleware] = list(spec.get("middleware", []))
+
+    interrupt_on = spec.get("interrupt_on")
+    if interrupt_on:
+        middleware.append(HumanInTheLoopMiddleware(interrupt_on=interrupt_on))
+
+    if len({m.name for m in middleware}) != len(middleware):
+        msg = "Please remove duplicate middleware instances."
+        raise AssertionError(msg)
+    return middleware
+
+
+def _files_delta(passed: dict[str, Any], returned: dict[str, Any]) -> dict[str, Any]:
+    """Compute the `files` update a subagent actually made.
+
+    Files the subagent returned unchanged are dropped so the parent does not re-merge
+    (and re-checkpoint) them. Files that were passed in but are missing from the result
+    become `None` deletion markers for `_file_data_reducer`.
+    """
+    delta: dict[str, Any] = {path: data for path, data in returned.items() if passed.get(path) != data}
+    delta.update(dict.fromkeys(passed.keys() - returned.keys()))
+    return delta
+
+
+FilesHandoff = Literal["copy", "reference"]
+"""How the parent's `files` state is handed to a subagent.
+
+- `"copy"`: the subagent receives the parent's `files` in its input state.
+- `"reference"`: the subagent starts without `files` of its own; `StateBackend` reads
+  fall through to the parent's files, so only what the subagent writes is stored in
+  its state and checkpoints. Subagents that read `state["files"]` directly (rather than
+  through `StateBackend`) will not see the parent's files in this mode.
+
+In both modes only files the subagent changed are merged back into the parent.
+"""
+
+
+def _build_task_tool(  # noqa: C901, PLR0915
     subagents: list[_SubagentSpec],
     task_description: str | None = None,
+    scheduler: _SubagentScheduler | None = None,
+    files_handoff: FilesHandoff = "copy",
+    result_cache: SubAgentResultCache | None = None,
 ) -> BaseTool:
     """Create a task tool from pre-built subagent graphs.
 
@@ -383,12 +843,20 @@ def _build_task_tool(  # noqa: C901
         subagents: List of subagent specs containing name, description, and runnable.
         task_description: Custom description for the task tool. If `None`,
             uses default template. Supports `{available_agents}` placeholder.
+        scheduler: Scheduler that admits, times and cancels subagent runs. If `None`,
+            an unbounded scheduler without a default timeout is used.
+        files_handoff: How the parent's `files` are handed to subagents.
+        result_cache: Optional cache of final subagent messages.
 
     Returns:
         A StructuredTool that can invoke subagents by type.
     """
+    if scheduler is None:
+        scheduler = _SubagentScheduler(max_concurrency=None, default_timeout=None)
+
     # Build the graphs dict and descriptions from the unified spec list
     subagent_graphs: dict[str, Runnable] = {spec["name"]: spec["runnable"] for spec in subagents}
+    subagent_timeouts: dict[str, float] = {spec["name"]: spec["timeout"] for spec in subagents if "timeout" in spec}
     subagent_description_str = "\n".join(f"- {s['name']}: {s['description']}" for s in subagents)
 
     # Use custom description if provided, otherwise use default template
@@ -399,7 +867,9 @@ def _build_task_tool(  # noqa: C901
     else:
         description = task_description
 
-    def _return_command_with_state_update(result: dict, tool_call_id: str) -> Command:
+    excluded_state_keys = _EXCLUDED_STATE_KEYS | {"files"} if files_handoff == "reference" else _EXCLUDED_STATE_KEYS
+
+    def _return_command_with_state_update(result: dict, tool_call_id: str, passed_files: dict[str, Any]) -> Command:
         # Validate that the result contains a 'messages' key
         if "messages" not in result:
             error_msg = (
@@ -410,6 +880,10 @@ def _build_task_tool(  # noqa: C901
             raise ValueError(error_msg)
 
         state_update = {k: v for k, v in result.items() if k not in _EXCLUDED_STATE_KEYS}
+        if state_update.get("files") is not None:
+            files_update = _files_delta(passed_files, state_update.pop("files"))
+            if files_update:
+                state_update["files"] = files_update
         # Strip trailing whitespace to prevent API errors with Anthropic
         message_text = result["messages"][-1].text.rstrip() if result["messages"][-1].text else ""
         return Command(
@@ -423,10 +897,22 @@ def _build_task_tool(  # noqa: C901
         """Prepare state for invocation."""
         subagent = subagent_graphs[subagent_type]
         # Create a new state dict to avoid mutating the original
-        subagent_state = {k: v for k, v in runtime.state.items() if k not in _EXCLUDED_STATE_KEYS}
+        subagent_state = {k: v for k, v in runtime.state.items() if k not in excluded_state_keys}
         subagent_state["messages"] = [HumanMessage(content=description)]
         return subagent, subagent_state
 
+    def _cacheable_message(command: Command) -> str | None:
+        """Return the result message if the run changed nothing else in the parent's state."""
+        update = cast("dict[str, Any]", command.update)
+        if result_cache is None or set(update) != {"messages"}:
+            return None
+        return update["messages"][0].content
+
+    def _files_context(runtime: ToolRuntime) -> contextlib.AbstractContextManager[None]:
+        if files_handoff == "reference":
+            return inherit_files(visible_files(runtime.state))
+        return contextlib.nullcontext()
+
     def task(
         description: Annotated[
             str,
@@ -438,12 +924,23 @@ def _build_task_tool(  # noqa: C901
         if subagent_type not in subagent_graphs:
             allowed_types = ", ".join([f"`{k}`" for k in subagent_graphs])
             return f"We cannot invoke subagent {subagent_type} because it does not exist, the only allowed types are {allowed_types}"
+        if result_cache is not None and runtime.tool_call_id:
+            cached = result_cache.get(subagent_type, description)
+            if cached is not None:
+                return Command(update={"messages": [ToolMessage(cached, tool_call_id=runtime.tool_call_id)]})
         subagent, subagent_state = _validate_and_prepare_state(subagent_type, description, runtime)
-        result = subagent.invoke(subagent_state)
+        # Snapshot references (not contents) so in-place updates cannot hide changes
+        passed_files = dict(subagent_state.get("files") or {})
+        with _files_context(runtime):
+            result = scheduler.run(subagent_type, lambda: subagent.invoke(subagent_state))
         if not runtime.tool_call_id:
             value_error_msg = "Tool call ID is required for subagent invocation"
             raise ValueError(value_error_msg)
-        return _return_command_with_state_update(result, runtime.tool_call_id)
+        command = _return_command_with_state_update(result, runtime.tool_call_id, passed_files)
+        message = _cacheable_message(command)
+        if result_cache is not None and message is not None:
+            result_cache.put(subagent_type, description, message)
+        return command
 
     async def atask(
         description: Annotated[
@@ -456,12 +953,31 @@ def _build_task_tool(  # noqa: C901
         if subagent_type not in subagent_graphs:
             allowed_types = ", ".join([f"`{k}`" for k in subagent_graphs])
             return f"We cannot invoke subagent {subagent_type} because it does not exist, the only allowed types are {allowed_types}"
+        if result_cache is not None and runtime.tool_call_id:
+            cached = await result_cache.aget(subagent_type, description)
+            if cached is not None:
+                return Command(update={"messages": [ToolMessage(cached, tool_call_id=runtime.tool_call_id)]})
         subagent, subagent_state = _validate_and_prepare_state(subagent_type, description, runtime)
-        result = await subagent.ainvoke(subagent_state)
+        # Snapshot references (not contents) so in-place updates cannot hide changes
+        passed_files = dict(subagent_state.get("files") or {})
+        with _files_context(runtime):
+            result = await scheduler.arun(
+                subagent_type,
+                lambda: subagent.ainvoke(subagent_state),
+                batch_key=_task_batch_key(runtime),
+                tool_call_id=runtime.tool_call_id or "",
+                timeout=subagent_timeouts.get(subagent_type),
+            )
+        if isinstance(result, str):
+            return result
         if not runtime.tool_call_id:
             value_error_msg = "Tool call ID is required for subagent invocation"
             raise ValueError(value_error_msg)
-        return _return_command_with_state_update(result, runtime.tool_call_id)
+        command = _return_command_with_state_update(result, runtime.tool_call_id, passed_files)
+        message = _cacheable_message(command)
+        if result_cache is not None and message is not None:
+            await result_cache.aput(subagent_type, description, message)
+        return command
 
     return StructuredTool.from_function(
         name="task",
@@ -496,10 +1012,24 @@ class SubAgentMiddleware(AgentMiddleware[Any, ContextT, ResponseT]):
         backend: Backend for file operations and execution. Required for the new API.
         subagents: List of fully-specified subagent configs. Each SubAgent
             must specify `model` and `tools`. Optional `interrupt_on` on
-            individual subagents is respected.
+            individual subagents is respected. `SubAgent` graphs are compiled on
+            their first `task` call and reused afterwards.
         system_prompt: Instructions appended to main agent's system prompt
             about how to use the task tool.
         task_description: Custom description for the task tool.
+        max_concurrency: Maximum number of subagents running at once across all
+            parallel `task` calls. Extra calls wait for a free slot in arrival order.
+            `None` (default) runs every call immediately.
+        task_timeout: Default number of seconds a `task` call may run before it is
+            stopped and reported to the model as timed out. Individual subagents can
+            override it with their `timeout` key. Only enforced for async execution.
+        files_handoff: How the parent's `files` state is handed to subagents. `"copy"`
+            (default) passes it in the subagent's input state; `"reference"` lets
+            `StateBackend` reads fall through to the parent's files so large file
+            sets are not copied into, and checkpointed by, every subagent.
+        result_cache: Optional `SubAgentResultCache`. Repeated `task` calls with the
+            same subagent type and description are answered from it without
+            invoking the subagent.
 
     Example:
         ```python
@@ -549,6 +1079,10 @@ class SubAgentMiddleware(AgentMiddleware[Any, ContextT, ResponseT]):
         subagents: list[SubAgent | CompiledSubAgent] | None = None,
         system_prompt: str | None = TASK_SYSTEM_PROMPT,
         task_description: str | None = None,
+        max_concurrency: int | None = None,
+        task_timeout: float | None = None,
+        files_handoff: FilesHandoff = "copy",
+        result_cache: SubAgentResultCache | None = None,
         **deprecated_kwargs: Unpack[_DeprecatedKwargs],
     ) -> None:
         """Initialize the `SubAgentMiddleware`."""
@@ -607,7 +1141,8 @@ class SubAgentMiddleware(AgentMiddleware[Any, ContextT, ResponseT]):
             msg = "SubAgentMiddleware requires either `backend` (new API) or `default_model` (deprecated API)"
             raise ValueError(msg)
 
-        task_tool = _build_task_tool(subagent_specs, task_description)
+        self._scheduler = _SubagentScheduler(max_concurrency=max_concurrency, default_timeout=task_timeout)
+        task_tool = _build_task_tool(subagent_specs, task_description, self._scheduler, files_handoff, result_cache)
 
         # Build system prompt with available agents
         if system_prompt and subagent_specs:
@@ -618,9 +1153,17 @@ class SubAgentMiddleware(AgentMiddleware[Any, ContextT, ResponseT]):
 
         self.tools = [task_tool]
 
+    @property
+    def scheduler_stats(self) -> SubagentSchedulerStats:
+        """Queue wait, run time and outcome counters for `task` calls made so far."""
+        return self._scheduler.stats
+
     def _get_subagents(self) -> list[_SubagentSpec]:
         """Create runnable agents from specs.
 
+        `SubAgent` specs are validated here but only compiled the first time the `task`
+        tool invokes them.
+
         Returns:
             List of subagent specs with name, description, and runnable.
         """
@@ -630,7 +1173,10 @@ class SubAgentMiddleware(AgentMiddleware[Any, ContextT, ResponseT]):
             if "runnable" in spec:
                 # CompiledSubAgent - use as-is
                 compiled = cast("CompiledSubAgent", spec)
-                specs.append({"name": compiled["name"], "description": compiled["description"], "runnable": compiled["runnable"]})
+                compiled_spec: _SubagentSpec = {"name": compiled["name"], "description": compiled["description"], "runnable": compiled["runnable"]}
+                if "timeout" in compiled:
+                    compiled_spec["timeout"] = compiled["timeout"]
+                specs.append(compiled_spec)
                 continue
 
             # SubAgent - validate required fields
@@ -641,31 +1187,14 @@ class SubAgentMiddleware(AgentMiddleware[Any, ContextT, ResponseT]):
                 msg = f"SubAgent '{spec['name']}' must specify 'tools'"
                 raise ValueError(msg)
 
-            # Resolve model if string
-            model = spec["model"]
-            if isinstance(model, str):
-                model = init_chat_model(model)
-
-            # Use middleware as provided (caller is responsible for building full stack)
-            middleware: list[AgentMiddleware] = list(spec.get("middleware", []))
-
-            interrupt_on = spec.get("interrupt_on")
-            if interrupt_on:
-                middleware.append(HumanInTheLoopMiddleware(interrupt_on=interrupt_on))
-
-            specs.append(
-                {
-                    "name": spec["name"],
-                    "description": spec["description"],
-                    "runnable": create_agent(
-                        model,
-                        system_prompt=spec["system_prompt"],
-                        tools=spec["tools"],
-                        middleware=middleware,
-                        name=spec["name"],
-                    ),
-                }
-            )
+            subagent_spec: _SubagentSpec = {
+                "name": spec["name"],
+                "description": spec["description"],
+                "runnable": _LazySubagent(spec, _create_subagent_runnable),
+            }
+            if "timeout" in spec:
+                subagent_spec["timeout"] = spec["timeout"]
+            specs.append(subagent_spec)
 
         return specs
 
@@ -68,6 +68,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_TRUNCATION_TEXT = "...(argument truncated)"
+"""Default text that replaces the tail of truncated tool call arguments."""
+
 
 class SummarizationEvent(TypedDict):
     """Represents a summarization event.
@@ -238,12 +241,12 @@ class _DeepAgentsSummarizationMiddleware(AgentMiddleware):
             self._truncate_args_trigger = None
             self._truncate_args_keep: ContextSize = ("messages", 20)
             self._max_arg_length = 2000
-            self._truncation_text = "...(argument truncated)"
+            self._truncation_text = DEFAULT_TRUNCATION_TEXT
         else:
             self._truncate_args_trigger = truncate_args_settings.get("trigger")
             self._truncate_args_keep = truncate_args_settings.get("keep", ("messages", 20))
             self._max_arg_length = truncate_args_settings.get("max_length", 2000)
-            self._truncation_text = truncate_args_settings.get("truncation_text", "...(argument truncated)")
+            self._truncation_text = truncate_args_settings.get("truncation_text", DEFAULT_TRUNCATION_TEXT)
 
     # Delegated properties and methods from langchain helper
     @property
@@ -0,0 +1,66 @@
+"""Benchmarks for `create_deep_agent` construction time.
+
+Subagent middleware stacks and graphs are built on a subagent's first `task` call,
+so constructing an agent should cost about the same no matter how many subagents
+it declares. These tests guard that invariant: if subagents are compiled eagerly
+again, construction time grows linearly with the subagent count and the tests fail.
+
+Run with::
+
+    make benchmark          # uses the `benchmark` pytest marker
+    uv run --group test pytest tests/ -m benchmark -v
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from deepagents.graph import create_deep_agent
+from tests.unit_tests.chat_model import GenericFakeChatModel
+
+if TYPE_CHECKING:
+    from deepagents.middleware.subagents import SubAgent
+
+pytestmark = pytest.mark.benchmark
+
+ROUNDS = 5
+
+
+def _construction_seconds(num_subagents: int) -> float:
+    """Return the median wall-clock time of `create_deep_agent` over `ROUNDS` runs."""
+    subagents: list[SubAgent] = [
+        {"name": f"subagent-{i}", "description": f"Subagent number {i}.", "system_prompt": "You help."} for i in range(num_subagents)
+    ]
+    timings = []
+    for _ in range(ROUNDS):
+        model = GenericFakeChatModel(messages=iter([AIMessage(content="Done.")]))
+        start = time.perf_counter()
+        create_deep_agent(model=model, subagents=list(subagents))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+class TestCreateDeepAgentConstruction:
+    def test_construction_under_threshold(self) -> None:
+        """Constructing an agent with many subagents stays fast.
+
+        The threshold is generous to avoid flaky CI; eager compilation of 20
+        subagents takes several seconds.
+        """
+        _construction_seconds(0)  # warm up imports and pydantic schema caches
+        elapsed = _construction_seconds(20)
+        assert elapsed < 1.5, f"create_deep_agent with 20 subagents took {elapsed:.2f}s — expected < 1.5s"
+
+    def test_construction_independent_of_subagent_count(self) -> None:
+        """Adding subagents must not add per-subagent compilation cost."""
+        _construction_seconds(0)
+        baseline = _construction_seconds(1)
+        many = _construction_seconds(20)
+        assert many < baseline * 3, (
+            f"create_deep_agent took {baseline:.3f}s with 1 subagent but {many:.3f}s with 20 — are subagents compiled eagerly?"
+        )
@@ -0,0 +1,109 @@
+"""Benchmarks for `FilesystemBackend.ls_info` and `glob_info` on large trees.
+
+Both walk directories with `os.scandir` and describe each entry with one `stat`
+call, resolving only symlinks. The baselines below reproduce the previous
+`pathlib` implementation, which called `is_file()`, `is_dir()`, `stat()` and
+`resolve()` for every entry. The gap grows with syscall latency, so it is much
+larger on network filesystems than on the local disk measured here.
+
+Run with::
+
+    make benchmark          # uses the `benchmark` pytest marker
+    uv run --group test pytest tests/ -m benchmark -v
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from deepagents.backends.filesystem import FilesystemBackend
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+pytestmark = pytest.mark.benchmark
+
+ROUNDS = 5
+FLAT_ENTRIES = 10_000
+TREE_DEPTH = 6
+TREE_FANOUT = 3
+FILES_PER_DIR = 20
+
+
+def _median_seconds(func: Callable[[], object]) -> float:
+    func()  # warm up the dentry cache so both sides measure the same work
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def _pathlib_ls(root: Path, directory: Path) -> list[dict]:
+    results = []
+    for child in directory.iterdir():
+        if child.is_file() or child.is_dir():
+            st = child.stat()
+            results.append({"path": "/" + child.resolve().relative_to(root).as_posix(), "size": st.st_size, "modified_at": st.st_mtime})
+    return results
+
+
+def _pathlib_glob(root: Path, pattern: str) -> list[dict]:
+    results = []
+    for match in root.rglob(pattern):
+        if match.is_file():
+            match.resolve().relative_to(root)  # containment check, resolved again for the virtual path
+            st = match.stat()
+            results.append({"path": "/" + match.resolve().relative_to(root).as_posix(), "size": st.st_size, "modified_at": st.st_mtime})
+    return results
+
+
+def _build_tree(directory: Path, depth: int) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(FILES_PER_DIR):
+        (directory / f"module_{i}.py" if i % 2 else directory / f"notes_{i}.txt").write_text("x")
+    if depth:
+        for i in range(TREE_FANOUT):
+            _build_tree(directory / f"pkg_{i}", depth - 1)
+
+
+@pytest.fixture(scope="module")
+def flat_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    root = tmp_path_factory.mktemp("flat")
+    for i in range(FLAT_ENTRIES):
+        (root / f"file_{i}.txt").write_text("x")
+    return root
+
+
+@pytest.fixture(scope="module")
+def deep_tree(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    root = tmp_path_factory.mktemp("deep")
+    _build_tree(root, TREE_DEPTH)
+    return root
+
+
+class TestFilesystemListing:
+    def test_ls_info_faster_than_pathlib(self, flat_dir: Path) -> None:
+        backend = FilesystemBackend(root_dir=flat_dir, virtual_mode=True)
+        assert len(backend.ls_info("/")) == FLAT_ENTRIES
+
+        scandir = _median_seconds(lambda: backend.ls_info("/"))
+        baseline = _median_seconds(lambda: _pathlib_ls(flat_dir, flat_dir))
+        print(f"ls_info of {FLAT_ENTRIES} entries: {scandir * 1000:.1f}ms, pathlib baseline {baseline * 1000:.1f}ms")  # noqa: T201
+        assert scandir < baseline, f"ls_info took {scandir:.3f}s, the pathlib baseline {baseline:.3f}s"
+
+    def test_glob_info_faster_than_pathlib(self, deep_tree: Path) -> None:
+        backend = FilesystemBackend(root_dir=deep_tree, virtual_mode=True)
+        expected = sorted(info["path"] for info in _pathlib_glob(deep_tree, "*.py"))
+        assert [info["path"] for info in backend.glob_info("**/*.py")] == expected
+
+        scandir = _median_seconds(lambda: backend.glob_info("**/*.py"))
+        baseline = _median_seconds(lambda: _pathlib_glob(deep_tree, "*.py"))
+        print(f"glob_info over {len(expected)} matches: {scandir * 1000:.1f}ms, pathlib baseline {baseline * 1000:.1f}ms")  # noqa: T201
+        assert scandir < baseline, f"glob_info took {scandir:.3f}s, the pathlib baseline {baseline:.3f}s"
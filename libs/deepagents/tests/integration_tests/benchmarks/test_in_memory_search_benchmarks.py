@@ -0,0 +1,107 @@
+"""Benchmarks for grep and glob over in-memory FileData (`StateBackend`, `StoreBackend`).
+
+Grep joins each file into one buffer, cached until the file's `modified_at`
+changes, and rules out files without a match with a single regex search of that
+buffer instead of testing every line. Glob patterns are compiled once instead of
+once per file. The baselines reproduce the previous per-line and per-file
+implementations.
+
+Regex searches gain the most, since they no longer pay a `re` call per line.
+Literal searches were already a fast substring test per line, so they are bound
+by how fast a buffer can be scanned.
+
+Run with::
+
+    make benchmark          # uses the `benchmark` pytest marker
+    uv run --group test pytest tests/ -m benchmark -v
+"""
+
+from __future__ import annotations
+
+import re
+import statistics
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import wcmatch.glob as wcglob
+
+from deepagents.backends.utils import _glob_search_files, _grep_search_files, create_file_data, grep_matches_from_files
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+pytestmark = pytest.mark.benchmark
+
+ROUNDS = 5
+NUM_FILES = 5_000
+LINES_PER_FILE = 200
+
+
+def _median_seconds(func: Callable[[], object]) -> float:
+    func()  # warm up caches, as repeated searches of one agent run would
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def _per_line_grep(files: dict[str, Any], pattern: str) -> list[dict[str, Any]]:
+    return [
+        {"path": file_path, "line": line_num, "text": line}
+        for file_path, file_data in files.items()
+        for line_num, line in enumerate(file_data["content"], 1)
+        if pattern in line
+    ]
+
+
+def _per_line_regex_grep(files: dict[str, Any], pattern: str) -> dict[str, list[tuple[int, str]]]:
+    regex = re.compile(pattern)
+    results: dict[str, list[tuple[int, str]]] = {}
+    for file_path, file_data in files.items():
+        for line_num, line in enumerate(file_data["content"], 1):
+            if regex.search(line):
+                results.setdefault(file_path, []).append((line_num, line))
+    return results
+
+
+def _per_file_glob(files: dict[str, Any], pattern: str) -> list[str]:
+    return [file_path for file_path in files if wcglob.globmatch(file_path[1:], pattern, flags=wcglob.BRACE | wcglob.GLOBSTAR)]
+
+
+@pytest.fixture(scope="module")
+def files() -> dict[str, Any]:
+    body = "\n".join(f"    value_{i} = compute(value_{i - 1}, offset={i})" for i in range(LINES_PER_FILE))
+    return {f"/src/pkg_{i % 50}/module_{i}.py": create_file_data(body + ("\nTODO: remove" if i % 100 == 0 else "")) for i in range(NUM_FILES)}
+
+
+class TestInMemorySearch:
+    def test_grep_faster_than_per_line_search(self, files: dict[str, Any]) -> None:
+        matches = grep_matches_from_files(files, "TODO")
+        assert matches == _per_line_grep(files, "TODO")
+        assert len(matches) == NUM_FILES // 100
+
+        buffered = _median_seconds(lambda: grep_matches_from_files(files, "TODO"))
+        baseline = _median_seconds(lambda: _per_line_grep(files, "TODO"))
+        print(f"grep over {NUM_FILES} files: {buffered * 1000:.1f}ms, per-line baseline {baseline * 1000:.1f}ms")  # noqa: T201
+        assert buffered < baseline, f"grep took {buffered:.3f}s, the per-line baseline {baseline:.3f}s"
+
+    def test_regex_grep_faster_than_per_line_search(self, files: dict[str, Any]) -> None:
+        pattern = r"TODO:\s+\w+"
+        assert _grep_search_files(files, pattern, output_mode="count").count("\n") + 1 == len(_per_line_regex_grep(files, pattern))
+
+        buffered = _median_seconds(lambda: _grep_search_files(files, pattern))
+        baseline = _median_seconds(lambda: _per_line_regex_grep(files, pattern))
+        print(f"regex grep over {NUM_FILES} files: {buffered * 1000:.1f}ms, per-line baseline {baseline * 1000:.1f}ms")  # noqa: T201
+        assert buffered * 3 < baseline, f"regex grep took {buffered:.3f}s, the per-line baseline {baseline:.3f}s"
+
+    def test_glob_faster_than_per_file_matching(self, files: dict[str, Any]) -> None:
+        pattern = "**/pkg_7/*.py"
+        assert sorted(_glob_search_files(files, pattern).split("\n")) == sorted(_per_file_glob(files, pattern))
+
+        compiled = _median_seconds(lambda: _glob_search_files(files, pattern))
+        baseline = _median_seconds(lambda: _per_file_glob(files, pattern))
+        print(f"glob over {NUM_FILES} files: {compiled * 1000:.1f}ms, per-file baseline {baseline * 1000:.1f}ms")  # noqa: T201
+        assert compiled < baseline, f"glob took {compiled:.3f}s, the per-file baseline {baseline:.3f}s"
@@ -0,0 +1,115 @@
+"""Tests for content-addressed blob stores and `StateBackend` with externalized files."""
+
+import json
+import os
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from langchain.tools import ToolRuntime
+from langgraph.store.memory import InMemoryStore
+
+from deepagents.backends import BlobStore, DirectoryBlobStore, SqliteBlobStore, StateBackend, StoreBlobStore, blob_refcounts
+from deepagents.backends.utils import create_file_data
+
+
+@pytest.fixture(params=["directory", "sqlite", "store"])
+def blob_store(request: pytest.FixtureRequest, tmp_path: Path) -> BlobStore:
+    if request.param == "directory":
+        return DirectoryBlobStore(tmp_path / "blobs")
+    if request.param == "sqlite":
+        return SqliteBlobStore(tmp_path / "blobs.db")
+    return StoreBlobStore(InMemoryStore())
+
+
+def _runtime(files: dict | None = None) -> ToolRuntime:
+    return ToolRuntime(
+        state={"messages": [], "files": files or {}},
+        context=None,
+        tool_call_id="t1",
+        store=None,
+        stream_writer=lambda _: None,
+        config={},
+    )
+
+
+def test_put_get_and_collect(blob_store: BlobStore) -> None:
+    kept = blob_store.put("line 1\nline 2")
+    dropped = blob_store.put("old content")
+
+    assert blob_store.put("line 1\nline 2") == kept
+    # Reads go to storage once the cache is empty
+    blob_store._cache.clear()
+    assert blob_store.get_lines(kept) == ["line 1", "line 2"]
+    assert blob_store.get("0" * 64) is None
+
+    assert blob_store.collect({kept: 1}) == 0  # within the grace period
+    assert blob_store.collect({kept: 1}, grace_seconds=-1) == 1
+    assert blob_store.get(dropped) is None
+    assert blob_store.get(kept) == "line 1\nline 2"
+
+
+def _age(blob_store: BlobStore, digest: str, seconds: float) -> None:
+    """Move the storage time of a blob `seconds` into the past."""
+    stored_at = time.time() - seconds
+    if isinstance(blob_store, DirectoryBlobStore):
+        os.utime(blob_store._path(digest), (stored_at, stored_at))
+    elif isinstance(blob_store, SqliteBlobStore):
+        blob_store._conn.execute(f"UPDATE {blob_store.table} SET stored_at = ? WHERE digest = ?", (stored_at, digest))  # noqa: S608
+    else:
+        item = blob_store.store.get(blob_store.namespace, digest)
+        item.updated_at = datetime.fromtimestamp(stored_at, tz=UTC)
+
+
+def test_put_refreshes_storage_time(blob_store: BlobStore) -> None:
+    digest = blob_store.put("unreferenced")
+    _age(blob_store, digest, 7200)
+
+    # A state not checkpointed yet references the blob again
+    assert blob_store.put("unreferenced") == digest
+    assert blob_store.collect({}) == 0
+    assert blob_store.get(digest) == "unreferenced"
+
+    _age(blob_store, digest, 7200)
+    assert blob_store.collect({}) == 1
+
+
+def test_state_backend_keeps_contents_in_blob_store(blob_store: BlobStore) -> None:
+    runtime = _runtime({"/inline.txt": create_file_data("inline content")})
+    backend = StateBackend(runtime, blob_store=blob_store)
+    body = "x" * 10_000
+
+    runtime.state["files"].update(backend.write("/big.txt", f"{body}\nneedle").files_update)
+    stored = runtime.state["files"]["/big.txt"]
+    assert "content" not in stored
+    assert stored["size"] == len(body) + 7
+    assert len(json.dumps(stored)) < 256
+
+    update = backend.edit("/big.txt", "needle", "pin").files_update
+    runtime.state["files"].update(update)
+
+    assert "pin" in backend.read("/big.txt", offset=1)
+    assert [m["path"] for m in backend.grep_raw("content")] == ["/inline.txt"]
+    assert backend.grep_raw("pin")[0]["line"] == 2
+    assert {i["path"]: i["size"] for i in backend.ls_info("/")} == {"/big.txt": len(body) + 4, "/inline.txt": 14}
+    assert backend.download_files(["/big.txt"])[0].content == f"{body}\npin".encode()
+
+    # Only the blob of the current content is referenced
+    refcounts = blob_refcounts([runtime.state])
+    assert blob_store.collect(refcounts, grace_seconds=-1) == 1
+    assert backend.read("/big.txt", offset=1).endswith("pin")
+
+
+def test_state_backend_reports_missing_blob(tmp_path: Path) -> None:
+    blob_store = DirectoryBlobStore(tmp_path)
+    files = {"/gone.txt": {"content_hash": "f" * 64, "size": 3, "created_at": "", "modified_at": ""}}
+    backend = StateBackend(_runtime(files), blob_store=blob_store)
+
+    assert "missing from the blob store" in backend.read("/gone.txt")
+    assert backend.download_files(["/gone.txt"])[0].error == "file_not_found"
+
+
+def test_sqlite_blob_store_rejects_invalid_table(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Invalid table name"):
+        SqliteBlobStore(tmp_path / "blobs.db", table="blobs; DROP TABLE x")
@@ -0,0 +1,167 @@
+import os
+from pathlib import Path
+
+from deepagents.backends import CompositeBackend, FileContentCache, FilesystemBackend, StateBackend
+from deepagents.backends.protocol import BackendProtocol, FileDownloadResponse
+
+
+class CountingBackend(BackendProtocol):
+    """Unversioned backend serving files from a dict and counting downloads."""
+
+    def __init__(self, files: dict[str, str]) -> None:
+        self.files = files
+        self.downloads = 0
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        self.downloads += 1
+        return [
+            FileDownloadResponse(path=p, content=self.files[p].encode()) if p in self.files else FileDownloadResponse(path=p, error="file_not_found")
+            for p in paths
+        ]
+
+
+def test_for_backend_shares_one_cache_per_owner() -> None:
+    backend = CountingBackend({})
+
+    assert FileContentCache.for_backend(backend) is FileContentCache.for_backend(backend)
+    assert FileContentCache.for_backend(backend) is not FileContentCache.for_backend(CountingBackend({}))
+
+
+def test_read_through_is_scoped_to_thread() -> None:
+    backend = CountingBackend({"/a.txt": "hello"})
+    cache = FileContentCache()
+
+    assert cache.read(backend, "/a.txt", thread_id="t1") == "hello"
+    assert cache.read(backend, "/a.txt", thread_id="t1") == "hello"
+    assert backend.downloads == 1
+
+    assert cache.read(backend, "/a.txt", thread_id="t2") == "hello"
+    assert backend.downloads == 2
+    assert cache.read(backend, "/missing.txt", thread_id="t1") is None
+
+
+def test_reads_without_thread_are_not_cached() -> None:
+    backend = CountingBackend({"/a.txt": "hello"})
+    cache = FileContentCache()
+
+    cache.put(backend, "/a.txt", "hello", thread_id=None)
+
+    assert cache.get(backend, "/a.txt", thread_id=None) is None
+    assert cache.read(backend, "/a.txt", thread_id=None) is None
+    assert not cache.has_entries(None)
+
+
+def test_entries_are_scoped_to_backend_instance() -> None:
+    alice = CountingBackend({"/secret.txt": "alice"})
+    bob = CountingBackend({"/secret.txt": "bob"})
+    cache = FileContentCache()
+
+    assert cache.read(alice, "/secret.txt", thread_id="t") == "alice"
+    assert cache.get(bob, "/secret.txt", thread_id="t") is None
+    assert cache.read(bob, "/secret.txt", thread_id="t") == "bob"
+    assert cache.read(alice, "/secret.txt", thread_id="t") == "alice"
+    assert alice.downloads == 1
+
+
+def test_filesystem_backends_with_the_same_root_share_entries(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("v1")
+    cache = FileContentCache()
+
+    cache.put(FilesystemBackend(root_dir=tmp_path, virtual_mode=True), "/a.txt", "v1", thread_id="t")
+
+    assert cache.get(FilesystemBackend(root_dir=tmp_path, virtual_mode=True), "/a.txt", thread_id="t") == "v1"
+    assert cache.get(FilesystemBackend(root_dir=tmp_path / "other", virtual_mode=True), "/a.txt", thread_id="t") is None
+
+
+def test_filesystem_entries_are_revalidated(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("v1")
+    backend = CompositeBackend(default=StateBackend(None), routes={"/disk/": FilesystemBackend(root_dir=tmp_path, virtual_mode=True)})
+    cache = FileContentCache()
+
+    assert cache.read(backend, "/disk/a.txt", thread_id="t") == "v1"
+    assert cache.get(backend, "/disk/a.txt", thread_id="t") == "v1"
+
+    (tmp_path / "a.txt").write_text("v2")
+    os.utime(tmp_path / "a.txt", ns=(0, 0))
+    assert cache.get(backend, "/disk/a.txt", thread_id="t") is None
+    assert cache.read(backend, "/disk/a.txt", thread_id="t") == "v2"
+
+    # State files are never cached, and disk files survive turn boundaries
+    assert not FileContentCache.cacheable(backend, "/notes.txt")
+    cache.invalidate("t", unversioned_only=True)
+    assert cache.get(backend, "/disk/a.txt", thread_id="t") == "v2"
+
+
+def test_invalidate_unversioned_and_bounds() -> None:
+    backend = CountingBackend({"/a.txt": "a", "/b.txt": "b", "/big.txt": "x" * 20})
+    cache = FileContentCache(max_entries=1, max_entry_chars=10)
+
+    cache.read(backend, "/a.txt", thread_id="t")
+    cache.read(backend, "/b.txt", thread_id="t")
+    assert cache.get(backend, "/a.txt", thread_id="t") is None
+    assert cache.get(backend, "/b.txt", thread_id="t") == "b"
+
+    assert cache.read(backend, "/big.txt", thread_id="t") == "x" * 20
+    assert cache.get(backend, "/big.txt", thread_id="t") is None
+
+    cache.invalidate("t", unversioned_only=True)
+    assert not cache.has_entries("t")
+
+
+def test_uncacheable_files_are_not_downloaded_again() -> None:
+    backend = CountingBackend({"/big.txt": "x" * 20})
+    cache = FileContentCache(max_entry_chars=10)
+
+    assert cache.read(backend, "/big.txt", thread_id="t") == "x" * 20
+    assert cache.read(backend, "/big.txt", thread_id="t") is None
+    assert backend.downloads == 1
+
+    cache.invalidate("t", unversioned_only=True)
+    assert cache.read(backend, "/big.txt", thread_id="t") == "x" * 20
+    assert backend.downloads == 2
+
+
+def test_large_filesystem_files_are_not_downloaded(tmp_path: Path) -> None:
+    (tmp_path / "big.txt").write_text("x" * 20)
+    backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=True)
+    cache = FileContentCache(max_entry_chars=10)
+    downloads: list[list[str]] = []
+    download_files = backend.download_files
+    backend.download_files = lambda paths: downloads.append(paths) or download_files(paths)  # type: ignore[method-assign]
+
+    assert cache.read(backend, "/big.txt", thread_id="t") is None
+    assert downloads == []
+
+
+def test_non_utf8_filesystem_files_are_downloaded_once_per_version(tmp_path: Path) -> None:
+    (tmp_path / "data.bin").write_bytes(b"\xff\xfe")
+    backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=True)
+    cache = FileContentCache()
+    downloads: list[list[str]] = []
+    download_files = backend.download_files
+    backend.download_files = lambda paths: downloads.append(paths) or download_files(paths)  # type: ignore[method-assign]
+
+    assert cache.read(backend, "/data.bin", thread_id="t") is None
+    assert cache.read(backend, "/data.bin", thread_id="t") is None
+    assert len(downloads) == 1
+
+    (tmp_path / "data.bin").write_text("text")
+    assert cache.read(backend, "/data.bin", thread_id="t") == "text"
+    assert len(downloads) == 2
+
+
+def test_download_is_stored_under_the_version_before_it(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("v1")
+    backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=True)
+    cache = FileContentCache()
+    download_files = backend.download_files
+
+    def download_then_change(paths: list[str]) -> list[FileDownloadResponse]:
+        responses = download_files(paths)
+        (tmp_path / "a.txt").write_text("v2 changed")
+        return responses
+
+    backend.download_files = download_then_change  # type: ignore[method-assign]
+
+    assert cache.read(backend, "/a.txt", thread_id="t") == "v1"
+    assert cache.get(backend, "/a.txt", thread_id="t") is None
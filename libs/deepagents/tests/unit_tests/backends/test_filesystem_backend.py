@@ -1,3 +1,5 @@
+import errno
+import os
 from pathlib import Path
 
 import pytest
@@ -585,3 +587,117 @@ class TestWindowsPathHandling:
         infos = be.ls_info("/a/b/c/d")
         for info in infos:
             assert "\\" not in info["path"], f"Backslash in deep path: {info['path']}"
+
+
+@pytest.mark.parametrize(
+    ("new_string", "expected"),
+    [
+        ("kiwi", "apple\nbanana\napple\nkiwi\napple\n"),
+        ("grape!", "apple\nbanana\napple\ngrape!\napple\n"),
+        ("", "apple\nbanana\napple\n\napple\n"),
+    ],
+)
+def test_filesystem_backend_edit_with_line_range(tmp_path: Path, new_string: str, expected: str):
+    """An occurrence unique in the file and within the line range is replaced."""
+    write_file(tmp_path / "fruits.txt", "apple\nbanana\napple\norange\napple\n")
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True)
+
+    res = be.edit("/fruits.txt", "orange", new_string, line_range=(2, 4))
+
+    assert res.error is None and res.occurrences == 1
+    assert (tmp_path / "fruits.txt").read_text() == expected
+    # The hint never bypasses the uniqueness check
+    assert "appears 3 times" in be.edit("/fruits.txt", "apple", "pear", line_range=(1, 3)).error
+    assert (tmp_path / "fruits.txt").read_text() == expected
+
+
+def test_filesystem_backend_splice_falls_back_when_kernel_copy_fails(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Any kernel copy error, e.g. `sendfile` to a regular file on macOS, falls back to a user space copy."""
+
+    def unsupported(*_args: object) -> int:
+        raise OSError(errno.ENOTSOCK, "Socket operation on non-socket")
+
+    monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+    monkeypatch.setattr(os, "sendfile", unsupported, raising=False)
+    write_file(tmp_path / "fruits.txt", "apple\nbanana\norange\n")
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True)
+
+    assert be.edit("/fruits.txt", "banana", "kiwi", line_range=(1, 2)).error is None
+    assert (tmp_path / "fruits.txt").read_text() == "apple\nkiwi\norange\n"
+
+
+@pytest.mark.parametrize("fsync", ["none", "file", "full"])
+def test_filesystem_backend_writes_replace_files_atomically(tmp_path: Path, fsync: str):
+    """Writes go through a renamed temp file that keeps the permissions of the replaced file."""
+    target = tmp_path / "script.sh"
+    write_file(target, "echo one\necho two\n")
+    target.chmod(0o755)
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True, fsync=fsync)
+
+    assert be.edit("/script.sh", "one", "uno").error is None
+    assert be.edit("/script.sh", "two", "dos", line_range=(1, 2)).error is None
+    assert be.write("/new.txt", "fresh").error is None
+    assert be.upload_files([("/data.bin", b"\x00\x01")])[0].error is None
+
+    assert target.read_text() == "echo uno\necho dos\n"
+    assert target.stat().st_mode & 0o777 == 0o755
+    assert (tmp_path / "new.txt").read_text() == "fresh"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["data.bin", "new.txt", "script.sh"]
+
+
+def test_filesystem_backend_edit_refuses_symlink(tmp_path: Path):
+    write_file(tmp_path / "real.txt", "hello")
+    (tmp_path / "link.txt").symlink_to(tmp_path / "real.txt")
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
+
+    res = be.edit(str(tmp_path / "link.txt"), "hello", "bye")
+
+    assert res.error is not None
+    assert (tmp_path / "real.txt").read_text() == "hello"
+    assert (tmp_path / "link.txt").is_symlink()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["link.txt", "real.txt"]
+
+
+def test_filesystem_backend_rejects_unknown_fsync_policy(tmp_path: Path):
+    with pytest.raises(ValueError, match="fsync policy"):
+        FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True, fsync="always")
+
+
+@pytest.mark.parametrize("pattern", ["*.py", "**/*.py", "src/*.py", "src/**/test_*.py", ".*", "[ab]*.txt", "*/c.txt", "**"])
+def test_glob_info_matches_rglob(tmp_path: Path, pattern: str):
+    """`glob_info` walks the tree with `scandir` but keeps the matching rules of `Path.rglob`."""
+    for rel in ["a.txt", "b.txt", "c.txt", "x.py", ".env", "src/app.py", "src/pkg/test_app.py", "src/pkg/c.txt", ".hidden/test_x.py"]:
+        write_file(tmp_path / rel, rel)
+    (tmp_path / "src" / "link.py").symlink_to(tmp_path / "x.py")
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
+
+    expected = sorted(str(p) for p in tmp_path.rglob(pattern) if p.is_file())
+
+    assert [info["path"] for info in be.glob_info(pattern, path=str(tmp_path))] == expected
+
+
+def test_ls_info_follows_symlinks_within_root(tmp_path: Path):
+    write_file(tmp_path / "root" / "real.txt", "12345")
+    write_file(tmp_path / "outside.txt", "x")
+    (tmp_path / "root" / "sub").mkdir()
+    (tmp_path / "root" / "inside_link").symlink_to(tmp_path / "root" / "real.txt")
+    (tmp_path / "root" / "outside_link").symlink_to(tmp_path / "outside.txt")
+    (tmp_path / "root" / "broken_link").symlink_to(tmp_path / "missing.txt")
+    be = FilesystemBackend(root_dir=str(tmp_path / "root"), virtual_mode=True)
+
+    infos = be.ls_info("/")
+
+    assert [(i["path"], i["is_dir"], i["size"]) for i in infos] == [("/real.txt", False, 5), ("/real.txt", False, 5), ("/sub/", True, 0)]
+
+
+def test_ignore_patterns_and_gitignore(tmp_path: Path):
+    write_file(tmp_path / ".gitignore", "# build output\nbuild/\n*.log\n!keep.log\n/secret.txt\n")
+    files = ["app.py", "debug.log", "keep.log", "secret.txt", "build/out.py", "src/secret.txt", "node_modules/pkg/index.js", "src/node_modules/x.js"]
+    for rel in files:
+        write_file(tmp_path / rel, rel)
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True, ignore_patterns=["node_modules/"], respect_gitignore=True)
+
+    assert [i["path"] for i in be.ls_info("/")] == ["/.gitignore", "/app.py", "/keep.log", "/src/"]
+    assert [i["path"] for i in be.glob_info("**/*")] == ["/.gitignore", "/app.py", "/keep.log", "/src/secret.txt"]
+    # Without ignore rules every file is visible
+    assert len(FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True).glob_info("**/*")) == 9
@@ -10,6 +10,11 @@ that need to be escaped as {{e}} for Python's .format() method.
 
 import base64
 import json
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+import pytest
 
 from deepagents.backends.protocol import (
     ExecuteResponse,
@@ -73,6 +78,35 @@ def test_edit_command_template_format() -> None:
     assert payload_b64 in cmd
 
 
+def _run_edit_script(path: Path, old: str, new: str, line_range: tuple[int, int] | None) -> subprocess.CompletedProcess[str]:
+    payload = json.dumps({"path": str(path), "old": old, "new": new, "range": line_range})
+    payload_b64 = base64.b64encode(payload.encode("utf-8")).decode("ascii")
+    cmd = _EDIT_COMMAND_TEMPLATE.format(payload_b64=payload_b64, replace_all=False)
+    # The command is the script this module generates; it only touches tmp_path
+    return subprocess.run(cmd, shell=True, capture_output=True, text=True, check=False)  # noqa: S602
+
+
+@pytest.mark.parametrize(
+    ("new", "expected"),
+    [
+        ("BETA", "alpha\nBETA\ngamma\ndelta\n"),
+        ("b", "alpha\nb\ngamma\ndelta\n"),
+        ("beta beta", "alpha\nbeta beta\ngamma\ndelta\n"),
+    ],
+    ids=["equal_length", "shorter", "longer"],
+)
+def test_edit_command_line_range_keeps_tail(tmp_path: Path, new: str, expected: str) -> None:
+    """Test that an in-place line range edit preserves the content after the edited span."""
+    path = tmp_path / "file.txt"
+    path.write_text("alpha\nbeta\ngamma\ndelta\n")
+
+    result = _run_edit_script(path, "beta", new, (1, 2))
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "1"
+    assert path.read_text() == expected
+
+
 def test_glob_command_template_format() -> None:
     """Test that _GLOB_COMMAND_TEMPLATE can be formatted without KeyError."""
     path_b64 = base64.b64encode(b"/test").decode("ascii")
@@ -85,6 +119,27 @@ def test_glob_command_template_format() -> None:
     assert pattern_b64 in cmd
 
 
+def test_sandbox_glob_info_reports_size_and_modified_at(tmp_path: Path) -> None:
+    """Test that glob_info keeps the size and modification time the glob script prints."""
+    skill = tmp_path / "skill" / "SKILL.md"
+    skill.parent.mkdir()
+    skill.write_text("---\nname: skill\n---\n")
+    sandbox = MockSandbox()
+
+    def run_execute(command: str) -> ExecuteResponse:
+        # The command is the script this module generates; it only reads tmp_path
+        result = subprocess.run(command, shell=True, capture_output=True, text=True, check=False)  # noqa: S602
+        return ExecuteResponse(output=result.stdout, exit_code=result.returncode, truncated=False)
+
+    sandbox.execute = run_execute
+
+    infos = sandbox.glob_info("**/SKILL.md", path=str(tmp_path))
+
+    assert [info["path"] for info in infos] == ["skill/SKILL.md"]
+    assert infos[0]["size"] == skill.stat().st_size
+    assert datetime.fromisoformat(infos[0]["modified_at"]).timestamp() == pytest.approx(skill.stat().st_mtime)
+
+
 def test_read_command_template_format() -> None:
     """Test that _READ_COMMAND_TEMPLATE can be formatted without KeyError."""
     cmd = _READ_COMMAND_TEMPLATE.format(file_path="/test/file.txt", offset=0, limit=100)
@@ -174,3 +229,55 @@ def test_sandbox_grep_literal_search() -> None:
     # Verify the command uses grep -rHnF for literal search (combined flags)
     assert sandbox.last_command is not None
     assert "grep -rHnF" in sandbox.last_command
+
+
+class HostSandbox(MockSandbox):
+    """Sandbox running the generated scripts on the host, recording each command."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.commands: list[str] = []
+
+    def execute(self, command: str, *, timeout: int | None = None) -> ExecuteResponse:
+        self.commands.append(command)
+        # The commands are the scripts this module generates; tests only point them at tmp_path
+        result = subprocess.run(command, shell=True, capture_output=True, text=True, check=False)  # noqa: S602
+        return ExecuteResponse(output=result.stdout, exit_code=result.returncode, truncated=False)
+
+
+def test_sandbox_batch_file_operations_runs_one_command(tmp_path: Path) -> None:
+    """Test that batched read-only operations run as one command and match the individual calls."""
+    (tmp_path / "app.py").write_text("import os\nprint(os.getcwd())\n")
+    root = str(tmp_path)
+    operations = [
+        ("ls_info", {"path": root}),
+        ("read", {"file_path": f"{root}/app.py", "offset": 1, "limit": 1}),
+        ("read", {"file_path": f"{root}/missing.py"}),
+        ("grep_raw", {"pattern": "import", "path": root}),
+        ("glob_info", {"pattern": "*.py", "path": root}),
+    ]
+    sandbox = HostSandbox()
+    expected = [getattr(sandbox, name)(**kwargs) for name, kwargs in operations]
+    sandbox.commands.clear()
+
+    results = sandbox.batch_file_operations(operations)
+
+    assert len(sandbox.commands) == 1
+    assert results == expected
+    assert results[2] == f"Error: File '{root}/missing.py' not found"
+
+
+def test_sandbox_batch_file_operations_uses_overridden_methods(tmp_path: Path) -> None:
+    """Test that an operation a subclass overrides runs through the override, not the batch script."""
+
+    class CustomLsSandbox(HostSandbox):
+        def ls_info(self, path: str) -> list:
+            return [{"path": f"{path}/custom", "is_dir": False}]
+
+    (tmp_path / "app.py").write_text("x\n")
+    sandbox = CustomLsSandbox()
+
+    results = sandbox.batch_file_operations([("ls_info", {"path": str(tmp_path)}), ("read", {"file_path": f"{tmp_path}/app.py"})])
+
+    assert results[0] == [{"path": f"{tmp_path}/custom", "is_dir": False}]
+    assert results[1] == sandbox.read(f"{tmp_path}/app.py")
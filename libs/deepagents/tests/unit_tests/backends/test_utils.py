@@ -1,10 +1,22 @@
 """Tests for backends/utils.py utility functions."""
 
-from typing import Any
+import re
+from collections.abc import Callable
+from typing import Any, ClassVar
 
 import pytest
 
-from deepagents.backends.utils import _glob_search_files, validate_path
+from deepagents.backends.utils import (
+    _glob_search_files,
+    _grep_search_files,
+    create_file_data,
+    grep_matches_from_files,
+    perform_string_replacement,
+    replace_in_file_data_lines,
+    replace_in_line_range,
+    update_file_data,
+    validate_path,
+)
 
 
 class TestValidatePath:
@@ -132,3 +144,76 @@ class TestGlobSearchFiles:
         """Test that path traversal in path parameter is rejected."""
         result = _glob_search_files(sample_files, "*.py", "../etc/")
         assert result == "No files found"
+
+
+class TestLineRangeReplacement:
+    """Tests for line-range addressed replacements."""
+
+    CONTENT = "apple\nbanana\napple\norange\napple"
+
+    @pytest.mark.parametrize(
+        ("line_range", "old", "new", "expected"),
+        [
+            ((3, 4), "orange", "kiwi", "apple\nbanana\napple\nkiwi\napple"),
+            ((2, 10), "orange\napple", "kiwi", "apple\nbanana\napple\nkiwi"),
+            ((1, 2), "banana\n", "", "apple\napple\norange\napple"),
+            ((0, 2), "orange", "kiwi", None),
+            ((0, 2), "apple\nbanana\napple", "x", None),
+            ((1, 3), "apple", "pear", None),
+            ((4, 10), "apple", "pear", None),
+            ((0, 5), "apple", "pear", None),
+            ((9, 12), "orange", "kiwi", None),
+        ],
+    )
+    def test_replacement_within_range(self, line_range: tuple[int, int], old: str, new: str, expected: str | None) -> None:
+        """Only an occurrence unique in the file and fully inside the range is replaced."""
+        assert replace_in_line_range(self.CONTENT, old, new, line_range) == expected
+        lines = replace_in_file_data_lines(self.CONTENT.split("\n"), old, new, line_range)
+        assert ("\n".join(lines) if lines is not None else None) == expected
+
+    def test_perform_string_replacement_falls_back_to_whole_file(self) -> None:
+        """A hint that misses behaves like a replacement without it."""
+        assert perform_string_replacement(self.CONTENT, "banana", "kiwi", line_range=(3, 5)) == (self.CONTENT.replace("banana", "kiwi"), 1)
+        assert "appears 3 times" in perform_string_replacement(self.CONTENT, "apple", "pear", line_range=(1, 2))
+        assert "appears 3 times" in perform_string_replacement(self.CONTENT, "apple", "pear", line_range=(1, 3))
+        replaced_all = perform_string_replacement(self.CONTENT, "apple", "pear", replace_all=True, line_range=(1, 3))
+        assert replaced_all == (self.CONTENT.replace("apple", "pear"), 3)
+
+
+class TestBufferSearch:
+    """Grep searches whole joined buffers but must report exactly what a per-line search would."""
+
+    FILES: ClassVar[dict[str, Any]] = {
+        "/a.py": create_file_data("import os\nfoo = 1\n  foo bar;\n\nbaz;\nfoo"),
+        "/b.txt": create_file_data("\n\nfoo\n"),
+        "/c.md": create_file_data(""),
+    }
+
+    @staticmethod
+    def _per_line(files: dict[str, Any], test: Callable[[str], object]) -> list[tuple[str, int, str]]:
+        return [(path, i, line) for path, fd in files.items() for i, line in enumerate(fd["content"], 1) if test(line)]
+
+    @pytest.mark.parametrize("pattern", ["foo", "", ";", "o\nf", "baz;", "  "])
+    def test_literal_matches_per_line_search(self, pattern: str) -> None:
+        matches = grep_matches_from_files(self.FILES, pattern)
+
+        assert [(m["path"], m["line"], m["text"]) for m in matches] == self._per_line(self.FILES, lambda line: pattern in line)
+
+    @pytest.mark.parametrize("pattern", ["^foo", "foo$", "^$", r"foo\s+bar", r"[^;]*;", r"\Afoo", r"bar(?=;)", r"\w+\s*$", "(?s)foo.*baz"])
+    def test_regex_matches_per_line_search(self, pattern: str) -> None:
+        regex = re.compile(pattern)
+        expected = self._per_line(self.FILES, regex.search)
+
+        result = _grep_search_files(self.FILES, pattern, output_mode="content")
+
+        lines = [line for line in result.split("\n") if line.startswith("  ")]
+        assert lines == [f"  {i}: {line}" for path in sorted(self.FILES) for p, i, line in expected if p == path]
+
+    def test_buffer_follows_file_updates(self) -> None:
+        files = {"/a.txt": create_file_data("old line")}
+        assert grep_matches_from_files(files, "old")[0]["line"] == 1
+
+        files["/a.txt"] = update_file_data(files["/a.txt"], "new\nold line")
+        files["/b.txt"] = {**files["/a.txt"], "content": ["old"]}
+
+        assert [(m["path"], m["line"]) for m in grep_matches_from_files(files, "old")] == [("/a.txt", 2), ("/b.txt", 1)]
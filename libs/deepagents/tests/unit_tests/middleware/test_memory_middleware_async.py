@@ -97,6 +97,36 @@ async def test_load_memory_from_backend_multiple_sources_async(tmp_path: Path) -
     assert "FastAPI" in result["memory_contents"][project_path]
 
 
+async def test_abefore_agent_batches_sources_into_one_download_async(tmp_path: Path) -> None:
+    """All memory sources are fetched with a single `adownload_files` call (async)."""
+    backend = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
+    user_path = str(tmp_path / "user" / "AGENTS.md")
+    project_path = str(tmp_path / "project" / "AGENTS.md")
+    missing_path = str(tmp_path / "missing" / "AGENTS.md")
+    backend.upload_files(
+        [
+            (user_path, make_memory_content("User", "- Be concise").encode("utf-8")),
+            (project_path, make_memory_content("Project", "FastAPI project").encode("utf-8")),
+        ]
+    )
+
+    download_calls: list[list[str]] = []
+    adownload_files = backend.adownload_files
+
+    async def spy_adownload_files(paths: list[str]) -> list:
+        download_calls.append(paths)
+        return await adownload_files(paths)
+
+    backend.adownload_files = spy_adownload_files  # type: ignore[method-assign]
+    middleware = MemoryMiddleware(backend=backend, sources=[user_path, missing_path, project_path])
+
+    result = await middleware.abefore_agent({}, None, {})  # type: ignore[arg-type]
+
+    assert download_calls == [[user_path, missing_path, project_path]]
+    assert result is not None
+    assert list(result["memory_contents"]) == [user_path, project_path]
+
+
 async def test_load_memory_handles_missing_file_async(tmp_path: Path) -> None:
     """Test that missing files raise an error (async)."""
     backend = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
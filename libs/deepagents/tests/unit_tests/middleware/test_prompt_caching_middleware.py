@@ -0,0 +1,149 @@
+"""Unit tests for PromptCachingMiddleware breakpoint planning and cache statistics."""
+
+from typing import Any
+
+import pytest
+from langchain.agents.middleware.types import ModelRequest, ModelResponse
+from langchain_anthropic import ChatAnthropic
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, SystemMessage, ToolMessage
+
+from deepagents.middleware.prompt_caching import PromptCachingMiddleware
+from tests.unit_tests.chat_model import GenericFakeChatModel
+
+CACHE_CONTROL = {"type": "ephemeral", "ttl": "5m"}
+
+
+def _request(messages: list[AnyMessage], system_message: SystemMessage | None = None) -> ModelRequest:
+    return ModelRequest(
+        model=ChatAnthropic(model="claude-sonnet-4-20250514", api_key="test-key"),
+        messages=messages,
+        system_message=system_message,
+        tools=[],
+        runtime=None,
+        state={"messages": messages},
+    )
+
+
+def _response(**input_token_details: int) -> ModelResponse:
+    input_tokens = 100
+    message = AIMessage(
+        content="Done.",
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": 5,
+            "total_tokens": input_tokens + 5,
+            "input_token_details": input_token_details,
+        },
+    )
+    return ModelResponse(result=[message])
+
+
+def _plan(middleware: PromptCachingMiddleware, request: ModelRequest) -> ModelRequest:
+    captured: list[ModelRequest] = []
+
+    def handler(req: ModelRequest) -> ModelResponse:
+        captured.append(req)
+        return _response()
+
+    middleware.wrap_model_call(request, handler)
+    return captured[0]
+
+
+def _payload(request: ModelRequest) -> dict[str, Any]:
+    """Build the Anthropic API payload the model would send for `request`."""
+    messages = [request.system_message, *request.messages] if request.system_message else request.messages
+    return request.model._get_request_payload(messages, **request.model_settings)
+
+
+def _breakpoints(payload: dict[str, Any]) -> list[str]:
+    """Describe every block carrying `cache_control`, in prompt order."""
+    found = [f"system:{block['text']}" for block in payload.get("system", []) if "cache_control" in block]
+    for message in payload["messages"]:
+        if isinstance(message["content"], list):
+            found.extend(f"{message['role']}:{block['type']}" for block in message["content"] if "cache_control" in block)
+    return found
+
+
+def _write_turn(call_id: str, content: str) -> list[AnyMessage]:
+    return [
+        AIMessage(
+            content="",
+            tool_calls=[{"name": "write_file", "args": {"file_path": "/a.py", "content": content}, "id": call_id, "type": "tool_call"}],
+        ),
+        ToolMessage(content="Updated file /a.py", tool_call_id=call_id),
+    ]
+
+
+class TestBreakpointPlanning:
+    def test_marks_system_prompt_and_conversation_end(self) -> None:
+        system = SystemMessage(content=[{"type": "text", "text": "You are helpful."}, {"type": "text", "text": "\n\n## Tools"}])
+        request = _request([HumanMessage(content="Hi")], system_message=system)
+
+        planned = _plan(PromptCachingMiddleware(), request)
+
+        assert _breakpoints(_payload(planned)) == ["system:\n\n## Tools", "user:text"]
+        # The composed system message is shared across calls and must not be mutated
+        assert all("cache_control" not in block for block in system.content)
+
+    def test_marks_summary_and_truncation_boundary(self) -> None:
+        summary = HumanMessage(content="Summary of the conversation so far.", additional_kwargs={"lc_source": "summarization"})
+        messages = [
+            summary,
+            *_write_turn("call_1", "print('hello')...(argument truncated)"),
+            *_write_turn("call_2", "print('hello world')"),
+            HumanMessage(content="Now run it"),
+        ]
+
+        planned = _plan(PromptCachingMiddleware(), _request(messages, system_message=SystemMessage(content="You are helpful.")))
+
+        assert planned.messages[0].content[0]["cache_control"] == CACHE_CONTROL
+        assert planned.messages[2].content[0]["cache_control"] == CACHE_CONTROL
+        assert planned.messages[4] is messages[4]
+        assert len(_breakpoints(_payload(planned))) == 4
+        assert messages[0].content == "Summary of the conversation so far."
+
+    def test_truncation_boundary_advances_without_changing_prefix(self) -> None:
+        """Truncating a newer call moves the breakpoint forward and leaves the cached prefix intact."""
+        middleware = PromptCachingMiddleware()
+        first_turn = _write_turn("call_1", "print('hello')...(argument truncated)")
+        untruncated = _write_turn("call_2", "x" * 50)
+        truncated = _write_turn("call_2", "x" * 20 + "...(argument truncated)")
+        before = _payload(_plan(middleware, _request([*first_turn, *untruncated, HumanMessage(content="Next")])))
+        after = _payload(_plan(middleware, _request([*first_turn, *truncated, HumanMessage(content="Next")])))
+
+        assert "cache_control" in before["messages"][1]["content"][0]
+        assert "cache_control" in after["messages"][3]["content"][0]
+        # Cache lookups ignore `cache_control` markers, so only the remaining content must match
+        before["messages"][1]["content"][0].pop("cache_control")
+        assert before["messages"][:2] == after["messages"][:2]
+
+    def test_unsupported_model_is_left_untouched(self) -> None:
+        request = _request([HumanMessage(content="Hi")]).override(model=GenericFakeChatModel(messages=iter([])))
+
+        with pytest.warns(UserWarning, match="only supports Anthropic models"):
+            planned = _plan(PromptCachingMiddleware(), request)
+
+        assert planned is request
+
+
+class TestCacheStats:
+    def test_accumulates_usage_metadata(self) -> None:
+        middleware = PromptCachingMiddleware()
+        request = _request([HumanMessage(content="Hi")])
+
+        middleware.wrap_model_call(request, lambda _: _response(cache_creation=80))
+        middleware.wrap_model_call(request, lambda _: _response(cache_read=80))
+
+        stats = middleware.cache_stats
+        assert (stats.requests, stats.input_tokens, stats.cache_read_tokens, stats.cache_creation_tokens) == (2, 200, 80, 80)
+        assert stats.hit_ratio == pytest.approx(0.4)
+
+    async def test_accumulates_usage_metadata_async(self) -> None:
+        middleware = PromptCachingMiddleware()
+
+        async def handler(_: ModelRequest) -> ModelResponse:
+            return _response(cache_read=50)
+
+        await middleware.awrap_model_call(_request([HumanMessage(content="Hi")]), handler)
+
+        assert middleware.cache_stats.hit_ratio == pytest.approx(0.5)
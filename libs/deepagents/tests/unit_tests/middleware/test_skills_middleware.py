@@ -962,6 +962,132 @@ def test_before_agent_loads_skills(tmp_path: Path) -> None:
     assert skill_names == {"skill-one", "skill-two"}
 
 
+def test_before_agent_reuses_cached_metadata_until_skills_change(tmp_path: Path) -> None:
+    """Unchanged skill trees are not re-downloaded; edited SKILL.md files are."""
+    backend = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
+    skills_dir = tmp_path / "skills" / "user"
+    skill_path = str(skills_dir / "skill-one" / "SKILL.md")
+    backend.upload_files([(skill_path, make_skill_content("skill-one", "First skill").encode("utf-8"))])
+
+    downloads: list[list[str]] = []
+    download_files = backend.download_files
+
+    def spy_download_files(paths: list[str]) -> list:
+        downloads.append(paths)
+        return download_files(paths)
+
+    backend.download_files = spy_download_files  # type: ignore[method-assign]
+    middleware = SkillsMiddleware(backend=backend, sources=[str(skills_dir)])
+
+    first = middleware.before_agent({}, None, {})  # type: ignore[arg-type]
+    second = middleware.before_agent({}, None, {})  # type: ignore[arg-type]
+
+    assert first == second
+    assert len(downloads) == 1
+
+    Path(skill_path).write_text(make_skill_content("skill-one", "First skill, now with more detail"))
+    third = middleware.before_agent({}, None, {})  # type: ignore[arg-type]
+
+    assert third is not None
+    assert third["skills_metadata"][0]["description"] == "First skill, now with more detail"
+    assert len(downloads) == 2
+
+
+def test_before_agent_caches_empty_sources_and_returns_copies(tmp_path: Path) -> None:
+    """Sources without skills are cached too, and callers cannot mutate cached metadata."""
+    backend = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
+    empty_dir = tmp_path / "skills" / "empty"
+    empty_dir.mkdir(parents=True)
+    skills_dir = tmp_path / "skills" / "user"
+    backend.upload_files([(str(skills_dir / "skill-one" / "SKILL.md"), make_skill_content("skill-one", "First skill").encode("utf-8"))])
+
+    listed: list[str] = []
+    ls_info = backend.ls_info
+
+    def spy_ls_info(path: str) -> list:
+        listed.append(path)
+        return ls_info(path)
+
+    backend.ls_info = spy_ls_info  # type: ignore[method-assign]
+    middleware = SkillsMiddleware(backend=backend, sources=[str(empty_dir), str(skills_dir)])
+
+    first = middleware.before_agent({}, None, {})  # type: ignore[arg-type]
+    assert first is not None
+    first["skills_metadata"][0]["description"] = "Mutated"
+    second = middleware.before_agent({}, None, {})  # type: ignore[arg-type]
+
+    assert second is not None
+    assert second["skills_metadata"][0]["description"] == "First skill"
+    assert listed.count(str(empty_dir)) == 1
+
+
+def test_before_agent_does_not_cache_skills_in_state() -> None:
+    """Skills in the state of different threads are never served from the cache."""
+    now = "2024-01-01T00:00:00+00:00"
+
+    def state_with(description: str) -> dict:
+        content = make_skill_content("skill-one", description)
+        return {"files": {"/skills/skill-one/SKILL.md": {"content": content.split("\n"), "created_at": now, "modified_at": now}}}
+
+    middleware = SkillsMiddleware(backend=StateBackend, sources=["/skills"])
+    runtime = SimpleNamespace(context=None, stream_writer=lambda _: None, store=None)
+
+    alice = middleware.before_agent(state_with("Alice's skill"), runtime, {})  # type: ignore[arg-type]
+    bob = middleware.before_agent(state_with("Bobby's skill"), runtime, {})  # type: ignore[arg-type]
+
+    assert alice is not None
+    assert bob is not None
+    assert alice["skills_metadata"][0]["description"] == "Alice's skill"
+    assert bob["skills_metadata"][0]["description"] == "Bobby's skill"
+
+
+def test_before_agent_shares_cached_metadata_across_backends_of_a_factory() -> None:
+    """Backends a factory builds per thread reuse the skills cached for the factory."""
+    downloads: list[list[str]] = []
+
+    class CountingStoreBackend(StoreBackend):
+        def download_files(self, paths: list[str]) -> list:
+            downloads.append(paths)
+            return super().download_files(paths)
+
+    store = InMemoryStore()
+    store.put(("filesystem",), "/skills/user/skill-one/SKILL.md", create_store_skill_item(make_skill_content("skill-one", "First skill")))
+    middleware = SkillsMiddleware(backend=lambda rt: CountingStoreBackend(rt, namespace=lambda _: ("filesystem",)), sources=["/skills/user"])
+    runtime = SimpleNamespace(context=None, store=store, stream_writer=lambda _: None)
+
+    first = middleware.before_agent({}, runtime, {"configurable": {"thread_id": "t1"}})  # type: ignore[arg-type]
+    second = middleware.before_agent({}, runtime, {"configurable": {"thread_id": "t2"}})  # type: ignore[arg-type]
+
+    assert first == second
+    assert first is not None
+    assert first["skills_metadata"][0]["description"] == "First skill"
+    assert len(downloads) == 1
+
+
+def test_before_agent_without_fingerprints_always_reloads(tmp_path: Path) -> None:
+    """Backends that report no modification times are reloaded and fingerprinted only once."""
+    glob_calls: list[str] = []
+
+    class NoMetadataBackend(FilesystemBackend):
+        def glob_info(self, pattern: str, path: str = "/") -> list:
+            glob_calls.append(path)
+            return [{"path": info["path"], "is_dir": False} for info in super().glob_info(pattern, path)]
+
+    backend = NoMetadataBackend(root_dir=str(tmp_path), virtual_mode=False)
+    skills_dir = tmp_path / "skills" / "user"
+    skill_path = str(skills_dir / "skill-one" / "SKILL.md")
+    backend.upload_files([(skill_path, make_skill_content("skill-one", "First skill").encode("utf-8"))])
+    middleware = SkillsMiddleware(backend=backend, sources=[str(skills_dir)])
+
+    middleware.before_agent({}, None, {})  # type: ignore[arg-type]
+    Path(skill_path).write_text(make_skill_content("skill-one", "Edited"))
+    result = middleware.before_agent({}, None, {})  # type: ignore[arg-type]
+
+    assert result is not None
+    assert result["skills_metadata"][0]["description"] == "Edited"
+    assert len(glob_calls) == 1
+
+
 def test_before_agent_skill_override(tmp_path: Path) -> None:
     """Test that skills from later sources override earlier ones."""
     backend = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
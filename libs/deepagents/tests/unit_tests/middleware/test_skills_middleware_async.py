@@ -3,6 +3,7 @@
 This module contains async versions of skills middleware tests.
 """
 
+import asyncio
 from pathlib import Path
 
 from langchain.agents import create_agent
@@ -277,6 +278,38 @@ async def test_abefore_agent_skill_override(tmp_path: Path) -> None:
     }
 
 
+async def test_abefore_agent_loads_sources_concurrently(tmp_path: Path) -> None:
+    """Skill sources are listed concurrently and still merged in source order (async)."""
+    in_flight = [0, 0]
+
+    class SlowListingBackend(FilesystemBackend):
+        async def als_info(self, path: str) -> list:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+            try:
+                await asyncio.sleep(0.05)
+                return await super().als_info(path)
+            finally:
+                in_flight[0] -= 1
+
+    backend = SlowListingBackend(root_dir=str(tmp_path), virtual_mode=False)
+    base_dir = tmp_path / "skills" / "base"
+    user_dir = tmp_path / "skills" / "user"
+    backend.upload_files(
+        [
+            (str(base_dir / "shared" / "SKILL.md"), make_skill_content("shared", "Base version").encode("utf-8")),
+            (str(user_dir / "shared" / "SKILL.md"), make_skill_content("shared", "User version").encode("utf-8")),
+        ]
+    )
+    middleware = SkillsMiddleware(backend=backend, sources=[str(base_dir), str(user_dir)])
+
+    result = await middleware.abefore_agent({}, None, {})  # type: ignore[arg-type]
+
+    assert in_flight[1] == 2
+    assert result is not None
+    assert [s["description"] for s in result["skills_metadata"]] == ["User version"]
+
+
 async def test_abefore_agent_empty_sources(tmp_path: Path) -> None:
     """Test abefore_agent with empty sources (async)."""
     backend = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
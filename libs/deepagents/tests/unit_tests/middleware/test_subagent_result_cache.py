@@ -0,0 +1,143 @@
+"""Unit tests for SubAgentResultCache and its use by the `task` tool."""
+
+from typing import Any
+
+import pytest
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.store.memory import InMemoryStore
+
+from deepagents.backends.state import StateBackend
+from deepagents.backends.utils import create_file_data
+from deepagents.middleware.subagents import CompiledSubAgent, SubAgentMiddleware, SubAgentResultCache
+from tests.unit_tests.chat_model import GenericFakeChatModel
+
+
+def _sequential_task_calls(*descriptions: str) -> GenericFakeChatModel:
+    """Create a parent model that issues one `task` call per turn."""
+    return GenericFakeChatModel(
+        messages=iter(
+            [
+                *(
+                    AIMessage(
+                        content="",
+                        tool_calls=[
+                            {
+                                "name": "task",
+                                "args": {"description": description, "subagent_type": "researcher"},
+                                "id": f"call_{i}",
+                                "type": "tool_call",
+                            }
+                        ],
+                    )
+                    for i, description in enumerate(descriptions)
+                ),
+                AIMessage(content="Done."),
+            ]
+        )
+    )
+
+
+class TestSubAgentResultCache:
+    def test_exact_match(self) -> None:
+        cache = SubAgentResultCache()
+        cache.put("researcher", "Find the capital of France", "Paris")
+
+        assert cache.get("researcher", "Find the capital of France") == "Paris"
+        assert cache.get("researcher", "find the capital of  France") is None
+        assert cache.get("writer", "Find the capital of France") is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_normalized_match(self) -> None:
+        cache = SubAgentResultCache(normalize=True)
+        cache.put("researcher", "Find the capital of France", "Paris")
+
+        assert cache.get("researcher", "  find the CAPITAL\nof France ") == "Paris"
+
+    def test_ttl_expiry(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        now = [1000.0]
+        monkeypatch.setattr("deepagents.middleware.subagents.time.time", lambda: now[0])
+        cache = SubAgentResultCache(ttl=60)
+        cache.put("researcher", "task", "result")
+
+        now[0] += 59
+        assert cache.get("researcher", "task") == "result"
+        now[0] += 2
+        assert cache.get("researcher", "task") is None
+
+    def test_lru_eviction(self) -> None:
+        cache = SubAgentResultCache(max_entries=2)
+        cache.put("researcher", "a", "A")
+        cache.put("researcher", "b", "B")
+        assert cache.get("researcher", "a") == "A"
+        cache.put("researcher", "c", "C")
+
+        assert cache.get("researcher", "b") is None
+        assert cache.get("researcher", "a") == "A"
+        assert cache.get("researcher", "c") == "C"
+
+    async def test_store_backed(self) -> None:
+        store = InMemoryStore()
+        writer = SubAgentResultCache(store=store)
+        reader = SubAgentResultCache(store=store)
+
+        await writer.aput("researcher", "task", "result")
+
+        assert await reader.aget("researcher", "task") == "result"
+        assert reader.get("researcher", "task") == "result"
+        assert reader.hits == 2
+        assert store.search(("subagent_results",))
+
+
+class TestTaskToolResultCache:
+    def test_repeated_task_skips_subagent(self) -> None:
+        """A second identical `task` call is answered from the cache."""
+        invocations: list[dict[str, Any]] = []
+
+        def research(state: dict[str, Any]) -> dict[str, Any]:
+            invocations.append(state)
+            return {"messages": [AIMessage(content="Paris")]}
+
+        cache = SubAgentResultCache()
+        agent = create_agent(
+            model=_sequential_task_calls("Find the capital of France", "Find the capital of France"),
+            middleware=[
+                SubAgentMiddleware(
+                    backend=StateBackend,
+                    subagents=[CompiledSubAgent(name="researcher", description="Researches.", runnable=RunnableLambda(research))],
+                    result_cache=cache,
+                )
+            ],
+        )
+
+        result = agent.invoke({"messages": [HumanMessage(content="Go")]})
+
+        assert len(invocations) == 1
+        assert [m.content for m in result["messages"] if isinstance(m, ToolMessage)] == ["Paris", "Paris"]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    async def test_runs_with_state_updates_are_not_cached(self) -> None:
+        """Results of subagents that wrote files are never replayed from the cache."""
+        invocations: list[dict[str, Any]] = []
+
+        async def write_report(state: dict[str, Any]) -> dict[str, Any]:
+            invocations.append(state)
+            return {"messages": [AIMessage(content="Wrote report")], "files": {"/report.md": create_file_data("report")}}
+
+        cache = SubAgentResultCache()
+        agent = create_agent(
+            model=_sequential_task_calls("Write the report", "Write the report"),
+            middleware=[
+                SubAgentMiddleware(
+                    backend=StateBackend,
+                    subagents=[CompiledSubAgent(name="researcher", description="Researches.", runnable=RunnableLambda(write_report))],
+                    result_cache=cache,
+                )
+            ],
+        )
+
+        await agent.ainvoke({"messages": [HumanMessage(content="Go")]})
+
+        assert len(invocations) == 2
+        assert cache.hits == 0
@@ -0,0 +1,162 @@
+"""Unit tests for concurrency control of parallel `task` calls in SubAgentMiddleware."""
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+import pytest
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+
+from deepagents.backends.state import StateBackend
+from deepagents.middleware.subagents import CompiledSubAgent, SubAgentMiddleware
+from tests.unit_tests.chat_model import GenericFakeChatModel
+
+
+def _parallel_task_calls(*subagent_types: str) -> GenericFakeChatModel:
+    """Create a parent model that issues one `task` call per subagent type in a single message."""
+    return GenericFakeChatModel(
+        messages=iter(
+            [
+                AIMessage(
+                    content="",
+                    tool_calls=[
+                        {
+                            "name": "task",
+                            "args": {"description": f"Task {i}", "subagent_type": subagent_type},
+                            "id": f"call_{i}",
+                            "type": "tool_call",
+                        }
+                        for i, subagent_type in enumerate(subagent_types)
+                    ],
+                ),
+                AIMessage(content="Done."),
+            ]
+        )
+    )
+
+
+def _sleeping_subagent(name: str, seconds: float, running: list[int] | None = None) -> CompiledSubAgent:
+    peak = running if running is not None else [0, 0]
+
+    async def run(_state: dict[str, Any]) -> dict[str, Any]:
+        peak[0] += 1
+        peak[1] = max(peak[1], peak[0])
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            peak[0] -= 1
+        return {"messages": [AIMessage(content=f"{name} finished")]}
+
+    return CompiledSubAgent(name=name, description=f"{name} subagent.", runnable=RunnableLambda(run))
+
+
+class TestSubagentScheduler:
+    async def test_max_concurrency_limits_parallel_task_calls(self) -> None:
+        """Parallel `task` calls never exceed `max_concurrency` running subagents."""
+        running = [0, 0]
+        middleware = SubAgentMiddleware(
+            backend=StateBackend,
+            subagents=[_sleeping_subagent("worker", 0.05, running)],
+            max_concurrency=2,
+        )
+        agent = create_agent(model=_parallel_task_calls("worker", "worker", "worker", "worker"), middleware=[middleware])
+
+        result = await agent.ainvoke({"messages": [HumanMessage(content="Go")]})
+
+        tool_messages = [m for m in result["messages"] if isinstance(m, ToolMessage)]
+        assert [m.content for m in tool_messages] == ["worker finished"] * 4
+        assert running[1] == 2
+        stats = middleware.scheduler_stats
+        assert stats.started == 4
+        assert stats.completed == 4
+        assert stats.queue_wait_seconds > 0
+        assert stats.run_seconds >= 4 * 0.05
+
+    async def test_per_subagent_timeout_reports_to_model(self) -> None:
+        """A subagent exceeding its timeout returns an error message instead of blocking the turn."""
+        slow = _sleeping_subagent("slow", 5)
+        slow["timeout"] = 0.05
+        middleware = SubAgentMiddleware(
+            backend=StateBackend,
+            subagents=[slow, _sleeping_subagent("fast", 0)],
+            task_timeout=10,
+        )
+        agent = create_agent(model=_parallel_task_calls("slow", "fast"), middleware=[middleware])
+
+        result = await agent.ainvoke({"messages": [HumanMessage(content="Go")]})
+
+        contents = {m.tool_call_id: m.content for m in result["messages"] if isinstance(m, ToolMessage)}
+        assert "timed out after 0.05 seconds" in contents["call_0"]
+        assert contents["call_1"] == "fast finished"
+        assert middleware.scheduler_stats.timed_out == 1
+        assert middleware.scheduler_stats.completed == 1
+
+    async def test_failing_task_cancels_siblings(self) -> None:
+        """When one parallel `task` call raises, its still-running siblings are cancelled."""
+        sibling_cancelled = asyncio.Event()
+
+        async def failing(_state: dict[str, Any]) -> dict[str, Any]:
+            await asyncio.sleep(0.01)
+            msg = "boom"
+            raise RuntimeError(msg)
+
+        async def long_running(_state: dict[str, Any]) -> dict[str, Any]:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                sibling_cancelled.set()
+                raise
+            return {"messages": [AIMessage(content="unreachable")]}
+
+        middleware = SubAgentMiddleware(
+            backend=StateBackend,
+            subagents=[
+                CompiledSubAgent(name="failing", description="Fails.", runnable=RunnableLambda(failing)),
+                CompiledSubAgent(name="long", description="Runs long.", runnable=RunnableLambda(long_running)),
+            ],
+        )
+        agent = create_agent(model=_parallel_task_calls("failing", "long"), middleware=[middleware])
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await agent.ainvoke({"messages": [HumanMessage(content="Go")]})
+
+        await asyncio.wait_for(sibling_cancelled.wait(), timeout=1)
+        await asyncio.sleep(0)
+        assert middleware.scheduler_stats.failed == 1
+        assert middleware.scheduler_stats.cancelled == 1
+
+    def test_sync_task_calls_respect_max_concurrency(self) -> None:
+        """The sync `task` path shares the same concurrency limit and counters."""
+        running = [0, 0]
+        lock = threading.Lock()
+
+        def run(_state: dict[str, Any]) -> dict[str, Any]:
+            with lock:
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            try:
+                time.sleep(0.05)
+            finally:
+                with lock:
+                    running[0] -= 1
+            return {"messages": [AIMessage(content="ok")]}
+
+        middleware = SubAgentMiddleware(
+            backend=StateBackend,
+            subagents=[CompiledSubAgent(name="worker", description="Worker.", runnable=RunnableLambda(run))],
+            max_concurrency=1,
+        )
+        agent = create_agent(model=_parallel_task_calls("worker", "worker"), middleware=[middleware])
+
+        agent.invoke({"messages": [HumanMessage(content="Go")]})
+
+        assert running[1] == 1
+        assert middleware.scheduler_stats.started == 2
+        assert middleware.scheduler_stats.completed == 2
+
+    def test_invalid_max_concurrency(self) -> None:
+        with pytest.raises(ValueError, match="max_concurrency must be at least 1"):
+            SubAgentMiddleware(backend=StateBackend, subagents=[_sleeping_subagent("worker", 0)], max_concurrency=0)
@@ -0,0 +1,125 @@
+"""Unit tests for memoized system prompt composition across middleware."""
+
+import gc
+import uuid
+
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from deepagents.backends.state import StateBackend
+from deepagents.backends.utils import create_file_data
+from deepagents.middleware._utils import PromptFragmentCache, append_to_system_message, cacheable_prefix_length
+from deepagents.middleware.filesystem import FilesystemMiddleware
+from deepagents.middleware.memory import MemoryMiddleware
+from tests.unit_tests.chat_model import GenericFakeChatModel
+
+
+def _unique(text: str) -> str:
+    """Make `text` unique so no fragment cache of another test holds it."""
+    return f"{text} {uuid.uuid4()}"
+
+
+class TestAppendToSystemMessage:
+    def test_identical_inputs_compose_identical_message(self) -> None:
+        base = SystemMessage(content=_unique("You are helpful."))
+        fragment = _unique("## Tools")
+
+        first = append_to_system_message(base, fragment)
+        second = append_to_system_message(SystemMessage(content=base.text), fragment)
+
+        assert second is not first
+        assert second.content_blocks == first.content_blocks
+        assert first.content_blocks == [{"type": "text", "text": base.text}, {"type": "text", "text": f"\n\n{fragment}"}]
+
+    def test_returned_messages_are_independent(self) -> None:
+        base = SystemMessage(content=_unique("You are helpful."))
+        fragment = _unique("## Tools")
+
+        first = append_to_system_message(base, fragment)
+        first.content.append({"type": "text", "text": "mutated"})  # type: ignore[union-attr]
+
+        assert append_to_system_message(base, fragment).content_blocks == [
+            {"type": "text", "text": base.text},
+            {"type": "text", "text": f"\n\n{fragment}"},
+        ]
+
+    def test_without_base_message(self) -> None:
+        fragment = _unique("## Tools")
+
+        assert append_to_system_message(None, fragment).content_blocks == [{"type": "text", "text": fragment}]
+
+    def test_cacheable_prefix_length(self) -> None:
+        base = SystemMessage(content=_unique("You are helpful."))
+        static = _unique("## Tools")
+        memory = PromptFragmentCache()
+        v1, v2 = _unique("memory v1"), _unique("memory v2")
+
+        first_turn = append_to_system_message(append_to_system_message(base, static), memory.render("v1", lambda: v1))
+        assert cacheable_prefix_length(first_turn) == len(base.text) + len(f"\n\n{static}")
+
+        # The next call renders the same memory, which is then stable
+        second_call = append_to_system_message(append_to_system_message(base, static), memory.render("v1", lambda: v1))
+        assert second_call.content_blocks == first_turn.content_blocks
+        assert cacheable_prefix_length(second_call) == len(second_call.text)
+
+        # The memory changed in the next turn
+        second_turn = append_to_system_message(append_to_system_message(base, static), memory.render("v2", lambda: v2))
+        assert cacheable_prefix_length(second_turn) == len(base.text) + len(f"\n\n{static}")
+
+
+class TestPromptFragmentCache:
+    def test_renders_each_fingerprint_once(self) -> None:
+        cache = PromptFragmentCache(maxsize=2)
+        builds: list[str] = []
+
+        def build(text: str) -> str:
+            builds.append(text)
+            return _unique(text)
+
+        first = cache.render("a", lambda: build("a"))
+        assert cache.render("a", lambda: build("a")) is first
+        cache.render("b", lambda: build("b"))
+        cache.render("c", lambda: build("c"))
+        cache.render("a", lambda: build("a"))
+
+        assert builds == ["a", "b", "c", "a"]
+        assert cache.is_stable(first) is None
+        assert cache.render(None, lambda: build("d")) is not None
+        assert builds[-1] == "d"
+
+    def test_released_caches_are_not_consulted(self) -> None:
+        fragment = _unique("memory")
+        cache = PromptFragmentCache()
+        message = append_to_system_message(SystemMessage(content="base"), cache.render("k", lambda: fragment))
+        assert cacheable_prefix_length(message) == len("base")
+
+        del cache
+        gc.collect()
+        assert cacheable_prefix_length(message) == len(message.text)
+
+
+def test_system_prompt_is_byte_identical_across_model_calls() -> None:
+    """Every model call in a run sees the same composed system message."""
+    model = GenericFakeChatModel(
+        messages=iter(
+            [
+                AIMessage(content="", tool_calls=[{"name": "ls", "args": {"path": "/"}, "id": "call_ls", "type": "tool_call"}]),
+                AIMessage(content="Done."),
+            ]
+        )
+    )
+    agent = create_agent(
+        model=model,
+        system_prompt=_unique("You are helpful."),
+        middleware=[
+            MemoryMiddleware(backend=StateBackend, sources=["/AGENTS.md"]),
+            FilesystemMiddleware(backend=StateBackend),
+        ],
+    )
+
+    agent.invoke({"messages": [HumanMessage(content="List files")], "files": {"/AGENTS.md": create_file_data(_unique("Prefer tabs."))}})
+
+    first, second = (call["messages"][0] for call in model.call_history)
+    assert isinstance(first, SystemMessage)
+    assert second.content == first.content
+    assert cacheable_prefix_length(second) == len(second.text)
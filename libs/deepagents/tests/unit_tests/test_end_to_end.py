@@ -820,6 +820,40 @@ class TestDeepAgentEndToEnd:
             assert "AttributeError" not in glob_result
             assert "'list' object has no attribute 'items'" not in glob_result
 
+    def test_deep_agent_evicts_repeated_large_results_once(self) -> None:
+        """Test that identical large tool results are stored once by a default deep agent."""
+        large_content = "y" * (NUM_CHARS_PER_TOKEN * TOOL_RESULT_TOKEN_LIMIT + 1000)
+
+        @tool
+        def dump_logs() -> str:
+            """Dump the build logs."""
+            return large_content
+
+        model = FixedGenericFakeChatModel(
+            messages=iter(
+                [
+                    AIMessage(
+                        content="",
+                        tool_calls=[
+                            {"name": "dump_logs", "args": {}, "id": "call_1", "type": "tool_call"},
+                            {"name": "dump_logs", "args": {}, "id": "call_2", "type": "tool_call"},
+                        ],
+                    ),
+                    AIMessage(content="", tool_calls=[{"name": "dump_logs", "args": {}, "id": "call_3", "type": "tool_call"}]),
+                    AIMessage(content="Done."),
+                ]
+            )
+        )
+        agent = create_deep_agent(model=model, tools=[dump_logs])
+
+        result = agent.invoke({"messages": [HumanMessage(content="Show the logs")]})
+
+        evicted = [path for path in result["files"] if path.startswith("/large_tool_results/")]
+        assert len(evicted) == 1
+        tool_messages = [msg for msg in result["messages"] if msg.type == "tool"]
+        assert len(tool_messages) == 3
+        assert all(evicted[0] in msg.content for msg in tool_messages)
+
     @pytest.mark.parametrize("backend_factory", BACKEND_FACTORIES)
     def test_deep_agent_read_file_truncation(self, tmp_path: Path, backend_factory: Callable[[Path], BackendProtocol]) -> None:
         """Test that read_file truncates large files and provides pagination guidance."""
@@ -604,6 +604,27 @@ class TestLocalSandboxOperations:
         assert "red cat" in file_content
         assert "The quick red cat jumps" in file_content
 
+    def test_edit_with_line_range(self, sandbox: LocalSubprocessSandbox) -> None:
+        """Test that a line range hint locates a unique occurrence without relaxing uniqueness."""
+        test_path = "/tmp/test_sandbox_ops/edit_line_range.txt"
+        content = "apple\nbanana\napple\norange\napple"
+        sandbox.write(test_path, content)
+
+        result = sandbox.edit(test_path, "orange", "pear", line_range=(2, 4))
+        assert result.error is None
+        assert result.occurrences == 1
+        assert [line.split("\t")[1] for line in sandbox.read(test_path).splitlines()] == ["apple", "banana", "apple", "pear", "apple"]
+
+        # A string repeated elsewhere in the file is rejected even if unique in the range
+        result = sandbox.edit(test_path, "apple", "grape", line_range=(4, 5))
+        assert result.error is not None
+        assert "multiple times" in result.error
+
+        # Same-length replacement, and a miss falling back to the whole file
+        assert sandbox.edit(test_path, "pear", "plum", line_range=(3, 5)).error is None
+        assert sandbox.edit(test_path, "banana", "kiwi", line_range=(3, 5)).error is None
+        assert [line.split("\t")[1] for line in sandbox.read(test_path).splitlines()] == ["apple", "kiwi", "apple", "plum", "apple"]
+
     # ==================== ls_info() tests ====================
 
     def test_ls_info_path_is_absolute(self, sandbox: LocalSubprocessSandbox) -> None:
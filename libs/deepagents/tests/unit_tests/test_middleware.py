@@ -12,7 +12,7 @@ from langchain_core.messages import (
 from langgraph.store.memory import InMemoryStore
 from langgraph.types import Command, Overwrite
 
-from deepagents.backends import CompositeBackend, StateBackend, StoreBackend
+from deepagents.backends import CompositeBackend, FilesystemBackend, StateBackend, StoreBackend
 from deepagents.backends.protocol import (
     ExecuteResponse,
     FileDownloadResponse,
@@ -31,6 +31,7 @@ from deepagents.middleware.filesystem import (
     FileData,
     FilesystemMiddleware,
     FilesystemState,
+    _content_to_evict,
     _create_content_preview,
     _supports_execution,
 )
@@ -1120,6 +1121,88 @@ class TestFilesystemMiddleware:
         assert "'type': 'text'" in file_text
         assert "'type': 'image'" in file_text
 
+    def test_deduplicated_eviction_writes_repeated_results_once(self):
+        """Identical large results share one evicted file and add no state the second time."""
+        middleware = FilesystemMiddleware(tool_token_limit_before_evict=1000, deduplicate_evictions=True)
+        large_content = "z" * 5000
+
+        state = FilesystemState(messages=[], files={})
+        runtime = ToolRuntime(state=state, context=None, tool_call_id="call_1", store=None, stream_writer=lambda _: None, config={})
+        first = middleware._intercept_large_tool_result(ToolMessage(content=large_content, tool_call_id="call_1"), runtime)
+
+        assert isinstance(first, Command)
+        (evicted_path,) = first.update["files"]
+        assert evicted_path.startswith("/large_tool_results/")
+
+        state = FilesystemState(messages=[], files=first.update["files"])
+        runtime = ToolRuntime(state=state, context=None, tool_call_id="call_2", store=None, stream_writer=lambda _: None, config={})
+        second = middleware._intercept_large_tool_result(ToolMessage(content=large_content, tool_call_id="call_2"), runtime)
+
+        assert isinstance(second, ToolMessage)
+        assert evicted_path in second.content
+
+    def test_read_edit_read_downloads_file_once(self, tmp_path):
+        """Reads after an edit are served from the file content cache with the edited content."""
+        downloads = []
+
+        class CountingBackend(FilesystemBackend):
+            def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+                downloads.extend(paths)
+                return super().download_files(paths)
+
+        (tmp_path / "app.py").write_text("x = 1\n")
+        middleware = FilesystemMiddleware(backend=CountingBackend(root_dir=tmp_path, virtual_mode=True))
+        runtime = ToolRuntime(
+            state=FilesystemState(messages=[], files={}),
+            context=None,
+            tool_call_id="call_1",
+            store=None,
+            stream_writer=lambda _: None,
+            config={"configurable": {"thread_id": "thread-1"}},
+        )
+        tools = {tool.name: tool for tool in middleware.tools}
+
+        assert "x = 1" in tools["read_file"].invoke({"file_path": "/app.py", "runtime": runtime})
+        tools["edit_file"].invoke({"file_path": "/app.py", "old_string": "x = 1", "new_string": "x = 2", "runtime": runtime})
+        assert "x = 2" in tools["read_file"].invoke({"file_path": "/app.py", "runtime": runtime})
+        assert downloads == ["/app.py"]
+        assert middleware.file_cache.get(middleware.backend, "/app.py", thread_id="thread-1") == "x = 2\n"
+
+        # Changes made outside of the tools are picked up
+        (tmp_path / "app.py").write_text("x = 30\n")
+        assert "x = 30" in tools["read_file"].invoke({"file_path": "/app.py", "runtime": runtime})
+        assert len(downloads) == 2
+
+    def test_edit_file_read_window_does_not_bypass_uniqueness(self):
+        """A string repeated in the file is rejected even after reading one of its occurrences."""
+        middleware = FilesystemMiddleware()
+        state = FilesystemState(messages=[], files={"/app.py": create_file_data("x = 1\ny = 2\nx = 1")})
+        config = {"configurable": {"thread_id": "t"}}
+        runtime = ToolRuntime(state=state, context=None, tool_call_id="call_1", store=None, stream_writer=lambda _: None, config=config)
+        tools = {tool.name: tool for tool in middleware.tools}
+
+        tools["read_file"].invoke({"file_path": "/app.py", "offset": 2, "limit": 10, "runtime": runtime})
+        assert middleware._edit_options(middleware._get_backend(runtime), "t", "/app.py", replace_all=False)["line_range"] == (2, 12)
+
+        result = tools["edit_file"].invoke({"file_path": "/app.py", "old_string": "x = 1", "new_string": "x = 3", "runtime": runtime})
+        assert "appears 2 times" in result
+
+        result = tools["edit_file"].invoke({"file_path": "/app.py", "old_string": "y = 2", "new_string": "y = 3", "runtime": runtime})
+        assert isinstance(result, Command)
+        assert result.update["files"]["/app.py"]["content"] == ["x = 1", "y = 3", "x = 1"]
+
+    def test_read_window_is_not_remembered_without_thread_id(self):
+        """Runs without a thread id do not share read windows."""
+        middleware = FilesystemMiddleware()
+        state = FilesystemState(messages=[], files={"/app.py": create_file_data("x = 1")})
+        runtime = ToolRuntime(state=state, context=None, tool_call_id="call_1", store=None, stream_writer=lambda _: None, config={})
+        tools = {tool.name: tool for tool in middleware.tools}
+
+        tools["read_file"].invoke({"file_path": "/app.py", "runtime": runtime})
+
+        assert "line_range" not in middleware._edit_options(middleware._get_backend(runtime), None, "/app.py", replace_all=False)
+        assert not middleware._read_windows
+
     def test_read_file_image_returns_standard_image_content_block(self):
         """Test image reads return standard image blocks with base64 + mime_type."""
 
@@ -1453,6 +1536,37 @@ class TestFilesystemMiddleware:
             for i in range(num_lines):
                 assert f"line {i}" in preview
 
+    def test_content_preview_line_numbers_match_stored_lines(self):
+        """Preview line numbers follow the stored file lines, ignoring a trailing newline."""
+        content_str = "".join(f"line {i}\n" for i in range(1, 21))
+
+        preview = _create_content_preview(content_str)
+
+        assert "[10 lines truncated]" in preview
+        assert f"{20:6d}\tline 20" in preview
+        assert preview.count("\n") == 10
+
+    @pytest.mark.parametrize("num_lines", [3, 20])
+    def test_content_preview_strips_carriage_returns(self, num_lines):
+        """CRLF content previews without stray carriage returns, as `splitlines()` would."""
+        content_str = "".join(f"line {i}\r\n" for i in range(1, num_lines + 1))
+
+        preview = _create_content_preview(content_str)
+
+        assert "\r" not in preview
+        assert f"{num_lines:6d}\tline {num_lines}" in preview
+
+    def test_content_to_evict(self):
+        """Only content over the limit is stringified, and string content is not copied."""
+        large = "x" * 100
+        assert _content_to_evict(large, 100) is None
+        assert _content_to_evict(large, 99) is large
+
+        blocks = [{"type": "text", "text": "a" * 50}, {"type": "text", "text": "b" * 50}]
+        assert _content_to_evict(blocks, 1000) is None
+        assert _content_to_evict(blocks, 10) == str(blocks)
+        assert _content_to_evict([{"type": "text", "text": large}], 10) is large
+
 
 class TestPatchToolCallsMiddleware:
     def test_first_message(self) -> None:
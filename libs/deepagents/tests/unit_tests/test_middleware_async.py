@@ -1,13 +1,23 @@
 """Async tests for middleware filesystem tools."""
 
+import asyncio
+import subprocess
+from pathlib import Path
+
 import pytest
+from langchain.agents import create_agent
 from langchain.tools import ToolRuntime
+from langchain.tools.tool_node import ToolCallRequest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langgraph.store.memory import InMemoryStore
 from langgraph.types import Command
 
-from deepagents.backends import CompositeBackend, StateBackend
-from deepagents.backends.protocol import ExecuteResponse, SandboxBackendProtocol
+from deepagents.backends import CompositeBackend, FilesystemBackend, StateBackend
+from deepagents.backends.protocol import ExecuteResponse, FileDownloadResponse, FileUploadResponse, SandboxBackendProtocol
+from deepagents.backends.sandbox import BaseSandbox
+from deepagents.backends.utils import create_file_data, format_content_with_line_numbers
 from deepagents.middleware.filesystem import FileData, FilesystemMiddleware, FilesystemState
+from tests.unit_tests.chat_model import GenericFakeChatModel
 
 
 def build_composite_state_backend(runtime: ToolRuntime, *, routes):
@@ -21,6 +31,38 @@ def build_composite_state_backend(runtime: ToolRuntime, *, routes):
     return CompositeBackend(default=default_state, routes=built_routes)
 
 
+class _SubprocessSandbox(BaseSandbox):
+    """Sandbox running its commands on the host, recording each command."""
+
+    def __init__(self) -> None:
+        self.commands: list[str] = []
+
+    @property
+    def id(self) -> str:
+        return "subprocess-sandbox"
+
+    def execute(self, command: str, *, timeout: int | None = None) -> ExecuteResponse:
+        self.commands.append(command)
+        # The commands are the scripts BaseSandbox generates; tests only point them at tmp_path
+        result = subprocess.run(command, shell=True, capture_output=True, text=True, check=False)  # noqa: S602
+        return ExecuteResponse(output=result.stdout, exit_code=result.returncode)
+
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        return [FileUploadResponse(path=path, error="permission_denied") for path, _ in files]
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        return [FileDownloadResponse(path=path, content=Path(path).read_bytes()) for path in paths]
+
+
+def _tool_call_request(tool, args: dict, runtime: ToolRuntime) -> ToolCallRequest:
+    call = {"name": tool.name, "args": args, "id": f"call_{tool.name}", "type": "tool_call"}
+    return ToolCallRequest(tool_call=call, tool=tool, state=runtime.state, runtime=runtime)
+
+
+async def _run_tool(request: ToolCallRequest):
+    return await request.tool.ainvoke({**request.tool_call["args"], "runtime": request.runtime})
+
+
 class TestFilesystemMiddlewareAsync:
     """Async tests for filesystem middleware tools."""
 
@@ -808,3 +850,207 @@ class TestFilesystemMiddlewareAsync:
 
         assert "Async Very long output..." in result
         assert "truncated" in result
+
+    async def test_parallel_read_file_calls_share_one_download(self, tmp_path: Path):
+        """Concurrent read_file cache misses are served by one batched download, with per-call results."""
+        (tmp_path / "a.txt").write_text("alpha\nbeta")
+        (tmp_path / "b.txt").write_text("one\ntwo\nthree")
+        downloads: list[list[str]] = []
+        reads: list[str] = []
+
+        class CountingFilesystemBackend(FilesystemBackend):
+            async def adownload_files(self, paths):
+                downloads.append(paths)
+                return await super().adownload_files(paths)
+
+            async def aread(self, file_path, offset=0, limit=2000):
+                reads.append(file_path)
+                return await super().aread(file_path, offset=offset, limit=limit)
+
+        calls = [
+            {"name": "read_file", "args": {"file_path": "/a.txt"}, "id": "call_a", "type": "tool_call"},
+            {"name": "read_file", "args": {"file_path": "/b.txt", "offset": 1, "limit": 1}, "id": "call_b", "type": "tool_call"},
+            {"name": "read_file", "args": {"file_path": "/a.txt", "offset": 1}, "id": "call_a2", "type": "tool_call"},
+            {"name": "read_file", "args": {"file_path": "/missing.txt"}, "id": "call_missing", "type": "tool_call"},
+        ]
+        agent = create_agent(
+            model=GenericFakeChatModel(messages=iter([AIMessage(content="", tool_calls=calls), AIMessage(content="Done.")])),
+            middleware=[FilesystemMiddleware(backend=CountingFilesystemBackend(root_dir=tmp_path, virtual_mode=True))],
+        )
+
+        result = await agent.ainvoke({"messages": [HumanMessage(content="Read")]}, config={"configurable": {"thread_id": "t"}})
+
+        tool_results = {m.tool_call_id: m.content for m in result["messages"] if isinstance(m, ToolMessage)}
+        assert downloads == [["/a.txt", "/b.txt"]]
+        assert reads == ["/missing.txt"]
+        assert tool_results == {
+            "call_a": format_content_with_line_numbers(["alpha", "beta"]),
+            "call_b": format_content_with_line_numbers(["two"], start_line=2),
+            "call_a2": format_content_with_line_numbers(["beta"], start_line=2),
+            "call_missing": "Error: File '/missing.txt' not found",
+        }
+
+    async def test_parallel_reads_the_cache_does_not_keep_read_only_the_requested_lines(self):
+        """Reads without a thread or from agent state go to the backend's ranged read, not a whole-file download."""
+        downloads: list[list[str]] = []
+        reads: list[tuple[str, int, int]] = []
+
+        class CountingStateBackend(StateBackend):
+            async def adownload_files(self, paths):
+                downloads.append(paths)
+                return await super().adownload_files(paths)
+
+            async def aread(self, file_path, offset=0, limit=2000):
+                reads.append((file_path, offset, limit))
+                return await super().aread(file_path, offset=offset, limit=limit)
+
+        calls = [
+            {"name": "read_file", "args": {"file_path": "/a.txt"}, "id": "call_a", "type": "tool_call"},
+            {"name": "read_file", "args": {"file_path": "/b.txt", "offset": 1, "limit": 1}, "id": "call_b", "type": "tool_call"},
+        ]
+        agent = create_agent(
+            model=GenericFakeChatModel(messages=iter([AIMessage(content="", tool_calls=calls), AIMessage(content="Done.")])),
+            middleware=[FilesystemMiddleware(backend=CountingStateBackend)],
+        )
+        files = {"/a.txt": create_file_data("alpha"), "/b.txt": create_file_data("one\ntwo\nthree")}
+
+        result = await agent.ainvoke({"messages": [HumanMessage(content="Read")], "files": files}, config={"configurable": {"thread_id": "t"}})
+
+        tool_results = {m.tool_call_id: m.content for m in result["messages"] if isinstance(m, ToolMessage)}
+        assert downloads == []
+        assert sorted(reads) == [("/a.txt", 0, 100), ("/b.txt", 1, 1)]
+        assert tool_results == {
+            "call_a": format_content_with_line_numbers(["alpha"]),
+            "call_b": format_content_with_line_numbers(["two"], start_line=2),
+        }
+
+    async def test_concurrent_reads_from_different_runtimes_are_not_batched_together(self, tmp_path: Path):
+        """Calls running against different agent states never see each other's files."""
+        downloads: list[list[str]] = []
+
+        class CountingFilesystemBackend(FilesystemBackend):
+            async def adownload_files(self, paths):
+                downloads.append(paths)
+                return await super().adownload_files(paths)
+
+        for owner in ("alice", "bob"):
+            (tmp_path / owner).mkdir()
+            (tmp_path / owner / "secret.txt").write_text(f"{owner}'s secret")
+            (tmp_path / owner / "notes.txt").write_text(f"{owner}'s notes")
+        middleware = FilesystemMiddleware(backend=lambda rt: CountingFilesystemBackend(root_dir=tmp_path / rt.state["owner"], virtual_mode=True))
+        read_file = next(tool for tool in middleware.tools if tool.name == "read_file")
+
+        def runtime(owner: str) -> ToolRuntime:
+            return ToolRuntime(
+                state={"messages": [], "owner": owner},
+                context=None,
+                tool_call_id=None,
+                store=None,
+                stream_writer=lambda _: None,
+                config={"configurable": {"thread_id": owner}},
+            )
+
+        alice, bob = runtime("alice"), runtime("bob")
+        results = await asyncio.gather(
+            *(
+                middleware.awrap_tool_call(_tool_call_request(read_file, {"file_path": path}, rt), _run_tool)
+                for rt in (alice, bob)
+                for path in ("/secret.txt", "/notes.txt")
+            )
+        )
+
+        assert downloads == [["/secret.txt", "/notes.txt"], ["/secret.txt", "/notes.txt"]]
+        assert results == [
+            format_content_with_line_numbers(["alice's secret"]),
+            format_content_with_line_numbers(["alice's notes"]),
+            format_content_with_line_numbers(["bob's secret"]),
+            format_content_with_line_numbers(["bob's notes"]),
+        ]
+
+    async def test_parallel_reads_skip_files_the_cache_would_not_keep(self, tmp_path: Path):
+        """Files too large to cache are not downloaded, and failed batch reads are not downloaded again."""
+        (tmp_path / "a.txt").write_text("alpha")
+        (tmp_path / "big.txt").write_text("x" * 20)
+        (tmp_path / "data.bin").write_bytes(b"\xff\xfe")
+        downloads: list[list[str]] = []
+
+        class CountingFilesystemBackend(FilesystemBackend):
+            async def adownload_files(self, paths):
+                downloads.append(paths)
+                return await super().adownload_files(paths)
+
+        middleware = FilesystemMiddleware(backend=CountingFilesystemBackend(root_dir=tmp_path, virtual_mode=True))
+        middleware.file_cache.max_entry_chars = 10
+        read_file = next(tool for tool in middleware.tools if tool.name == "read_file")
+        rt = ToolRuntime(
+            state=FilesystemState(messages=[], files={}),
+            context=None,
+            tool_call_id=None,
+            store=None,
+            stream_writer=lambda _: None,
+            config={"configurable": {"thread_id": "t"}},
+        )
+
+        results = await asyncio.gather(
+            *(
+                middleware.awrap_tool_call(_tool_call_request(read_file, {"file_path": path}, rt), _run_tool)
+                for path in ("/a.txt", "/big.txt", "/data.bin")
+            )
+        )
+
+        assert downloads == [["/a.txt", "/data.bin"]]
+        assert results[:2] == [format_content_with_line_numbers(["alpha"]), format_content_with_line_numbers(["x" * 20])]
+
+        # Neither file is downloaded again on the next read
+        await read_file.ainvoke({"file_path": "/data.bin", "runtime": rt, "offset": 0, "limit": 1})
+        await read_file.ainvoke({"file_path": "/big.txt", "runtime": rt, "offset": 0, "limit": 1})
+        assert downloads == [["/a.txt", "/data.bin"]]
+
+    async def test_parallel_read_only_calls_share_one_sandbox_command(self, tmp_path: Path):
+        """Parallel ls, glob, grep and read_file calls on a sandbox run as one command, with per-call results."""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "app.py").write_text("import os\nprint(os.getcwd())\n")
+        sandbox = _SubprocessSandbox()
+        root = str(tmp_path)
+        calls = [
+            {"name": "ls", "args": {"path": root}, "id": "call_ls", "type": "tool_call"},
+            {"name": "glob", "args": {"pattern": "**/*.py", "path": root}, "id": "call_glob", "type": "tool_call"},
+            {"name": "grep", "args": {"pattern": "import", "path": root, "output_mode": "content"}, "id": "call_grep", "type": "tool_call"},
+            {"name": "read_file", "args": {"file_path": f"{root}/src/app.py", "limit": 1}, "id": "call_read", "type": "tool_call"},
+        ]
+        middleware = FilesystemMiddleware(backend=sandbox)
+        tools = {tool.name: tool for tool in middleware.tools}
+        rt = ToolRuntime(state={"messages": []}, context=None, tool_call_id=None, store=None, stream_writer=lambda _: None, config={})
+        expected = {call["id"]: await tools[call["name"]].ainvoke({**call["args"], "runtime": rt}) for call in calls}
+        sandbox.commands.clear()
+        agent = create_agent(
+            model=GenericFakeChatModel(messages=iter([AIMessage(content="", tool_calls=calls), AIMessage(content="Done.")])),
+            middleware=[middleware],
+        )
+
+        result = await agent.ainvoke({"messages": [HumanMessage(content="Look around")]})
+
+        tool_results = {m.tool_call_id: m.content for m in result["messages"] if isinstance(m, ToolMessage)}
+        assert len(sandbox.commands) == 1
+        assert tool_results == expected
+        assert f"{root}/src/app.py" in tool_results["call_grep"]
+
+    async def test_single_read_file_call_reads_directly(self):
+        """A read_file call without concurrent reads uses the backend's read."""
+        downloads: list[list[str]] = []
+
+        class CountingStateBackend(StateBackend):
+            async def adownload_files(self, paths):
+                downloads.append(paths)
+                return await super().adownload_files(paths)
+
+        call = {"name": "read_file", "args": {"file_path": "/a.txt"}, "id": "call_a", "type": "tool_call"}
+        agent = create_agent(
+            model=GenericFakeChatModel(messages=iter([AIMessage(content="", tool_calls=[call]), AIMessage(content="Done.")])),
+            middleware=[FilesystemMiddleware(backend=CountingStateBackend)],
+        )
+
+        result = await agent.ainvoke({"messages": [HumanMessage(content="Read")], "files": {"/a.txt": create_file_data("alpha")}})
+
+        assert downloads == []
+        assert result["messages"][2].content == format_content_with_line_numbers(["alpha"])
@@ -5,6 +5,7 @@ are invoked, how they return results, and how state is managed between parent
 and child agents.
 """
 
+import threading
 import warnings
 from pathlib import Path
 from typing import Any, TypedDict
@@ -14,17 +15,21 @@ from langchain.agents import create_agent
 from langchain.agents.middleware import TodoListMiddleware
 from langchain.agents.structured_output import ToolStrategy
 from langchain.tools import ToolRuntime
-from langchain_core.messages import AIMessage, HumanMessage
-from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
 from langchain_core.tools import tool
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.graph import END, START, StateGraph
 from pydantic import BaseModel, Field
 
+import deepagents.graph
 from deepagents.backends.filesystem import FilesystemBackend
+from deepagents.backends.state import StateBackend
+from deepagents.backends.utils import create_file_data
 from deepagents.graph import create_deep_agent
+from deepagents.middleware.filesystem import FilesystemMiddleware
 from deepagents.middleware.skills import SkillsMiddleware
-from deepagents.middleware.subagents import CompiledSubAgent, SubAgent, SubAgentMiddleware
+from deepagents.middleware.subagents import CompiledSubAgent, SubAgent, SubAgentMiddleware, _files_delta
 from tests.unit_tests.chat_model import GenericFakeChatModel
 
 
@@ -1591,3 +1596,254 @@ class TestSubAgentMiddlewareValidation:
         assert len(w) == 1
         assert issubclass(w[0].category, DeprecationWarning)
         assert "deprecated" in str(w[0].message).lower()
+
+
+class TestFilesHandoff:
+    """Tests for how the parent's `files` state is handed to and merged back from subagents."""
+
+    def test_files_delta_keeps_only_changes(self) -> None:
+        """Unchanged files are dropped and files missing from the result become deletions."""
+        unchanged = create_file_data("same")
+        edited = create_file_data("before")
+        removed = create_file_data("gone")
+        added = create_file_data("new")
+        passed = {"/same.txt": unchanged, "/edited.txt": edited, "/removed.txt": removed}
+        returned = {"/same.txt": unchanged, "/edited.txt": create_file_data("after"), "/added.txt": added}
+
+        delta = _files_delta(passed, returned)
+
+        assert set(delta) == {"/edited.txt", "/added.txt", "/removed.txt"}
+        assert delta["/edited.txt"]["content"] == ["after"]
+        assert delta["/added.txt"] is added
+        assert delta["/removed.txt"] is None
+
+    def test_unchanged_files_are_not_merged_back(self) -> None:
+        """A subagent that returns the parent's files untouched produces no `files` update."""
+        received: list[dict[str, Any]] = []
+
+        def passthrough(state: dict[str, Any]) -> dict[str, Any]:
+            received.append(state)
+            return {"messages": [AIMessage(content="Looked around")], "files": state["files"]}
+
+        middleware = SubAgentMiddleware(
+            backend=StateBackend,
+            subagents=[CompiledSubAgent(name="reader", description="Reads.", runnable=RunnableLambda(passthrough))],
+        )
+        task_tool = middleware.tools[0]
+        files = {"/big.txt": create_file_data("x" * 1000)}
+        runtime = ToolRuntime(
+            state={"messages": [], "files": files},
+            context=None,
+            config={},
+            stream_writer=lambda _: None,
+            tool_call_id="call_1",
+            store=None,
+        )
+
+        command = task_tool.func(description="Look", subagent_type="reader", runtime=runtime)  # type: ignore[misc]
+
+        assert received[0]["files"] is files
+        assert "files" not in command.update
+
+    def test_reference_handoff_reads_parent_files_and_returns_writes(self) -> None:
+        """In reference mode the subagent reads the parent's files without receiving them in its state."""
+        subagent_states: list[dict[str, Any]] = []
+
+        @tool
+        def capture_state(runtime: ToolRuntime) -> str:
+            """Captures the subagent's state."""
+            subagent_states.append(dict(runtime.state))
+            return "captured"
+
+        subagent_model = GenericFakeChatModel(
+            messages=iter(
+                [
+                    AIMessage(
+                        content="",
+                        tool_calls=[
+                            {"name": "capture_state", "args": {}, "id": "call_capture", "type": "tool_call"},
+                            {"name": "read_file", "args": {"file_path": "/notes.txt"}, "id": "call_read", "type": "tool_call"},
+                        ],
+                    ),
+                    AIMessage(
+                        content="",
+                        tool_calls=[
+                            {
+                                "name": "write_file",
+                                "args": {"file_path": "/summary.txt", "content": "summary"},
+                                "id": "call_write",
+                                "type": "tool_call",
+                            }
+                        ],
+                    ),
+                    AIMessage(content="Summarized."),
+                ]
+            )
+        )
+        subagent = create_agent(
+            model=subagent_model,
+            tools=[capture_state],
+            middleware=[FilesystemMiddleware(backend=StateBackend)],
+            name="summarizer",
+        )
+        parent_model = GenericFakeChatModel(
+            messages=iter(
+                [
+                    AIMessage(
+                        content="",
+                        tool_calls=[
+                            {
+                                "name": "task",
+                                "args": {"description": "Summarize notes", "subagent_type": "summarizer"},
+                                "id": "call_task",
+                                "type": "tool_call",
+                            }
+                        ],
+                    ),
+                    AIMessage(content="Done."),
+                ]
+            )
+        )
+        parent = create_agent(
+            model=parent_model,
+            middleware=[
+                FilesystemMiddleware(backend=StateBackend),
+                SubAgentMiddleware(
+                    backend=StateBackend,
+                    subagents=[CompiledSubAgent(name="summarizer", description="Summarizes.", runnable=subagent)],
+                    files_handoff="reference",
+                ),
+            ],
+        )
+
+        result = parent.invoke(
+            {"messages": [HumanMessage(content="Go")], "files": {"/notes.txt": create_file_data("remember the milk")}},
+        )
+
+        assert "files" not in subagent_states[0]
+        read_results = [m for m in subagent_model.call_history[1]["messages"] if isinstance(m, ToolMessage) and m.tool_call_id == "call_read"]
+        assert "remember the milk" in read_results[0].content
+        assert set(result["files"]) == {"/notes.txt", "/summary.txt"}
+        task_result = next(m for m in result["messages"] if isinstance(m, ToolMessage) and m.tool_call_id == "call_task")
+        assert task_result.content == "Summarized."
+
+
+class TestLazySubagentCompilation:
+    """Tests that subagent graphs are compiled on first use rather than at construction."""
+
+    def test_subagents_compiled_once_on_first_task_call(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        compiled: list[str] = []
+        create_subagent_runnable = deepagents.graph._create_subagent_runnable
+
+        def spy(spec: SubAgent) -> Runnable:
+            compiled.append(spec["name"])
+            return create_subagent_runnable(spec)
+
+        monkeypatch.setattr(deepagents.graph, "_create_subagent_runnable", spy)
+
+        task_calls = [
+            AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": "task",
+                        "args": {"description": f"Research {topic}", "subagent_type": "researcher"},
+                        "id": f"call_{topic}",
+                        "type": "tool_call",
+                    }
+                ],
+            )
+            for topic in ("cats", "dogs")
+        ]
+        agent = create_deep_agent(
+            model=GenericFakeChatModel(messages=iter([*task_calls, AIMessage(content="Done.")])),
+            subagents=[
+                {
+                    "name": "researcher",
+                    "description": "Researches topics.",
+                    "system_prompt": "You research.",
+                    "model": GenericFakeChatModel(messages=iter([AIMessage(content="Cats purr."), AIMessage(content="Dogs bark.")])),
+                },
+                {"name": "writer", "description": "Writes reports.", "system_prompt": "You write."},
+            ],
+        )
+
+        assert compiled == []
+
+        result = agent.invoke({"messages": [HumanMessage(content="Research pets")]})
+
+        assert compiled == ["researcher"]
+        assert [m.content for m in result["messages"] if isinstance(m, ToolMessage)] == ["Cats purr.", "Dogs bark."]
+
+    def test_string_subagent_model_initialized_on_first_task_call(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        initialized: list[str] = []
+
+        def fake_init_chat_model(model: str) -> GenericFakeChatModel:
+            initialized.append(model)
+            return GenericFakeChatModel(messages=iter([AIMessage(content="Cats purr.")]))
+
+        monkeypatch.setattr(deepagents.graph, "init_chat_model", fake_init_chat_model)
+        task_call = {"name": "task", "args": {"description": "Research cats", "subagent_type": "researcher"}, "id": "call_cats", "type": "tool_call"}
+        agent = create_deep_agent(
+            model=GenericFakeChatModel(messages=iter([AIMessage(content="", tool_calls=[task_call]), AIMessage(content="Done.")])),
+            subagents=[
+                {"name": "researcher", "description": "Researches topics.", "system_prompt": "You research.", "model": "openai:gpt-4o"},
+                {"name": "writer", "description": "Writes reports.", "system_prompt": "You write.", "model": "openai:gpt-4o-mini"},
+            ],
+        )
+
+        assert initialized == []
+
+        result = agent.invoke({"messages": [HumanMessage(content="Research cats")]})
+
+        assert initialized == ["openai:gpt-4o"]
+        assert [m.content for m in result["messages"] if isinstance(m, ToolMessage)] == ["Cats purr."]
+
+    def test_subagent_middleware_validates_eagerly(self) -> None:
+        with pytest.raises(ValueError, match="must specify 'tools'"):
+            SubAgentMiddleware(
+                backend=StateBackend,
+                subagents=[{"name": "researcher", "description": "Researches.", "system_prompt": "You research.", "model": "openai:gpt-4o"}],  # type: ignore[typeddict-item]
+            )
+
+    def test_duplicate_subagent_middleware_rejected_at_construction(self) -> None:
+        with pytest.raises(AssertionError, match="duplicate middleware"):
+            create_deep_agent(
+                model=GenericFakeChatModel(messages=iter([])),
+                subagents=[
+                    {
+                        "name": "researcher",
+                        "description": "Researches topics.",
+                        "system_prompt": "You research.",
+                        "middleware": [TodoListMiddleware()],
+                    }
+                ],
+            )
+
+    async def test_lazy_subagent_is_a_runnable_compiled_off_the_event_loop(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        compile_threads: list[int] = []
+        create_subagent_runnable = deepagents.graph._create_subagent_runnable
+
+        def spy(spec: SubAgent) -> Runnable:
+            compile_threads.append(threading.get_ident())
+            return create_subagent_runnable(spec)
+
+        monkeypatch.setattr(deepagents.graph, "_create_subagent_runnable", spy)
+        spec = deepagents.graph._lazy_subagent(
+            {
+                "name": "researcher",
+                "description": "Researches topics.",
+                "system_prompt": "You research.",
+                "model": GenericFakeChatModel(messages=iter([AIMessage(content="Cats purr.")])),
+                "tools": [],
+            },
+            backend=StateBackend,
+            skills=None,
+        )
+
+        assert isinstance(spec["runnable"], Runnable)
+        result = await spec["runnable"].ainvoke({"messages": [HumanMessage(content="Research cats")]})
+
+        assert result["messages"][-1].content == "Cats purr."
+        assert len(compile_threads) == 1
+        assert compile_threads[0] != threading.get_ident()